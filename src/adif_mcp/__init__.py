@@ -1,14 +1,24 @@
 # src/adif_mcp/__init__.py
 from __future__ import annotations
 
-from importlib.metadata import PackageNotFoundError, version
 from typing import Final
 
-# Resolve once, then bind to Final exactly once
-try:
-    _pkg_version = version("adif-mcp")
-except PackageNotFoundError:  # local dev / editable installs without dist metadata
-    _pkg_version = "0.0.0"
-
-__version__: Final[str] = _pkg_version
 __adif_spec__: Final[str] = "3.1.6"
+
+
+def __getattr__(name: str) -> str:
+    """Resolve `__version__` on first access.
+
+    `importlib.metadata` is comparatively slow to import, so it is deferred
+    until the version is actually needed rather than paid by every CLI run.
+    """
+    if name != "__version__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        value = version("adif-mcp")
+    except PackageNotFoundError:  # local dev / editable installs without dist metadata
+        value = "0.0.0"
+    globals()["__version__"] = value
+    return value
@@ -0,0 +1 @@
+"""Reproducible benchmarks for the parser, validation and tool hot paths."""
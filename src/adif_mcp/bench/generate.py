@@ -0,0 +1,327 @@
+"""
+Deterministic synthetic ADIF log generator for load and scale testing.
+
+Values come from the bundled ADIF 3.1.6 enumerations: bands (with a FREQ
+inside the band edges), mode/submode pairs, DXCC entities and their primary
+subdivisions (STATE, CQZ). A fixed pool of stations gives each call a stable
+entity, subdivision and grid, so the same station is worked repeatedly as in
+a real log. QSO times advance monotonically from `start`.
+
+Speed comes from doing the per-record work in bulk: every field is
+pre-encoded as a tag+value fragment, a block of records is drawn with
+`random.choices`, and records are assembled with `bytes.join` and written with
+`writelines`. Dirty data (bad dates, wrong declared lengths, unknown fields,
+lowercase tags) is injected into a seeded sample of each block.
+
+The same seed and options always produce the same bytes.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, BinaryIO
+
+__all__ = ["DirtyRates", "LogGenerator", "write_log"]
+
+_SPEC_DIR = Path(__file__).resolve().parent.parent / "resources" / "spec" / "316"
+
+_BLOCK = 8192
+
+# Relative weights for popular (mode, submode) pairs; every other enumerated
+# pair gets `_RARE_WEIGHT`.
+_POPULAR_MODES: dict[tuple[str, str], float] = {
+    ("FT8", ""): 35.0,
+    ("CW", ""): 25.0,
+    ("SSB", "USB"): 10.0,
+    ("SSB", "LSB"): 6.0,
+    ("MFSK", "FT4"): 8.0,
+    ("RTTY", ""): 4.0,
+    ("PSK", "PSK31"): 2.0,
+    ("FM", ""): 2.0,
+}
+_RARE_WEIGHT = 0.02
+
+_POPULAR_BANDS: dict[str, float] = {
+    "160m": 3, "80m": 6, "60m": 1, "40m": 14, "30m": 6, "20m": 22, "17m": 8,
+    "15m": 10, "12m": 4, "10m": 9, "6m": 6, "2m": 4, "70cm": 1,
+}
+
+# Minutes between consecutive QSOs and their cumulative weights.
+_GAPS = (1, 2, 3, 5, 8, 15, 40, 180, 900)
+_GAP_CUM_WEIGHTS = tuple(accumulate((30, 25, 15, 10, 8, 6, 3, 2, 1)))
+
+_PHONE = {"SSB", "AM", "FM", "DIGITALVOICE"}
+# Weak-signal modes report SNR in dB rather than RST.
+_SNR_MODES = {"FT8", "FT4", "FST4", "JT4", "JT9", "JT65", "Q65", "MSK144", "WSPR"}
+
+_UNKNOWN_FIELDS = (b"<X_FOO:3>bar", b"<MYSTERY_FIELD:2>42", b"<QSO_NOTE_V2:4>test")
+_BAD_DATES = (b"20231341", b"20230230", b"2023-1-5", b"00000000", b"99999999")
+_TAG_NAME = re.compile(rb"<([A-Z_0-9]+)(?=[:>])")
+_CALL_TAG = re.compile(rb"<CALL:(\d+)>")
+_DATE_FRAG = b"<QSO_DATE:8>"
+
+
+@dataclass(frozen=True)
+class DirtyRates:
+    """Fractions (0..1) of records to corrupt in each way."""
+
+    bad_date: float = 0.0
+    wrong_length: float = 0.0
+    unknown_field: float = 0.0
+    lowercase_tags: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Reject rates outside 0..1."""
+        for name, value in vars(self).items():
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1, got {value}")
+
+
+@lru_cache(maxsize=None)
+def _enum(name: str) -> dict[str, dict[str, str]]:
+    """Records of one bundled enumeration, keyed as in the spec export."""
+    path = _SPEC_DIR / f"enumerations_{name.lower()}.json"
+    data: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    records: dict[str, dict[str, str]] = data["Adif"]["Enumerations"][name]["Records"]
+    return records
+
+
+def _field(tag: str, value: str) -> bytes:
+    data = value.encode("utf-8")
+    return b"<%s:%d>%s" % (tag.encode("ascii"), len(data), data)
+
+
+def _with_bad_date(rec: bytes, bad: bytes) -> bytes:
+    i = rec.find(_DATE_FRAG)
+    end = i + len(_DATE_FRAG) + 8
+    return rec[:i] + b"<QSO_DATE:%d>%s" % (len(bad), bad) + rec[end:]
+
+
+def _overstate_length(m: re.Match[bytes]) -> bytes:
+    return b"<CALL:%d>" % (int(m.group(1)) + 2)
+
+
+def _lower_tag(m: re.Match[bytes]) -> bytes:
+    return b"<" + m.group(1).lower()
+
+
+def _rst(mode: str, submode: str) -> bytes:
+    if mode in _SNR_MODES or submode in _SNR_MODES:
+        return b"-10"
+    return b"59" if mode in _PHONE else b"599"
+
+
+class LogGenerator:
+    """Seeded generator of realistic ADIF records.
+
+    Args:
+        seed: RNG seed; identical seeds give identical output.
+        station_call: STATION_CALLSIGN written on every record.
+        start: Date of the first QSO.
+        stations: Size of the pool of worked stations.
+        dirty: Dirty-data injection rates.
+        confirmed_rate: Fraction of records with LOTW_QSL_RCVD=Y.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        *,
+        station_call: str = "KI7MT",
+        start: date = date(2015, 1, 1),
+        stations: int = 20_000,
+        dirty: DirtyRates | None = None,
+        confirmed_rate: float = 0.3,
+    ) -> None:
+        """Build the value pools (deterministically from `seed`)."""
+        self.seed = seed
+        self.dirty = dirty or DirtyRates()
+        self._rng = random.Random(seed)
+        self._station = _field("STATION_CALLSIGN", station_call.upper())
+        self._epoch = start
+        self._minute = 0
+        self._date_cache: dict[int, bytes] = {}
+        self._times = [_field("TIME_ON", f"{m // 60:02d}{m % 60:02d}") for m in range(1440)]
+        self._confirm = [b"<LOTW_QSL_RCVD:1>Y", b""]
+        self._confirm_w = [confirmed_rate, 1.0]
+        self._build_band_modes()
+        self._build_stations(stations)
+
+    # ------------------------ pools ------------------------
+
+    def _build_band_modes(self) -> None:
+        rng = self._rng
+        bands = _enum("Band")
+        self._bands: list[bytes] = []
+        band_w: list[float] = []
+        for name, rec in bands.items():
+            lo, hi = float(rec["Lower Freq (MHz)"]), float(rec["Upper Freq (MHz)"])
+            freqs = [f"{rng.uniform(lo, hi):.4f}" for _ in range(8)]
+            for f in freqs:
+                self._bands.append(_field("BAND", name) + _field("FREQ", f))
+                band_w.append(_POPULAR_BANDS.get(name, 0.05) / len(freqs))
+        # random.choices is cheaper with cumulative weights precomputed.
+        self._band_w = list(accumulate(band_w))
+
+        pairs: set[tuple[str, str]] = {
+            (m, "") for m, r in _enum("Mode").items() if r.get("Import-only") != "true"
+        }
+        pairs.update(
+            (r["Mode"], s)
+            for s, r in _enum("Submode").items()
+            if r.get("Import-only") != "true" and r.get("Mode")
+        )
+        self._modes: list[bytes] = []
+        mode_w: list[float] = []
+        for mode, sub in sorted(pairs):
+            frag = _field("MODE", mode) + (_field("SUBMODE", sub) if sub else b"")
+            rst = _rst(mode, sub)
+            frag += b"<RST_SENT:%d>%s<RST_RCVD:%d>%s" % (len(rst), rst, len(rst), rst)
+            self._modes.append(frag)
+            mode_w.append(_POPULAR_MODES.get((mode, sub), _RARE_WEIGHT))
+        self._mode_w = list(accumulate(mode_w))
+
+    def _build_stations(self, n: int) -> None:
+        rng = self._rng
+        entities = {
+            code: rec["Entity Name"]
+            for code, rec in _enum("DXCC_Entity_Code").items()
+            if code != "0" and rec.get("Deleted") != "true"
+        }
+        subdivisions: dict[str, list[tuple[str, str]]] = {}
+        for rec in _enum("Primary_Administrative_Subdivision").values():
+            code = rec.get("DXCC Entity Code", "")
+            if code in entities and rec.get("Code"):
+                subdivisions.setdefault(code, []).append((rec["Code"], rec.get("CQ Zone", "")))
+        codes = sorted(entities, key=int)
+        # Roughly a third of contacts are with US stations.
+        weights = [len(codes) * 0.5 if c == "291" else 1.0 for c in codes]
+
+        self._calls: list[bytes] = []
+        seen: set[str] = set()
+        while len(self._calls) < n:
+            dxcc = rng.choices(codes, weights)[0]
+            call = self._callsign(rng, dxcc)
+            if call in seen:
+                continue
+            seen.add(call)
+            parts = [_field("CALL", call), _field("DXCC", dxcc)]
+            subs = subdivisions.get(dxcc)
+            if subs:
+                state, cqz = rng.choice(subs)
+                parts.append(_field("STATE", state))
+                if cqz.isdigit():
+                    parts.append(_field("CQZ", str(int(cqz))))
+            grid = (
+                rng.choice("ABCDEFGHIJKLMNOPQR")
+                + rng.choice("ABCDEFGHIJKLMNOPQR")
+                + f"{rng.randrange(100):02d}"
+            )
+            if rng.random() < 0.4:
+                grid += "".join(rng.choices("abcdefghijklmnopqrstuvwx", k=2))
+            parts.append(_field("GRIDSQUARE", grid))
+            self._calls.append(b"".join(parts))
+
+    @staticmethod
+    def _callsign(rng: random.Random, dxcc: str) -> str:
+        letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+        if dxcc == "291":
+            prefix = rng.choice(("K", "N", "W", "AA", "AB", "KB", "KD", "KI", "N", "W"))
+        else:
+            # Synthetic, but stable per entity (real prefixes are not bundled).
+            r = random.Random(int(dxcc))
+            prefix = r.choice(letters) + r.choice(letters + "0123456789")
+        suffix = "".join(rng.choice(letters) for _ in range(rng.randint(1, 3)))
+        return f"{prefix}{rng.randrange(10)}{suffix}"
+
+    # ------------------------ output ------------------------
+
+    def header(self) -> bytes:
+        """ADIF header naming the generator and seed."""
+        return (
+            b"Generated by adif-mcp generate (seed %d)\n" % self.seed
+            + _field("ADIF_VER", "3.1.6")
+            + _field("PROGRAMID", "ADIF-MCP")
+            + b"<EOH>\n"
+        )
+
+    def _date(self, day: int) -> bytes:
+        frag = self._date_cache.get(day)
+        if frag is None:
+            frag = _field("QSO_DATE", (self._epoch + timedelta(days=day)).strftime("%Y%m%d"))
+            self._date_cache[day] = frag
+        return frag
+
+    def block(self, n: int) -> list[bytes]:
+        """The next `n` records (each ending in `<EOR>` and a newline)."""
+        rng = self._rng
+        choices = rng.choices
+        gaps = choices(_GAPS, cum_weights=_GAP_CUM_WEIGHTS, k=n)
+        minutes = list(accumulate(gaps, initial=self._minute))[1:]
+        self._minute = minutes[-1] if minutes else self._minute
+        times = self._times
+        dates = [self._date(m // 1440) for m in minutes]
+        recs = list(
+            map(
+                b"".join,
+                zip(
+                    [self._station] * n,
+                    choices(self._calls, k=n),
+                    dates,
+                    [times[m % 1440] for m in minutes],
+                    choices(self._bands, cum_weights=self._band_w, k=n),
+                    choices(self._modes, cum_weights=self._mode_w, k=n),
+                    choices(self._confirm, cum_weights=self._confirm_w, k=n),
+                    [b"<EOR>\n"] * n,
+                ),
+            )
+        )
+        self._dirty(recs)
+        return recs
+
+    def _dirty(self, recs: list[bytes]) -> None:
+        rng, d, n = self._rng, self.dirty, len(recs)
+
+        def sample(rate: float) -> list[int]:
+            k = int(rate * n + rng.random())  # unbiased rounding
+            return rng.sample(range(n), min(k, n)) if k else []
+
+        for i in sample(d.bad_date):
+            recs[i] = _with_bad_date(recs[i], rng.choice(_BAD_DATES))
+        for i in sample(d.wrong_length):
+            recs[i] = _CALL_TAG.sub(_overstate_length, recs[i], count=1)
+        for i in sample(d.unknown_field):
+            recs[i] = recs[i].replace(b"<EOR>", rng.choice(_UNKNOWN_FIELDS) + b"<EOR>", 1)
+        for i in sample(d.lowercase_tags):
+            recs[i] = _TAG_NAME.sub(_lower_tag, recs[i])
+
+    def records(self, n: int) -> Iterator[bytes]:
+        """Yield `n` encoded records in blocks."""
+        while n > 0:
+            k = min(n, _BLOCK)
+            yield from self.block(k)
+            n -= k
+
+
+def write_log(fh: BinaryIO, n: int, generator: LogGenerator | None = None) -> int:
+    """Write a header and `n` generated records to `fh`; returns bytes written."""
+    gen = generator or LogGenerator()
+    head = gen.header()
+    fh.write(head)
+    total = len(head)
+    remaining = n
+    while remaining > 0:
+        k = min(remaining, _BLOCK)
+        recs = gen.block(k)
+        fh.writelines(recs)
+        total += sum(map(len, recs))
+        remaining -= k
+    return total
@@ -0,0 +1,310 @@
+"""
+Benchmark runner behind `adif-mcp bench`.
+
+Each workload runs against a deterministic synthetic log of a given size and
+records one latency sample per operation: a full pass over the log for the
+bulk parsers, a single call for the per-record tools. Results report
+throughput (items per second), latency percentiles and the process' peak RSS,
+and can be compared against a stored baseline with a regression threshold.
+
+Per-call workloads (validation, enumeration search, geography) are capped at
+`MAX_CALLS` calls per size so large sizes stay practical; their throughput is
+per call, not per log record.
+"""
+
+from __future__ import annotations
+
+import platform
+import random
+import sys
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import Any
+
+__all__ = [
+    "MAX_CALLS",
+    "WORKLOADS",
+    "BenchResult",
+    "compare",
+    "parse_size",
+    "peak_rss_kb",
+    "run",
+    "synthetic_log",
+]
+
+MAX_CALLS = 10_000
+
+# (name, per_call): bulk workloads time whole passes, per-call ones single calls.
+WORKLOADS: dict[str, bool] = {
+    "parse_adi_text": False,
+    "convert_parse_build": False,
+    "adi_stream": False,
+    "adi_write": False,
+    "adx_stream": False,
+    "adx_write": False,
+    "validate_adif_record": True,
+    "search_enumerations": True,
+    "geography": True,
+    "worked_lookup": True,
+}
+
+_SIZE_UNITS = {"k": 1_000, "m": 1_000_000}
+
+
+@dataclass
+class BenchResult:
+    """Measurements for one workload at one log size."""
+
+    workload: str
+    size: int
+    items: int
+    seconds: float
+    throughput_per_s: float
+    latency_ms: dict[str, float]
+    peak_rss_kb: int | None
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-friendly form."""
+        return asdict(self)
+
+
+def parse_size(text: str) -> int:
+    """Parse `1000`, `1k`, `100K` or `1M` into a record count."""
+    t = text.strip().lower()
+    mult = _SIZE_UNITS.get(t[-1:], 1)
+    if mult != 1:
+        t = t[:-1]
+    value = int(float(t) * mult)
+    if value <= 0:
+        raise ValueError(f"size must be > 0: {text!r}")
+    return value
+
+
+def peak_rss_kb() -> int | None:
+    """Peak resident set size of this process in KiB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def synthetic_log(size: int, seed: int = 0) -> str:
+    """Deterministic ADIF text with `size` records from `generate.LogGenerator`."""
+    from adif_mcp.bench.generate import LogGenerator
+
+    gen = LogGenerator(seed, stations=max(1, min(size, 20_000)))
+    return (gen.header() + b"".join(gen.records(size))).decode("utf-8")
+
+
+def _letters(rng: random.Random, n: int) -> str:
+    return "".join(rng.choice("ABCDEFGHIJKLMNOPQR") for _ in range(n))
+
+
+def _geography(a: str, b: str) -> tuple[float, float]:
+    from adif_mcp.utils.geography import calculate_distance_impl, calculate_heading_impl
+
+    return calculate_distance_impl(a, b), calculate_heading_impl(a, b)
+
+
+def _percentiles(samples: Sequence[float]) -> dict[str, float]:
+    """Nearest-rank p50/p90/p99/max of `samples` (seconds) in milliseconds."""
+    s = sorted(samples)
+    n = len(s)
+
+    def pct(p: float) -> float:
+        return round(s[min(n - 1, max(0, int(p * n + 0.5) - 1))] * 1000, 4)
+
+    return {"p50": pct(0.50), "p90": pct(0.90), "p99": pct(0.99), "max": pct(1.0)}
+
+
+def _bulk_ops(name: str, text: str) -> Callable[[], int]:
+    if name == "parse_adi_text":
+        from adif_mcp.parsers.adif_reader import parse_adi_text
+
+        return lambda: len(parse_adi_text(text))
+    if name == "convert_parse_build":
+        from adif_mcp.cli.convert_adi import build_qso, parse_adif
+
+        return lambda: sum(1 for f in parse_adif(text) if build_qso(f) is not None)
+    if name == "adi_stream":
+        from adif_mcp.parsers.adi_stream import AdiScanner
+
+        data = text.encode("utf-8")
+
+        def scan() -> int:
+            sc = AdiScanner()
+            return len(sc.feed(data)) + len(sc.finish())
+
+        return scan
+    if name == "adi_write":
+        import io
+
+        from adif_mcp.parsers.adi_stream import AdiScanner
+        from adif_mcp.parsers.adi_writer import AdiWriter
+
+        sc = AdiScanner()
+        fields = [r.fields for r in sc.feed(text.encode("utf-8")) + sc.finish()]
+
+        def write_adi() -> int:
+            with AdiWriter(io.BytesIO()) as w:
+                return w.write_all(fields)
+
+        return write_adi
+    if name in ("adx_stream", "adx_write"):
+        import io
+
+        from adif_mcp.parsers.adi_stream import AdiScanner
+        from adif_mcp.parsers.adx import AdxReader, AdxWriter
+
+        sc = AdiScanner()
+        records = [r.fields for r in sc.feed(text.encode("utf-8")) + sc.finish()]
+
+        def write() -> bytes:
+            buf = io.BytesIO()
+            with AdxWriter(buf) as w:
+                w.write_all(records)
+            return buf.getvalue()
+
+        if name == "adx_write":
+            return lambda: len(records) if write() else 0
+        xml = write()
+        return lambda: sum(1 for _ in AdxReader(io.BytesIO(xml)))
+    raise KeyError(name)
+
+
+def _call_ops(name: str, text: str, calls: int, seed: int) -> list[Callable[[], object]]:
+    rng = random.Random(seed)
+    if name == "validate_adif_record":
+        from adif_mcp.mcp.server import validate_adif_record
+
+        body = text.split("<EOH>", 1)[-1]
+        records = [p.strip() + "<EOR>" for p in body.split("<EOR>") if p.strip()]
+        return [partial(validate_adif_record, r) for r in records[:calls]]
+    if name == "search_enumerations":
+        from adif_mcp.mcp.server import search_enumerations
+
+        terms = ("FT8", "Canada", "20m", "LoTW", "Alaska", "CW", "JT65", "Japan")
+        return [partial(search_enumerations, rng.choice(terms)) for _ in range(calls)]
+    if name == "geography":
+        grids = [f"{_letters(rng, 2)}{rng.randrange(100):02d}" for _ in range(2 * calls)]
+        return [partial(_geography, grids[2 * i], grids[2 * i + 1]) for i in range(calls)]
+    if name == "worked_lookup":
+        from adif_mcp.logbook.lookup import WorkedIndex
+        from adif_mcp.parsers.adi_stream import AdiScanner
+
+        sc = AdiScanner()
+        qsos = [r.fields for r in sc.feed(text.encode("utf-8")) + sc.finish()]
+        index = WorkedIndex(bloom_capacity=max(1, len(qsos)))
+        index.add_many(qsos)
+        picks = [rng.choice(qsos) for _ in range(calls)]
+        return [
+            partial(
+                index.check,
+                f.get("call", ""),
+                f.get("band"),
+                f.get("mode"),
+                dxcc=f.get("dxcc"),
+            )
+            for f in picks
+        ]
+    raise KeyError(name)
+
+
+def run_workload(
+    name: str, size: int, *, seed: int = 0, repeat: int = 3, text: str | None = None
+) -> BenchResult:
+    """Run one workload over a synthetic log of `size` records."""
+    log = text if text is not None else synthetic_log(size, seed)
+    samples: list[float] = []
+    items = 0
+    clock = time.perf_counter
+    if WORKLOADS[name]:
+        ops = _call_ops(name, log, min(size, MAX_CALLS), seed)
+        ops[0]()  # warm caches (spec JSON) outside the measurement
+        for op in ops:
+            t0 = clock()
+            op()
+            samples.append(clock() - t0)
+        items = len(ops)
+    else:
+        op_bulk = _bulk_ops(name, log)
+        for _ in range(max(1, repeat)):
+            t0 = clock()
+            items = op_bulk()
+            samples.append(clock() - t0)
+    total = sum(samples)
+    per_pass = total / (1 if WORKLOADS[name] else len(samples))
+    return BenchResult(
+        workload=name,
+        size=size,
+        items=items,
+        seconds=round(total, 6),
+        throughput_per_s=round(items / per_pass, 2) if per_pass > 0 else 0.0,
+        latency_ms=_percentiles(samples),
+        peak_rss_kb=peak_rss_kb(),
+    )
+
+
+def run(
+    sizes: Iterable[int],
+    workloads: Iterable[str] | None = None,
+    *,
+    seed: int = 0,
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """Run `workloads` (default: all) at every size and return a JSON report."""
+    names = list(workloads or WORKLOADS)
+    unknown = [n for n in names if n not in WORKLOADS]
+    if unknown:
+        raise ValueError(f"Unknown workload(s): {', '.join(unknown)}")
+    import adif_mcp
+
+    results = []
+    for size in sizes:
+        log = synthetic_log(size, seed)
+        for name in names:
+            results.append(
+                run_workload(name, size, seed=seed, repeat=repeat, text=log).to_dict()
+            )
+        del log
+    return {
+        "adif_mcp": adif_mcp.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(
+    report: dict[str, Any], baseline: dict[str, Any], threshold: float = 0.10
+) -> list[dict[str, Any]]:
+    """Throughput regressions of `report` against `baseline`.
+
+    A (workload, size) pair regresses when its throughput drops by more than
+    `threshold` (a fraction) relative to the baseline. Pairs missing from
+    either side are ignored.
+    """
+    base = {(r["workload"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in report.get("results", []):
+        b = base.get((r["workload"], r["size"]))
+        if not b or not b["throughput_per_s"]:
+            continue
+        change = r["throughput_per_s"] / b["throughput_per_s"] - 1.0
+        if change < -threshold:
+            regressions.append(
+                {
+                    "workload": r["workload"],
+                    "size": r["size"],
+                    "baseline_per_s": b["throughput_per_s"],
+                    "current_per_s": r["throughput_per_s"],
+                    "change": round(change, 4),
+                }
+            )
+    return regressions
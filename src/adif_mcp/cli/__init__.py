@@ -8,19 +8,21 @@ namespace setup.
 
 from __future__ import annotations
 
-from importlib.metadata import PackageNotFoundError, version
 from typing import Final
 
+import adif_mcp
+
 from .root import main
 
-# Resolve once, then bind to Final exactly once
-try:
-    _pkg_version = version("adif-mcp")
-except PackageNotFoundError:  # local dev / editable installs without dist metadata
-    _pkg_version = "0.0.0"
+__adif_spec__: Final[str] = adif_mcp.__adif_spec__
+
+
+def __getattr__(name: str) -> str:
+    """Delegate `__version__` to the (lazily resolved) package version."""
+    if name != "__version__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return str(adif_mcp.__version__)
 
-__version__: Final[str] = _pkg_version
-__adif_spec__: Final[str] = "3.1.6"
 
 __all__: list[str] = []
 
@@ -8,28 +8,12 @@ and dispatch subcommands.
 
 from __future__ import annotations
 
-import argparse
-import sys
-from typing import Callable, cast
-
-from .root import build_parser
+from .root import main as _root_main
 
 
 def main(argv: list[str] | None = None) -> int:
-    """Entry point for the adif-mcp CLI; delegates to root.build_parser()."""
-    parser = build_parser()
-    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
-
-    # mypy: argparse injects .func dynamically; tell the type checker what it is
-    func = cast(Callable[[argparse.Namespace], int] | None, getattr(args, "func", None))
-    if func is not None:
-        return func(args)
-
-    # Default to MCP server if no subcommand was provided
-    from adif_mcp.mcp.server import run as run_mcp
-
-    run_mcp()
-    return 0
+    """Entry point for the adif-mcp CLI; delegates to root.main()."""
+    return _root_main(argv)
 
 
 if __name__ == "__main__":
@@ -1,36 +1,135 @@
-"""Annotate NDJSON QSOs with persona-based callsign attribution by date."""
+"""Annotate NDJSON QSOs with persona-based callsign attribution by date.
+
+Ranges come from one or more personas in the persona store and/or a JSON
+ranges file, so an operator can list every vanity, contest and DXpedition
+call with its dates. They are flattened once into sorted, non-overlapping
+date segments (where ranges overlap, the latest start wins), so each QSO
+date costs one `bisect`; repeated dates are answered from an LRU memo.
+
+Each range may list aliases such as `KI7MT/4`: a record whose station_call
+is an alias of the attributed call keeps it (it is the more precise call),
+and an undated record logged under an alias is still attributed.
+"""
 
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
+from bisect import bisect_right
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, cast
+
+
+class CallRange(NamedTuple):
+    """One callsign held by a persona from `start` to `end` (inclusive; None = open)."""
+
+    persona: str
+    callsign: str
+    start: date
+    end: Optional[date] = None
+    aliases: tuple[str, ...] = ()
 
-from qso_graph_auth.identity.store import PersonaStore
+
+class Attribution(NamedTuple):
+    """The call (and persona) a QSO is attributed to."""
+
+    persona: str
+    callsign: str
+    aliases: frozenset[str]
 
 
 def _parse_yyyymmdd(d: str) -> date:
-    """Parse YYYYMMDD date string from QSO records."""
+    """Parse YYYYMMDD (or YYYY-MM-DD) date string from QSO records."""
+    d = d.replace("-", "")
+    if len(d) != 8 or not d.isdigit():
+        raise ValueError(f"invalid date {d!r}")
     return date(int(d[0:4]), int(d[4:6]), int(d[6:8]))
 
 
-def _choose_callsign(
-    ranges: list[tuple[str, date, date | None]], qso_d: date,
-) -> str | None:
-    """Pick the range whose [start, end] contains qso_d.
+class CallsignIndex:
+    """Date -> callsign over many, possibly overlapping, ranges."""
 
-    If multiple match, choose the one with the latest start.
-    """
-    matches = []
-    for cs, s, e in ranges:
-        if qso_d >= s and (e is None or qso_d <= e):
-            matches.append((s, cs))
-    if not matches:
-        return None
-    matches.sort(key=lambda t: t[0], reverse=True)
-    return matches[0][1]
+    def __init__(self, ranges: Iterable[CallRange], memo_size: int = 4096) -> None:
+        """Flatten `ranges` into sorted segments (earlier-listed ranges win exact ties)."""
+        self.ranges = list(ranges)
+        attribs = [
+            Attribution(
+                r.persona,
+                r.callsign.upper(),
+                frozenset({r.callsign.upper(), *(a.upper() for a in r.aliases)}),
+            )
+            for r in self.ranges
+        ]
+        # alias (or call) -> attribution of the first range listing it
+        self.by_call: Dict[str, Attribution] = {}
+        for a in attribs:
+            for call in sorted(a.aliases):
+                self.by_call.setdefault(call, a)
+
+        # Sweep the start / end+1 boundaries with a heap of the active ranges,
+        # keyed so the latest start (then the earliest listed) is on top.
+        never = date.max.toordinal() + 1
+        spans = [
+            (r.start.toordinal(), r.end.toordinal() + 1 if r.end else never, i)
+            for i, r in enumerate(self.ranges)
+        ]
+        points = sorted({p for s, e, _ in spans for p in (s, e) if p != never})
+        pending = sorted(spans)
+        active: List[tuple[int, int, int]] = []
+        self._starts: List[int] = []
+        self._winners: List[Optional[Attribution]] = []
+        j = 0
+        for point in points:
+            while j < len(pending) and pending[j][0] <= point:
+                s, e, i = pending[j]
+                heapq.heappush(active, (-s, i, e))
+                j += 1
+            while active and active[0][2] <= point:
+                heapq.heappop(active)
+            winner = attribs[active[0][1]] if active else None
+            if self._winners and self._winners[-1] == winner:
+                continue
+            self._starts.append(point)
+            self._winners.append(winner)
+        self.lookup = lru_cache(maxsize=memo_size)(self._lookup)
+
+    def at(self, day: date) -> Optional[Attribution]:
+        """Attribution for a date, or None if no range covers it."""
+        i = bisect_right(self._starts, day.toordinal()) - 1
+        return self._winners[i] if i >= 0 else None
+
+    def _lookup(self, qso_date: str) -> Optional[Attribution]:
+        """`at()` for a YYYYMMDD string (memoized as `lookup`).
+
+        Raises:
+            ValueError: If the date is missing or invalid.
+        """
+        return self.at(_parse_yyyymmdd(qso_date))
+
+
+def _load_ranges(path: Path) -> List[CallRange]:
+    """Ranges from a JSON list of {persona, callsign, start, end?, aliases?}."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: expected a JSON list of ranges")
+    out = []
+    for n, item in enumerate(data, start=1):
+        try:
+            out.append(
+                CallRange(
+                    str(item.get("persona") or item["callsign"]),
+                    str(item["callsign"]),
+                    _parse_yyyymmdd(str(item["start"])),
+                    _parse_yyyymmdd(str(item["end"])) if item.get("end") else None,
+                    tuple(str(a) for a in item.get("aliases") or ()),
+                )
+            )
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"{path}: range {n} is invalid ({e})") from e
+    return out
 
 
 def _iter_ndjson(path: Path) -> Iterable[Dict[str, Any]]:
@@ -43,22 +142,101 @@ def _iter_ndjson(path: Path) -> Iterable[Dict[str, Any]]:
             yield cast(Dict[str, Any], json.loads(line))
 
 
-def cmd_attrib(args: argparse.Namespace) -> int:
-    """Annotate NDJSON QSOs with persona-based callsign attribution."""
+def _persona_ranges(names: List[str]) -> List[CallRange]:
+    """Ranges of the named personas from the persona store.
+
+    Raises:
+        LookupError: If a persona is not in the store.
+    """
+    from qso_graph_auth.identity.store import PersonaStore
+
     store = PersonaStore()
-    p = store.get(args.persona)
-    if not p:
-        print(f"Persona '{args.persona}' not found")
-        return 1
+    ranges: List[CallRange] = []
+    for name in names:
+        p = store.get(name)
+        if not p:
+            raise LookupError(f"Persona '{name}' not found")
+        # Build ranges from persona (single callsign/start/end)
+        if p.callsign and p.start:
+            ranges.append(CallRange(name, p.callsign, p.start, p.end))
+    return ranges
+
 
-    # Build ranges from persona (single callsign/start/end)
-    ranges: List[Tuple[str, date, Optional[date]]] = []
-    if p.callsign and p.start:
-        ranges.append((p.callsign, p.start, p.end))
+def build_index(personas: List[str], ranges_path: Optional[str] = None) -> CallsignIndex:
+    """Index over a ranges file (listed first, so it wins exact ties) and personas.
 
+    Raises:
+        LookupError: If a persona is not in the store.
+        ValueError: If there are no ranges or the ranges file is invalid.
+        OSError: If the ranges file cannot be read.
+    """
+    if not personas and not ranges_path:
+        raise ValueError("Give --persona and/or --ranges")
+    ranges = _load_ranges(Path(ranges_path)) if ranges_path else []
+    if personas:
+        ranges.extend(_persona_ranges(personas))
     if not ranges:
-        print(f"No callsign/date ranges defined for persona '{args.persona}'.")
+        names = ", ".join(personas)
+        raise ValueError(f"No callsign/date ranges defined for persona '{names}'.")
+    return CallsignIndex(ranges)
+
+
+def attribute(
+    index: CallsignIndex,
+    station_call: Optional[str],
+    qso_date: Optional[str],
+    *,
+    force_overwrite: bool = False,
+    default_persona: Optional[str] = None,
+) -> tuple[Optional[str], Dict[str, Any]]:
+    """Attribute one QSO.
+
+    Returns:
+        The station_call to set (None to keep the record's) and the
+        `_attrib` annotation.
+    """
+    station = (station_call or "").upper()
+    try:
+        hit = index.lookup(qso_date or "")
+    except ValueError:
+        # cannot attribute by date; an alias still names the persona
+        alias = index.by_call.get(station) if station else None
+        return None, {
+            "persona": alias.persona if alias else default_persona,
+            "callsign": alias.callsign if alias else None,
+            "source": "alias" if alias else "none",
+            "note": "missing_or_invalid_qso_date",
+        }
+    if hit is None:
+        # no range matched; preserve record station_call if any
+        return None, {
+            "persona": default_persona,
+            "callsign": station_call or None,
+            "source": "record" if station_call else "none",
+        }
+    new_call = None
+    if station in hit.aliases and station != hit.callsign:
+        source = "alias"  # keep the more precise call, e.g. KI7MT/4
+    else:
+        source = "range"
+        if force_overwrite or not station:
+            new_call = hit.callsign
+    return new_call, {"persona": hit.persona, "callsign": hit.callsign, "source": source}
+
+
+def cmd_attrib(args: argparse.Namespace) -> int:
+    """Annotate NDJSON QSOs with persona-based callsign attribution."""
+    personas: List[str] = args.persona or []
+    try:
+        index = build_index(personas, args.ranges)
+    except LookupError as e:
+        print(e)
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"error: {e}")
         return 2
+    # reported for QSOs no range covers
+    default_persona = personas[0] if len(personas) == 1 else None
 
     ip = Path(args.input)
     op = Path(args.output)
@@ -68,39 +246,18 @@ def cmd_attrib(args: argparse.Namespace) -> int:
     with op.open("w", encoding="utf-8") as outf:
         for rec in _iter_ndjson(ip):
             count += 1
-            qd = str(rec.get("qso_date") or "")
-            try:
-                qd_dt = _parse_yyyymmdd(qd)
-            except Exception:
-                # cannot attribute without a date
-                rec["_attrib"] = {
-                    "persona": args.persona,
-                    "callsign": None,
-                    "source": "none",
-                    "note": "missing_or_invalid_qso_date",
-                }
-                print(json.dumps(rec), file=outf)
-                continue
-
-            cs = _choose_callsign(ranges, qd_dt)
-            if cs:
-                if args.force_overwrite or not rec.get("station_call"):
-                    rec["station_call"] = cs
-                rec["_attrib"] = {
-                    "persona": args.persona,
-                    "callsign": cs,
-                    "source": "range",
-                }
-            else:
-                # no range matched; preserve record station_call if any
-                rec["_attrib"] = {
-                    "persona": args.persona,
-                    "callsign": rec.get("station_call"),
-                    "source": "record" if rec.get("station_call") else "none",
-                }
-
-            print(json.dumps(rec), file=outf)
-            done += 1
+            new_call, rec["_attrib"] = attribute(
+                index,
+                rec.get("station_call"),
+                str(rec.get("qso_date") or ""),
+                force_overwrite=args.force_overwrite,
+                default_persona=default_persona,
+            )
+            if new_call:
+                rec["station_call"] = new_call
+            outf.write(json.dumps(rec) + "\n")
+            if "note" not in rec["_attrib"]:
+                done += 1
 
     if args.stats:
         print(f"attributed={done} total={count} → {op}")
@@ -120,13 +277,24 @@ def register_cli(
         ),
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
-    p.add_argument("--persona", required=True, help="Persona name with ranges")
+    p.add_argument(
+        "--persona",
+        action="append",
+        help="Persona name with ranges (repeatable)",
+    )
+    p.add_argument(
+        "--ranges",
+        help=(
+            "JSON file listing ranges: "
+            '[{"persona", "callsign", "start", "end", "aliases": ["KI7MT/4"]}, ...]'
+        ),
+    )
     p.add_argument("-i", "--input", required=True, help="Input NDJSON path")
     p.add_argument("-o", "--output", required=True, help="Output NDJSON path")
     p.add_argument(
         "--force-overwrite",
         action="store_true",
-        help="Overwrite station_call even if already set",
+        help="Overwrite station_call even if already set (aliases are kept)",
     )
     p.add_argument("--stats", action="store_true", help="Print summary stats")
     p.set_defaults(func=cmd_attrib)
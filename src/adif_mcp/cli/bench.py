@@ -0,0 +1,85 @@
+"""Run the benchmark suite and optionally check it against a baseline."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from adif_mcp.bench.runner import WORKLOADS, compare, parse_size, run
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    """Run the selected workloads and report (and gate on) the results."""
+    try:
+        sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    report = run(sizes, args.workload, seed=args.seed, repeat=args.repeat)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(text + "\n", encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold)
+        for r in regressions:
+            print(
+                f"REGRESSION {r['workload']} @ {r['size']}: "
+                f"{r['current_per_s']:.0f}/s vs {r['baseline_per_s']:.0f}/s "
+                f"({r['change']:+.1%})",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.threshold:.0%}", file=sys.stderr)
+    return 0
+
+
+def register_cli(
+    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
+) -> None:
+    """Register the bench subcommand."""
+    p = subparsers.add_parser(
+        "bench",
+        help="Benchmark parsers, validation and tools",
+        description=(
+            "Run fixed workloads over generated logs; report throughput, latency "
+            "percentiles and peak RSS as JSON, optionally against a baseline."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    p.add_argument(
+        "--sizes", default="1k,100k", help="Comma-separated log sizes (e.g. 1k,100k,1M)"
+    )
+    p.add_argument(
+        "-w",
+        "--workload",
+        action="append",
+        choices=sorted(WORKLOADS),
+        default=None,
+        help="Workload to run (repeatable; default: all)",
+    )
+    p.add_argument("--repeat", type=int, default=3, help="Passes per bulk workload")
+    p.add_argument("--seed", type=int, default=0, help="Seed for the generated logs")
+    p.add_argument("-o", "--output", type=Path, default=None, help="Write the report here")
+    p.add_argument("--baseline", type=Path, default=None, help="Baseline report to compare")
+    p.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Allowed throughput drop vs baseline (fraction)",
+    )
+    p.add_argument(
+        "--save-baseline", type=Path, default=None, help="Also write the report as a baseline"
+    )
+    p.set_defaults(func=cmd_bench)
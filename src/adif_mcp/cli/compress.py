@@ -0,0 +1,53 @@
+"""Write a seekable block-compressed copy of an ADIF log."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from adif_mcp.cli.sort import parse_size
+from adif_mcp.parsers.adi_blocks import DEFAULT_BLOCK_BYTES, index_path, write_blocked
+
+
+def cmd_compress(args: argparse.Namespace) -> int:
+    """Compress the input log into blocked gzip plus its index."""
+    if args.input.resolve() == args.output.resolve():
+        print("error: input and output must be different files")
+        return 2
+    index = write_blocked(
+        args.input, args.output, block_bytes=args.block_size, level=args.level
+    )
+    print(
+        f"wrote {index.records} record(s) in {len(index.blocks)} block(s) → {args.output} "
+        f"(index {index_path(args.output)})"
+    )
+    return 0
+
+
+def register_cli(
+    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
+) -> None:
+    """Register the compress subcommand."""
+    p = subparsers.add_parser(
+        "compress",
+        help="Write a seekable block-compressed (.adi.gz) copy of a log",
+        description=(
+            "Rewrite an ADIF log (plain or gzip/bz2/xz/zstd) as multi-member gzip "
+            "with a .bidx block index, so paginated readers can seek without "
+            "decompressing the whole file. The output is a normal .gz file."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    p.add_argument("-i", "--input", type=Path, required=True, help="Input ADIF file")
+    p.add_argument("-o", "--output", type=Path, required=True, help="Output .adi.gz file")
+    p.add_argument(
+        "-b",
+        "--block-size",
+        type=parse_size,
+        default=DEFAULT_BLOCK_BYTES,
+        help="Uncompressed bytes per block (e.g. 256K, 1M)",
+    )
+    p.add_argument(
+        "--level", type=int, choices=range(1, 10), default=6, help="gzip level", metavar="1-9"
+    )
+    p.set_defaults(func=cmd_compress)
@@ -20,13 +20,23 @@ Exit codes:
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
 import re
+import sys
 from collections import Counter
 from collections.abc import Iterable, Iterator
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import TypedDict
+from typing import NamedTuple, TypedDict
+
+from adif_mcp.logbook.timeindex import log_time_index, parse_bound
+from adif_mcp.parsers.adi_stream import iter_raw_records
+from adif_mcp.parsers.adi_writer import AdiWriter
+from adif_mcp.parsers.adx import is_adx, iter_adx_records, read_adx_header
+from adif_mcp.parsers.columnar import FORMATS, have_pyarrow, open_columnar
+from adif_mcp.parsers.compression import open_log
+from adif_mcp.parsers.parse_cache import CachedLog, default_cache
 
 
 class _ErrorRec(TypedDict):
@@ -43,6 +53,9 @@ ADIF_FIELD = re.compile(
     re.IGNORECASE,
 )
 
+# Longest header searched for <EOH> before a log is taken to have none.
+_MAX_HEADER_BYTES = 1 << 20
+
 
 def _coerce_value(raw: str, vtype: str | None) -> str:
     # Keep as string for safety; schema validation downstream handles types.
@@ -97,9 +110,15 @@ HEADER_CALL_PATTERNS = [
 ]
 
 
-def _extract_header_info(
-    full_text: str,
-) -> tuple[str | None, str | None, str | None]:
+class HeaderInfo(NamedTuple):
+    """Per-log defaults taken from the ADIF header (or the command line)."""
+
+    station_call: str | None
+    station_call_source: str | None  # "cli" | "header_tag:<tag>" | "header_text"
+    source_program: str | None  # e.g., "eQSL.cc DownloadInBox"
+
+
+def extract_header_info(full_text: str) -> HeaderInfo:
     """
     Returns (station_call, station_call_source, source_program)
       station_call_source: "header_tag:<tag>" | "header_text" | None
@@ -134,15 +153,24 @@ def _extract_header_info(
         idx = m.end() + length
 
     if station_tag_val:
-        return station_tag_val, f"header_tag:{station_tag_name}", source_program
+        return HeaderInfo(station_tag_val, f"header_tag:{station_tag_name}", source_program)
 
     # 2) Plain-text fallback (eQSL style)
     for pat in HEADER_CALL_PATTERNS:
         pm = pat.search(header)
         if pm:
-            return pm.group(1).upper(), "header_text", source_program
+            return HeaderInfo(pm.group(1).upper(), "header_text", source_program)
+
+    return HeaderInfo(None, None, source_program)
 
-    return None, None, source_program
+
+def header_info_from_fields(fields: dict[str, str]) -> HeaderInfo:
+    """`extract_header_info` for an already-parsed header (e.g. ADX)."""
+    source_program = fields.get("programid") or None
+    for name, val in fields.items():
+        if name in ("station_callsign", "my_call", "operator", "station_call") and val:
+            return HeaderInfo(val.upper(), f"header_tag:{name}", source_program)
+    return HeaderInfo(None, None, source_program)
 
 
 # ---------- helpers ----------
@@ -229,14 +257,23 @@ class QsoRecord:
     adif_fields: dict[str, str] | None = field(default=None)
 
 
-# module-global defaults used by builder/filters
+# module-global defaults used by build_qso when no HeaderInfo is passed
 _DEFAULT_STATION_CALL: str | None = None
 _DEFAULT_STATION_CALL_SOURCE: str | None = None  # "cli" | "header_tag:<tag>" | "header_text"
 _DEFAULT_SOURCE_PROGRAM: str | None = None  # e.g., "eQSL.cc DownloadInBox"
 
 
-def build_qso(fields: dict[str, str]) -> QsoRecord:
-    """Construct a QsoRecord from raw ADIF field map with provenance."""
+def build_qso(fields: dict[str, str], header: HeaderInfo | None = None) -> QsoRecord:
+    """Construct a QsoRecord from raw ADIF field map with provenance.
+
+    `header` supplies the log's station call and source program; without it
+    the module defaults are used.
+    """
+    if header is None:
+        header = HeaderInfo(
+            _DEFAULT_STATION_CALL, _DEFAULT_STATION_CALL_SOURCE, _DEFAULT_SOURCE_PROGRAM
+        )
+    source_program = header.source_program
     f = dict(fields)  # copy to annotate provenance/adif_fields
     prov: dict[str, str] = {}
 
@@ -248,8 +285,8 @@ def build_qso(fields: dict[str, str]) -> QsoRecord:
     # If clearly an eQSL Inbox export and rcvd missing, imply Y
     if (
         (f.get("eqsl_qsl_rcvd") in (None, ""))
-        and _DEFAULT_SOURCE_PROGRAM
-        and "downloadinbox" in _DEFAULT_SOURCE_PROGRAM.lower()
+        and source_program
+        and "downloadinbox" in source_program.lower()
     ):
         f["eqsl_qsl_rcvd"] = "Y"
         prov["_eqsl_inbox_implied_rcvd"] = "Y"
@@ -268,8 +305,8 @@ def build_qso(fields: dict[str, str]) -> QsoRecord:
         station_call = f["station_call"]
         sc_source = "record:station_call"
     else:
-        station_call = _DEFAULT_STATION_CALL or ""
-        sc_source = _DEFAULT_STATION_CALL_SOURCE or "unknown"
+        station_call = header.station_call or ""
+        sc_source = header.station_call_source or "unknown"
 
     call = f.get("call", "")
     qso_date = f.get("qso_date") or f.get("qso_date_off") or ""
@@ -317,8 +354,8 @@ def build_qso(fields: dict[str, str]) -> QsoRecord:
     f["_station_call_source"] = sc_source
     if "eqsl_qslrdate" in fields:
         f["_had_eqsl_qslrdate"] = "1"
-    if _DEFAULT_SOURCE_PROGRAM:
-        f["_source_program"] = _DEFAULT_SOURCE_PROGRAM
+    if source_program:
+        f["_source_program"] = source_program
     for k, v in prov.items():
         f[k] = v
 
@@ -385,6 +422,21 @@ def write_ndjson(records_iter: Iterable[QsoRecord], out_path: Path) -> int:
     return n
 
 
+def write_adi(records_iter: Iterable[dict[str, str]], out_path: Path) -> int:
+    """Stream raw ADIF field maps to an ADI file.
+
+    Args:
+        records_iter (Iterable[dict[str, str]]): Field maps (any key case).
+        out_path (Path): Destination `.adi` path.
+
+    Returns:
+        int: Number of records written.
+    """
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("wb") as f, AdiWriter(f, comment="adif-mcp convert") as w:
+        return w.write_all(records_iter)
+
+
 def write_errors_ndjson(errors_iter: Iterable[dict[str, str]], out_path: Path) -> int:
     """_summary_
 
@@ -406,7 +458,7 @@ def write_errors_ndjson(errors_iter: Iterable[dict[str, str]], out_path: Path) -
 
 
 # ---------- Filters ----------
-def _record_matches_filters(
+def record_matches_filters(
     r: QsoRecord,
     bands: list[str],
     modes: list[str],
@@ -460,6 +512,69 @@ def _record_matches_filters(
     return True
 
 
+def _read_adi_header(
+    path: Path, chunk_size: int = 1 << 16, max_bytes: int = _MAX_HEADER_BYTES
+) -> str:
+    """Text of an ADI log up to its `<EOH>`, or "" when it has no header.
+
+    Only new bytes are searched per chunk, and the search stops at the first
+    `<EOR>` (a header-less log: nothing past its first record is read) or
+    after `max_bytes`.
+    """
+    chunks: list[bytes] = []
+    read = 0
+    tail = b""  # end of the previous chunk, for a tag split across chunks
+    with open_log(path) as fh:
+        while read < max_bytes and (chunk := fh.read(chunk_size)):
+            chunks.append(chunk)
+            read += len(chunk)
+            window = (tail + chunk).lower()
+            eoh, eor = window.find(b"<eoh>"), window.find(b"<eor>")
+            if eoh >= 0 and (eor < 0 or eoh < eor):
+                end = read - len(window) + eoh + 5
+                return b"".join(chunks)[:end].decode("utf-8", errors="ignore")
+            if eor >= 0:
+                return ""
+            tail = chunk[-4:]
+    return ""
+
+
+def _open_indexed(
+    path: Path, since: str | None, until: str | None, use_cache: bool
+) -> CachedLog | None:
+    """The cached log, when `--cache` is on and `--since/--until` can use its time index."""
+    if not use_cache or not (since or until):
+        return None
+    try:
+        parse_bound(since)
+        parse_bound(until, end=True)
+        return default_cache().open(path)
+    except (OSError, ValueError):
+        return None
+
+
+def _scanned_records(path: Path) -> Iterator[tuple[int, dict[str, str]]]:
+    """(1-based index, fields) of every record, parsed like the parse cache does."""
+    with open_log(path) as fh:
+        for i, rec in enumerate(iter_raw_records(fh), start=1):
+            yield i, rec.fields
+
+
+def _indexed_records(
+    log: CachedLog, since: str | None, until: str | None
+) -> Iterator[tuple[int, dict[str, str]]]:
+    """(1-based index, fields) of the records in the date range, in file order.
+
+    Undated records are included too, so they are still filtered and
+    reported exactly as in a full scan.
+    """
+    with log:
+        index = log_time_index(log)
+        picked = index.ordinals(since, until, file_order=True)
+        for i in heapq.merge(picked, index.undated):
+            yield i + 1, log.record(i)
+
+
 # ---------- Main pipeline ----------
 def main(argv: Iterable[str] | None = None) -> int:
     """_summary_
@@ -478,7 +593,13 @@ def main(argv: Iterable[str] | None = None) -> int:
         description="Convert ADIF (.adi) to QsoRecord "
         "JSON/NDJSON (streaming) with provenance.",
     )
-    p.add_argument("-i", "--input", required=True, type=Path, help="Path to ADIF .adi file")
+    p.add_argument(
+        "-i",
+        "--input",
+        required=True,
+        type=Path,
+        help="Path to ADIF .adi or .adx file (may be gzip/bz2/xz/zstd-compressed)",
+    )
     p.add_argument(
         "-o",
         "--output",
@@ -493,7 +614,9 @@ def main(argv: Iterable[str] | None = None) -> int:
         help="Optional path to write validation errors (JSON or NDJSON)",
     )
     p.add_argument("--pretty", action="store_true", help="Pretty-print JSON array output")
-    p.add_argument(
+    # output formats (JSON array when none is given)
+    out_fmt = p.add_mutually_exclusive_group()
+    out_fmt.add_argument(
         "--ndjson",
         action="store_true",
         help="Write NDJSON (one QSO per line, memory-efficient)",
@@ -503,6 +626,32 @@ def main(argv: Iterable[str] | None = None) -> int:
         action="store_true",
         help="Write errors as NDJSON (one error per line)",
     )
+    out_fmt.add_argument(
+        "--adi",
+        action="store_true",
+        help="Write the matching records as ADI (original fields) instead of JSON",
+    )
+    out_fmt.add_argument(
+        "--csv",
+        action="store_true",
+        help="Write typed columns as CSV (no extra dependencies)",
+    )
+    out_fmt.add_argument(
+        "--parquet",
+        action="store_true",
+        help="Write typed columns as Parquet (needs the 'arrow' extra)",
+    )
+    out_fmt.add_argument(
+        "--arrow",
+        action="store_true",
+        help="Write typed columns as an Arrow IPC file (needs the 'arrow' extra)",
+    )
+    p.add_argument(
+        "--row-group-size",
+        type=int,
+        default=65536,
+        help="Rows per Parquet row group / Arrow batch when streaming columnar output",
+    )
     p.add_argument(
         "--stats", action="store_true", help="Print totals and band/mode counts to stdout"
     )
@@ -538,6 +687,11 @@ def main(argv: Iterable[str] | None = None) -> int:
     p.add_argument(
         "--until", type=str, default=None, help="Filter: qso_date <= YYYYMMDD (inclusive)"
     )
+    p.add_argument(
+        "--cache",
+        action="store_true",
+        help="Answer --since/--until from the on-disk parse cache (built on first use)",
+    )
     p.add_argument(
         "--confirmed-only",
         action="store_true",
@@ -551,22 +705,36 @@ def main(argv: Iterable[str] | None = None) -> int:
     )
 
     a = p.parse_args(list(argv) if argv is not None else None)
-
-    # Read once, set defaults from header (or CLI)
-    full_text = a.input.read_text(encoding="utf-8", errors="ignore")
-    hdr_call, hdr_source, source_program = _extract_header_info(full_text)
-
-    global _DEFAULT_STATION_CALL, _DEFAULT_STATION_CALL_SOURCE, _DEFAULT_SOURCE_PROGRAM
-    if a.station_call:
-        _DEFAULT_STATION_CALL = a.station_call.strip().upper()
-        _DEFAULT_STATION_CALL_SOURCE = "cli"
+    columnar = next((f for f in FORMATS if getattr(a, f)), None)
+    if columnar in ("parquet", "arrow") and not have_pyarrow():
+        print(
+            f"error: --{columnar} needs the optional 'pyarrow' package "
+            "(pip install 'adif-mcp[arrow]'); --csv works without it",
+            file=sys.stderr,
+        )
+        return 2
+
+    # (1-based index, fields); a cached log answers --since/--until by bisection
+    records_parser: Iterator[tuple[int, dict[str, str]]]
+    cached = _open_indexed(a.input, a.since, a.until, a.cache)
+    # records stream one by one; the header is read up front
+    if is_adx(a.input):
+        header = header_info_from_fields(read_adx_header(a.input))
     else:
-        _DEFAULT_STATION_CALL = hdr_call
-        _DEFAULT_STATION_CALL_SOURCE = hdr_source
-    _DEFAULT_SOURCE_PROGRAM = source_program
+        header = extract_header_info(_read_adi_header(a.input))
+    if cached is not None:
+        records_parser = _indexed_records(cached, a.since, a.until)
+    elif is_adx(a.input):
+        records_parser = enumerate(iter_adx_records(a.input), start=1)
+    else:
+        # the byte-counting scanner the parse cache uses, so --since/--until
+        # never changes how a record is read
+        records_parser = _scanned_records(a.input)  # plain or gzip/bz2/xz/zstd
 
-    # Process records (stream)
-    records_parser = parse_adif(full_text)
+    if a.station_call:
+        header = header._replace(
+            station_call=a.station_call.strip().upper(), station_call_source="cli"
+        )
 
     # streaming stats for the *emitted subset*
     total_emitted = 0
@@ -577,14 +745,14 @@ def main(argv: Iterable[str] | None = None) -> int:
     # errors handling
     errors_buffer: list[dict[str, str]] = [] if (a.errors and not a.errors_ndjson) else []
 
-    if a.ndjson:
-        # stream records to NDJSON
-        def rec_iter() -> Iterator[QsoRecord]:
+    if a.ndjson or a.adi or columnar:
+        # stream records to NDJSON, ADI (keeping the source fields) or columns
+        def rec_iter() -> Iterator[tuple[dict[str, str], QsoRecord]]:
             nonlocal total_emitted, eqsl_y_emitted
-            for idx, fields in enumerate(records_parser, start=1):
+            for idx, fields in records_parser:
                 try:
-                    rec = build_qso(fields)
-                    if _record_matches_filters(
+                    rec = build_qso(fields, header)
+                    if record_matches_filters(
                         rec,
                         bands=a.band,
                         modes=a.mode,
@@ -599,7 +767,7 @@ def main(argv: Iterable[str] | None = None) -> int:
                             eqsl_y_emitted += 1
                         by_band[rec.band] += 1
                         by_mode[rec.mode] += 1
-                        yield rec
+                        yield fields, rec
                 except Exception as e:
                     err_obj: dict[str, str] = {
                         "index": str(idx),
@@ -611,14 +779,20 @@ def main(argv: Iterable[str] | None = None) -> int:
                     elif a.errors:
                         errors_buffer.append(err_obj)
 
-        write_ndjson(rec_iter(), a.output)
+        if a.adi:
+            write_adi((f for f, _ in rec_iter()), a.output)
+        elif columnar:
+            with open_columnar(a.output, columnar, row_group_size=a.row_group_size) as w:
+                w.write_all(r for _, r in rec_iter())
+        else:
+            write_ndjson((r for _, r in rec_iter()), a.output)
     else:
         # collect to list, then write JSON array
         rec_buffer: list[QsoRecord] = []
-        for idx, fields in enumerate(records_parser, start=1):
+        for idx, fields in records_parser:
             try:
-                rec = build_qso(fields)
-                if _record_matches_filters(
+                rec = build_qso(fields, header)
+                if record_matches_filters(
                     rec,
                     bands=a.band,
                     modes=a.mode,
@@ -680,7 +854,13 @@ def add_convert_args(p: argparse.ArgumentParser) -> None:
     Args:
         p (argparse.ArgumentParser): _description_
     """
-    p.add_argument("-i", "--input", required=True, type=Path, help="Path to ADIF .adi file")
+    p.add_argument(
+        "-i",
+        "--input",
+        required=True,
+        type=Path,
+        help="Path to ADIF .adi or .adx file (may be gzip/bz2/xz/zstd-compressed)",
+    )
     p.add_argument(
         "-o",
         "--output",
@@ -695,7 +875,9 @@ def add_convert_args(p: argparse.ArgumentParser) -> None:
         help="Optional path to write validation errors (JSON or NDJSON)",
     )
     p.add_argument("--pretty", action="store_true", help="Pretty-print JSON array output")
-    p.add_argument(
+    # output formats (JSON array when none is given)
+    out_fmt = p.add_mutually_exclusive_group()
+    out_fmt.add_argument(
         "--ndjson",
         action="store_true",
         help="Write NDJSON (one QSO per line, memory-efficient)",
@@ -705,6 +887,32 @@ def add_convert_args(p: argparse.ArgumentParser) -> None:
         action="store_true",
         help="Write errors as NDJSON (one error per line)",
     )
+    out_fmt.add_argument(
+        "--adi",
+        action="store_true",
+        help="Write the matching records as ADI (original fields) instead of JSON",
+    )
+    out_fmt.add_argument(
+        "--csv",
+        action="store_true",
+        help="Write typed columns as CSV (no extra dependencies)",
+    )
+    out_fmt.add_argument(
+        "--parquet",
+        action="store_true",
+        help="Write typed columns as Parquet (needs the 'arrow' extra)",
+    )
+    out_fmt.add_argument(
+        "--arrow",
+        action="store_true",
+        help="Write typed columns as an Arrow IPC file (needs the 'arrow' extra)",
+    )
+    p.add_argument(
+        "--row-group-size",
+        type=int,
+        default=65536,
+        help="Rows per Parquet row group / Arrow batch when streaming columnar output",
+    )
     p.add_argument(
         "--stats", action="store_true", help="Print totals and band/mode counts to stdout"
     )
@@ -739,6 +947,11 @@ def add_convert_args(p: argparse.ArgumentParser) -> None:
     p.add_argument(
         "--until", type=str, default=None, help="Filter: qso_date <= YYYYMMDD (inclusive)"
     )
+    p.add_argument(
+        "--cache",
+        action="store_true",
+        help="Answer --since/--until from the on-disk parse cache (built on first use)",
+    )
     p.add_argument(
         "--confirmed-only",
         action="store_true",
@@ -771,6 +984,35 @@ def build_convert_parser(prog: str | None = None) -> argparse.ArgumentParser:
     return p
 
 
+def _argv_after(command: str, argv: list[str] | None = None) -> list[str]:
+    """Arguments following `command` (after any global options).
+
+    `argv` is the list the root parser dispatched (default: `sys.argv[1:]`).
+    """
+    args = sys.argv[1:] if argv is None else argv
+    return args[args.index(command) + 1 :] if command in args else args[1:]
+
+
+def register_cli(
+    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
+) -> None:
+    """Register the convert subcommand and its convert-adi alias."""
+    for name, help_text in (
+        ("convert", "Convert ADIF to JSON/NDJSON"),
+        ("convert-adi", "(alias) Convert ADIF to JSON/NDJSON"),
+    ):
+        p = subparsers.add_parser(
+            name,
+            help=help_text,
+            description="Convert ADIF (.adi) to QsoRecord JSON/NDJSON.",
+            formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        )
+        add_convert_args(p)
+        p.set_defaults(
+            func=lambda args, _name=name: main(_argv_after(_name, getattr(args, "argv", None)))
+        )
+
+
 # def main(argv: list[str] | None = None) -> int:
 #     parser = build_convert_parser()
 #     parser.parse_args(argv)
@@ -0,0 +1,354 @@
+"""
+Resident daemon: a warm adif-mcp process behind a local Unix socket.
+
+`adif-mcp daemon start` loads the spec indexes once and then serves requests
+on a Unix socket. While it is running, the file-oriented subcommands in
+`FORWARDED_COMMANDS` are forwarded to it by `root.main` so batch scripts get
+warm-cache latency; if the socket is missing or dead, or the daemon does not
+reply within `REQUEST_TIMEOUT` seconds, the command simply runs locally.
+`adif-mcp daemon call TOOL JSON` invokes an MCP tool function (e.g.
+`validate_adif_record`, `search_enumerations`) against the warm caches.
+
+Protocol: the client sends one JSON object per connection, terminated by a
+newline, and reads one JSON object back:
+
+- `{"op": "ping"}` -> `{"ok": true, "pid": ..., "served": ...}`
+- `{"op": "run", "argv": [...], "cwd": "..."}` -> `{"code", "stdout", "stderr"}`
+- `{"op": "call", "tool": "...", "args": {...}, "cwd": "..."}` -> `{"result": ...}`
+  or `{"error": ...}`; relative path arguments are resolved against `cwd`
+- `{"op": "stop"}` -> `{"ok": true}` and the daemon exits
+
+Set `ADIF_MCP_NO_DAEMON=1` to never forward, or `ADIF_MCP_SOCKET` to use a
+different socket path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+SOCKET_ENV = "ADIF_MCP_SOCKET"
+NO_DAEMON_ENV = "ADIF_MCP_NO_DAEMON"
+
+# Subcommands that are safe to run inside the daemon (file in, file/stdout out).
+FORWARDED_COMMANDS = frozenset(
+    {"convert", "convert-adi", "validate-manifest", "dedup", "reconcile", "sort"}
+)
+
+_MAX_REQUEST = 16 * 1024 * 1024
+
+# Seconds a client waits on each socket operation before giving up on the daemon.
+REQUEST_TIMEOUT = 60.0
+
+# Tool arguments naming files (as in mcp.server); resolved against the caller's cwd.
+_PATH_ARGS = ("file_path", "file_paths", "remote_path", "output_dir")
+
+
+def default_socket_path() -> Path:
+    """Socket path: `$ADIF_MCP_SOCKET`, else `daemon.sock` in the config dir."""
+    env = os.environ.get(SOCKET_ENV)
+    if env:
+        return Path(env)
+    from adif_mcp.utils.paths import config_path
+
+    return config_path("daemon.sock")
+
+
+# ------------------------ client ------------------------
+
+
+def request(
+    payload: dict[str, Any],
+    sock_path: str | Path | None = None,
+    *,
+    timeout: float | None = None,
+) -> dict[str, Any]:
+    """Send one request to the daemon and return its reply.
+
+    Args:
+        payload: The request object.
+        sock_path: Socket path (default: `default_socket_path()`).
+        timeout: Seconds to wait on each socket operation (default:
+            `REQUEST_TIMEOUT`).
+
+    Raises:
+        OSError: If no daemon is listening on the socket, or it stays silent
+            for `timeout` seconds (`TimeoutError`).
+    """
+    path = str(sock_path or default_socket_path())
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(REQUEST_TIMEOUT if timeout is None else timeout)
+        s.connect(path)
+        s.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        s.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = s.recv(1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    if not chunks:
+        raise ConnectionError("daemon closed the connection without a reply")
+    reply: dict[str, Any] = json.loads(b"".join(chunks))
+    return reply
+
+
+def forward(argv: list[str]) -> int | None:
+    """Run `argv` in the daemon if one is reachable.
+
+    Returns:
+        The command's exit code, or None when it should run locally.
+    """
+    if os.environ.get(NO_DAEMON_ENV) or not hasattr(socket, "AF_UNIX"):
+        return None
+    path = default_socket_path()
+    if not path.exists():
+        return None
+    try:
+        reply = request({"op": "run", "argv": argv, "cwd": os.getcwd()}, path)
+    except (OSError, ValueError):
+        return None
+    if "code" not in reply:
+        return None
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stderr.write(reply.get("stderr", ""))
+    return int(reply["code"])
+
+
+# ------------------------ server ------------------------
+
+
+@lru_cache(maxsize=1)
+def _tool_names() -> frozenset[str]:
+    """Names of the tools registered on the MCP server."""
+    import asyncio
+
+    from adif_mcp.mcp import server as mcp_server
+
+    return frozenset(t.name for t in asyncio.run(mcp_server.mcp.list_tools()))
+
+
+def _resolve_paths(args: dict[str, Any], cwd: str) -> dict[str, Any]:
+    """`args` with relative path arguments made absolute against `cwd`."""
+
+    def resolve(value: Any) -> Any:
+        if isinstance(value, list):
+            return [resolve(v) for v in value]
+        if isinstance(value, str) and value and not os.path.isabs(value):
+            return os.path.join(cwd, os.path.expanduser(value))
+        return value
+
+    return {k: resolve(v) if k in _PATH_ARGS else v for k, v in args.items()}
+
+
+def call_tool(name: str, args: dict[str, Any], cwd: str | None = None) -> dict[str, Any]:
+    """Invoke a registered MCP tool function from `mcp.server` in this process.
+
+    Only tools are dispatched, never other module-level callables such as
+    `main` or `warm_caches`. With `cwd`, relative path arguments are resolved
+    against it (the client's directory, not the daemon's).
+    """
+    import asyncio
+    import inspect
+
+    from adif_mcp.mcp import server as mcp_server
+
+    fn = getattr(mcp_server, name, None) if name in _tool_names() else None
+    if not callable(fn):
+        return {"error": f"Unknown tool '{name}'"}
+    if cwd is not None:
+        args = _resolve_paths(args, cwd)
+    try:
+        result = fn(**args)
+        if inspect.iscoroutine(result):
+            result = asyncio.run(result)
+    except Exception as e:  # a failing tool is an error reply, not a dead connection
+        return {"error": str(e)}
+    return {"result": result}
+
+
+def _exit_code(exc: SystemExit) -> int:
+    """Exit status for a SystemExit raised by argparse or a command."""
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+def serve(sock_path: str | Path | None = None, *, warm: bool = True) -> None:
+    """Serve requests on `sock_path` until a `stop` request arrives."""
+    import contextlib
+    import io
+    import socketserver
+    import threading
+
+    from adif_mcp.cli import root
+    from adif_mcp.mcp import server as mcp_server
+
+    path = Path(sock_path or default_socket_path())
+    if path.exists():
+        try:
+            request({"op": "ping"}, path)
+        except OSError:
+            path.unlink()  # stale socket from a daemon that died
+        else:
+            raise RuntimeError(f"a daemon is already listening on {path}")
+
+    if warm:
+        mcp_server.warm_caches()
+
+    # CLI commands redirect stdout and chdir, so they (and tool calls, which
+    # must not see another request's cwd) run one at a time.
+    run_lock = threading.Lock()
+    state = {"served": 0}
+
+    def run_argv(argv: list[str], cwd: str) -> dict[str, Any]:
+        if not argv or argv[0] not in FORWARDED_COMMANDS:
+            return {"code": 2, "stdout": "", "stderr": f"not forwardable: {argv[:1]}\n"}
+        out, err = io.StringIO(), io.StringIO()
+        with run_lock:
+            old_cwd, old_argv = os.getcwd(), sys.argv
+            try:
+                os.chdir(cwd)
+                # convert_adi re-parses sys.argv, so present the client's argv.
+                sys.argv = ["adif-mcp", *argv]
+                with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                    try:
+                        code = root.dispatch(argv)
+                    except SystemExit as e:
+                        code = _exit_code(e)
+                    except Exception as e:  # report, keep serving
+                        print(f"error: {e}", file=sys.stderr)
+                        code = 1
+            finally:
+                sys.argv = old_argv
+                os.chdir(old_cwd)
+        return {"code": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+    class Handler(socketserver.StreamRequestHandler):
+        """Handle one JSON request per connection."""
+
+        def handle(self) -> None:
+            """Read the request line, dispatch it and write the reply."""
+            line = self.rfile.readline(_MAX_REQUEST)
+            reply: dict[str, Any]
+            try:
+                req = json.loads(line)
+                op = req.get("op")
+                if op == "ping":
+                    reply = {"ok": True, "pid": os.getpid(), "served": state["served"]}
+                elif op == "run":
+                    reply = run_argv([str(a) for a in req.get("argv", [])], req["cwd"])
+                elif op == "call":
+                    cwd = req.get("cwd")
+                    with run_lock:
+                        reply = call_tool(
+                            str(req.get("tool", "")),
+                            dict(req.get("args") or {}),
+                            str(cwd) if cwd else None,
+                        )
+                elif op == "stop":
+                    reply = {"ok": True}
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                else:
+                    reply = {"error": f"Unknown op '{op}'"}
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                reply = {"error": f"Bad request: {e}"}
+            except Exception as e:  # always answer, so the client never hangs
+                reply = {"error": str(e)}
+            state["served"] += 1
+            self.wfile.write(json.dumps(reply, default=str).encode("utf-8"))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with socketserver.ThreadingUnixStreamServer(str(path), Handler) as srv:
+        os.chmod(path, 0o600)
+        srv.daemon_threads = True
+        print(f"adif-mcp daemon listening on {path} (pid {os.getpid()})", file=sys.stderr)
+        try:
+            srv.serve_forever()
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+
+
+# ------------------------ CLI ------------------------
+
+
+def cmd_daemon(args: argparse.Namespace) -> int:
+    """Start, stop, query or call into the daemon."""
+    sock = args.socket
+    if args.daemon_cmd == "start":
+        try:
+            serve(sock, warm=not args.no_warm)
+        except (RuntimeError, OSError) as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.daemon_cmd == "call":
+        try:
+            params = json.loads(args.args) if args.args else {}
+        except ValueError as e:
+            print(f"error: invalid JSON arguments: {e}", file=sys.stderr)
+            return 2
+        try:
+            payload = {"op": "call", "tool": args.tool, "args": params, "cwd": os.getcwd()}
+            reply = request(payload, sock)
+        except OSError:
+            reply = call_tool(args.tool, params)  # no daemon: run it here
+        print(json.dumps(reply.get("result", reply), indent=2, default=str))
+        return 1 if "error" in reply else 0
+
+    op = "stop" if args.daemon_cmd == "stop" else "ping"
+    try:
+        reply = request({"op": op}, sock)
+    except OSError:
+        print("adif-mcp daemon is not running")
+        return 1
+    if op == "stop":
+        print("adif-mcp daemon stopped")
+    else:
+        print(f"adif-mcp daemon running (pid {reply['pid']}, {reply['served']} request(s))")
+    return 0
+
+
+def register_cli(
+    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
+) -> None:
+    """Register the daemon subcommand."""
+    p = subparsers.add_parser(
+        "daemon",
+        help="Run a warm adif-mcp process on a local Unix socket",
+        description=(
+            "Keep spec indexes and caches loaded in one process. While it runs, "
+            "convert/dedup/reconcile/sort/validate-manifest are forwarded to it."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    p.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help=f"Socket path (default: ${SOCKET_ENV} or <config dir>/daemon.sock)",
+    )
+    sp = p.add_subparsers(dest="daemon_cmd", required=True)
+    p_start = sp.add_parser("start", help="Run the daemon in the foreground")
+    p_start.add_argument(
+        "--no-warm", action="store_true", help="Skip preloading the spec enumerations"
+    )
+    sp.add_parser("status", help="Show whether a daemon is running")
+    sp.add_parser("stop", help="Stop a running daemon")
+    p_call = sp.add_parser("call", help="Call an MCP tool (in the daemon if running)")
+    p_call.add_argument("tool", help="Tool name, e.g. validate_adif_record")
+    p_call.add_argument("args", nargs="?", default=None, help="Tool arguments as JSON")
+    p.set_defaults(func=cmd_daemon)
@@ -0,0 +1,90 @@
+"""Find (and optionally drop) duplicate QSOs across one or many ADIF logs."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from adif_mcp.logbook.dedup import find_duplicates, write_deduplicated
+from adif_mcp.parsers.parse_cache import default_cache
+
+
+def cmd_dedup(args: argparse.Namespace) -> int:
+    """Report duplicate QSOs and write a deduplicated log if requested."""
+    try:
+        result = find_duplicates(
+            args.input,
+            window_minutes=args.window,
+            max_in_memory=args.max_in_memory,
+            cache=None if args.no_cache else default_cache(),
+        )
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    report = result.to_dict()
+
+    if args.report:
+        rp = Path(args.report)
+        rp.parent.mkdir(parents=True, exist_ok=True)
+        with rp.open("w", encoding="utf-8") as fh:
+            for g in report["groups"]:
+                fh.write(json.dumps(g, ensure_ascii=False))
+                fh.write("\n")
+
+    if args.output:
+        try:
+            written = write_deduplicated(result, args.output)
+        except OSError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+        print(f"wrote {written} record(s) → {args.output}")
+
+    if args.stats or not (args.report or args.output):
+        summary = {k: v for k, v in report.items() if k != "groups"}
+        print(json.dumps(summary, indent=2))
+    return 0
+
+
+def register_cli(
+    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
+) -> None:
+    """Register the dedup subcommand."""
+    p = subparsers.add_parser(
+        "dedup",
+        help="Find duplicate QSOs across ADIF logs",
+        description=(
+            "Match QSOs on call/band/mode within a time window across one or "
+            "more ADIF files; report which record was kept and why."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    p.add_argument(
+        "-i",
+        "--input",
+        action="append",
+        required=True,
+        type=Path,
+        help="ADIF file (repeatable; earlier files win ties)",
+    )
+    p.add_argument(
+        "-w", "--window", type=int, default=5, help="Match window in minutes (±N)"
+    )
+    p.add_argument("-o", "--output", type=Path, default=None, help="Write deduplicated ADI")
+    p.add_argument(
+        "--report", type=Path, default=None, help="Write duplicate groups as NDJSON"
+    )
+    p.add_argument(
+        "--max-in-memory",
+        type=int,
+        default=500_000,
+        help="Entries kept in RAM before spilling to temp files",
+    )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-parse the logs instead of using the on-disk parse cache",
+    )
+    p.add_argument("--stats", action="store_true", help="Print summary stats")
+    p.set_defaults(func=cmd_dedup)
@@ -0,0 +1,61 @@
+"""Reconcile a local ADIF log against an eQSL or LoTW download."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from adif_mcp.logbook.reconcile import reconcile
+
+
+def cmd_reconcile(args: argparse.Namespace) -> int:
+    """Match local and provider QSOs and write the result sets."""
+    result = reconcile(
+        args.local,
+        args.remote,
+        provider=args.provider,
+        tolerance_minutes=args.tolerance,
+        max_in_memory=args.max_in_memory,
+    )
+    summary = result.summary(sample=args.sample)
+    if args.output_dir:
+        summary["files"] = result.write(args.output_dir)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+def register_cli(
+    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
+) -> None:
+    """Register the reconcile subcommand."""
+    p = subparsers.add_parser(
+        "reconcile",
+        help="Match a local log against eQSL/LoTW downloads",
+        description=(
+            "Sort-merge a local ADIF log with a provider ADIF download; report "
+            "matched and unmatched QSOs and write a confirmation patch ADI."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    p.add_argument("-l", "--local", type=Path, required=True, help="Local ADIF log")
+    p.add_argument("-r", "--remote", type=Path, required=True, help="Provider ADIF download")
+    p.add_argument("-p", "--provider", choices=["eqsl", "lotw"], default="eqsl")
+    p.add_argument(
+        "-t", "--tolerance", type=int, default=30, help="Match tolerance in minutes (±N)"
+    )
+    p.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Write matched/unmatched NDJSON and patch.adi here",
+    )
+    p.add_argument("--sample", type=int, default=10, help="Unmatched samples in the summary")
+    p.add_argument(
+        "--max-in-memory",
+        type=int,
+        default=250_000,
+        help="Entries per side kept in RAM before spilling sorted runs",
+    )
+    p.set_defaults(func=cmd_reconcile)
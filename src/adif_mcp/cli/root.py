@@ -1,16 +1,31 @@
 """Root CLI wiring for adif-mcp.
 
 Builds the top-level argument parser and registers all subcommands.
+
+Subcommand modules are imported lazily: `_COMMANDS` maps each command to the
+module that registers it, and only the module for the command being
+dispatched is imported. Every other command gets a help-only placeholder so
+`adif-mcp --help` still lists it. This keeps short-lived invocations such as
+`adif-mcp convert` and `adif-mcp --version` from paying for unrelated
+imports (click, fastmcp, ...).
+
+Global options `--profile[=DIR]`, `--profile-mode` and `--trace-malloc`
+profile the dispatched command (see `adif_mcp.utils.profiling`); profiled
+commands always run locally rather than in the daemon.
 """
 
 from __future__ import annotations
 
 import argparse
-import importlib.metadata
+import importlib
+import os
 import sys
-from typing import Callable, Protocol, cast
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Protocol, cast
 
-from . import convert_adi, eqsl_stub, validate
+if TYPE_CHECKING:
+    from adif_mcp.utils.profiling import ProfileConfig
 
 
 class _RegisterCLI(Protocol):
@@ -19,47 +34,148 @@ class _RegisterCLI(Protocol):
     def __call__(self, sp: argparse._SubParsersAction[argparse.ArgumentParser]) -> None: ...
 
 
-# ------------------------ parser ------------------------
+# command -> (module in adif_mcp.cli exposing register_cli, one-line help)
+_COMMANDS: dict[str, tuple[str, str]] = {
+    "convert": ("convert_adi", "Convert ADIF to JSON/NDJSON"),
+    "convert-adi": ("convert_adi", "(alias) Convert ADIF to JSON/NDJSON"),
+    "eqsl": ("eqsl_stub", "eQSL utilities (stub)"),
+    "validate-manifest": ("validate", "Validate manifest.json against the schema"),
+    "dedup": ("dedup", "Find duplicate QSOs across ADIF logs"),
+    "reconcile": ("reconcile", "Match a local log against eQSL/LoTW downloads"),
+    "sort": ("sort", "Sort an ADIF file by date/time or other fields"),
+    "pipeline": ("pipeline", "Run parse→normalize→filter→attrib→dedup→write in one process"),
+    "transcode": ("transcode", "Convert a log between ADI and ADX"),
+    "compress": ("compress", "Write a seekable block-compressed (.adi.gz) copy of a log"),
+    "generate": ("generate", "Generate a synthetic ADIF log for load testing"),
+    "bench": ("bench", "Benchmark parsers, validation and tools"),
+    "watch": ("watch", "Follow live ADIF logs and print new QSOs"),
+    "daemon": ("daemon", "Run a warm adif-mcp process on a local Unix socket"),
+}
 
 
-def build_parser() -> argparse.ArgumentParser:
-    """Create and return the root argparse parser with all subcommands."""
-    parser = argparse.ArgumentParser(prog="adif-mcp", description="adif-mcp CLI")
+# Kept in sync with daemon.FORWARDED_COMMANDS (not imported, to stay lazy).
+_FORWARDED = frozenset(
+    {"convert", "convert-adi", "validate-manifest", "dedup", "reconcile", "sort"}
+)
+
+
+# Global options that take a separate value (`--profile-mode sample`).
+_GLOBAL_VALUE_OPTS = frozenset({"--profile-mode"})
+_PROFILE_OPTS = ("--profile", "--profile-mode", "--trace-malloc")
+
+
+def _requested_command(argv: Sequence[str]) -> str | None:
+    """First positional argument, i.e. the subcommand name (if any)."""
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in _GLOBAL_VALUE_OPTS:
+            skip = True
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def _global_args(argv: Sequence[str]) -> list[str]:
+    """Arguments before the subcommand name."""
+    cmd = _requested_command(argv)
+    return list(argv) if cmd is None else list(argv[: list(argv).index(cmd)])
+
+
+def _normalize_argv(argv: Sequence[str]) -> list[str]:
+    """Spell a bare `--profile` as `--profile=` so it never eats the command."""
+    n = len(_global_args(argv))
+    return [("--profile=" if i < n and a == "--profile" else a) for i, a in enumerate(argv)]
+
+
+def _profiling_requested(argv: Sequence[str]) -> bool:
+    """True if any profiling option appears before the subcommand."""
+    return any(a.split("=", 1)[0] in _PROFILE_OPTS for a in _global_args(argv))
+
+
+def _version() -> str:
+    """Installed package version (resolved only when --version is used)."""
+    import importlib.metadata
 
-    # Dynamic versioning from metadata
     try:
-        ver = importlib.metadata.version("adif-mcp")
+        return importlib.metadata.version("adif-mcp")
     except importlib.metadata.PackageNotFoundError:
-        ver = "0.0.0-dev"
-    parser.add_argument("--version", action="version", version=f"%(prog)s {ver}")
+        return "0.0.0-dev"
+
+
+class _VersionAction(argparse.Action):
+    """`--version` that defers the metadata lookup until it is requested."""
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: object,
+        option_string: str | None = None,
+    ) -> None:
+        """Print the version and exit."""
+        parser.exit(message=f"{parser.prog} {_version()}\n")
+
+
+# ------------------------ parser ------------------------
+
+
+def build_parser(argv: Sequence[str] | None = None) -> argparse.ArgumentParser:
+    """Create and return the root argparse parser.
+
+    Args:
+        argv: Command-line arguments about to be parsed. When given, only the
+            module for the requested subcommand is imported; without it all
+            subcommands are registered in full.
+    """
+    parser = argparse.ArgumentParser(prog="adif-mcp", description="adif-mcp CLI")
+    parser.add_argument(
+        "--version",
+        action=_VersionAction,
+        nargs=0,
+        help="show program's version number and exit",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="DIR",
+        help="Profile the command into a per-run directory under DIR "
+        "(use --profile=DIR; default: <config dir>/profiles)",
+    )
+    parser.add_argument(
+        "--profile-mode",
+        choices=("cprofile", "sample"),
+        default=None,
+        help="cProfile stats or sampled stacks of all threads "
+        "(default: cprofile; sample for the mcp server)",
+    )
+    parser.add_argument(
+        "--trace-malloc",
+        action="store_true",
+        help="Record tracemalloc peak and top allocation sites",
+    )
 
     subparsers: argparse._SubParsersAction[argparse.ArgumentParser] = parser.add_subparsers(
         dest="command"
     )
 
-    # convert + alias
-    p_conv = subparsers.add_parser(
-        "convert",
-        help="Convert ADIF to JSON/NDJSON",
-        description="Convert ADIF (.adi) to QsoRecord JSON/NDJSON.",
-        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-    )
-    convert_adi.add_convert_args(p_conv)
-    p_conv.set_defaults(func=lambda _args: convert_adi.main(sys.argv[2:]))
-
-    p_conv_alias = subparsers.add_parser(
-        "convert-adi",
-        help="(alias) Convert ADIF to JSON/NDJSON",
-        description="Convert ADIF (.adi) to QsoRecord JSON/NDJSON.",
-        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-    )
-    convert_adi.add_convert_args(p_conv_alias)
-    p_conv_alias.set_defaults(func=lambda _args: convert_adi.main(sys.argv[2:]))
+    if argv is None:
+        wanted = {module for module, _ in _COMMANDS.values()}
+    else:
+        cmd = _requested_command(argv)
+        wanted = {_COMMANDS[cmd][0]} if cmd in _COMMANDS else set()
 
-    if hasattr(eqsl_stub, "register_cli"):
-        cast(_RegisterCLI, getattr(eqsl_stub, "register_cli"))(subparsers)
-    if hasattr(validate, "register_cli"):
-        cast(_RegisterCLI, getattr(validate, "register_cli"))(subparsers)
+    loaded: set[str] = set()
+    for name, (module, help_text) in _COMMANDS.items():
+        if module not in wanted:
+            subparsers.add_parser(name, help=help_text)
+        elif module not in loaded:
+            mod = importlib.import_module(f"{__package__}.{module}")
+            cast(_RegisterCLI, getattr(mod, "register_cli"))(subparsers)
+            loaded.add(module)
 
     # --------------------------------------------------------
     # MCP Gateway Subcommand
@@ -86,10 +202,54 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def _profile_config(args: argparse.Namespace) -> ProfileConfig | None:
+    """Profiling settings from the global options, or None if not requested."""
+    if args.profile is None and not args.trace_malloc:
+        return None
+    from adif_mcp.utils.profiling import ProfileConfig, default_root
+
+    root = Path(args.profile).expanduser() if args.profile else default_root()
+    mode = None
+    if args.profile is not None:
+        mode = args.profile_mode or ("sample" if args.command == "mcp" else "cprofile")
+    return ProfileConfig(root=root, mode=mode, trace_malloc=args.trace_malloc)
+
+
+def dispatch(argv: list[str]) -> int:
+    """Parse `argv` and run the selected subcommand in this process."""
+    argv = _normalize_argv(argv)
+    parser = build_parser(argv)
+    args = parser.parse_args(argv)
+    args.argv = argv  # for commands that re-parse their own arguments (convert)
+    func = cast(Callable[[argparse.Namespace], int] | None, getattr(args, "func", None))
+    if func is None:
+        parser.print_help()
+        return 2
+
+    config = _profile_config(args)
+    if config is None:
+        return func(args)
+
+    from adif_mcp.utils import profiling
+
+    if args.command == "mcp":
+        # Long-running server: profile each tool call instead of the whole run.
+        os.environ[profiling.PROFILE_ENV] = str(config.root) if config.mode else "0"
+        os.environ[profiling.PROFILE_MODE_ENV] = config.mode or ""
+        os.environ[profiling.TRACE_MALLOC_ENV] = "1" if config.trace_malloc else "0"
+        return func(args)
+
+    session = profiling.ProfileSession(config)
+    try:
+        with session.profile(args.command):
+            return func(args)
+    finally:
+        print(f"adif-mcp: profile written to {session.directory}", file=sys.stderr)
+
+
 def main(argv: list[str] | None = None) -> int:
     """Entry point for the adif-mcp CLI."""
     args_in = sys.argv[1:] if argv is None else argv
-    parser = build_parser()
 
     # Default to MCP server if no subcommand was provided
     if not args_in:
@@ -98,10 +258,17 @@ def main(argv: list[str] | None = None) -> int:
         run_mcp()
         return 0
 
-    args = parser.parse_args(args_in)
-    func = cast(Callable[[argparse.Namespace], int] | None, getattr(args, "func", None))
-    if func is not None:
-        return func(args)
+    cmd = _requested_command(args_in)
+    if (
+        cmd in _FORWARDED
+        and "-h" not in args_in
+        and "--help" not in args_in
+        and not _profiling_requested(args_in)
+    ):
+        from . import daemon
+
+        code = daemon.forward(args_in)
+        if code is not None:
+            return code
 
-    parser.print_help()
-    return 2
+    return dispatch(args_in)
@@ -0,0 +1,68 @@
+"""Sort an ADIF file by one or more fields, larger-than-RAM safe."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from adif_mcp.logbook.adisort import DEFAULT_MAX_BYTES, DEFAULT_SORT_KEYS, sort_adif
+
+_UNITS = {"k": 1 << 10, "m": 1 << 20, "g": 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    """Parse a byte size such as `65536`, `512K`, `64M` or `2G`."""
+    t = text.strip().lower().removesuffix("b")
+    mult = _UNITS.get(t[-1:], 1)
+    if mult != 1:
+        t = t[:-1]
+    try:
+        value = int(float(t) * mult)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {text!r}") from None
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"size must be > 0: {text!r}")
+    return value
+
+
+def cmd_sort(args: argparse.Namespace) -> int:
+    """Sort the input log into the output file."""
+    keys = args.key or list(DEFAULT_SORT_KEYS)
+    n = sort_adif(
+        args.input, args.output, keys, max_bytes=args.max_memory, tmp_dir=args.tmp_dir
+    )
+    print(f"sorted {n} record(s) by {', '.join(keys)} → {args.output}")
+    return 0
+
+
+def register_cli(
+    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
+) -> None:
+    """Register the sort subcommand."""
+    p = subparsers.add_parser(
+        "sort",
+        help="Sort an ADIF file by date/time or other fields",
+        description=(
+            "External merge sort of an ADIF file: sorted runs are spilled to temp "
+            "files and merged, keeping the header and original record bytes."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    p.add_argument("-i", "--input", type=Path, required=True, help="Input ADIF file")
+    p.add_argument("-o", "--output", type=Path, required=True, help="Output ADIF file")
+    p.add_argument(
+        "-k",
+        "--key",
+        action="append",
+        default=None,
+        help=f"Sort field (repeatable; default: {' '.join(DEFAULT_SORT_KEYS)})",
+    )
+    p.add_argument(
+        "-m",
+        "--max-memory",
+        type=parse_size,
+        default=DEFAULT_MAX_BYTES,
+        help="Approximate memory cap for buffered records (e.g. 64M, 1G)",
+    )
+    p.add_argument("--tmp-dir", default=None, help="Directory for temporary run files")
+    p.set_defaults(func=cmd_sort)
@@ -0,0 +1,72 @@
+"""Convert ADIF logs between ADI and ADX, streaming."""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterator
+from pathlib import Path
+
+from adif_mcp.parsers.adi_stream import AdiScanner, iter_raw_records, open_adi
+from adif_mcp.parsers.adi_writer import AdiWriter
+from adif_mcp.parsers.adx import AdxWriter, is_adx, iter_adx_records, read_adx_header
+
+
+def _read(path: Path) -> tuple[dict[str, str], Iterator[dict[str, str]]]:
+    """Header fields and a record iterator for an ADI or ADX input."""
+    if is_adx(path):
+        return read_adx_header(path), iter_adx_records(path)
+
+    scanner = AdiScanner()
+    fh = open_adi(path)
+    records = iter_raw_records(fh, scanner=scanner)
+    first = next(records, None)
+
+    def gen() -> Iterator[dict[str, str]]:
+        with fh:
+            if first is not None:
+                yield first.fields
+            for rec in records:
+                yield rec.fields
+
+    return dict(scanner.header_fields), gen()
+
+
+def cmd_transcode(args: argparse.Namespace) -> int:
+    """Rewrite the input log in the requested format."""
+    fmt = args.to or ("adx" if args.output.suffix.lower() == ".adx" else "adi")
+    if args.input.resolve() == args.output.resolve():
+        print("error: input and output must be different files")
+        return 2
+    header, records = _read(args.input)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with args.output.open("wb") as out:
+        if fmt == "adx":
+            header["programid"] = "ADIF-MCP"
+            with AdxWriter(out, header) as w:
+                n = w.write_all(records)
+        else:
+            with AdiWriter(out, header, comment="adif-mcp transcode") as aw:
+                n = aw.write_all(records)
+    print(f"wrote {n} record(s) as {fmt.upper()} → {args.output}")
+    return 0
+
+
+def register_cli(
+    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
+) -> None:
+    """Register the transcode subcommand."""
+    p = subparsers.add_parser(
+        "transcode",
+        help="Convert a log between ADI and ADX",
+        description=(
+            "Stream an ADI or ADX log (plain or compressed) into the other format. "
+            "The output format follows the output suffix unless --to is given."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    p.add_argument("-i", "--input", type=Path, required=True, help="Input .adi/.adx file")
+    p.add_argument("-o", "--output", type=Path, required=True, help="Output file")
+    p.add_argument(
+        "--to", choices=("adi", "adx"), default=None, help="Output format (default: by suffix)"
+    )
+    p.set_defaults(func=cmd_transcode)
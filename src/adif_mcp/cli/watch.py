@@ -0,0 +1,113 @@
+"""Follow live ADI logs and print QSOs as they are appended."""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import re
+import sys
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from adif_mcp.logbook.awards import AwardTracker
+from adif_mcp.logbook.watch import AwardSink, LogWatcher
+from adif_mcp.parsers.adi_stream import LogCursor
+
+_REQUIRED = ("call", "qso_date", "time_on")
+_TIME = re.compile(r"([01]\d|2[0-3])[0-5]\d([0-5]\d)?\Z")
+
+
+def problems(rec: Mapping[str, str]) -> list[str]:
+    """Quick structural checks on one QSO (missing keys, bad date/time)."""
+    out = [f"missing {name.upper()}" for name in _REQUIRED if not rec.get(name)]
+    day = rec.get("qso_date", "")
+    if day:
+        try:
+            datetime.datetime.strptime(day, "%Y%m%d")
+        except ValueError:
+            out.append(f"bad QSO_DATE {day!r}")
+    tod = rec.get("time_on", "")
+    if tod and not _TIME.match(tod):
+        out.append(f"bad TIME_ON {tod!r}")
+    return out
+
+
+class _Printer:
+    """Sink that prints each QSO as one NDJSON line."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = str(path)
+
+    def add(self, rec: Mapping[str, str]) -> None:
+        line: dict[str, Any] = {"file": self.path, "record": dict(rec)}
+        issues = problems(rec)
+        if issues:
+            line["problems"] = issues
+        print(json.dumps(line, ensure_ascii=False), flush=True)
+
+
+def _end_offset(path: Path) -> int:
+    """Offset just past the last complete record (where a plain tail starts)."""
+    cursor = LogCursor(path)
+    for _ in cursor.read_new():
+        pass
+    return cursor.offset
+
+
+def cmd_watch(args: argparse.Namespace) -> int:
+    """Poll the logs and print appended QSOs until interrupted."""
+    watcher = LogWatcher(interval=args.interval)
+    for path in args.logs:
+        if not path.exists():
+            print(f"error: {path} not found", file=sys.stderr)
+            return 2
+        offset = 0 if args.from_start else _end_offset(path)
+        watcher.watch(path, _Printer(path.resolve()), offset=offset)
+        if args.awards:
+            awards = AwardSink(AwardTracker.open(path), path)
+            watcher.watch(path, awards, offset=awards.offset)
+    resets = dict.fromkeys(watcher.watching(), 0)
+    try:
+        while True:
+            watcher.poll()
+            for key, info in watcher.stats()["logs"].items():
+                if info["resets"] != resets[key]:
+                    resets[key] = info["resets"]
+                    print(f"adif-mcp: {key} was replaced or truncated", file=sys.stderr)
+                if info["error"]:
+                    print(f"adif-mcp: {key}: {info['error']}", file=sys.stderr)
+            if args.once:
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+def register_cli(
+    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
+) -> None:
+    """Register the watch subcommand."""
+    p = subparsers.add_parser(
+        "watch",
+        help="Follow live ADIF logs and print new QSOs",
+        description=(
+            "Poll one or more .adi logs (no OS notification APIs needed) and print "
+            "each appended QSO as an NDJSON line, with quick validation problems. "
+            "Only new bytes are parsed; truncated, rotated or replaced logs are "
+            "detected by size, inode and content and re-read from the start."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    p.add_argument("logs", type=Path, nargs="+", help="ADIF log file(s) to follow")
+    p.add_argument("-n", "--interval", type=float, default=1.0, help="Seconds between polls")
+    p.add_argument("--from-start", action="store_true", help="Print the existing QSOs first")
+    p.add_argument(
+        "--awards",
+        action="store_true",
+        help="Also keep the persisted award state (award_progress) up to date",
+    )
+    p.add_argument("--once", action="store_true", help="Poll once and exit")
+    p.set_defaults(func=cmd_watch)
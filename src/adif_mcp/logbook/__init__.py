@@ -0,0 +1 @@
+"""Log-level engines that operate on whole operator logs (awards, lookups, ...)."""
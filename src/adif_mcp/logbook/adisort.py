@@ -0,0 +1,120 @@
+"""
+External merge sort for ADIF files larger than RAM.
+
+Records are streamed with the byte-level scanner and buffered together with
+their sort keys until the memory budget is reached; each full buffer is
+sorted and spilled as a run, and the runs are k-way merged with
+`heapq.merge` (see `extsort`). Records are written back byte for byte and
+the original header is kept. The sort is stable, so records with equal keys
+keep their file order.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+from adif_mcp.logbook.extsort import external_sort
+from adif_mcp.parsers.adi_stream import AdiScanner, iter_raw_records, open_adi
+
+__all__ = ["DEFAULT_SORT_KEYS", "DEFAULT_MAX_BYTES", "record_sort_key", "sort_adif"]
+
+DEFAULT_SORT_KEYS: tuple[str, ...] = ("qso_date", "time_on")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Rough per-record overhead (tuple, key strings, bytes object) on top of its size.
+_RECORD_OVERHEAD = 200
+
+# Times are compared as HHMMSS so "2121" and "212100" sort together.
+_TIME_FIELDS = frozenset({"time_on", "time_off"})
+# Values compared case-insensitively.
+_FOLDED_FIELDS = frozenset({"call", "station_callsign", "operator", "band", "mode", "submode"})
+
+_SortItem = tuple[tuple[str, ...], bytes]
+
+
+def record_sort_key(fields: Mapping[str, str], keys: Sequence[str]) -> tuple[str, ...]:
+    """Sort key for one record; missing fields sort first."""
+    out = []
+    for k in keys:
+        v = fields.get(k, "")
+        if k in _TIME_FIELDS:
+            v = v.ljust(6, "0")
+        elif k in _FOLDED_FIELDS:
+            v = v.upper()
+        out.append(v)
+    return tuple(out)
+
+
+def sort_adif(
+    in_path: str | Path,
+    out_path: str | Path,
+    keys: Sequence[str] = DEFAULT_SORT_KEYS,
+    *,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    tmp_dir: str | None = None,
+) -> int:
+    """Sort an ADIF file by `keys` into `out_path` within a memory budget.
+
+    Args:
+        in_path: Source ADIF file.
+        out_path: Destination file (must differ from `in_path`).
+        keys: Lowercase ADIF field names, most significant first.
+        max_bytes: Approximate buffer budget before a sorted run is spilled.
+        tmp_dir: Directory for run files (defaults to the system temp dir).
+
+    Returns:
+        Number of records written.
+    """
+    src, dst = Path(in_path), Path(out_path)
+    if src.resolve() == dst.resolve():
+        raise ValueError("out_path must differ from in_path")
+    key_names = [k.strip().lower() for k in keys if k.strip()]
+    if not key_names:
+        raise ValueError("at least one sort key is required")
+    if max_bytes <= 0:
+        raise ValueError("max_bytes must be > 0")
+
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    scanner = AdiScanner()
+    n = 0
+    with open_adi(src) as fh, dst.open("wb") as w:
+        items = (
+            (record_sort_key(rec.fields, key_names), rec.raw)
+            for rec in iter_raw_records(fh, scanner=scanner)
+        )
+        merged = external_sort(
+            items,
+            key=_item_key,
+            max_items=1 << 62,
+            max_bytes=max_bytes,
+            sizeof=_item_size,
+            tmp_dir=tmp_dir,
+        )
+        # The first item only arrives once the input is fully consumed, so
+        # the header is known before any record is written.
+        first = next(merged, None)
+        if scanner.header:
+            w.write(scanner.header + b"\n")
+        if first is not None:
+            w.write(first[1] + b"\n")
+            n = 1
+            batch: list[bytes] = []
+            for _, raw in merged:
+                batch.append(raw)
+                batch.append(b"\n")
+                if len(batch) >= 8192:
+                    w.writelines(batch)
+                    n += len(batch) // 2
+                    batch = []
+            w.writelines(batch)
+            n += len(batch) // 2
+    return n
+
+
+def _item_key(item: _SortItem) -> tuple[str, ...]:
+    return item[0]
+
+
+def _item_size(item: _SortItem) -> int:
+    return len(item[1]) + _RECORD_OVERHEAD
@@ -0,0 +1,472 @@
+"""
+Single-pass group-by aggregation over ADIF logs.
+
+`Aggregator` groups QSOs by any combination of keys and keeps a small
+state per group for each requested aggregate, so a log is read once, in
+order, without materializing its records.
+
+Group keys (normalized the way the other log engines key on them):
+
+    band, mode, mode_group, year, month (YYYY-MM), date, dxcc, cqz,
+    continent, call, prefix (WPX), grid (4-character locator), station_call
+
+Any other name groups on that ADIF field's raw value.
+
+Aggregates:
+
+    count             QSOs in the group
+    distinct:FIELD    distinct values of FIELD (or of a group key, e.g. distinct:call)
+    approx_distinct:FIELD
+                      HyperLogLog estimate of distinct:FIELD (~3% error, 1 KiB
+                      per group however many values; see `sketch`)
+    min:FIELD         smallest value (numeric when the values are numbers)
+    max:FIELD         largest value
+    confirmed         share of QSOs confirmed via LoTW, eQSL or paper QSL
+    confirmed:SOURCE  share confirmed via one source (lotw, eqsl, qsl)
+
+`since` / `until` keep QSOs starting within a date (or date/time) range.
+For a cached log the range is cut from its `timeindex.TimeIndex`, so only
+the records inside it are decoded.
+
+Memory is bounded by `max_in_memory`, counted as groups plus the values
+held for `distinct`, plus one per HyperLogLog register (1024 per group) for
+`approx_distinct`. Past that, the partial states are hash-partitioned by
+group into temporary run files and the table starts empty again; at the
+end each partition is loaded and merged on its own (a group never spans
+partitions), as `dedup` does for its entries.
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import zlib
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import IO, Any
+
+from adif_mcp.logbook.normalize import (
+    CONFIRM_FIELDS,
+    call_prefix,
+    is_confirmed,
+    mode_group,
+    norm_band,
+    norm_call,
+    norm_mode,
+    qso_minutes,
+)
+from adif_mcp.logbook.sketch import HyperLogLog
+from adif_mcp.logbook.timeindex import log_time_index, parse_bound
+from adif_mcp.parsers.adi_stream import iter_records
+from adif_mcp.parsers.parse_cache import ParseCache
+
+__all__ = ["GROUP_KEYS", "Aggregator", "aggregate_files", "key_function"]
+
+_PARTITIONS = 64
+
+# HyperLogLog precision for approx_distinct (2**10 registers per group).
+_APPROX_PRECISION = 10
+
+# Memory cells charged for a new approx_distinct state: one per register.
+_APPROX_CELLS = 1 << _APPROX_PRECISION
+
+
+def _date(rec: Mapping[str, str]) -> str:
+    d = (rec.get("qso_date") or "").strip()
+    return d if len(d) == 8 and d.isdigit() else ""
+
+
+def _int(name: str) -> Callable[[Mapping[str, str]], str]:
+    def get(rec: Mapping[str, str]) -> str:
+        v = (rec.get(name) or "").strip()
+        return str(int(v)) if v.isdigit() else v
+
+    return get
+
+
+# key -> (function of the record, ADIF fields it reads)
+_KEYS: dict[str, tuple[Callable[[Mapping[str, str]], str], tuple[str, ...]]] = {
+    "band": (lambda r: norm_band(r.get("band")), ("band",)),
+    "mode": (lambda r: norm_mode(r.get("mode")), ("mode",)),
+    "mode_group": (lambda r: mode_group(r.get("mode")), ("mode",)),
+    "year": (lambda r: _date(r)[:4], ("qso_date",)),
+    "month": (lambda r: f"{d[:4]}-{d[4:6]}" if (d := _date(r)) else "", ("qso_date",)),
+    "date": (_date, ("qso_date",)),
+    "dxcc": (_int("dxcc"), ("dxcc",)),
+    "cqz": (_int("cqz"), ("cqz",)),
+    "continent": (lambda r: (r.get("cont") or "").strip().upper(), ("cont",)),
+    "call": (lambda r: norm_call(r.get("call")), ("call",)),
+    "prefix": (lambda r: call_prefix(r.get("call")), ("call",)),
+    "grid": (lambda r: (r.get("gridsquare") or "").strip()[:4].upper(), ("gridsquare",)),
+    "station_call": (
+        lambda r: norm_call(r.get("station_callsign") or r.get("station_call")),
+        ("station_callsign", "station_call"),
+    ),
+}
+
+GROUP_KEYS: tuple[str, ...] = tuple(_KEYS)
+
+
+def key_function(name: str) -> tuple[Callable[[Mapping[str, str]], str], tuple[str, ...]]:
+    """Value function for a group key or plain field name, and the fields it reads."""
+    name = name.strip().lower()
+    if not name:
+        raise ValueError("empty group key")
+    known = _KEYS.get(name)
+    if known is not None:
+        return known
+    return (lambda r: (r.get(name) or "").strip()), (name,)
+
+
+def _order(value: str) -> tuple[int, float, str]:
+    """Sort key comparing numbers numerically and everything else as text."""
+    try:
+        return (0, float(value), "")
+    except ValueError:
+        return (1, 0.0, value)
+
+
+class _Agg:
+    """One aggregate: how to update, merge and finish its per-group state."""
+
+    def __init__(self, spec: str) -> None:
+        """Parse an aggregate spec such as `count` or `distinct:call`."""
+        self.spec = spec.strip().lower()
+        kind, _, arg = self.spec.partition(":")
+        self.kind = kind
+        self.fields: tuple[str, ...] = ()
+        # cells a new group's state costs against `max_in_memory`
+        self.cells = _APPROX_CELLS if kind == "approx_distinct" else 0
+        if kind == "count" and not arg:
+            return
+        if kind == "confirmed":
+            sources = (arg,) if arg else tuple(CONFIRM_FIELDS)
+            if any(s not in CONFIRM_FIELDS for s in sources):
+                raise ValueError(f"unknown confirmation source in {spec!r}")
+            self.sources = sources
+            self.fields = tuple(CONFIRM_FIELDS[s] for s in sources)
+            return
+        if kind in ("distinct", "approx_distinct", "min", "max") and arg:
+            self.value, self.fields = key_function(arg)
+            return
+        raise ValueError(
+            f"unknown aggregate {spec!r} (use count, distinct:F, approx_distinct:F, "
+            "min:F, max:F or confirmed[:SOURCE])"
+        )
+
+    def new(self) -> Any:
+        """Empty state for a new group."""
+        if self.kind == "distinct":
+            return set()
+        if self.kind == "approx_distinct":
+            return HyperLogLog(_APPROX_PRECISION)
+        if self.kind == "confirmed":
+            return [0, 0]
+        return 0 if self.kind == "count" else None
+
+    def add(self, state: Any, rec: Mapping[str, str]) -> tuple[Any, int]:
+        """Updated state and how many values were added to memory."""
+        kind = self.kind
+        if kind == "count":
+            return state + 1, 0
+        if kind == "confirmed":
+            state[0] += is_confirmed(rec, self.sources)
+            state[1] += 1
+            return state, 0
+        v = self.value(rec)
+        if not v:
+            return state, 0
+        if kind == "distinct":
+            if v in state:
+                return state, 0
+            state.add(v)
+            return state, 1
+        if kind == "approx_distinct":
+            state.add(v)
+            return state, 0
+        if state is None:
+            return v, 0
+        if kind == "min":
+            better = _order(v) < _order(state)
+        else:
+            better = _order(v) > _order(state)
+        return (v if better else state), 0
+
+    def merge(self, a: Any, b: Any) -> Any:
+        """Combine two partial states of the same group."""
+        kind = self.kind
+        if kind == "count":
+            return a + b
+        if kind == "distinct":
+            a.update(b)
+            return a
+        if kind == "approx_distinct":
+            return a.merge(b)
+        if kind == "confirmed":
+            return [a[0] + b[0], a[1] + b[1]]
+        if a is None or b is None:
+            return b if a is None else a
+        pick = min if kind == "min" else max
+        return pick(a, b, key=_order)
+
+    def dump(self, state: Any) -> Any:
+        """JSON-serializable form of a state (for spill files)."""
+        if self.kind == "approx_distinct":
+            return state.to_dict()
+        return sorted(state) if self.kind == "distinct" else state
+
+    def load(self, data: Any) -> Any:
+        """State from its `dump` form."""
+        if self.kind == "approx_distinct":
+            return HyperLogLog.from_dict(data)
+        return set(data) if self.kind == "distinct" else data
+
+    def finish(self, state: Any) -> Any:
+        """Final value reported for the group."""
+        if self.kind == "distinct":
+            return len(state)
+        if self.kind == "approx_distinct":
+            return state.count()
+        if self.kind == "confirmed":
+            return round(state[0] / state[1], 4) if state[1] else None
+        return state
+
+
+class Aggregator:
+    """Streaming group-by with bounded memory (see the module docstring)."""
+
+    def __init__(
+        self,
+        group_by: Sequence[str],
+        aggregates: Sequence[str] = ("count",),
+        *,
+        where: Mapping[str, str] | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        max_in_memory: int = 500_000,
+    ) -> None:
+        """Prepare the aggregation.
+
+        Args:
+            group_by: Group keys (see `GROUP_KEYS`) or ADIF field names; empty
+                for one overall group.
+            aggregates: Aggregate specs such as `count` or `distinct:call`.
+            where: Only QSOs whose key (normalized as for grouping) equals
+                the value, e.g. `{"band": "20M", "year": "2024"}`.
+            since: Only QSOs starting at or after this YYYYMMDD[HHMM].
+            until: Only QSOs starting at or before this YYYYMMDD[HHMM]
+                (a date alone includes the whole day).
+            max_in_memory: Groups plus distinct values (and approx_distinct
+                registers) held before spilling.
+
+        Raises:
+            ValueError: For an unknown aggregate or confirmation source, or
+                an invalid `since` / `until`.
+        """
+        self.group_by = [g.strip().lower() for g in group_by]
+        self._keys = [key_function(g)[0] for g in self.group_by]
+        self._aggs = [_Agg(a) for a in (aggregates or ("count",))]
+        self._group_cells = 1 + sum(agg.cells for agg in self._aggs)
+        self._where: list[tuple[Callable[[Mapping[str, str]], str], str]] = []
+        self._where_names = []
+        for name, want in (where or {}).items():
+            get, reads = key_function(name)
+            raw = str(want).strip()
+            # normalize the wanted value like a record value (band 20M -> 20m)
+            self._where.append((get, get(dict.fromkeys(reads, raw)) or raw))
+            self._where_names.append(name)
+        self.since = since
+        self.until = until
+        self._lo = parse_bound(since)
+        self._hi = parse_bound(until, end=True)
+        self.windowed = self._lo is not None or self._hi is not None
+        self.max_in_memory = max(1, max_in_memory)
+        self.total = 0
+        self.matched = 0
+        self.spills = 0
+        self._table: dict[tuple[str, ...], list[Any]] = {}
+        self._cells = 0
+        self._runs: list[IO[str]] = []
+
+    @property
+    def fields(self) -> set[str]:
+        """ADIF fields the keys, filters and aggregates read."""
+        names: set[str] = set()
+        for g in [*self.group_by, *self._where_names]:
+            names.update(key_function(g)[1])
+        for agg in self._aggs:
+            names.update(agg.fields)
+        if self.windowed:
+            names.update(("qso_date", "time_on"))
+        return names
+
+    def add(self, rec: Mapping[str, str]) -> None:
+        """Fold one QSO (lowercase ADIF field names) into its group."""
+        self.total += 1
+        if self.windowed and not self._in_window(rec):
+            return
+        for get, want in self._where:
+            if get(rec) != want:
+                return
+        self.matched += 1
+        key = tuple(get(rec) for get in self._keys)
+        states = self._table.get(key)
+        if states is None:
+            states = self._table[key] = [agg.new() for agg in self._aggs]
+            self._cells += self._group_cells
+        for i, agg in enumerate(self._aggs):
+            states[i], grew = agg.add(states[i], rec)
+            self._cells += grew
+        if self._cells >= self.max_in_memory:
+            self._spill()
+
+    def _in_window(self, rec: Mapping[str, str]) -> bool:
+        minute = qso_minutes(rec.get("qso_date"), rec.get("time_on"))
+        if minute is None:
+            return False
+        return (self._lo is None or minute >= self._lo) and (
+            self._hi is None or minute <= self._hi
+        )
+
+    def add_many(self, records: Iterable[Mapping[str, str]]) -> int:
+        """Fold every record; returns how many were read."""
+        before = self.total
+        for rec in records:
+            self.add(rec)
+        return self.total - before
+
+    def _spill(self) -> None:
+        if not self._runs:
+            self._runs = [
+                tempfile.TemporaryFile("w+", encoding="utf-8") for _ in range(_PARTITIONS)
+            ]
+        n = len(self._runs)
+        for key, states in self._table.items():
+            line = json.dumps(
+                [key, [agg.dump(s) for agg, s in zip(self._aggs, states)]],
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            self._runs[zlib.crc32("\x1f".join(key).encode("utf-8")) % n].write(line + "\n")
+        self._table = {}
+        self._cells = 0
+        self.spills += 1
+
+    def _partitions(self) -> Iterator[dict[tuple[str, ...], list[Any]]]:
+        if not self._runs:
+            yield self._table
+            return
+        self._spill()
+        for fh in self._runs:
+            fh.seek(0)
+            table: dict[tuple[str, ...], list[Any]] = {}
+            for line in fh:
+                raw_key, raw_states = json.loads(line)
+                key = tuple(raw_key)
+                states = [agg.load(s) for agg, s in zip(self._aggs, raw_states)]
+                have = table.get(key)
+                if have is None:
+                    table[key] = states
+                else:
+                    table[key] = [
+                        agg.merge(a, b) for agg, a, b in zip(self._aggs, have, states)
+                    ]
+            yield table
+            fh.close()
+        self._runs = []
+
+    def results(
+        self, order_by: str | None = None, limit: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Finished rows: group keys (None if absent) and aggregate values.
+
+        Args:
+            order_by: A group key or aggregate spec, `-` prefixed for
+                descending; default is ascending by the group keys.
+            limit: Keep only the first `limit` rows.
+
+        Raises:
+            ValueError: If `order_by` names neither a key nor an aggregate.
+        """
+        rows: list[dict[str, Any]] = []
+        for table in self._partitions():
+            for key, states in table.items():
+                row: dict[str, Any] = {g: (v or None) for g, v in zip(self.group_by, key)}
+                for agg, state in zip(self._aggs, states):
+                    row[agg.spec] = agg.finish(state)
+                rows.append(row)
+        self._table = {}
+
+        if order_by:
+            desc = order_by.startswith("-")
+            col = order_by.lstrip("-").strip().lower()
+            if col not in self.group_by and col not in {a.spec for a in self._aggs}:
+                raise ValueError(f"cannot order by {order_by!r}")
+            present = [r for r in rows if r[col] is not None]
+            present.sort(key=lambda r: _order(str(r[col])), reverse=desc)
+            rows = present + [r for r in rows if r[col] is None]
+        else:
+            rows.sort(key=lambda r: [(r[g] is None, r[g] or "") for g in self.group_by])
+        return rows if limit is None else rows[: max(0, limit)]
+
+    def close(self) -> None:
+        """Drop any spill files."""
+        for fh in self._runs:
+            fh.close()
+        self._runs = []
+
+
+def aggregate_files(
+    paths: Iterable[str | Path],
+    group_by: Sequence[str],
+    aggregates: Sequence[str] = ("count",),
+    *,
+    where: Mapping[str, str] | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    order_by: str | None = None,
+    limit: int | None = None,
+    max_in_memory: int = 500_000,
+    cache: ParseCache | None = None,
+) -> dict[str, Any]:
+    """Aggregate the QSOs of one or more ADIF/ADX logs in one pass.
+
+    With a `cache`, logs it holds are read column by column (only the
+    fields the query needs are decoded), and a `since` / `until` range
+    decodes only the records its time index places inside the range.
+
+    Returns:
+        `{"total", "matched", "groups", "rows"}`; `groups` counts all
+        groups, `rows` is ordered and cut to `limit`.
+    """
+    agg = Aggregator(
+        group_by,
+        aggregates,
+        where=where,
+        since=since,
+        until=until,
+        max_in_memory=max_in_memory,
+    )
+    try:
+        fields = agg.fields
+        for path in paths:
+            log = cache.open(path) if cache is not None else None
+            if log is None:
+                agg.add_many(iter_records(path))
+                continue
+            with log:
+                if not agg.windowed:
+                    agg.add_many(log.iter_records(fields))
+                    continue
+                picked = log_time_index(log).ordinals(since, until, file_order=True)
+                agg.total += len(log) - len(picked)
+                agg.add_many(log.iter_records(fields, picked))
+        rows = agg.results(order_by)
+    finally:
+        agg.close()
+    return {
+        "total": agg.total,
+        "matched": agg.matched,
+        "groups": len(rows),
+        "rows": rows if limit is None else rows[: max(0, limit)],
+    }
@@ -0,0 +1,375 @@
+"""
+Incremental award-progress engine (DXCC, WAS, WAZ, VUCC).
+
+Each award keeps worked and confirmed sets of credit keys per slice, where a
+slice is `(band, mode_group)` with `"*"` as the wildcard. Every QSO updates the
+four slices it belongs to (`*|*`, `band|*`, `*|mode`, `band|mode`), so a
+progress question is a single dict lookup plus `len()`.
+
+State is persisted as JSON together with the byte offset, inode and trailing
+bytes consumed from each ingested log, so re-opening a log only scans the QSOs
+appended since and still notices a log that was replaced in between.
+
+Credit keys:
+    DXCC  DXCC entity code (`DXCC` field)
+    WAS   `STATE` for DXCC 291 / 6 / 110 (USA, Alaska, Hawaii)
+    WAZ   CQ zone (`CQZ`, 1..40)
+    VUCC  4-character grid from `GRIDSQUARE` / `VUCC_GRIDS`, 6m and up
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from adif_mcp.logbook.normalize import CONFIRM_FIELDS, is_confirmed, mode_group, norm_band
+from adif_mcp.parsers.adi_stream import LogCursor
+from adif_mcp.utils.paths import config_path
+
+__all__ = ["AWARDS", "AwardTracker", "award_keys", "state_path_for"]
+
+AWARDS: tuple[str, ...] = ("DXCC", "WAS", "WAZ", "VUCC")
+
+ANY = "*"
+
+_STATE_VERSION = 1
+
+# DXCC entities whose STATE counts toward WAS: USA, Alaska, Hawaii.
+_WAS_DXCC = frozenset({"291", "6", "110"})
+
+# VUCC is a VHF/UHF/microwave award.
+_VUCC_BANDS = frozenset(
+    {
+        "6m", "4m", "2m", "1.25m", "70cm", "33cm", "23cm", "13cm", "9cm",
+        "6cm", "3cm", "1.25cm", "6mm", "4mm", "2.5mm", "2mm", "1mm", "submm",
+    }
+)
+
+_GRID4 = re.compile(r"^[A-R]{2}[0-9]{2}$")
+
+Slice = dict[str, set[str]]
+
+
+def _int_key(value: str | None, lo: int, hi: int) -> str | None:
+    """Return `value` as a canonical integer string if within [lo, hi]."""
+    try:
+        n = int((value or "").strip())
+    except ValueError:
+        return None
+    return str(n) if lo <= n <= hi else None
+
+
+def award_keys(rec: Mapping[str, str]) -> dict[str, list[str]]:
+    """Extract the credit keys a QSO contributes to each award.
+
+    Args:
+        rec: Record with lowercased ADIF field names.
+
+    Returns:
+        Mapping of award name -> credit keys (possibly empty).
+    """
+    dxcc = _int_key(rec.get("dxcc"), 1, 999)
+    keys: dict[str, list[str]] = {"DXCC": [dxcc] if dxcc else []}
+
+    state = (rec.get("state") or "").strip().upper()
+    if dxcc in _WAS_DXCC and state:
+        # ARRL WAS: the District of Columbia counts for Maryland.
+        keys["WAS"] = ["MD" if state == "DC" else state]
+    else:
+        keys["WAS"] = []
+
+    cqz = _int_key(rec.get("cqz"), 1, 40)
+    keys["WAZ"] = [cqz] if cqz else []
+
+    grids: list[str] = []
+    if norm_band(rec.get("band")) in _VUCC_BANDS:
+        raw = [rec.get("gridsquare") or ""]
+        raw.extend((rec.get("vucc_grids") or "").split(","))
+        for g in raw:
+            g4 = g.strip()[:4].upper()
+            if _GRID4.match(g4) and g4 not in grids:
+                grids.append(g4)
+    keys["VUCC"] = grids
+    return keys
+
+
+def state_path_for(log_path: str | Path) -> Path:
+    """Default persisted-state location for a log, under the user config dir."""
+    digest = hashlib.sha1(str(Path(log_path).resolve()).encode("utf-8")).hexdigest()
+    return config_path(f"awards/{digest[:16]}.json")
+
+
+class AwardTracker:
+    """Worked/confirmed award state, updated one QSO at a time."""
+
+    def __init__(self, confirm_sources: Iterable[str] = ("lotw", "eqsl", "qsl")) -> None:
+        """Create an empty tracker.
+
+        Args:
+            confirm_sources: Which of `lotw`, `eqsl`, `qsl` count as confirmation.
+        """
+        sources = tuple(confirm_sources)
+        unknown = [s for s in sources if s not in CONFIRM_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown confirmation source(s): {', '.join(unknown)}")
+        self.confirm_sources = sources
+        self.worked: dict[str, Slice] = {a: {} for a in AWARDS}
+        self.confirmed: dict[str, Slice] = {a: {} for a in AWARDS}
+        self.offsets: dict[str, int] = {}
+        self.inodes: dict[str, int] = {}
+        self.marks: dict[str, bytes] = {}
+        self.qso_count = 0
+
+    # ---------------- updates ----------------
+
+    def add(self, rec: Mapping[str, str]) -> dict[str, list[str]]:
+        """Apply one QSO.
+
+        Returns:
+            Award -> credit keys that were not worked anywhere before this QSO.
+        """
+        band = norm_band(rec.get("band"))
+        mode = mode_group(rec.get("mode"))
+        slices = [f"{ANY}|{ANY}"]
+        if band:
+            slices.append(f"{band}|{ANY}")
+        if mode:
+            slices.append(f"{ANY}|{mode}")
+        if band and mode:
+            slices.append(f"{band}|{mode}")
+        confirmed = is_confirmed(rec, self.confirm_sources)
+
+        self.qso_count += 1
+        new: dict[str, list[str]] = {}
+        for award, keys in award_keys(rec).items():
+            if not keys:
+                continue
+            worked = self.worked[award]
+            overall = worked.setdefault(slices[0], set())
+            fresh = [k for k in keys if k not in overall]
+            if fresh:
+                new[award] = fresh
+            for s in slices:
+                worked.setdefault(s, set()).update(keys)
+                if confirmed:
+                    self.confirmed[award].setdefault(s, set()).update(keys)
+        return new
+
+    def reset(self) -> None:
+        """Forget every QSO and file position (logs are re-read from the start)."""
+        self.worked = {a: {} for a in AWARDS}
+        self.confirmed = {a: {} for a in AWARDS}
+        self.offsets = {}
+        self.inodes = {}
+        self.marks = {}
+        self.qso_count = 0
+
+    def reset_log(self, path: str | Path) -> None:
+        """Forget the QSOs of one log so it can be re-read from the start.
+
+        Credits are not kept per log, so the tracker is cleared and every
+        other log it has ingested is read again from the top; a log that no
+        longer exists is dropped.
+        """
+        key = str(Path(path).resolve())
+        others = [k for k in self.offsets if k != key]
+        self.reset()
+        for other in others:
+            try:
+                self._consume(other)
+            except FileNotFoundError:
+                self.offsets.pop(other, None)
+                self.inodes.pop(other, None)
+                self.marks.pop(other, None)
+
+    def add_many(self, records: Iterable[Mapping[str, str]]) -> int:
+        """Apply many QSOs; returns how many were processed."""
+        n = 0
+        for rec in records:
+            self.add(rec)
+            n += 1
+        return n
+
+    def ingest_file(self, path: str | Path) -> int:
+        """Apply the QSOs appended to `path` since it was last ingested.
+
+        Only complete records (terminated by `<EOR>`) are consumed, so a log
+        that is still being written is picked up safely on the next call. If
+        the file shrank or was replaced (new inode) the tracker is reset and
+        rebuilt from the new contents, so QSOs and credits that only the old
+        file had are dropped; the other logs it holds are re-read (see
+        `reset_log()`).
+
+        Returns:
+            Number of QSOs applied.
+        """
+        return self._consume(str(Path(path).resolve()))
+
+    def _consume(self, key: str) -> int:
+        cursor = LogCursor(
+            Path(key),
+            self.offsets.get(key, 0),
+            inode=self.inodes.get(key, -1),
+            mark=self.marks.get(key, b""),
+        )
+        n = resets = 0
+        for rec in cursor.read_new():
+            if cursor.resets != resets:
+                resets = cursor.resets
+                self.reset_log(key)
+            self.add(rec.fields)
+            n += 1
+        if cursor.resets != resets:
+            self.reset_log(key)  # replaced by a log with no complete records yet
+        self.offsets[key] = cursor.offset
+        self.inodes[key] = cursor.inode
+        self.marks[key] = cursor.mark
+        return n
+
+    # ---------------- queries ----------------
+
+    @staticmethod
+    def _slice_key(band: str | None, mode: str | None) -> str:
+        b = norm_band(band) or ANY
+        m = mode_group(mode) if mode and mode.upper() not in ("MIXED", ANY) else ANY
+        return f"{b}|{m or ANY}"
+
+    def _check(self, award: str) -> str:
+        a = award.strip().upper()
+        if a not in AWARDS:
+            raise ValueError(f"Unknown award '{award}'. Expected one of {', '.join(AWARDS)}.")
+        return a
+
+    def progress(
+        self, award: str, band: str | None = None, mode: str | None = None
+    ) -> dict[str, Any]:
+        """Worked/confirmed counts for one award slice.
+
+        Args:
+            award: DXCC, WAS, WAZ or VUCC.
+            band: Optional band filter (e.g. "20m").
+            mode: Optional mode or mode group (CW, PHONE, DIGITAL, or any ADIF mode).
+        """
+        a = self._check(award)
+        s = self._slice_key(band, mode)
+        b, m = s.split("|")
+        return {
+            "award": a,
+            "band": b,
+            "mode": m,
+            "worked": len(self.worked[a].get(s, ())),
+            "confirmed": len(self.confirmed[a].get(s, ())),
+        }
+
+    def members(
+        self,
+        award: str,
+        band: str | None = None,
+        mode: str | None = None,
+        *,
+        confirmed: bool = False,
+    ) -> list[str]:
+        """Sorted credit keys worked (or confirmed) in a slice."""
+        a = self._check(award)
+        table = self.confirmed if confirmed else self.worked
+        return sorted(table[a].get(self._slice_key(band, mode), ()))
+
+    def unconfirmed(
+        self, award: str, band: str | None = None, mode: str | None = None
+    ) -> list[str]:
+        """Credit keys worked but not yet confirmed in a slice."""
+        a = self._check(award)
+        s = self._slice_key(band, mode)
+        return sorted(self.worked[a].get(s, set()) - self.confirmed[a].get(s, set()))
+
+    def summary(self) -> dict[str, Any]:
+        """Per-award totals plus per-band and per-mode breakdowns."""
+        out: dict[str, Any] = {"qso_count": self.qso_count, "awards": {}}
+        for a in AWARDS:
+            worked = self.worked[a]
+            confirmed = self.confirmed[a]
+            by_band: dict[str, dict[str, int]] = {}
+            by_mode: dict[str, dict[str, int]] = {}
+            for s, keys in worked.items():
+                b, m = s.split("|")
+                cell = {"worked": len(keys), "confirmed": len(confirmed.get(s, ()))}
+                if m == ANY and b != ANY:
+                    by_band[b] = cell
+                elif b == ANY and m != ANY:
+                    by_mode[m] = cell
+            mixed = f"{ANY}|{ANY}"
+            out["awards"][a] = {
+                "worked": len(worked.get(mixed, ())),
+                "confirmed": len(confirmed.get(mixed, ())),
+                "by_band": dict(sorted(by_band.items())),
+                "by_mode": dict(sorted(by_mode.items())),
+            }
+        return out
+
+    # ---------------- persistence ----------------
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable snapshot of the tracker."""
+        return {
+            "version": _STATE_VERSION,
+            "confirm_sources": list(self.confirm_sources),
+            "qso_count": self.qso_count,
+            "offsets": dict(self.offsets),
+            "inodes": dict(self.inodes),
+            "marks": {k: m.hex() for k, m in self.marks.items()},
+            "worked": {
+                a: {s: sorted(k) for s, k in t.items()} for a, t in self.worked.items()
+            },
+            "confirmed": {
+                a: {s: sorted(k) for s, k in t.items()} for a, t in self.confirmed.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> AwardTracker:
+        """Rebuild a tracker from `to_dict()` output."""
+        if data.get("version") != _STATE_VERSION:
+            raise ValueError(f"Unsupported award state version: {data.get('version')!r}")
+        t = cls(data.get("confirm_sources", ("lotw", "eqsl", "qsl")))
+        t.qso_count = int(data.get("qso_count", 0))
+        t.offsets = {str(k): int(v) for k, v in data.get("offsets", {}).items()}
+        t.inodes = {str(k): int(v) for k, v in data.get("inodes", {}).items()}
+        t.marks = {str(k): bytes.fromhex(v) for k, v in data.get("marks", {}).items()}
+        for attr in ("worked", "confirmed"):
+            table: dict[str, Slice] = getattr(t, attr)
+            for a, slices in data.get(attr, {}).items():
+                if a in table:
+                    table[a] = {s: set(keys) for s, keys in slices.items()}
+        return t
+
+    def save(self, path: str | Path) -> None:
+        """Persist the tracker as JSON (written atomically)."""
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(p.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), separators=(",", ":")), encoding="utf-8")
+        tmp.replace(p)
+
+    @classmethod
+    def load(cls, path: str | Path) -> AwardTracker:
+        """Load a tracker saved with `save()`."""
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    @classmethod
+    def open(cls, log_path: str | Path, state_path: str | Path | None = None) -> AwardTracker:
+        """Load persisted state for `log_path` and catch up on appended QSOs.
+
+        The updated state is saved back before returning.
+        """
+        sp = Path(state_path) if state_path else state_path_for(log_path)
+        try:
+            tracker = cls.load(sp) if sp.exists() else cls()
+        except (ValueError, json.JSONDecodeError):
+            tracker = cls()
+        if tracker.ingest_file(log_path) or not sp.exists():
+            tracker.save(sp)
+        return tracker
@@ -0,0 +1,450 @@
+"""
+Duplicate-QSO detection across one or many ADIF logs.
+
+Each record is reduced to a compact entry: the canonical key `CALL|band|MODE`
+(the mode as `normalize.qso_mode` folds it, so the same QSO logged as SSB by
+one program and USB by another, or as FT8 and MFSK/FT8, still matches while
+FT8 and RTTY contacts stay separate QSOs), the
+QSO start as epoch minutes (date and time folded together so a window can
+cross midnight), a confirmation level, a field count, and its (source,
+ordinal) position. Entries are sorted by (key, minute) and
+swept once; records of the same key whose start lies within `window_minutes`
+of the first record of a cluster are duplicates of each other.
+
+Memory is bounded by `max_in_memory`: past that many entries, everything is
+hash-partitioned by callsign into temporary run files and each partition is
+sorted and swept independently (a call never spans partitions). Total cost is
+O(n log n) with at most one partition resident at a time.
+
+Within a cluster the kept record is the best confirmed (LoTW > eQSL/paper >
+none), then the most complete, then the first seen.
+
+`StreamDeduper` applies the same rules to a stream of records without a
+second pass: a record is held only until no later record within the window
+can still join its cluster, so memory follows the window, not the log. For
+time-ordered input the answer is that of `find_duplicates`; a copy arriving
+after its cluster was released is dropped in favour of the record already
+passed on, as long as that cluster started within the window of the newest
+record seen (older clusters are forgotten).
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import tempfile
+import zlib
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Generic, NamedTuple, TypeVar
+
+from adif_mcp.logbook.normalize import (
+    CONFIRM_FIELDS,
+    is_confirmed,
+    norm_band,
+    norm_call,
+    qso_minutes,
+    qso_mode,
+)
+from adif_mcp.parsers.adi_stream import AdiScanner, iter_raw_records, open_adi
+from adif_mcp.parsers.parse_cache import ParseCache
+
+__all__ = [
+    "DuplicateGroup",
+    "DedupResult",
+    "QsoEntry",
+    "StreamDeduper",
+    "find_duplicates",
+    "write_deduplicated",
+]
+
+_PARTITIONS = 64
+
+# Fields read when matching (a cached log decodes only these columns).
+_MATCH_FIELDS = (
+    "call",
+    "qso_date",
+    "time_on",
+    "band",
+    "mode",
+    "submode",
+    *CONFIRM_FIELDS.values(),
+)
+
+_REASONS = {2: "confirmed via LoTW", 1: "confirmed via eQSL/QSL"}
+
+T = TypeVar("T")
+
+
+class QsoEntry(NamedTuple):
+    """Compact per-record entry used for matching (sortable as a tuple)."""
+
+    key: str
+    minute: int
+    source: int
+    ordinal: int
+    confirmed: int
+    nfields: int
+    call: str
+    qso_date: str
+    time_on: str
+
+
+@dataclass
+class DuplicateGroup:
+    """One kept record and the duplicates dropped in its favour."""
+
+    kept: QsoEntry
+    dropped: list[QsoEntry]
+    reason: str
+
+
+@dataclass
+class DedupResult:
+    """Totals plus the duplicate groups found."""
+
+    sources: list[str]
+    total: int = 0
+    undated: int = 0
+    groups: list[DuplicateGroup] = field(default_factory=list)
+
+    @property
+    def duplicates(self) -> int:
+        """Number of records that would be dropped."""
+        return sum(len(g.dropped) for g in self.groups)
+
+    def dropped_positions(self) -> set[tuple[int, int]]:
+        """(source, ordinal) pairs of every dropped record."""
+        return {(d.source, d.ordinal) for g in self.groups for d in g.dropped}
+
+    def to_dict(self, limit: int | None = None) -> dict[str, Any]:
+        """JSON-friendly report; `limit` caps the number of groups listed."""
+        groups = self.groups if limit is None else self.groups[:limit]
+        return {
+            "sources": self.sources,
+            "total": self.total,
+            "unique": self.total - self.duplicates,
+            "duplicates": self.duplicates,
+            "undated": self.undated,
+            "group_count": len(self.groups),
+            "groups": [_group_as_dict(g, self.sources) for g in groups],
+        }
+
+
+def _entry_as_dict(e: QsoEntry, sources: Sequence[str]) -> dict[str, Any]:
+    return {
+        "source": sources[e.source],
+        "index": e.ordinal,
+        "call": e.call,
+        "qso_date": e.qso_date,
+        "time_on": e.time_on,
+    }
+
+
+def _group_as_dict(g: DuplicateGroup, sources: Sequence[str]) -> dict[str, Any]:
+    """Render a duplicate group with source file names."""
+    return {
+        "kept": _entry_as_dict(g.kept, sources),
+        "dropped": [_entry_as_dict(d, sources) for d in g.dropped],
+        "reason": g.reason,
+    }
+
+
+def _confirm_level(fields: Mapping[str, str]) -> int:
+    if is_confirmed(fields, ("lotw",)):
+        return 2
+    if is_confirmed(fields, ("eqsl", "qsl")):
+        return 1
+    return 0
+
+
+def _key(call: str, f: Mapping[str, str]) -> str:
+    """Matching key `CALL|band|MODE` of a record with normalized `call`."""
+    return f"{call}|{norm_band(f.get('band'))}|{qso_mode(f.get('mode'), f.get('submode'))}"
+
+
+def _scan(path: Path, cache: ParseCache | None) -> Iterator[tuple[dict[str, str], int]]:
+    """(fields needed for matching, field count) per record, from the cache if possible."""
+    log = cache.open(path) if cache is not None else None
+    if log is not None:
+        with log:
+            yield from zip(log.iter_records(_MATCH_FIELDS), log.nfields)
+        return
+    with open_adi(path) as fh:
+        for rec in iter_raw_records(fh):
+            yield rec.fields, len(rec.fields)
+
+
+def _entries(
+    paths: Sequence[Path], result: DedupResult, cache: ParseCache | None = None
+) -> Iterator[QsoEntry]:
+    for src, path in enumerate(paths):
+        for idx, (f, nfields) in enumerate(_scan(path, cache), start=1):
+            result.total += 1
+            call = norm_call(f.get("call"))
+            minute = qso_minutes(f.get("qso_date"), f.get("time_on"))
+            if not call or minute is None:
+                result.undated += 1
+                continue
+            yield QsoEntry(
+                _key(call, f),
+                minute,
+                src,
+                idx,
+                _confirm_level(f),
+                nfields,
+                call,
+                f.get("qso_date", ""),
+                f.get("time_on", ""),
+            )
+
+
+def _pick(cluster: list[QsoEntry]) -> DuplicateGroup:
+    best = max(cluster, key=lambda e: (e.confirmed, e.nfields, -e.source, -e.ordinal))
+    rest = [e for e in cluster if e is not best]
+    if best.confirmed > min(e.confirmed for e in rest):
+        reason = _REASONS[best.confirmed]
+    elif best.nfields > min(e.nfields for e in rest):
+        reason = f"most complete record ({best.nfields} fields)"
+    else:
+        reason = "first occurrence"
+    return DuplicateGroup(best, rest, reason)
+
+
+def _sweep(entries: list[QsoEntry], window: int) -> Iterator[DuplicateGroup]:
+    entries.sort()
+    cluster: list[QsoEntry] = []
+    for e in entries:
+        if cluster and e.key == cluster[0].key and e.minute - cluster[0].minute <= window:
+            cluster.append(e)
+            continue
+        if len(cluster) > 1:
+            yield _pick(cluster)
+        cluster = [e]
+    if len(cluster) > 1:
+        yield _pick(cluster)
+
+
+def _spill(entries: Iterable[QsoEntry], runs: list[IO[str]]) -> None:
+    n = len(runs)
+    for e in entries:
+        part = zlib.crc32(e.call.encode("utf-8")) % n
+        runs[part].write("\t".join(map(str, e)) + "\n")
+
+
+def _load_run(fh: IO[str]) -> list[QsoEntry]:
+    fh.seek(0)
+    out: list[QsoEntry] = []
+    for line in fh:
+        k, m, s, i, c, n, call, d, t = line.rstrip("\n").split("\t")
+        out.append(QsoEntry(k, int(m), int(s), int(i), int(c), int(n), call, d, t))
+    return out
+
+
+def find_duplicates(
+    paths: Iterable[str | Path],
+    window_minutes: int = 5,
+    *,
+    max_in_memory: int = 500_000,
+    cache: ParseCache | None = None,
+) -> DedupResult:
+    """Find duplicate QSOs across `paths`.
+
+    Args:
+        paths: ADIF files, read in order (earlier files win ties).
+        window_minutes: Records with the same call/band/mode whose start
+            times differ by at most this many minutes are duplicates.
+        max_in_memory: Entries held before spilling to partitioned temp files.
+        cache: Parse cache to read (and fill) instead of re-parsing logs.
+
+    Returns:
+        DedupResult with totals and groups ordered by canonical key.
+    """
+    if window_minutes < 0:
+        raise ValueError("window_minutes must be >= 0")
+    plist = [Path(p) for p in paths]
+    result = DedupResult(sources=[str(p) for p in plist])
+
+    buf: list[QsoEntry] = []
+    runs: list[IO[str]] = []
+    try:
+        for e in _entries(plist, result, cache):
+            buf.append(e)
+            if len(buf) >= max_in_memory:
+                if not runs:
+                    runs = [
+                        tempfile.TemporaryFile("w+", encoding="utf-8")
+                        for _ in range(_PARTITIONS)
+                    ]
+                _spill(buf, runs)
+                buf = []
+        if not runs:
+            result.groups.extend(_sweep(buf, window_minutes))
+            return result
+        _spill(buf, runs)
+        buf = []
+        for fh in runs:
+            result.groups.extend(_sweep(_load_run(fh), window_minutes))
+        result.groups.sort(key=lambda g: (g.kept.key, g.kept.minute))
+        return result
+    finally:
+        for fh in runs:
+            fh.close()
+
+
+class _Held(Generic[T]):
+    """A record waiting in a `StreamDeduper` until its cluster is decided."""
+
+    __slots__ = ("item", "keep")
+
+    def __init__(self, item: T, keep: bool | None) -> None:
+        self.item = item
+        self.keep = keep
+
+
+@dataclass
+class _Cluster(Generic[T]):
+    """Records of one key starting within the window of `start`."""
+
+    key: str
+    start: int
+    members: list[tuple[tuple[int, int, int], _Held[T]]] = field(default_factory=list)
+
+
+class StreamDeduper(Generic[T]):
+    """Drop duplicate QSOs from a stream, passing the rest on in arrival order.
+
+    Records are matched like `find_duplicates` (same key, start within
+    `window_minutes` of the first record of a cluster) and the best of each
+    cluster is kept. `push()` returns the records that can be released, and
+    `flush()` the rest at end of stream. Undated records are never dropped.
+    """
+
+    def __init__(self, window_minutes: int = 5) -> None:
+        """Create an empty deduper.
+
+        Raises:
+            ValueError: If `window_minutes` is negative.
+        """
+        if window_minutes < 0:
+            raise ValueError("window_minutes must be >= 0")
+        self.window = window_minutes
+        self.duplicates = 0
+        self._seq = 0
+        self._horizon: int | None = None
+        self._queue: deque[_Held[T]] = deque()
+        self._open: dict[str, _Cluster[T]] = {}
+        self._deadlines: list[tuple[int, int, _Cluster[T]]] = []
+        # starts of released clusters per key, and a heap of them to expire
+        self._released: dict[str, list[int]] = {}
+        self._expiry: list[tuple[int, str]] = []
+
+    def push(self, fields: Mapping[str, str], item: T) -> list[T]:
+        """Add one record (lowercase ADIF fields); returns the records now released."""
+        self._seq += 1
+        call = norm_call(fields.get("call"))
+        minute = qso_minutes(fields.get("qso_date"), fields.get("time_on"))
+        if not call or minute is None:
+            self._queue.append(_Held(item, True))
+            return self._release()
+        if self._horizon is None or minute > self._horizon:
+            self._horizon = minute
+            self._close(minute)
+            self._forget(minute - self.window)
+        key = _key(call, fields)
+        held: _Held[T] = _Held(item, None)
+        rank = (_confirm_level(fields), len(fields), -self._seq)
+        cluster = self._open.get(key)
+        if cluster is not None and abs(minute - cluster.start) <= self.window:
+            cluster.members.append((rank, held))
+        elif self._seen(key, minute):
+            held.keep = False  # its cluster's kept record was already passed on
+            self.duplicates += 1
+        elif cluster is not None:
+            # too early for the open cluster of its key, and nothing released
+            # matches: nothing can join it any more
+            held.keep = True
+            self._remember(key, minute)
+        else:
+            cluster = self._open[key] = _Cluster(key, minute, [(rank, held)])
+            heapq.heappush(self._deadlines, (minute + self.window, self._seq, cluster))
+            self._close(self._horizon)
+        self._queue.append(held)
+        return self._release()
+
+    def flush(self) -> list[T]:
+        """Decide every open cluster and return all records still held."""
+        for cluster in list(self._open.values()):
+            self._decide(cluster)
+        self._deadlines = []
+        return self._release()
+
+    def _seen(self, key: str, minute: int) -> bool:
+        """True if a released cluster of `key` started within the window of `minute`."""
+        starts = self._released.get(key)
+        if not starts:
+            return False
+        i = bisect.bisect_left(starts, minute - self.window)
+        return i < len(starts) and starts[i] <= minute + self.window
+
+    def _close(self, horizon: int) -> None:
+        """Decide the clusters no record at or after `horizon` can join."""
+        while self._deadlines and self._deadlines[0][0] < horizon:
+            self._decide(heapq.heappop(self._deadlines)[2])
+
+    def _decide(self, cluster: _Cluster[T]) -> None:
+        best = max(cluster.members, key=lambda m: m[0])[1]
+        for _, held in cluster.members:
+            held.keep = held is best
+        self.duplicates += len(cluster.members) - 1
+        del self._open[cluster.key]
+        self._remember(cluster.key, cluster.start)
+
+    def _remember(self, key: str, start: int) -> None:
+        bisect.insort(self._released.setdefault(key, []), start)
+        heapq.heappush(self._expiry, (start, key))
+
+    def _forget(self, before: int) -> None:
+        """Drop released cluster starts older than `before`."""
+        expiry, released = self._expiry, self._released
+        while expiry and expiry[0][0] < before:
+            start, key = heapq.heappop(expiry)
+            starts = released[key]
+            del starts[bisect.bisect_left(starts, start)]
+            if not starts:
+                del released[key]
+
+    def _release(self) -> list[T]:
+        out: list[T] = []
+        queue = self._queue
+        while queue and queue[0].keep is not None:
+            held = queue.popleft()
+            if held.keep:
+                out.append(held.item)
+        return out
+
+
+def write_deduplicated(result: DedupResult, out_path: str | Path) -> int:
+    """Copy every non-dropped record, byte for byte, into one ADI file.
+
+    The header of the first source is reused. Returns records written.
+    """
+    dropped = result.dropped_positions()
+    out = Path(out_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    n = 0
+    with out.open("wb") as w:
+        for src, path in enumerate(result.sources):
+            scanner = AdiScanner()
+            with open_adi(path) as fh:
+                for idx, rec in enumerate(iter_raw_records(fh, scanner=scanner), start=1):
+                    if src == 0 and idx == 1 and scanner.header:
+                        w.write(scanner.header + b"\n")
+                    if (src, idx) in dropped:
+                        continue
+                    w.write(rec.raw)
+                    w.write(b"\n")
+                    n += 1
+    return n
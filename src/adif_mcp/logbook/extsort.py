@@ -0,0 +1,84 @@
+"""
+External merge sort for streams that may not fit in memory.
+
+Items are buffered up to a cap, sorted, and spilled as pickled runs to
+anonymous temp files; the runs are then k-way merged lazily with
+`heapq.merge`. Small inputs never touch disk. The sort is stable.
+"""
+
+from __future__ import annotations
+
+import heapq
+import pickle
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from typing import IO, Any, TypeVar, cast
+
+__all__ = ["external_sort"]
+
+T = TypeVar("T")
+
+_BATCH = 4096
+
+
+def _write_run(items: list[T], tmp_dir: str | None) -> IO[bytes]:
+    fh = tempfile.TemporaryFile("w+b", dir=tmp_dir)
+    for i in range(0, len(items), _BATCH):
+        pickle.dump(items[i : i + _BATCH], fh, protocol=pickle.HIGHEST_PROTOCOL)
+    fh.seek(0)
+    return fh
+
+
+def _read_run(fh: IO[bytes]) -> Iterator[T]:
+    while True:
+        try:
+            batch = cast(list[T], pickle.load(fh))
+        except EOFError:
+            return
+        yield from batch
+
+
+def external_sort(
+    items: Iterable[T],
+    *,
+    key: Callable[[T], Any],
+    max_items: int = 250_000,
+    max_bytes: int | None = None,
+    sizeof: Callable[[T], int] | None = None,
+    tmp_dir: str | None = None,
+) -> Iterator[T]:
+    """Yield `items` ordered by `key`, spilling sorted runs to disk as needed.
+
+    Args:
+        items: Any iterable; consumed once.
+        key: Sort key function.
+        max_items: Spill a run once this many items are buffered.
+        max_bytes: Optional byte budget for the buffer (requires `sizeof`).
+        sizeof: Estimated in-memory size of one item, for `max_bytes`.
+        tmp_dir: Directory for run files (defaults to the system temp dir).
+    """
+    if max_bytes is not None and sizeof is None:
+        raise ValueError("max_bytes requires sizeof")
+    runs: list[IO[bytes]] = []
+    buf: list[T] = []
+    used = 0
+    try:
+        for item in items:
+            buf.append(item)
+            if sizeof is not None:
+                used += sizeof(item)
+            if len(buf) >= max_items or (max_bytes is not None and used >= max_bytes):
+                buf.sort(key=key)
+                runs.append(_write_run(buf, tmp_dir))
+                buf = []
+                used = 0
+        buf.sort(key=key)
+        if not runs:
+            yield from buf
+            return
+        streams: list[Iterator[T]] = [_read_run(fh) for fh in runs]
+        streams.append(iter(buf))
+        yield from heapq.merge(*streams, key=key)
+    finally:
+        for fh in runs:
+            fh.close()
@@ -0,0 +1,274 @@
+"""
+In-memory "worked before / needed" lookups for live operating.
+
+`WorkedIndex` answers, in a handful of hash probes:
+
+- has this call been worked at all, on this band, on this band + mode?
+- would this QSO be a new DXCC entity, CQ zone or 4-char grid
+  (overall, on the band, or on the band + mode group)?
+
+Keys are plain strings in Python sets (`"CALL|band|MODE"`), plus
+entity/zone/grid x band matrices stored as `key -> set of slices`. An optional
+Bloom filter in front of the call keys short-circuits the common "never
+worked" answer; with `exact=False` the call-level sets are dropped entirely and
+only the Bloom filter is kept, trading a small false-positive rate for far
+less memory on multi-million-QSO histories.
+
+The index follows its source logs through `LogCursor`, so `refresh()` only
+reads QSOs appended since the previous call.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from adif_mcp.logbook.awards import award_keys
+from adif_mcp.logbook.normalize import mode_group, norm_band, norm_call, norm_mode
+from adif_mcp.parsers.adi_stream import LogCursor
+
+__all__ = ["BloomFilter", "WorkedIndex"]
+
+_GRID4 = re.compile(r"^[A-R]{2}[0-9]{2}$")
+
+
+def _credits(dxcc: str | None, cqz: str | None, grid: str | None) -> dict[str, str | None]:
+    """Entity, zone and 4-char grid for a QSO (grids count on every band here)."""
+    keys = award_keys({"dxcc": dxcc or "", "cqz": cqz or ""})
+    g4 = (grid or "").strip()[:4].upper()
+    return {
+        "entity": keys["DXCC"][0] if keys["DXCC"] else None,
+        "zone": keys["WAZ"][0] if keys["WAZ"] else None,
+        "grid": g4 if _GRID4.match(g4) else None,
+    }
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on BLAKE2b)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        """Size the filter for `capacity` items at the target false-positive rate."""
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0.0 < error_rate < 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+        m = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.size = max(8, m)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterable[int]:
+        d = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:], "little") | 1
+        size = self.size
+        return ((h1 + i * h2) % size for i in range(self.hashes))
+
+    def clear(self) -> None:
+        """Remove every key."""
+        self.bits = bytearray(len(self.bits))
+        self.count = 0
+
+    def add(self, key: str) -> None:
+        """Insert `key`."""
+        bits = self.bits
+        for p in self._positions(key):
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def __contains__(self, key: object) -> bool:
+        """False means definitely absent; True means probably present."""
+        if not isinstance(key, str):
+            return False
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class WorkedIndex:
+    """Hashed worked-before state for one or more logs."""
+
+    def __init__(
+        self,
+        *,
+        bloom_capacity: int | None = None,
+        bloom_error_rate: float = 0.001,
+        exact: bool = True,
+    ) -> None:
+        """Create an empty index.
+
+        Args:
+            bloom_capacity: Expected number of QSOs; enables the Bloom pre-check.
+            bloom_error_rate: Target false-positive rate for the Bloom filter.
+            exact: Keep exact call keys. `False` requires `bloom_capacity` and
+                makes call answers probabilistic (never a false "not worked").
+        """
+        if not exact and not bloom_capacity:
+            raise ValueError("exact=False requires bloom_capacity")
+        self.exact = exact
+        self.bloom = (
+            BloomFilter(bloom_capacity * 3, bloom_error_rate) if bloom_capacity else None
+        )
+        self._keys: set[str] = set()
+        self._calls: set[str] = set()
+        # credit key -> slices ("*|*", "band|*", "band|MODEGROUP") it was worked in
+        self._matrix: dict[str, dict[str, set[str]]] = {"entity": {}, "zone": {}, "grid": {}}
+        self._cursors: dict[str, LogCursor] = {}
+        self.qso_count = 0
+
+    # ---------------- updates ----------------
+
+    def add(self, rec: Mapping[str, str]) -> None:
+        """Index one QSO (lowercased ADIF field names)."""
+        call = norm_call(rec.get("call"))
+        band = norm_band(rec.get("band"))
+        mode = norm_mode(rec.get("mode"))
+        if call:
+            keys = (call, f"{call}|{band}", f"{call}|{band}|{mode}")
+            if self.bloom is not None:
+                for k in keys:
+                    self.bloom.add(k)
+            if self.exact:
+                self._calls.add(call)
+                self._keys.update(keys[1:])
+
+        group = mode_group(mode)
+        slices = ["*|*"]
+        if band:
+            slices.append(f"{band}|*")
+            if group:
+                slices.append(f"{band}|{group}")
+        credits = _credits(rec.get("dxcc"), rec.get("cqz"), rec.get("gridsquare"))
+        for kind, credit in credits.items():
+            if credit:
+                self._matrix[kind].setdefault(credit, set()).update(slices)
+        self.qso_count += 1
+
+    def add_many(self, records: Iterable[Mapping[str, str]]) -> int:
+        """Index many QSOs; returns how many were added."""
+        n = 0
+        for rec in records:
+            self.add(rec)
+            n += 1
+        return n
+
+    def follow(self, path: str | Path) -> int:
+        """Start tracking a log file and index everything currently in it."""
+        p = Path(path).resolve()
+        self._cursors.setdefault(str(p), LogCursor(p))
+        return self.refresh()
+
+    def refresh(self) -> int:
+        """Index QSOs appended to followed logs since the last refresh.
+
+        When a followed log was replaced or rewritten, the index is cleared
+        and every followed log is indexed again from the start.
+        """
+        resets = [c.resets for c in self._cursors.values()]
+        n = self._read_new()
+        if resets != [c.resets for c in self._cursors.values()]:
+            self.reset()
+            for cursor in self._cursors.values():
+                cursor.rewind()
+            n = self._read_new()
+        return n
+
+    def _read_new(self) -> int:
+        n = 0
+        for cursor in self._cursors.values():
+            for rec in cursor.read_new():
+                self.add(rec.fields)
+                n += 1
+        return n
+
+    def reset(self) -> None:
+        """Forget every indexed QSO (followed logs stay followed)."""
+        if self.bloom is not None:
+            self.bloom.clear()
+        self._keys.clear()
+        self._calls.clear()
+        for credits in self._matrix.values():
+            credits.clear()
+        self.qso_count = 0
+
+    # ---------------- queries ----------------
+
+    def _has(self, key: str, exact_set: set[str]) -> bool:
+        if self.bloom is not None and key not in self.bloom:
+            return False
+        if not self.exact:
+            return True
+        return key in exact_set
+
+    def worked(self, call: str, band: str | None = None, mode: str | None = None) -> bool:
+        """True if `call` was worked (optionally on `band`, and `mode`)."""
+        c = norm_call(call)
+        if band is None:
+            return self._has(c, self._calls)
+        b = norm_band(band)
+        if mode is None:
+            return self._has(f"{c}|{b}", self._keys)
+        return self._has(f"{c}|{b}|{norm_mode(mode)}", self._keys)
+
+    def _new(self, kind: str, credit: str, band: str, group: str) -> dict[str, bool]:
+        slices = self._matrix[kind].get(credit, set())
+        out = {"overall": "*|*" not in slices}
+        if band:
+            out["band"] = f"{band}|*" not in slices
+            if group:
+                out["band_mode"] = f"{band}|{group}" not in slices
+        return out
+
+    def check(
+        self,
+        call: str,
+        band: str | None = None,
+        mode: str | None = None,
+        *,
+        dxcc: str | None = None,
+        cqz: str | None = None,
+        grid: str | None = None,
+    ) -> dict[str, Any]:
+        """Answer the live-operating questions for a prospective QSO.
+
+        Returns:
+            `worked` flags for the call and `new` flags per entity, zone and
+            grid (only for the credits supplied).
+        """
+        b = norm_band(band)
+        m = norm_mode(mode)
+        result: dict[str, Any] = {
+            "call": norm_call(call),
+            "band": b or None,
+            "mode": m or None,
+            "worked": {"any": self.worked(call)},
+            "approximate": not self.exact,
+        }
+        if b:
+            result["worked"]["band"] = self.worked(call, b)
+            if m:
+                result["worked"]["band_mode"] = self.worked(call, b, m)
+
+        group = mode_group(m)
+        result["new"] = {
+            kind: self._new(kind, credit, b, group)
+            for kind, credit in _credits(dxcc, cqz, grid).items()
+            if credit
+        }
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """Index size information."""
+        return {
+            "qso_count": self.qso_count,
+            "calls": len(self._calls) if self.exact else None,
+            "entities": len(self._matrix["entity"]),
+            "zones": len(self._matrix["zone"]),
+            "grids": len(self._matrix["grid"]),
+            "bloom_bits": self.bloom.size if self.bloom is not None else 0,
+            "logs": sorted(self._cursors),
+        }
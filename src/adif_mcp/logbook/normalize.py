@@ -0,0 +1,136 @@
+"""Canonical forms for the QSO fields the log engines key on."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import date
+from functools import lru_cache
+
+# ADIF modes that count as phone for award purposes; CW is its own group
+# and everything else is treated as digital.
+_PHONE_MODES = frozenset({"SSB", "AM", "FM", "DIGITALVOICE", "USB", "LSB"})
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# QSL_RCVD values that mean "confirmed" (Y = yes, V = verified).
+_CONFIRMED = frozenset({"Y", "V"})
+
+# Confirmation flags checked per source.
+CONFIRM_FIELDS: dict[str, str] = {
+    "lotw": "lotw_qsl_rcvd",
+    "eqsl": "eqsl_qsl_rcvd",
+    "qsl": "qsl_rcvd",
+}
+
+
+def norm_call(call: str | None) -> str:
+    """Uppercase and trim a callsign."""
+    return (call or "").strip().upper()
+
+
+# Portable/operating suffixes that are not part of a call's prefix.
+_CALL_SUFFIXES = frozenset({"P", "M", "MM", "AM", "QRP", "A", "R", "LH"})
+
+
+def _through_last_digit(part: str) -> str:
+    """`part` up to its last digit, or its first two letters + "0" if it has none."""
+    for i in range(len(part) - 1, -1, -1):
+        if part[i].isdigit():
+            return part[: i + 1]
+    return part[:2] + "0"
+
+
+def call_prefix(call: str | None) -> str:
+    """WPX-style prefix of a callsign ("W1AW" -> "W1", "3DA0XX" -> "3DA0").
+
+    A slashed country prefix wins ("JA1/K1ABC" -> "JA1", "DL/W1AW" -> "DL0"),
+    a single digit replaces the call area ("W1AW/4" -> "W4"), and portable
+    suffixes (/P, /M, /QRP, ...) are ignored.
+    """
+    parts = [p for p in norm_call(call).split("/") if p]
+    if not parts:
+        return ""
+    base = max(parts, key=len)
+    area = ""
+    for part in parts:
+        if part is base or part in _CALL_SUFFIXES:
+            continue
+        if part.isdigit():
+            area = part[-1]
+        elif len(part) <= 4:
+            return part if any(ch.isdigit() for ch in part) else part + "0"
+    prefix = _through_last_digit(base)
+    return prefix[:-1] + area if area else prefix
+
+
+def norm_band(band: str | None) -> str:
+    """Normalize band spelling ("40M" -> "40m", "70CM" -> "70cm")."""
+    return (band or "").strip().lower()
+
+
+def norm_mode(mode: str | None) -> str:
+    """Uppercase and trim a mode."""
+    return (mode or "").strip().upper()
+
+
+# Spellings of one mode: sideband submodes are logged as the mode itself.
+_MODE_ALIASES = {"USB": "SSB", "LSB": "SSB"}
+
+
+def qso_mode(mode: str | None, submode: str | None = None) -> str:
+    """The mode a QSO was made in, with spellings of the same mode folded together.
+
+    A submode names the mode more precisely than its container (MFSK + FT4
+    -> FT4, PSK + PSK31 -> PSK31), and USB/LSB are SSB, so one QSO logged by
+    two programs gets one mode while FT8, FT4 and RTTY stay distinct.
+    """
+    m = norm_mode(submode) or norm_mode(mode)
+    return _MODE_ALIASES.get(m, m)
+
+
+def mode_group(mode: str | None) -> str:
+    """Map an ADIF mode to its award group: CW, PHONE or DIGITAL ("" if unknown)."""
+    m = norm_mode(mode)
+    if not m:
+        return ""
+    if m in ("CW", "PHONE", "DIGITAL"):
+        return m
+    if m in _PHONE_MODES:
+        return "PHONE"
+    return "DIGITAL"
+
+
+def is_confirmed(
+    rec: Mapping[str, str], sources: tuple[str, ...] = ("lotw", "eqsl", "qsl")
+) -> bool:
+    """True when any of the given confirmation sources is Y/V on the record."""
+    for src in sources:
+        if (rec.get(CONFIRM_FIELDS[src]) or "").strip().upper() in _CONFIRMED:
+            return True
+    return False
+
+
+@lru_cache(maxsize=1 << 16)
+def _day_number(d: str) -> int | None:
+    """Days since 1970-01-01 for a YYYYMMDD string (logs repeat dates heavily)."""
+    if len(d) != 8 or not d.isdigit():
+        return None
+    try:
+        return date(int(d[0:4]), int(d[4:6]), int(d[6:8])).toordinal() - _EPOCH_ORDINAL
+    except ValueError:
+        return None
+
+
+def qso_minutes(qso_date: str | None, time_on: str | None) -> int | None:
+    """Minutes since 1970-01-01 UTC for an ADIF date/time pair, or None if invalid.
+
+    A missing time counts as 00:00.
+    """
+    days = _day_number((qso_date or "").strip())
+    t = (time_on or "").strip() or "0000"
+    if days is None or len(t) not in (4, 6) or not t.isdigit():
+        return None
+    hh, mm = int(t[0:2]), int(t[2:4])
+    if hh > 23 or mm > 59:
+        return None
+    return days * 1440 + hh * 60 + mm
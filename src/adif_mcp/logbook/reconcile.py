@@ -0,0 +1,290 @@
+"""
+Sort-merge reconciliation of a local log against provider downloads.
+
+Both sides are streamed into compact join entries, externally sorted by
+(call, epoch minute), and merge-joined call by call. Within a call, a local
+and a remote QSO match when their bands agree, their mode groups agree
+(providers often report `SSB` for `USB` or `DATA` for `FT8`), and their start
+times are within `tolerance_minutes`.
+
+The result carries matched, unmatched-local and unmatched-remote entries plus
+the patch records needed to mark matched local QSOs as confirmed
+(`EQSL_QSL_RCVD`/`EQSL_QSLRDATE` or `LOTW_QSL_RCVD`/`LOTW_QSLRDATE`).
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from adif_mcp.logbook.extsort import external_sort
+from adif_mcp.logbook.normalize import (
+    is_confirmed,
+    mode_group,
+    norm_band,
+    norm_call,
+    norm_mode,
+    qso_minutes,
+)
+from adif_mcp.parsers.adi_stream import iter_records
+from adif_mcp.parsers.adi_writer import AdiWriter
+
+__all__ = [
+    "JoinEntry",
+    "ReconcileResult",
+    "normalize_remote",
+    "reconcile",
+]
+
+# provider -> (confirmation source on the remote side, patch fields)
+_PROVIDERS: dict[str, tuple[str, str, str]] = {
+    "eqsl": ("eqsl", "EQSL_QSL_RCVD", "EQSL_QSLRDATE"),
+    "lotw": ("lotw", "LOTW_QSL_RCVD", "LOTW_QSLRDATE"),
+}
+
+# Remote-side date fields, in order of preference.
+_REMOTE_DATE_FIELDS = ("eqsl_qslrdate", "eqsl_qsl_date", "lotw_qslrdate", "qslrdate")
+
+
+class JoinEntry(NamedTuple):
+    """Compact, picklable join entry for one QSO on either side."""
+
+    call: str
+    minute: int
+    band: str
+    group: str
+    ordinal: int
+    qso_date: str
+    time_on: str
+    mode: str
+    submode: str
+    station_call: str
+    confirmed: bool
+    qsl_date: str
+
+
+@dataclass
+class ReconcileResult:
+    """Outcome of a reconciliation run."""
+
+    provider: str
+    matched: list[tuple[JoinEntry, JoinEntry]] = field(default_factory=list)
+    unmatched_local: list[JoinEntry] = field(default_factory=list)
+    unmatched_remote: list[JoinEntry] = field(default_factory=list)
+    skipped_local: int = 0
+    skipped_remote: int = 0
+
+    @property
+    def patches(self) -> list[tuple[JoinEntry, JoinEntry]]:
+        """Matched pairs confirmed remotely but not yet locally."""
+        return [(loc, rem) for loc, rem in self.matched if rem.confirmed and not loc.confirmed]
+
+    def summary(self, sample: int = 10) -> dict[str, Any]:
+        """Counts plus a few example entries from each set."""
+        return {
+            "provider": self.provider,
+            "matched": len(self.matched),
+            "already_confirmed": sum(1 for loc, _ in self.matched if loc.confirmed),
+            "to_patch": len(self.patches),
+            "unmatched_local": len(self.unmatched_local),
+            "unmatched_remote": len(self.unmatched_remote),
+            "skipped_local": self.skipped_local,
+            "skipped_remote": self.skipped_remote,
+            "sample_unmatched_local": [e._asdict() for e in self.unmatched_local[:sample]],
+            "sample_unmatched_remote": [e._asdict() for e in self.unmatched_remote[:sample]],
+        }
+
+    def patch_records(self) -> Iterator[dict[str, str]]:
+        """ADIF field maps (upper-case names) that confirm the matched QSOs."""
+        _, rcvd_field, date_field = _PROVIDERS[self.provider]
+        for loc, rem in self.patches:
+            rec = {
+                "CALL": loc.call,
+                "QSO_DATE": loc.qso_date,
+                "TIME_ON": loc.time_on,
+                "BAND": loc.band,
+                "MODE": loc.mode,
+            }
+            if loc.submode:
+                rec["SUBMODE"] = loc.submode
+            if loc.station_call:
+                rec["STATION_CALLSIGN"] = loc.station_call
+            rec[rcvd_field] = "Y"
+            if rem.qsl_date:
+                rec[date_field] = rem.qsl_date
+            yield rec
+
+    def write(self, out_dir: str | Path) -> dict[str, str]:
+        """Write matched/unmatched NDJSON files and `patch.adi` into `out_dir`."""
+        d = Path(out_dir)
+        d.mkdir(parents=True, exist_ok=True)
+        paths = {
+            "matched": d / "matched.ndjson",
+            "unmatched_local": d / "unmatched_local.ndjson",
+            "unmatched_remote": d / "unmatched_remote.ndjson",
+            "patch": d / "patch.adi",
+        }
+        with paths["matched"].open("w", encoding="utf-8") as fh:
+            for loc, rem in self.matched:
+                fh.write(json.dumps({"local": loc._asdict(), "remote": rem._asdict()}) + "\n")
+        for name in ("unmatched_local", "unmatched_remote"):
+            entries: list[JoinEntry] = getattr(self, name)
+            with paths[name].open("w", encoding="utf-8") as fh:
+                for e in entries:
+                    fh.write(json.dumps(e._asdict()) + "\n")
+        with paths["patch"].open("wb") as out, AdiWriter(
+            out, comment="adif-mcp reconcile patch"
+        ) as w:
+            w.write_all(self.patch_records())
+        return {k: str(v) for k, v in paths.items()}
+
+
+def normalize_remote(rec: Mapping[str, Any]) -> dict[str, str]:
+    """Lowercased string field map from a provider record.
+
+    Accepts raw ADIF field maps as well as `eqsl_tools.QsoRecord` dicts,
+    whose untouched tags live under `"adif"`.
+    """
+    raw = rec.get("adif")
+    src: Mapping[str, Any] = raw if isinstance(raw, Mapping) else rec
+    return {str(k).lower(): str(v) for k, v in src.items() if v not in (None, "")}
+
+
+def _entries(
+    records: Iterable[Mapping[str, str]], source: str, remote: bool, stats: list[int]
+) -> Iterator[JoinEntry]:
+    for ordinal, f in enumerate(records, start=1):
+        call = norm_call(f.get("call"))
+        minute = qso_minutes(f.get("qso_date"), f.get("time_on"))
+        if not call or minute is None:
+            stats[0] += 1
+            continue
+        if not remote:
+            confirmed = is_confirmed(f, (source,))
+        elif source == "eqsl" and "eqsl_qsl_rcvd" not in f:
+            # eQSL inbox downloads only contain received cards.
+            confirmed = True
+        else:
+            # LoTW reports confirmation as QSL_RCVD on its own records.
+            confirmed = is_confirmed(f, (source,)) or is_confirmed(f, ("qsl",))
+        qsl_date = next((f[k] for k in _REMOTE_DATE_FIELDS if f.get(k)), "")
+        mode = norm_mode(f.get("mode"))
+        yield JoinEntry(
+            call,
+            minute,
+            norm_band(f.get("band")),
+            mode_group(mode),
+            ordinal,
+            f.get("qso_date", ""),
+            f.get("time_on", ""),
+            mode,
+            norm_mode(f.get("submode")),
+            norm_call(f.get("station_callsign") or f.get("station_call")),
+            confirmed,
+            qsl_date,
+        )
+
+
+def _compatible(a: JoinEntry, b: JoinEntry, tol: int) -> bool:
+    if abs(a.minute - b.minute) > tol:
+        return False
+    if a.band and b.band and a.band != b.band:
+        return False
+    return not (a.group and b.group and a.group != b.group)
+
+
+def _join_call(
+    local: list[JoinEntry], remote: list[JoinEntry], tol: int, result: ReconcileResult
+) -> None:
+    used = [False] * len(remote)
+    start = 0
+    for loc in local:
+        while start < len(remote) and remote[start].minute < loc.minute - tol:
+            if not used[start]:
+                result.unmatched_remote.append(remote[start])
+                used[start] = True
+            start += 1
+        hit = -1
+        best = tol + 1
+        j = start
+        while j < len(remote) and remote[j].minute <= loc.minute + tol:
+            if not used[j] and _compatible(loc, remote[j], tol):
+                gap = abs(remote[j].minute - loc.minute)
+                if gap < best:
+                    hit, best = j, gap
+            j += 1
+        if hit >= 0:
+            used[hit] = True
+            result.matched.append((loc, remote[hit]))
+        else:
+            result.unmatched_local.append(loc)
+    result.unmatched_remote.extend(r for r, u in zip(remote, used) if not u)
+
+
+def reconcile(
+    local_path: str | Path,
+    remote: str | Path | Iterable[Mapping[str, Any]],
+    *,
+    provider: str = "eqsl",
+    tolerance_minutes: int = 30,
+    max_in_memory: int = 250_000,
+) -> ReconcileResult:
+    """Merge-join a local ADIF log with a provider download.
+
+    Args:
+        local_path: The operator's own ADIF log.
+        remote: Provider ADIF file, or provider records (e.g. the `records`
+            of `eqsl_tools.fetch_inbox`).
+        provider: "eqsl" or "lotw"; selects which confirmation is patched.
+        tolerance_minutes: Maximum start-time difference for a match.
+        max_in_memory: Entries per side held before spilling sorted runs.
+    """
+    prov = provider.strip().lower()
+    if prov not in _PROVIDERS:
+        raise ValueError(f"Unknown provider '{provider}'. Expected eqsl or lotw.")
+    source = _PROVIDERS[prov][0]
+
+    if isinstance(remote, (str, Path)):
+        remote_recs: Iterable[Mapping[str, str]] = iter_records(remote)
+    else:
+        remote_recs = (normalize_remote(r) for r in remote)
+
+    result = ReconcileResult(provider=prov)
+    lstats, rstats = [0], [0]
+
+    def sort_key(e: JoinEntry) -> tuple[str, int]:
+        return (e.call, e.minute)
+
+    local_sorted = external_sort(
+        _entries(iter_records(local_path), source, False, lstats),
+        key=sort_key,
+        max_items=max_in_memory,
+    )
+    remote_sorted = external_sort(
+        _entries(remote_recs, source, True, rstats), key=sort_key, max_items=max_in_memory
+    )
+
+    lgroups = itertools.groupby(local_sorted, key=lambda e: e.call)
+    rgroups = itertools.groupby(remote_sorted, key=lambda e: e.call)
+    lnext = next(lgroups, None)
+    rnext = next(rgroups, None)
+    while lnext is not None or rnext is not None:
+        if rnext is None or (lnext is not None and lnext[0] < rnext[0]):
+            assert lnext is not None
+            result.unmatched_local.extend(lnext[1])
+            lnext = next(lgroups, None)
+        elif lnext is None or rnext[0] < lnext[0]:
+            result.unmatched_remote.extend(rnext[1])
+            rnext = next(rgroups, None)
+        else:
+            _join_call(list(lnext[1]), list(rnext[1]), tolerance_minutes, result)
+            lnext = next(lgroups, None)
+            rnext = next(rgroups, None)
+
+    result.skipped_local = lstats[0]
+    result.skipped_remote = rstats[0]
+    return result
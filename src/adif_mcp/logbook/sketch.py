@@ -0,0 +1,382 @@
+"""
+Fixed-memory sketches for distinct counts and heavy hitters.
+
+Exact answers to "how many unique calls have I worked" or "top 20 most
+worked stations" need a set or counter entry per distinct call, which on
+multi-million-QSO histories is more memory than a small MCP process should
+hold. The sketches here trade a small, known error for a fixed size:
+
+- `HyperLogLog`: distinct count, standard error about 1.04 / sqrt(2**p)
+  (p=14: 16 KiB, ~0.8%).
+- `CountMinSketch`: per-key counts that never under-estimate; the excess
+  is at most e/width of the total with probability 1 - exp(-depth).
+- `TopK`: a Count-Min sketch plus a min-heap of the `k` heaviest keys seen.
+
+All three merge (`merge`) and serialize (`to_dict` / `from_dict`), so
+sketches built per log, or per process, combine into one for a whole
+directory of logs. `LogSketch` bundles them for the usual log questions.
+Hashing is BLAKE2b, as in `lookup.BloomFilter`.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import heapq
+import math
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+from adif_mcp.parsers.adi_stream import iter_records
+from adif_mcp.parsers.parse_cache import ParseCache
+
+__all__ = [
+    "CountMinSketch",
+    "HyperLogLog",
+    "LogSketch",
+    "TopK",
+    "sketch_files",
+]
+
+_MASK64 = (1 << 64) - 1
+
+
+def _hash128(key: str) -> tuple[int, int]:
+    d = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(d[:8], "little"), int.from_bytes(d[8:], "little")
+
+
+class HyperLogLog:
+    """Distinct-count estimator with 2**`precision` one-byte registers."""
+
+    def __init__(self, precision: int = 14) -> None:
+        """Create an empty sketch (`precision` 4..18)."""
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    def add(self, key: str) -> None:
+        """Count `key`."""
+        x = _hash128(key)[0]
+        idx = x >> (64 - self.p)
+        w = (x << self.p) & _MASK64
+        rank = 64 - w.bit_length() + 1 if w else 64 - self.p + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def count(self) -> int:
+        """Estimated number of distinct keys added."""
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        est = alpha * m * m / sum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+        if est <= 2.5 * m and zeros:
+            est = m * math.log(m / zeros)  # small-range (linear counting) correction
+        return round(est)
+
+    @property
+    def error(self) -> float:
+        """Relative standard error of `count()`."""
+        return 1.04 / math.sqrt(self.m)
+
+    def merge(self, other: HyperLogLog) -> HyperLogLog:
+        """Fold `other` (same precision) into this sketch; returns self."""
+        if other.p != self.p:
+            raise ValueError("cannot merge HyperLogLogs of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form."""
+        return {"p": self.p, "registers": base64.b64encode(self.registers).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> HyperLogLog:
+        """Rebuild a sketch from `to_dict` output."""
+        hll = cls(int(data["p"]))
+        regs = base64.b64decode(data["registers"])
+        if len(regs) != hll.m:
+            raise ValueError("register count does not match precision")
+        hll.registers = bytearray(regs)
+        return hll
+
+
+class CountMinSketch:
+    """Approximate per-key counts in a `depth` x `width` table."""
+
+    def __init__(self, width: int = 4096, depth: int = 4) -> None:
+        """Create an empty sketch."""
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be positive")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+
+    def _cells(self, key: str) -> list[int]:
+        h1, h2 = _hash128(key)
+        h2 |= 1
+        w = self.width
+        return [(h1 + i * h2) % w for i in range(self.depth)]
+
+    def add(self, key: str, n: int = 1) -> int:
+        """Count `key` `n` times; returns its new estimate."""
+        self.total += n
+        est = None
+        for row, cell in zip(self.rows, self._cells(key)):
+            row[cell] += n
+            est = row[cell] if est is None else min(est, row[cell])
+        return est or 0
+
+    def estimate(self, key: str) -> int:
+        """Estimated count of `key` (never below the true count)."""
+        return min(row[cell] for row, cell in zip(self.rows, self._cells(key)))
+
+    @property
+    def error(self) -> float:
+        """Bound on the over-estimate, as a share of `total` (at ~98% for depth 4)."""
+        return math.e / self.width
+
+    def merge(self, other: CountMinSketch) -> CountMinSketch:
+        """Fold `other` (same shape) into this sketch; returns self."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("cannot merge Count-Min sketches of different shape")
+        for mine, theirs in zip(self.rows, other.rows):
+            for i, v in enumerate(theirs):
+                if v:
+                    mine[i] += v
+        self.total += other.total
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form."""
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "total": self.total,
+            "rows": [base64.b64encode(row.tobytes()).decode("ascii") for row in self.rows],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> CountMinSketch:
+        """Rebuild a sketch from `to_dict` output."""
+        cms = cls(int(data["width"]), int(data["depth"]))
+        cms.total = int(data["total"])
+        for i, raw in enumerate(data["rows"]):
+            row = array("Q")
+            row.frombytes(base64.b64decode(raw))
+            if len(row) != cms.width:
+                raise ValueError("row length does not match width")
+            cms.rows[i] = row
+        return cms
+
+
+class TopK:
+    """The `k` most frequent keys, counted by a Count-Min sketch."""
+
+    def __init__(self, k: int = 20, *, width: int = 4096, depth: int = 4) -> None:
+        """Track the `k` heaviest keys."""
+        if k < 1:
+            raise ValueError("k must be positive")
+        self.k = k
+        self.cms = CountMinSketch(width, depth)
+        self._top: dict[str, int] = {}
+        self._heap: list[tuple[int, str]] = []
+
+    def add(self, key: str, n: int = 1) -> None:
+        """Count `key`."""
+        est = self.cms.add(key, n)
+        top = self._top
+        if key in top or len(top) < self.k:
+            top[key] = est
+            heapq.heappush(self._heap, (est, key))
+            if len(self._heap) > 2 * self.k:
+                self._rebuild()
+            return
+        low = self._floor()
+        if est > low[0]:
+            heapq.heappop(self._heap)
+            del top[low[1]]
+            top[key] = est
+            heapq.heappush(self._heap, (est, key))
+
+    def _rebuild(self) -> None:
+        """Drop stale heap entries (a tracked key is re-pushed on every add)."""
+        self._heap = [(v, key) for key, v in self._top.items()]
+        heapq.heapify(self._heap)
+
+    def _floor(self) -> tuple[int, str]:
+        """Lightest tracked key (drops stale heap entries on the way)."""
+        heap, top = self._heap, self._top
+        while heap[0][1] not in top or top[heap[0][1]] != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0]
+
+    def most_common(self, n: int | None = None) -> list[tuple[str, int]]:
+        """Heaviest keys with their estimated counts, largest first."""
+        ranked = sorted(self._top.items(), key=lambda kv: (-kv[1], kv[0]))
+        return ranked[: self.k if n is None else n]
+
+    def merge(self, other: TopK) -> TopK:
+        """Fold `other` into this tracker; returns self.
+
+        Candidates from both sides are re-estimated on the merged sketch.
+        """
+        self.cms.merge(other.cms)
+        keys = set(self._top) | set(other._top)
+        est = {key: self.cms.estimate(key) for key in keys}
+        best = sorted(est.items(), key=lambda kv: (-kv[1], kv[0]))[: self.k]
+        self._top = dict(best)
+        self._rebuild()
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form."""
+        return {"k": self.k, "cms": self.cms.to_dict(), "top": self._top}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> TopK:
+        """Rebuild a tracker from `to_dict` output."""
+        cms = CountMinSketch.from_dict(data["cms"])
+        top = cls(int(data["k"]), width=cms.width, depth=cms.depth)
+        top.cms = cms
+        top._top = {str(key): int(v) for key, v in data["top"].items()}
+        top._rebuild()
+        return top
+
+
+class LogSketch:
+    """Distinct counts and heavy hitters for chosen keys of a log."""
+
+    def __init__(
+        self,
+        distinct: Sequence[str] = ("call", "grid"),
+        top: Sequence[str] = ("call", "prefix"),
+        *,
+        k: int = 20,
+        precision: int = 14,
+        width: int = 4096,
+        depth: int = 4,
+    ) -> None:
+        """Sketch the `distinct` and `top` keys (any `aggregate` group key).
+
+        Keys are normalized as in `aggregate` (`grid` is the 4-character
+        locator, `prefix` the WPX prefix); empty values are skipped.
+        """
+        from adif_mcp.logbook.aggregate import key_function  # aggregate imports this module
+
+        self.qsos = 0
+        self.distinct = {name: HyperLogLog(precision) for name in distinct}
+        self.top = {name: TopK(k, width=width, depth=depth) for name in top}
+        keys = {name: key_function(name) for name in {*distinct, *top}}
+        self._get = {name: get for name, (get, _) in keys.items()}
+        self.fields = {f for _, reads in keys.values() for f in reads}
+
+    def add(self, rec: Mapping[str, str]) -> None:
+        """Add one QSO (lowercase ADIF field names)."""
+        self.qsos += 1
+        values = {name: get(rec) for name, get in self._get.items()}
+        for name, hll in self.distinct.items():
+            if values[name]:
+                hll.add(values[name])
+        for name, top in self.top.items():
+            if values[name]:
+                top.add(values[name])
+
+    def add_many(self, records: Iterable[Mapping[str, str]]) -> int:
+        """Add every record; returns how many were read."""
+        before = self.qsos
+        for rec in records:
+            self.add(rec)
+        return self.qsos - before
+
+    def merge(self, other: LogSketch) -> LogSketch:
+        """Fold a sketch built with the same settings into this one; returns self."""
+        if set(other.distinct) != set(self.distinct) or set(other.top) != set(self.top):
+            raise ValueError("cannot merge sketches of different keys")
+        self.qsos += other.qsos
+        for name, hll in self.distinct.items():
+            hll.merge(other.distinct[name])
+        for name, top in self.top.items():
+            top.merge(other.top[name])
+        return self
+
+    def summary(self, n: int | None = None) -> dict[str, Any]:
+        """Estimated distinct counts and the top `n` keys, with error bounds."""
+        return {
+            "qsos": self.qsos,
+            "distinct": {
+                name: {"estimate": hll.count(), "relative_error": round(hll.error, 4)}
+                for name, hll in self.distinct.items()
+            },
+            "top": {
+                name: {
+                    "keys": [{"key": key, "count": c} for key, c in top.most_common(n)],
+                    "max_overcount": math.ceil(top.cms.error * top.cms.total),
+                }
+                for name, top in self.top.items()
+            },
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form (mergeable after `from_dict`)."""
+        return {
+            "qsos": self.qsos,
+            "distinct": {name: hll.to_dict() for name, hll in self.distinct.items()},
+            "top": {name: top.to_dict() for name, top in self.top.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> LogSketch:
+        """Rebuild a sketch from `to_dict` output."""
+        sk = cls(list(data["distinct"]), list(data["top"]))
+        sk.qsos = int(data["qsos"])
+        sk.distinct = {n: HyperLogLog.from_dict(d) for n, d in data["distinct"].items()}
+        sk.top = {n: TopK.from_dict(d) for n, d in data["top"].items()}
+        return sk
+
+
+# Files picked up when a directory is given to `sketch_files`.
+_LOG_SUFFIXES = (".adi", ".adif", ".adx", ".gz", ".bz2", ".xz", ".zst")
+
+
+def _expand(paths: Iterable[str | Path]) -> list[Path]:
+    out: list[Path] = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            found = [f for f in p.iterdir() if f.suffix.lower() in _LOG_SUFFIXES]
+            out.extend(sorted(f for f in found if f.is_file()))
+        else:
+            out.append(p)
+    return out
+
+
+def sketch_files(
+    paths: Iterable[str | Path],
+    *,
+    distinct: Sequence[str] = ("call", "grid"),
+    top: Sequence[str] = ("call", "prefix"),
+    k: int = 20,
+    cache: ParseCache | None = None,
+) -> tuple[LogSketch, list[str]]:
+    """Sketch each log (directories expand to their ADIF files) and merge them.
+
+    Returns:
+        The merged sketch and the files that were read.
+    """
+    files = _expand(paths)
+    merged = LogSketch(distinct, top, k=k)
+    for path in files:
+        sk = LogSketch(distinct, top, k=k)
+        log = cache.open(path) if cache is not None else None
+        if log is None:
+            sk.add_many(iter_records(path))
+        else:
+            with log:
+                sk.add_many(log.iter_records(sk.fields))
+        merged.merge(sk)
+    return merged, [str(f) for f in files]
@@ -0,0 +1,251 @@
+"""
+Inverted index over the free-text fields of a log.
+
+Questions like "the QSO where he mentioned a 3-element yagi" mean reading
+COMMENT, QSLMSG, NOTES and NAME across every record. `TextIndex` tokenizes
+those fields once (lowercase word characters, so "3-element" is the two
+tokens `3` `element`) and keeps, per token, a posting list of the record
+ordinals that contain it, in ascending order. A query then costs a few
+posting-list intersections instead of a scan.
+
+Query syntax (all terms must match):
+
+    yagi              the word
+    yag*              any word starting with "yag"
+    "3 element yagi"  the words in sequence (a phrase); 3-element is the same
+    comment:yagi      the word in one field (comment, qslmsg, notes, name)
+
+Candidates for phrases and field-restricted terms come from the postings
+and are then checked against the stored text of those few records.
+
+The index is a `watch.LogSink`: records are numbered in the order they are
+added, so following a log with `LogWatcher` keeps it current by indexing
+only appended QSOs (and starts over when the log is replaced).
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, NamedTuple
+
+__all__ = ["TEXT_FIELDS", "TextIndex", "tokenize"]
+
+# Free-text ADIF fields indexed by default (the _INTL variants count as the
+# base field).
+TEXT_FIELDS: tuple[str, ...] = ("comment", "qslmsg", "notes", "name")
+
+# Record fields kept to describe a hit.
+_SUMMARY_FIELDS = ("call", "qso_date", "time_on", "band", "mode")
+
+_TOKEN = re.compile(r"\w+")
+_QUERY = re.compile(r'(?:(\w+):)?(?:"([^"]*)"(\*?)|(\S+))')
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens of `text`."""
+    return _TOKEN.findall(text.casefold())
+
+
+class _Term(NamedTuple):
+    """One query term: a word sequence, the last word optionally a prefix."""
+
+    tokens: tuple[str, ...]
+    prefix: bool
+    field: str | None
+
+
+def _parse(query: str, fields: Sequence[str]) -> list[_Term]:
+    terms = []
+    for m in _QUERY.finditer(query):
+        field, phrase, star, word = m.groups()
+        text = phrase if phrase is not None else word
+        prefix = bool(star) or (word is not None and word.endswith("*"))
+        if field is not None and field.lower() not in fields:
+            field, text = None, m.group(0)  # "14:30" is a phrase, not a field
+        tokens = tuple(tokenize(text))
+        if tokens:
+            terms.append(_Term(tokens, prefix, field.lower() if field else None))
+    return terms
+
+
+def _has(posting: Sequence[int], ordinal: int) -> bool:
+    i = bisect_left(posting, ordinal)
+    return i < len(posting) and posting[i] == ordinal
+
+
+class TextIndex:
+    """Token -> ordinal posting lists over the free-text fields of QSOs."""
+
+    def __init__(self, fields: Iterable[str] = TEXT_FIELDS) -> None:
+        """Create an empty index over `fields` (lowercase ADIF names)."""
+        self.fields = tuple(f.lower() for f in fields)
+        self.records = 0
+        self._postings: dict[str, array[int]] = {}
+        self._vocab: list[str] = []  # sorted tokens, rebuilt after new tokens arrive
+        self._texts: dict[int, dict[str, str]] = {}
+        # per field, the tokens joined as " tok tok " (phrases are substrings)
+        self._joined: dict[int, dict[str, str]] = {}
+        self._summary: list[tuple[str, ...]] = []
+
+    # ---------------- updates ----------------
+
+    def add(self, rec: Mapping[str, str]) -> None:
+        """Index one QSO (lowercase ADIF field names) as the next ordinal."""
+        ordinal = self.records
+        self.records += 1
+        self._summary.append(tuple(rec.get(f, "") for f in _SUMMARY_FIELDS))
+        texts: dict[str, str] = {}
+        for field in self.fields:
+            parts = [v for v in (rec.get(field), rec.get(field + "_intl")) if v]
+            if parts:
+                texts[field] = " / ".join(dict.fromkeys(parts))
+        if not texts:
+            return
+        self._texts[ordinal] = texts
+        joined: dict[str, str] = {}
+        tokens: set[str] = set()
+        for field, text in texts.items():
+            words = tokenize(text)
+            joined[field] = f" {' '.join(words)} "
+            tokens.update(words)
+        self._joined[ordinal] = joined
+        postings = self._postings
+        for token in tokens:
+            posting = postings.get(token)
+            if posting is None:
+                posting = postings[token] = array("I")
+                self._vocab = []
+            posting.append(ordinal)
+
+    def add_many(self, records: Iterable[Mapping[str, str]]) -> int:
+        """Index many QSOs; returns how many were added."""
+        before = self.records
+        for rec in records:
+            self.add(rec)
+        return self.records - before
+
+    def reset(self) -> None:
+        """Forget every record (the followed log was replaced)."""
+        self.records = 0
+        self._postings = {}
+        self._vocab = []
+        self._texts = {}
+        self._joined = {}
+        self._summary = []
+
+    # ---------------- queries ----------------
+
+    def _matching(self, token: str, prefix: bool) -> list[Sequence[int]]:
+        """Posting lists of `token`, or of every token it is a prefix of."""
+        if not prefix:
+            posting = self._postings.get(token)
+            return [posting] if posting is not None else []
+        if not self._vocab:
+            self._vocab = sorted(self._postings)
+        vocab = self._vocab
+        out: list[Sequence[int]] = []
+        for i in range(bisect_left(vocab, token), len(vocab)):
+            if not vocab[i].startswith(token):
+                break
+            out.append(self._postings[vocab[i]])
+        return out
+
+    def _candidates(self, term: _Term) -> Sequence[int]:
+        """Ascending ordinals holding every word of `term` (in any order)."""
+        lists: list[Sequence[int]] = []
+        for token in term.tokens[:-1]:
+            lists.extend(self._matching(token, False) or [()])
+        last = self._matching(term.tokens[-1], term.prefix)
+        if len(last) == 1:
+            lists.extend(last)
+        else:
+            lists.append(sorted({o for posting in last for o in posting}))
+        return _intersect(lists)
+
+    def _verify(self, ordinal: int, term: _Term, names: Iterable[str]) -> bool:
+        """True if `term`'s words appear in sequence in one of the `names` fields."""
+        joined = self._joined.get(ordinal, {})
+        needle = " " + " ".join(term.tokens) + ("" if term.prefix else " ")
+        return any(needle in joined.get(name, "") for name in names)
+
+    def search(
+        self, query: str, *, fields: Sequence[str] | None = None, limit: int | None = None
+    ) -> tuple[int, list[int]]:
+        """Ordinals of the QSOs matching every term of `query`.
+
+        Args:
+            query: Words, `prefix*`, `"phrases"` and `field:term` (see the
+                module docstring).
+            fields: Restrict unqualified terms to these fields.
+            limit: Return at most this many ordinals (the total is still counted).
+
+        Returns:
+            (total matches, the first `limit` matching 0-based ordinals, ascending).
+
+        Raises:
+            ValueError: For an unknown field name.
+        """
+        restrict = tuple(f.lower() for f in fields) if fields else None
+        if restrict and any(f not in self.fields for f in restrict):
+            raise ValueError(
+                f"unknown text field in {fields!r} (use {', '.join(self.fields)})"
+            )
+        terms = _parse(query, self.fields)
+        if not terms:
+            return 0, []
+        hits = _intersect([self._candidates(t) for t in terms])
+        # Terms the postings alone cannot decide: phrases and field-bound terms.
+        checks = []
+        for t in terms:
+            names = (t.field,) if t.field else restrict
+            if len(t.tokens) > 1 or names:
+                checks.append((t, names or self.fields))
+        total = 0
+        out: list[int] = []
+        for ordinal in hits:
+            if not all(self._verify(ordinal, t, names) for t, names in checks):
+                continue
+            total += 1
+            if limit is None or len(out) < limit:
+                out.append(ordinal)
+        return total, out
+
+    def describe(self, ordinal: int) -> dict[str, Any]:
+        """Summary fields and indexed text of one record (1-based `index`)."""
+        row: dict[str, Any] = {"index": ordinal + 1}
+        row.update(
+            (name, value)
+            for name, value in zip(_SUMMARY_FIELDS, self._summary[ordinal])
+            if value
+        )
+        row["text"] = dict(self._texts.get(ordinal, {}))
+        return row
+
+    def stats(self) -> dict[str, int]:
+        """Records, records with text, distinct tokens and total postings."""
+        return {
+            "records": self.records,
+            "with_text": len(self._texts),
+            "tokens": len(self._postings),
+            "postings": sum(len(p) for p in self._postings.values()),
+        }
+
+
+def _intersect(lists: Sequence[Sequence[int]]) -> Sequence[int]:
+    """Ascending values present in every ascending list (shortest first)."""
+    if not lists:
+        return []
+    ordered = sorted(lists, key=len)
+    if len(ordered) == 1:
+        return ordered[0]
+    keep: Sequence[int] = ordered[0]
+    for other in ordered[1:]:
+        if len(keep) * 16 < len(other):  # far shorter: probe by bisection
+            keep = [o for o in keep if _has(other, o)]
+        else:
+            both = set(keep).intersection(other)
+            keep = sorted(both)
+    return keep
@@ -0,0 +1,148 @@
+"""
+Sorted index over QSO start times for date-range slicing.
+
+Date-range filters used to compare `qso_date` strings on every record of a
+log. `TimeIndex` keeps each dated record's start as epoch minutes (see
+`normalize.qso_minutes`) in a sorted array, so a range is two `bisect`
+calls and its records are one contiguous slice. Logs are usually written in
+time order, in which case a sorted position is the record ordinal. When a
+log is not, a permutation array maps sorted positions back to ordinals.
+Records without a valid date/time are listed apart in `undated`.
+
+`log_time_index` builds the index from the `qso_date`/`time_on` columns of
+a cached log and keeps the last few in memory, keyed by the log's
+fingerprint, so repeated range queries against the same log skip the build.
+"""
+
+from __future__ import annotations
+
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from adif_mcp.logbook.normalize import qso_minutes
+from adif_mcp.parsers.parse_cache import CachedLog
+
+__all__ = ["TimeIndex", "log_time_index", "parse_bound"]
+
+# Indexes kept in memory by `log_time_index` (about 12 bytes per QSO each).
+_MEMO_SIZE = 8
+
+_memo: OrderedDict[tuple[str, Any], TimeIndex] = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def parse_bound(value: str | int | None, *, end: bool = False) -> int | None:
+    """Epoch minute for a range bound: YYYYMMDD, optionally followed by HHMM.
+
+    Dashes, colons, spaces and a `T` separator are ignored
+    ("2024-01-05T12:30"). A date-only upper bound (`end=True`) covers the
+    whole day. Integers are taken as epoch minutes already.
+
+    Raises:
+        ValueError: If the value is not a valid date or date/time.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    text = "".join(ch for ch in value if ch not in "-: T")
+    if not text:
+        return None
+    day, hhmm = text[:8], text[8:12]
+    minute = qso_minutes(day, hhmm or "0000")
+    if minute is None or (len(text) > 8 and len(hhmm) != 4):
+        raise ValueError(f"invalid date/time bound {value!r} (use YYYYMMDD[HHMM])")
+    return minute + 1439 if end and not hhmm else minute
+
+
+class TimeIndex:
+    """QSO start minutes in sorted order, with the ordinal of each record."""
+
+    def __init__(self, minutes: Iterable[int | None]) -> None:
+        """Index per-record start minutes, given in record order (None if undated)."""
+        keys = array("q")
+        ords = array("I")
+        self.undated = array("I")
+        n = 0
+        for n, m in enumerate(minutes, start=1):
+            if m is None:
+                self.undated.append(n - 1)
+            else:
+                keys.append(m)
+                ords.append(n - 1)
+        self.records = n
+        self.in_order = all(keys[i] <= keys[i + 1] for i in range(len(keys) - 1))
+        if not self.in_order:
+            perm = sorted(range(len(keys)), key=keys.__getitem__)  # stable
+            keys = array("q", (keys[i] for i in perm))
+            ords = array("I", (ords[i] for i in perm))
+        self.minutes = keys
+        # None when a sorted position is the ordinal itself (sorted, all dated).
+        self.order: array[int] | None = None if self.in_order and not self.undated else ords
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, str]]) -> TimeIndex:
+        """Index field dicts (lowercase names) in record order."""
+        return cls(qso_minutes(r.get("qso_date"), r.get("time_on")) for r in records)
+
+    def __len__(self) -> int:
+        """Number of dated records."""
+        return len(self.minutes)
+
+    def span(
+        self, since: str | int | None = None, until: str | int | None = None
+    ) -> tuple[int, int]:
+        """Sorted positions [lo, hi) of the QSOs starting within `since`..`until`.
+
+        Bounds are inclusive and parsed by `parse_bound`; None is open.
+        """
+        lo_min = parse_bound(since)
+        hi_min = parse_bound(until, end=True)
+        lo = 0 if lo_min is None else bisect_left(self.minutes, lo_min)
+        hi = len(self.minutes) if hi_min is None else bisect_right(self.minutes, hi_min)
+        return lo, max(lo, hi)
+
+    def ordinals(
+        self,
+        since: str | int | None = None,
+        until: str | int | None = None,
+        *,
+        file_order: bool = False,
+    ) -> Sequence[int]:
+        """0-based ordinals of the QSOs in range, in time order (or file order)."""
+        lo, hi = self.span(since, until)
+        if self.order is None:
+            return range(lo, hi)
+        picked = self.order[lo:hi]
+        return sorted(picked) if file_order and not self.in_order else picked
+
+    def count(self, since: str | int | None = None, until: str | int | None = None) -> int:
+        """Number of QSOs in range."""
+        lo, hi = self.span(since, until)
+        return hi - lo
+
+
+def _column_minutes(log: CachedLog) -> Iterable[int | None]:
+    dates = log.column("qso_date")
+    if dates is None:
+        return [None] * len(log)
+    times = log.column("time_on")
+    return map(qso_minutes, dates, times if times is not None else [None] * len(log))
+
+
+def log_time_index(log: CachedLog) -> TimeIndex:
+    """Time index of a cached log, built once per log content and memoized."""
+    key = (str(log.path), log.fingerprint)
+    with _memo_lock:
+        index = _memo.get(key)
+        if index is not None:
+            _memo.move_to_end(key)
+            return index
+    index = TimeIndex(_column_minutes(log))
+    with _memo_lock:
+        _memo[key] = index
+        while len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+    return index
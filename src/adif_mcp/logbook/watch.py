@@ -0,0 +1,249 @@
+"""
+Polling watcher for live ADI logs.
+
+A station logger appends to its `.adi` all day. `LogWatcher` follows such
+logs by polling `os.stat` (no OS-specific notification APIs), parses only
+the bytes appended since the previous poll, and pushes each new QSO to every
+subscriber of that log: a `WorkedIndex`, an `AwardTracker` (through
+`AwardSink`, which also persists its state), or anything else with an
+`add(fields)` method.
+
+Per log the watcher keeps one `LogCursor` (offset, size, mtime, inode and
+the bytes just before the offset), so a log that was truncated, rotated or
+replaced is detected and every subscriber is fed the new file from the
+start. A record still being written (no `<EOR>` yet) is left for the next
+poll. Each subscriber has its own offset: one that joins late, or resumes
+from persisted state, is caught up from there while the others only see
+new records, and in the steady state the appended bytes are parsed once.
+
+`poll()` can be called on demand (e.g. before answering a tool call), or
+`start()` runs it every `interval` seconds on a background thread.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+from adif_mcp.logbook.awards import AwardTracker, state_path_for
+from adif_mcp.parsers.adi_stream import LogCursor
+
+__all__ = ["AwardSink", "LogSink", "LogWatcher"]
+
+
+class LogSink(Protocol):
+    """Anything that accepts QSO field dicts.
+
+    A sink may also define `checkpoint(path, offset, inode, mark)`, called
+    after a poll moved its offset, to persist how far it has consumed (`mark`
+    is the `LogCursor.mark` ending at `offset`), and `reset()`,
+    called when the log was replaced and is about to be fed again from the
+    start.
+    """
+
+    def add(self, rec: Mapping[str, str]) -> Any:
+        """Apply one QSO (lowercased ADIF field names)."""
+
+
+class AwardSink:
+    """Feeds an `AwardTracker` and saves it after every poll that changed it."""
+
+    def __init__(
+        self,
+        tracker: AwardTracker,
+        log_path: str | Path,
+        state_path: str | Path | None = None,
+    ) -> None:
+        """Wrap `tracker`, which holds award state for `log_path`."""
+        self.tracker = tracker
+        self.log_path = Path(log_path).resolve()
+        self.state_path = Path(state_path) if state_path else state_path_for(log_path)
+
+    @property
+    def offset(self) -> int:
+        """Offset of `log_path` already consumed by the tracker (resume point)."""
+        return self.tracker.offsets.get(str(self.log_path), 0)
+
+    def add(self, rec: Mapping[str, str]) -> None:
+        """Apply one QSO to the tracker."""
+        self.tracker.add(rec)
+
+    def reset(self) -> None:
+        """Forget the QSOs of `log_path` (the log was replaced)."""
+        self.tracker.reset_log(self.log_path)
+
+    def checkpoint(self, path: Path, offset: int, inode: int, mark: bytes) -> None:
+        """Record the consumed position and persist the tracker."""
+        self.tracker.offsets[str(path)] = offset
+        self.tracker.inodes[str(path)] = inode
+        self.tracker.marks[str(path)] = mark
+        self.tracker.save(self.state_path)
+
+
+def _restart(subs: list[_Subscription]) -> None:
+    """Rewind subscribers to the start of a replaced log."""
+    for s in subs:
+        s.offset = 0
+        reset = getattr(s.sink, "reset", None)
+        if reset is not None:
+            reset()
+
+
+@dataclass
+class _Subscription:
+    sink: LogSink
+    offset: int
+
+
+@dataclass
+class _Log:
+    cursor: LogCursor
+    subs: list[_Subscription] = field(default_factory=list)
+    records: int = 0
+    error: str | None = None
+
+
+class LogWatcher:
+    """Poll logs for appended QSOs and push them to their subscribers."""
+
+    def __init__(self, interval: float = 1.0) -> None:
+        """Create a watcher that polls every `interval` seconds once started."""
+        self.interval = interval
+        self.polls = 0
+        self._logs: dict[str, _Log] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ---------------- subscriptions ----------------
+
+    def watch(self, path: str | Path, sink: LogSink, *, offset: int = 0) -> Path:
+        """Subscribe `sink` to `path`, starting at byte `offset`.
+
+        Nothing is read until the next `poll()`. `offset` must be a record
+        boundary (the default 0 feeds the whole log).
+
+        Returns:
+            The resolved log path used as the watch key.
+        """
+        p = Path(path).resolve()
+        with self._lock:
+            log = self._logs.get(str(p))
+            if log is None:
+                log = self._logs[str(p)] = _Log(LogCursor(p, offset))
+            log.subs.append(_Subscription(sink, offset))
+        return p
+
+    def unwatch(self, path: str | Path, sink: LogSink | None = None) -> None:
+        """Drop `sink` (or every subscriber) from `path`."""
+        key = str(Path(path).resolve())
+        with self._lock:
+            log = self._logs.get(key)
+            if log is None:
+                return
+            log.subs = [s for s in log.subs if sink is not None and s.sink is not sink]
+            if not log.subs:
+                del self._logs[key]
+
+    def watching(self) -> list[str]:
+        """Resolved paths of the watched logs."""
+        with self._lock:
+            return sorted(self._logs)
+
+    # ---------------- polling ----------------
+
+    def poll(self, path: str | Path | None = None) -> int:
+        """Read what was appended to one log (or all of them) and push it.
+
+        With `path`, errors (e.g. the log is missing) are raised; a full
+        poll records them per log instead (see `stats()`).
+
+        Returns:
+            Number of new records read.
+        """
+        with self._lock:
+            self.polls += 1
+            if path is not None:
+                log = self._logs.get(str(Path(path).resolve()))
+                return self._poll_log(log) if log is not None else 0
+            n = 0
+            for log in list(self._logs.values()):
+                try:
+                    n += self._poll_log(log)
+                except Exception as e:  # e.g. rotated away and not yet recreated
+                    log.error = str(e)
+            return n
+
+    def _poll_log(self, log: _Log) -> int:
+        cursor, subs = log.cursor, log.subs
+        start = min(s.offset for s in subs)
+        if start != cursor.offset:  # a subscriber lags: re-read from its offset
+            cursor.offset, cursor.size, cursor.mark = start, -1, b""
+        before = [s.offset for s in subs]
+        resets = cursor.resets
+        n = 0
+        for rec in cursor.read_new():
+            if cursor.resets != resets:
+                resets = cursor.resets
+                _restart(subs)
+            for s in subs:
+                if rec.offset >= s.offset:
+                    s.sink.add(rec.fields)
+                    s.offset = rec.end
+            n += 1
+        if cursor.resets != resets:  # replaced by a log with no complete record yet
+            _restart(subs)
+        for s, old in zip(subs, before):
+            s.offset = max(s.offset, cursor.offset)
+            checkpoint = getattr(s.sink, "checkpoint", None)
+            if checkpoint is not None and (s.offset != old or n):
+                mark = cursor.mark if s.offset == cursor.offset else b""
+                checkpoint(cursor.path, s.offset, cursor.inode, mark)
+        log.records += n
+        log.error = None
+        return n
+
+    def run(self, *, max_polls: int | None = None) -> None:
+        """Poll every `interval` seconds until `stop()` (or `max_polls` polls)."""
+        done = 0
+        while not self._stop.is_set():
+            self.poll()
+            done += 1
+            if max_polls is not None and done >= max_polls:
+                return
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """Run `run()` on a daemon thread (no-op if already running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="adif-log-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the background thread, if any."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict[str, Any]:
+        """Per-log offsets, record counts, resets and the last poll error."""
+        with self._lock:
+            return {
+                "polls": self.polls,
+                "logs": {
+                    key: {
+                        "offset": log.cursor.offset,
+                        "records": log.records,
+                        "resets": log.cursor.resets,
+                        "subscribers": len(log.subs),
+                        "error": log.error,
+                    }
+                    for key, log in self._logs.items()
+                },
+            }
@@ -4,17 +4,44 @@ ADIF-MCP Server: Authoritative 3.1.6 Specification Server.
 Provides tools for parsing, streaming, and validating ADIF data.
 """
 
+import asyncio
+import collections
 import datetime
+import functools
+import io
+import itertools
 import json
 import os
 import re
-from typing import Any, Dict, List, Optional, Set, Tuple
+import time
+import xml.etree.ElementTree as ET
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
-import aiofiles
 import mcp.types as types
 from fastmcp import FastMCP
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
 
 import adif_mcp
+from adif_mcp.logbook.aggregate import aggregate_files
+from adif_mcp.logbook.awards import AwardTracker
+from adif_mcp.logbook.dedup import find_duplicates as find_duplicates_impl
+from adif_mcp.logbook.lookup import WorkedIndex
+from adif_mcp.logbook.reconcile import reconcile
+from adif_mcp.logbook.sketch import sketch_files
+from adif_mcp.logbook.textindex import TextIndex
+from adif_mcp.logbook.watch import AwardSink, LogWatcher
+from adif_mcp.parsers.adi_blocks import iter_from
+from adif_mcp.parsers.adi_blocks import load_index as load_block_index
+from adif_mcp.parsers.adi_stream import (
+    RawRecord,
+    iter_raw_records,
+    iter_raw_records_reverse,
+    open_adi,
+)
+from adif_mcp.parsers.adx import AdxReader, is_adx, is_adx_bytes, iter_adx_records
+from adif_mcp.parsers.compression import sniff
+from adif_mcp.parsers.parse_cache import default_cache as default_parse_cache
+from adif_mcp.utils import profiling
 from adif_mcp.utils.geography import calculate_distance_impl, calculate_heading_impl
 
 # Initialize the FastMCP server
@@ -357,6 +384,18 @@ def _build_dxcc_pas_map() -> Dict[str, Set[str]]:
     return result
 
 
+def warm_caches() -> int:
+    """Preload every enumeration and the DXCC → PAS map (used by the daemon).
+
+    Returns:
+        Number of enumerations now cached.
+    """
+    for enum_name in ENUMERATION_FIELDS:
+        _load_enum_records(enum_name)
+    _build_dxcc_pas_map()
+    return len(_enum_cache)
+
+
 def _validate_date(field_name: str, value: str) -> List[str]:
     """Validate ADIF Date field: YYYYMMDD, 8 digits, calendar-valid."""
     errors: List[str] = []
@@ -455,7 +494,14 @@ async def get_system_version() -> str:
 
 
 def parse_adif_internal(text: str) -> Dict[str, str]:
-    """Surgically extracts ADIF tags and their data by length."""
+    """Surgically extracts ADIF tags and their data by length.
+
+    An ADX `<RECORD>` element (or whole ADX document) is accepted too; its
+    first record's fields are returned with upper-case names.
+    """
+    stripped = text.lstrip()
+    if stripped[:7].upper() == "<RECORD" or is_adx_bytes(stripped[:64].encode("utf-8")):
+        return _parse_adx_record(stripped)
     tag_pattern = re.compile(
         r"<(?P<name>[^:>]+):(?P<len>\d+)(?::(?P<type>[^>]+))?>", re.IGNORECASE
     )
@@ -471,6 +517,18 @@ def parse_adif_internal(text: str) -> Dict[str, str]:
     return results
 
 
+def _parse_adx_record(text: str) -> Dict[str, str]:
+    """Fields of the first record in an ADX snippet or document."""
+    if text[:7].upper() == "<RECORD":
+        text = f"<ADX><RECORDS>{text}</RECORDS></ADX>"
+    try:
+        reader = AdxReader(io.BytesIO(text.encode("utf-8")))
+        first = next(iter(reader), {})
+    except ET.ParseError:
+        return {}
+    return {k.upper(): v for k, v in first.items()}
+
+
 # --- Core Tools ---
 
 
@@ -495,41 +553,237 @@ def calculate_heading(start: str, end: str) -> float:
     return calculate_heading_impl(start, end)
 
 
+def _adi_text(fields: Dict[str, str]) -> str:
+    """ADI tag form of a field dict (lengths in UTF-8 bytes, as the scanner reads them)."""
+    tags = [f"<{k.upper()}:{len(v.encode('utf-8'))}>{v}" for k, v in fields.items()]
+    return "".join(tags) + "<EOR>"
+
+
+# One page entry: the record's fields (lowercase keys) and its ADI text.
+PageRow = Tuple[Dict[str, str], str]
+
+
+def _row(rec: RawRecord) -> PageRow:
+    """Page entry for a scanned ADI record."""
+    return rec.fields, rec.raw.decode("utf-8", "replace")
+
+
+def _cached_rows(
+    file_path: str, first: int, count: int
+) -> Optional[Tuple[int, List[PageRow]]]:
+    """Total and records `first`.. (0-based, negative counts from the end) from the cache.
+
+    A log large enough to be cached is parsed into the cache on first use;
+    None means it is too small (or the cache is unusable) and should be streamed.
+    """
+    try:
+        log = default_parse_cache().open(file_path)
+    except OSError:
+        return None
+    if log is None:
+        return None
+    with log:
+        if first < 0:
+            first += log.records
+        first = max(0, min(first, log.records))
+        stop = min(log.records, first + max(0, count))
+        fields = [log.record(i) for i in range(first, stop)]
+        if log.seekable:
+            texts = [raw.decode("utf-8", "replace") for raw in log.read_raw(first, stop)]
+        else:
+            texts = [_adi_text(f) for f in fields]
+        return log.records, list(zip(fields, texts))
+
+
+def _page_records(file_path: str, start_at: int, limit: int) -> Tuple[int, List[PageRow]]:
+    """Total record count and records `start_at`.. (1-based).
+
+    Streams the (possibly compressed) file in constant memory. A
+    block-compressed log with a `.bidx` index seeks straight to the page,
+    and large logs are served from the on-disk parse cache; ADX records are
+    shown in ADI tag form.
+    """
+    start_at = max(1, start_at)
+    if load_block_index(file_path) is None:
+        cached = _cached_rows(file_path, start_at - 1, limit)
+        if cached is not None:
+            return cached
+    if is_adx(file_path):
+        total = 0
+        rows: List[PageRow] = []
+        for total, fields in enumerate(iter_adx_records(file_path), start=1):
+            if start_at <= total < start_at + limit:
+                rows.append((fields, _adi_text(fields)))
+        return total, rows
+
+    index = load_block_index(file_path)
+    if index is not None:
+        page = itertools.islice(iter_from(file_path, start_at, index), max(0, limit))
+        return index.records, [_row(rec) for _, rec in page]
+
+    total = 0
+    rows = []
+    with open_adi(file_path) as fh:
+        for total, rec in enumerate(iter_raw_records(fh), start=1):
+            if start_at <= total < start_at + limit:
+                rows.append(_row(rec))
+    return total, rows
+
+
+def _tail_records(file_path: str, count: int) -> Tuple[Optional[int], List[PageRow]]:
+    """The last `count` records, in file order, and the total if known.
+
+    Plain ADI files are read backwards from EOF, so the cost follows
+    `count` rather than the file size; the total is only known when the
+    start of the file was reached. Compressed and ADX logs cannot be read
+    backwards: a block index gives the total and seeks to the tail,
+    otherwise the file is streamed once keeping the last `count` records.
+    """
+    count = max(0, count)
+    if not is_adx(file_path) and sniff(file_path) is None:
+        tail = list(itertools.islice(iter_raw_records_reverse(file_path), count + 1))
+        total = len(tail) if len(tail) <= count else None
+        return total, [_row(rec) for rec in reversed(tail[:count])]
+
+    index = load_block_index(file_path)
+    if index is not None:
+        start = max(1, index.records - count + 1)
+        page = itertools.islice(iter_from(file_path, start, index), count)
+        return index.records, [_row(rec) for _, rec in page]
+
+    cached = _cached_rows(file_path, -count, count)
+    if cached is not None:
+        return cached
+
+    last: Deque[PageRow] = collections.deque(maxlen=count)
+    total = 0
+    if is_adx(file_path):
+        for total, fields in enumerate(iter_adx_records(file_path), start=1):
+            last.append((fields, _adi_text(fields)))
+    else:
+        with open_adi(file_path) as fh:
+            for total, rec in enumerate(iter_raw_records(fh), start=1):
+                last.append(_row(rec))
+    return total, list(last)
+
+
+def _next_start(
+    start_at: int, shown: int, fetched: int, limit: int, total: Optional[int]
+) -> Optional[int]:
+    """`start_at` for the following page, or None when this page reached the end."""
+    nxt = start_at + shown
+    if shown == fetched and fetched < limit:
+        return None  # the log ran out before the limit
+    if total is not None and nxt > total or start_at < 0 and nxt >= 0:
+        return None
+    return nxt
+
+
 @mcp.tool()
 async def parse_adif(
-    file_path: str, start_at: int = 1, limit: int = 20
+    file_path: str,
+    start_at: int = 1,
+    limit: int = 20,
+    from_end: bool = False,
+    fields: Optional[List[str]] = None,
+    structured: bool = False,
+    max_bytes: int = 0,
 ) -> List[types.TextContent]:
     """Streaming parser for large ADIF files with record seeking.
 
+    A negative `start_at` counts from the end (-1 is the last record), and
+    `from_end=True` pages backwards from the end (`start_at=1` shows the
+    last `limit` records, `start_at=21` the `limit` before those). Tail
+    reads scan a plain log backwards from EOF, so "show my latest QSOs"
+    does not read the whole file; the total is then reported as unknown
+    unless the whole log was read.
+
+    `fields` (e.g. ["CALL", "QSO_DATE", "BAND"]) limits each record to
+    those fields. `structured=True` returns JSON (`records` is a list of
+    field objects numbered from `start_at`) instead of ADI text.
+    `max_bytes` caps the size of the records returned (about 4 bytes per
+    token); when it stops the page early, `next_start_at` (JSON) or a
+    `NEXT START_AT` line (text) gives the `start_at` to continue from.
+
+    gzip/bz2/xz (and zstd, if installed) logs are read directly; logs
+    written by `adif-mcp compress` seek to the page via their block index.
+
     SECURITY NOTE: This tool reads files from the local filesystem using
     the provided path. Only pass paths to ADIF log files you own.
     """
-    record_pattern = re.compile(r"(.*?)<EOR>", re.IGNORECASE | re.DOTALL)
-
     try:
         if not os.path.exists(file_path):
             err_msg = f"ERROR: File not found at {file_path}"
             return [types.TextContent(type="text", text=err_msg)]
 
-        async with aiofiles.open(file_path, mode="r") as f:
-            content = await f.read()
-            matches = list(record_pattern.finditer(content))
-            total_count = len(matches)
-
-            start_idx = max(0, start_at - 1)
-            end_idx = start_idx + limit
-            requested = matches[start_idx:end_idx]
-
-            output_text = f"FILE: {file_path}\nTOTAL RECORDS: {total_count}\n"
-            current_max = min(start_at + len(requested) - 1, total_count)
-            output_text += f"DISPLAYING: {start_at} to {current_max}\n\n"
-
-            for i, match in enumerate(requested):
-                current_num = start_at + i
-                output_text += f"--- RECORD {current_num} ---\n"
-                output_text += f"{match.group(0).strip()}\n\n"
+        if from_end:
+            start_at = -(max(1, start_at) - 1 + max(0, limit))
+        total_count: Optional[int]
+        if start_at < 0:
+            total_count, requested = await asyncio.to_thread(
+                _tail_records, file_path, -start_at
+            )
+            requested = requested[: max(0, limit)]
+            if total_count is not None:  # number from the start when known
+                start_at = max(1, total_count + start_at + 1)
+        else:
+            start_at = max(1, start_at)
+            total_count, requested = await asyncio.to_thread(
+                _page_records, file_path, start_at, limit
+            )
 
-            return [types.TextContent(type="text", text=output_text)]
+        want = [(f.strip().upper(), f.strip().lower()) for f in fields or [] if f.strip()]
+        chunks: List[str] = []
+        used = 0
+        for i, (rec, text) in enumerate(requested):
+            if want:
+                rec = {low: rec[low] for _, low in want if low in rec}
+            if structured:
+                chunk = json.dumps(
+                    {k.upper(): v for k, v in rec.items()},
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                )
+            else:
+                body = _adi_text(rec) if want else text.strip()
+                chunk = f"--- RECORD {start_at + i} ---\n{body}\n\n"
+            size = len(chunk) if chunk.isascii() else len(chunk.encode("utf-8"))
+            if max_bytes > 0 and chunks and used + size > max_bytes:
+                break
+            chunks.append(chunk)
+            used += size
+        shown = len(chunks)
+        next_start = _next_start(start_at, shown, len(requested), limit, total_count)
+
+        if structured:
+            head = {
+                "file": file_path,
+                "total": total_count,
+                "start_at": start_at,
+                "count": shown,
+                "fields": [name for name, _ in want] or None,
+                "next_start_at": next_start,
+            }
+            out = io.StringIO()
+            out.write(json.dumps(head, ensure_ascii=False, separators=(",", ":"))[:-1])
+            out.write(',"records":[')
+            out.write(",".join(chunks))
+            out.write("]}")
+            return [types.TextContent(type="text", text=out.getvalue())]
+
+        parts = [f"FILE: {file_path}\n"]
+        if total_count is None:
+            parts.append("TOTAL RECORDS: unknown (read from the end)\n")
+            parts.append(f"DISPLAYING: {start_at} to {start_at + shown - 1} (from the end)\n")
+        else:
+            parts.append(f"TOTAL RECORDS: {total_count}\n")
+            current_max = min(start_at + shown - 1, total_count)
+            parts.append(f"DISPLAYING: {start_at} to {current_max}\n")
+        if next_start is not None and shown < len(requested):
+            parts.append(f"NEXT START_AT: {next_start} (size limit reached)\n")
+        parts.append("\n")
+        parts.extend(chunks)
+        return [types.TextContent(type="text", text="".join(parts))]
 
     except Exception as e:
         return [types.TextContent(type="text", text=f"STREAM ERROR: {str(e)}")]
@@ -746,16 +1000,484 @@ def _cross_validate_dxcc_state(
         )
 
 
+# --- Log Tools ---
+
+# Follows the logs behind award_progress / worked_before and pushes appended
+# QSOs into their in-memory state (polled per call, or in the background when
+# ADIF_MCP_WATCH_INTERVAL is set).
+_watcher = LogWatcher()
+_award_sinks: Dict[str, AwardSink] = {}
+WATCH_INTERVAL_ENV = "ADIF_MCP_WATCH_INTERVAL"
+
+
+@mcp.tool()
+def award_progress(
+    file_path: str,
+    award: Optional[str] = None,
+    band: Optional[str] = None,
+    mode: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Worked/confirmed progress for DXCC, WAS, WAZ and VUCC from an ADIF log.
+
+    Award state is persisted per log and updated incrementally, so only QSOs
+    appended since the last call are scanned. Without `award`, returns the
+    full summary; with it, the count for one band/mode slice plus the
+    worked-but-unconfirmed credits.
+
+    SECURITY NOTE: This tool reads files from the local filesystem using
+    the provided path. Only pass paths to ADIF log files you own.
+    """
+    if not os.path.exists(file_path):
+        return {"error": f"File not found at {file_path}"}
+    key = os.path.abspath(file_path)
+    try:
+        sink = _award_sinks.get(key)
+        if sink is None:
+            sink = AwardSink(AwardTracker.open(key), key)
+            _watcher.watch(key, sink, offset=sink.offset)
+            _award_sinks[key] = sink
+        else:
+            _watcher.poll(key)
+        tracker = sink.tracker
+        if award is None:
+            return tracker.summary()
+        result = tracker.progress(award, band, mode)
+        result["unconfirmed"] = tracker.unconfirmed(award, band, mode)
+        return result
+    except (OSError, ValueError) as e:
+        return {"error": str(e)}
+
+
+# Live worked-before indexes, one per followed log (kept warm between calls)
+_worked_indexes: Dict[str, WorkedIndex] = {}
+
+
+@mcp.tool()
+def worked_before(
+    file_path: str,
+    call: str,
+    band: Optional[str] = None,
+    mode: Optional[str] = None,
+    dxcc: Optional[str] = None,
+    cqz: Optional[str] = None,
+    grid: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Instant "worked before / needed" check against an ADIF log.
+
+    Reports whether CALL was worked (any band, on BAND, on BAND+MODE) and
+    whether the optional DXCC entity, CQ zone and grid would be new. The log
+    is indexed once and then only newly appended QSOs are read.
+
+    SECURITY NOTE: This tool reads files from the local filesystem using
+    the provided path. Only pass paths to ADIF log files you own.
+    """
+    key = os.path.abspath(file_path)
+    try:
+        index = _worked_indexes.get(key)
+        if index is None:
+            if not os.path.exists(key):
+                return {"error": f"File not found at {file_path}"}
+            index = WorkedIndex()
+            _watcher.watch(key, index)
+            _worked_indexes[key] = index
+        _watcher.poll(key)
+        return index.check(call, band, mode, dxcc=dxcc, cqz=cqz, grid=grid)
+    except OSError as e:
+        return {"error": str(e)}
+
+
+# Full-text indexes over COMMENT/QSLMSG/NOTES/NAME, one per searched log
+_text_indexes: Dict[str, TextIndex] = {}
+
+
+@mcp.tool()
+def search_log(
+    file_path: str,
+    query: str,
+    fields: Optional[List[str]] = None,
+    limit: int = 20,
+) -> Dict[str, Any]:
+    """Full-text search of the COMMENT, QSLMSG, NOTES and NAME fields of a log.
+
+    All terms must match. Terms are words (case-insensitive), `prefix*`,
+    "quoted phrases" (3-element matches "3 element") and field:term, e.g.
+    qslmsg:yagi; `fields` limits every term to those fields. Returns the
+    total and up to `limit` QSOs (1-based `index`, as for parse_adif
+    start_at) with their text. The log is indexed on first use and then
+    only newly appended QSOs are read.
+
+    SECURITY NOTE: This tool reads files from the local filesystem using
+    the provided path. Only pass paths to ADIF log files you own.
+    """
+    key = os.path.abspath(file_path)
+    try:
+        index = _text_indexes.get(key)
+        if index is None:
+            if not os.path.exists(key):
+                return {"error": f"File not found at {file_path}"}
+            index = TextIndex()
+            _watcher.watch(key, index)
+            _text_indexes[key] = index
+        _watcher.poll(key)
+        total, ordinals = index.search(query, fields=fields, limit=max(0, limit))
+    except (OSError, ValueError) as e:
+        return {"error": str(e)}
+    return {
+        "file": file_path,
+        "query": query,
+        "total": total,
+        "count": len(ordinals),
+        "matches": [index.describe(i) for i in ordinals],
+    }
+
+
+@mcp.tool()
+def find_duplicates(
+    file_paths: List[str], window_minutes: int = 5, limit: int = 50
+) -> Dict[str, Any]:
+    """Finds duplicate QSOs (same call/band/mode within ±N minutes) across logs.
+
+    Each group names the record kept and why (confirmation, completeness,
+    or first occurrence). At most `limit` groups are listed.
+
+    SECURITY NOTE: This tool reads files from the local filesystem using
+    the provided paths. Only pass paths to ADIF log files you own.
+    """
+    missing = [p for p in file_paths if not os.path.exists(p)]
+    if missing:
+        return {"error": f"File not found at {', '.join(missing)}"}
+    try:
+        result = find_duplicates_impl(
+            file_paths, window_minutes=window_minutes, cache=default_parse_cache()
+        )
+    except (OSError, ValueError) as e:
+        return {"error": str(e)}
+    return result.to_dict(limit=max(0, limit))
+
+
+@mcp.tool()
+def aggregate_log(
+    file_paths: List[str],
+    group_by: List[str],
+    aggregates: Optional[List[str]] = None,
+    where: Optional[Dict[str, str]] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    order_by: Optional[str] = None,
+    limit: int = 50,
+) -> Dict[str, Any]:
+    """Group QSOs from one or more logs and compute counts and other aggregates.
+
+    `group_by` takes band, mode, mode_group, year, month, date, dxcc, cqz,
+    continent, call, prefix, grid, station_call or any ADIF field name
+    ([] for totals). `aggregates` (default ["count"]) takes count,
+    distinct:FIELD, approx_distinct:FIELD (fixed-memory estimate),
+    min:FIELD, max:FIELD and confirmed or confirmed:lotw|eqsl|qsl (share
+    of confirmed QSOs). `where` keeps only QSOs whose keys equal the given
+    values, e.g. {"year": "2024"}; `since` / `until` (YYYYMMDD[HHMM],
+    inclusive) keep QSOs in a time range; `order_by` is a key or
+    aggregate, with "-" for descending. The logs are read once with
+    bounded memory.
+
+    SECURITY NOTE: This tool reads files from the local filesystem using
+    the provided paths. Only pass paths to ADIF log files you own.
+    """
+    missing = [p for p in file_paths if not os.path.exists(p)]
+    if missing:
+        return {"error": f"File not found at {', '.join(missing)}"}
+    try:
+        return aggregate_files(
+            file_paths,
+            group_by,
+            aggregates or ["count"],
+            where=where,
+            since=since,
+            until=until,
+            order_by=order_by,
+            limit=max(0, limit),
+            cache=default_parse_cache(),
+        )
+    except (OSError, ValueError) as e:
+        return {"error": str(e)}
+
+
+@mcp.tool()
+def log_sketch(
+    file_paths: List[str],
+    distinct: Optional[List[str]] = None,
+    top: Optional[List[str]] = None,
+    k: int = 20,
+) -> Dict[str, Any]:
+    """Estimates distinct counts and most-worked keys across logs in fixed memory.
+
+    `distinct` (default ["call", "grid"]) and `top` (default ["call",
+    "prefix"]) take the same keys as aggregate_log `group_by`. Distinct
+    counts come from HyperLogLog sketches (~0.8% error) and the top `k`
+    from Count-Min sketches, which can over-count by at most
+    `max_overcount`. A directory expands to the ADIF logs in it; per-file
+    sketches are merged. Use aggregate_log for exact answers.
+
+    SECURITY NOTE: This tool reads files from the local filesystem using
+    the provided paths. Only pass paths to ADIF log files you own.
+    """
+    missing = [p for p in file_paths if not os.path.exists(p)]
+    if missing:
+        return {"error": f"File not found at {', '.join(missing)}"}
+    try:
+        sketch, files = sketch_files(
+            file_paths,
+            distinct=distinct or ("call", "grid"),
+            top=top or ("call", "prefix"),
+            k=max(1, k),
+            cache=default_parse_cache(),
+        )
+    except (OSError, ValueError) as e:
+        return {"error": str(e)}
+    return {"files": files, **sketch.summary()}
+
+
+@mcp.tool()
+def reconcile_log(
+    file_path: str,
+    remote_path: str,
+    provider: str = "eqsl",
+    tolerance_minutes: int = 30,
+    output_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Reconciles a local log against an eQSL or LoTW ADIF download.
+
+    QSOs match on callsign, band and mode group with start times within
+    `tolerance_minutes`. Returns counts and sample unmatched QSOs; when
+    `output_dir` is given, matched/unmatched NDJSON and a `patch.adi` that
+    marks newly confirmed QSOs are written there.
+
+    SECURITY NOTE: This tool reads files from the local filesystem using
+    the provided paths. Only pass paths to ADIF log files you own.
+    """
+    for p in (file_path, remote_path):
+        if not os.path.exists(p):
+            return {"error": f"File not found at {p}"}
+    try:
+        result = reconcile(
+            file_path, remote_path, provider=provider, tolerance_minutes=tolerance_minutes
+        )
+        summary = result.summary()
+        if output_dir:
+            summary["files"] = result.write(output_dir)
+    except (OSError, ValueError) as e:
+        return {"error": str(e)}
+    return summary
+
+
+# --- Request coalescing ---
+
+# Read-only tools whose results may be shared between identical calls.
+COALESCED_TOOLS = frozenset(
+    {
+        "parse_adif",
+        "find_duplicates",
+        "aggregate_log",
+        "log_sketch",
+        "search_log",
+        "reconcile_log",
+        "award_progress",
+        "worked_before",
+        "search_enumerations",
+        "list_enumerations",
+        "read_specification_resource",
+        "validate_adif_record",
+    }
+)
+# Arguments naming log files: their size and mtime are part of the call key.
+_PATH_ARGS = ("file_path", "file_paths", "remote_path")
+# Arguments that make a call write files; such calls always run.
+_SIDE_EFFECT_ARGS = ("output_dir",)
+MEMO_TTL_ENV = "ADIF_MCP_MEMO_TTL"
+
+
+def _file_token(path: Any) -> Any:
+    """Identity of a file argument: its real path, size and mtime (or None)."""
+    if isinstance(path, list):
+        return [_file_token(p) for p in path]
+    try:
+        real = os.path.realpath(str(path))
+        st = os.stat(real)
+    except (OSError, TypeError, ValueError):
+        return [str(path), None]
+    return [real, st.st_size, st.st_mtime_ns]
+
+
+class SingleFlightMiddleware(Middleware):
+    """Share one computation between identical concurrent tool calls.
+
+    Calls to `tools` with the same arguments (and, for log paths, the same
+    file size and mtime) while one is running wait for that run instead of
+    starting their own. Successful results are also kept for `ttl` seconds
+    in a table of at most `maxsize` entries (least recently used dropped
+    first), so a burst of repeated questions costs one computation.
+    Errors are shared with the waiting calls but never memoized.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 2.0,
+        maxsize: int = 256,
+        tools: frozenset[str] = COALESCED_TOOLS,
+    ) -> None:
+        """Coalesce calls to `tools`, memoizing results for `ttl` seconds (0: off)."""
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.tools = tools
+        self.calls = 0
+        self.coalesced = 0
+        self.memo_hits = 0
+        self._inflight: Dict[str, asyncio.Future[Any]] = {}
+        self._memo: collections.OrderedDict[str, Tuple[float, Any]] = collections.OrderedDict()
+
+    def key(self, name: str, arguments: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Normalized call key, or None if the call must not be shared."""
+        if name not in self.tools:
+            return None
+        args = dict(arguments or {})
+        if any(args.get(a) for a in _SIDE_EFFECT_ARGS):
+            return None
+        for a in _PATH_ARGS:
+            if a in args:
+                args[a] = [args[a], _file_token(args[a])]
+        try:
+            return name + ":" + json.dumps(args, sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+
+    def _remember(self, key: str, task: asyncio.Future[Any]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if self.ttl <= 0 or task.cancelled() or task.exception() is not None:
+            return
+        self._memo[key] = (time.monotonic() + self.ttl, task.result())
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.maxsize:
+            self._memo.popitem(last=False)
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[types.CallToolRequestParams],
+        call_next: CallNext[types.CallToolRequestParams, Any],
+    ) -> Any:
+        """Return a memoized or in-flight result, or run the call and share it."""
+        self.calls += 1
+        key = self.key(context.message.name, context.message.arguments)
+        if key is None:
+            return await call_next(context)
+        hit = self._memo.get(key)
+        if hit is not None:
+            if hit[0] > time.monotonic():
+                self._memo.move_to_end(key)
+                self.memo_hits += 1
+                return hit[1]
+            del self._memo[key]
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call_next(context))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._remember, key))
+        else:
+            self.coalesced += 1
+        # shield: a cancelled caller must not cancel the run others wait on
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        """Call, coalesced and memo-hit counters and the current table sizes."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "memo_hits": self.memo_hits,
+            "in_flight": len(self._inflight),
+            "memoized": len(self._memo),
+        }
+
+
+# --- Profiling ---
+
+
+class ProfilingMiddleware(Middleware):
+    """Profile each tool call into a `ProfileSession` (see `utils.profiling`).
+
+    Calls are serialised while profiling so every output covers one call.
+    """
+
+    def __init__(self, session: profiling.ProfileSession) -> None:
+        """Wrap tool calls with `session.profile`."""
+        self.session = session
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[types.CallToolRequestParams],
+        call_next: CallNext[types.CallToolRequestParams, Any],
+    ) -> Any:
+        """Run the tool under the profiler."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            with self.session.profile(f"tool-{context.message.name}"):
+                return await call_next(context)
+
+
+def install_profiling() -> Optional[profiling.ProfileSession]:
+    """Add `ProfilingMiddleware` if `ADIF_MCP_PROFILE*` is set; returns the session."""
+    config = profiling.config_from_env()
+    if config is None:
+        return None
+    session = profiling.ProfileSession(config)
+    mcp.add_middleware(ProfilingMiddleware(session))
+    return session
+
+
+def install_watcher() -> bool:
+    """Poll watched logs in the background if `ADIF_MCP_WATCH_INTERVAL` is set.
+
+    The value is the poll interval in seconds; appended QSOs are then already
+    indexed when the next question arrives.
+    """
+    try:
+        interval = float(os.environ.get(WATCH_INTERVAL_ENV, "0") or 0)
+    except ValueError:
+        return False
+    if interval <= 0:
+        return False
+    _watcher.interval = interval
+    _watcher.start()
+    return True
+
+
+def install_single_flight() -> SingleFlightMiddleware:
+    """Add `SingleFlightMiddleware`; `ADIF_MCP_MEMO_TTL` sets the memo TTL (0: off)."""
+    try:
+        ttl = float(os.environ.get(MEMO_TTL_ENV, "2") or 0)
+    except ValueError:
+        ttl = 2.0
+    middleware = SingleFlightMiddleware(ttl=ttl)
+    mcp.add_middleware(middleware)
+    return middleware
+
+
 # --- Entry Points ---
 
 
 def run() -> None:
     """Entry point for the server."""
+    install_profiling()
+    install_single_flight()
+    install_watcher()
     mcp.run()
 
 
 def main() -> None:
     """Main entry point."""
+    install_profiling()
+    install_single_flight()
+    install_watcher()
     mcp.run()
 
 
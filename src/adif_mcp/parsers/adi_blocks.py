@@ -0,0 +1,216 @@
+"""
+Seekable block-compressed ADI logs.
+
+`write_blocked` rewrites a log as a multi-member gzip file: one member for
+the header, then one member per ~`block_bytes` of whole records. The result
+is an ordinary `.adi.gz` (gunzip, zcat and `open_log` read it as one
+stream), plus a JSON sidecar `<file>.bidx` recording, for each member, its
+compressed offset, uncompressed offset, first record number and record
+count.
+
+With the sidecar, `iter_from` jumps straight to the member holding record
+N and decompresses only from there, so paginated readers (the MCP
+`parse_adif` tool) no longer inflate the whole archive to show page 500.
+A sidecar is ignored unless the file still has the recorded size, mtime and
+content digest (see `parse_cache.fingerprint`), so a log rewritten in place,
+even to the same size, never seeks into the wrong members.
+"""
+
+from __future__ import annotations
+
+import bisect
+import gzip
+import json
+import os
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import BinaryIO, cast
+
+from adif_mcp.parsers.adi_stream import AdiScanner, RawRecord, iter_raw_records, open_adi
+from adif_mcp.parsers.parse_cache import fingerprint
+
+__all__ = [
+    "Block",
+    "BlockIndex",
+    "index_path",
+    "iter_from",
+    "load_index",
+    "write_blocked",
+]
+
+INDEX_SUFFIX = ".bidx"
+INDEX_FORMAT = "adif-mcp-blocks/2"
+DEFAULT_BLOCK_BYTES = 1 << 20
+
+
+@dataclass(frozen=True)
+class Block:
+    """One gzip member holding whole records.
+
+    Attributes:
+        coffset: Byte offset of the member in the compressed file.
+        uoffset: Offset of its first byte in the decompressed stream.
+        first: 1-based number of its first record.
+        count: Records in the member.
+    """
+
+    coffset: int
+    uoffset: int
+    first: int
+    count: int
+
+
+@dataclass
+class BlockIndex:
+    """Sidecar index of a block-compressed log."""
+
+    size: int
+    records: int = 0
+    blocks: list[Block] = field(default_factory=list)
+    mtime_ns: int = -1
+    digest: str = ""
+
+    def find(self, record: int) -> Block | None:
+        """Block containing 1-based `record`, or None if out of range."""
+        if record < 1 or record > self.records or not self.blocks:
+            return None
+        firsts = [b.first for b in self.blocks]
+        return self.blocks[bisect.bisect_right(firsts, record) - 1]
+
+    def save(self, path: str | Path) -> None:
+        """Write the index as JSON to `path`."""
+        data = {
+            "format": INDEX_FORMAT,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "digest": self.digest,
+            "records": self.records,
+            "blocks": [list(asdict(b).values()) for b in self.blocks],
+        }
+        Path(path).write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+
+
+def index_path(path: str | Path) -> Path:
+    """Sidecar index path for a block-compressed log."""
+    return Path(str(path) + INDEX_SUFFIX)
+
+
+def load_index(path: str | Path) -> BlockIndex | None:
+    """Load the sidecar index for `path` if it exists and is still current."""
+    ipath = index_path(path)
+    try:
+        data = json.loads(ipath.read_text(encoding="utf-8"))
+        if not isinstance(data, dict) or data.get("format") != INDEX_FORMAT:
+            return None
+        st = os.stat(path)
+        if (data.get("size"), data.get("mtime_ns")) != (st.st_size, st.st_mtime_ns):
+            return None
+        fp = fingerprint(path)
+    except (OSError, ValueError):
+        return None
+    if (fp.size, fp.mtime_ns, fp.digest) != (st.st_size, st.st_mtime_ns, data.get("digest")):
+        return None
+    blocks = [Block(*map(int, b)) for b in data.get("blocks", [])]
+    return BlockIndex(
+        size=fp.size,
+        records=int(data.get("records", 0)),
+        blocks=blocks,
+        mtime_ns=fp.mtime_ns,
+        digest=fp.digest,
+    )
+
+
+def write_blocked(
+    src: str | Path,
+    dst: str | Path,
+    *,
+    block_bytes: int = DEFAULT_BLOCK_BYTES,
+    level: int = 6,
+) -> BlockIndex:
+    """Rewrite `src` (plain or compressed) as a seekable blocked gzip at `dst`.
+
+    Records are written one per line with their exact source bytes; the
+    sidecar index is written next to `dst`.
+
+    Returns:
+        The index that was saved.
+    """
+    if block_bytes <= 0:
+        raise ValueError("block_bytes must be positive")
+    index = BlockIndex(size=0)
+    scanner = AdiScanner()
+    pending: list[bytes] = []
+    pending_bytes = 0
+    uoffset = 0
+    wrote_header = False
+
+    with open_adi(src) as fh, open(dst, "wb") as out:
+
+        def member(data: bytes) -> int:
+            coffset = out.tell()
+            out.write(gzip.compress(data, compresslevel=level, mtime=0))
+            return coffset
+
+        def flush() -> None:
+            nonlocal pending_bytes, uoffset
+            data = b"".join(pending)
+            coffset = member(data)
+            index.blocks.append(Block(coffset, uoffset, index.records + 1, len(pending)))
+            index.records += len(pending)
+            uoffset += len(data)
+            pending.clear()
+            pending_bytes = 0
+
+        def header() -> None:
+            nonlocal wrote_header, uoffset
+            wrote_header = True
+            if scanner.header:
+                data = scanner.header + b"\n"
+                member(data)
+                uoffset += len(data)
+
+        for rec in iter_raw_records(fh, scanner=scanner):
+            if not wrote_header:
+                header()
+            pending.append(rec.raw + b"\n")
+            pending_bytes += len(rec.raw) + 1
+            if pending_bytes >= block_bytes:
+                flush()
+        if not wrote_header:
+            header()
+        if pending:
+            flush()
+
+    fp = fingerprint(dst)
+    index.size, index.mtime_ns, index.digest = fp.size, fp.mtime_ns, fp.digest
+    index.save(index_path(dst))
+    return index
+
+
+def iter_from(
+    path: str | Path, record: int, index: BlockIndex | None = None
+) -> Iterator[tuple[int, RawRecord]]:
+    """Yield `(number, record)` from 1-based `record` onward using the index.
+
+    Only the members from the one holding `record` to the end are read.
+
+    Raises:
+        ValueError: If `path` has no current sidecar index.
+    """
+    idx = index or load_index(path)
+    if idx is None:
+        raise ValueError(f"No current block index for {path}")
+    block = idx.find(max(record, 1))
+    if block is None:
+        return
+    with open(path, "rb") as raw:
+        raw.seek(block.coffset)
+        with gzip.GzipFile(fileobj=raw, mode="rb") as gz:
+            n = block.first
+            scanner = AdiScanner(block.uoffset)
+            stream = cast(BinaryIO, gz)
+            for rec in iter_raw_records(stream, scanner=scanner, offset=block.uoffset):
+                if n >= record:
+                    yield n, rec
+                n += 1
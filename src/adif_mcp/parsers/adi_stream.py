@@ -0,0 +1,399 @@
+"""
+Incremental, byte-oriented ADI scanner.
+
+Unlike `adif_reader.parse_adi_text`, which needs the whole file as one string,
+`AdiScanner` accepts the log in arbitrary byte chunks and emits each record as
+soon as its `<EOR>` arrives. Every record keeps its exact source bytes and
+absolute byte offset, so callers can resume from a stored offset, copy records
+through untouched, or index them for later seeking.
+
+- Field lengths are honoured as byte counts (values are decoded afterwards).
+- Keys are lowercased ADIF names; no renaming is applied.
+- Empty values are dropped, matching `adif_reader`.
+- Anything before `<EOH>` is kept aside as the header.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+
+from adif_mcp.parsers.compression import open_log, sniff
+
+__all__ = [
+    "AdiScanner",
+    "LogCursor",
+    "RawRecord",
+    "iter_raw_records",
+    "iter_raw_records_reverse",
+    "iter_records",
+    "open_adi",
+]
+
+_TAG = re.compile(rb"<([A-Za-z0-9_]+)(?::(\d+))?(?::[A-Za-z0-9]+)?>")
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Block size for reading a log backwards from EOF.
+DEFAULT_REVERSE_BLOCK = 1 << 16
+
+# Bytes before a cursor's offset remembered to detect in-place rewrites.
+_MARK_BYTES = 32
+
+
+@dataclass(frozen=True, slots=True)
+class RawRecord:
+    """One ADI record as found in the source stream.
+
+    Attributes:
+        fields: Lowercased field name -> stripped value.
+        raw: Exact source bytes, from the first tag through `<EOR>`.
+        offset: Absolute byte offset of `raw[0]` in the stream.
+    """
+
+    fields: dict[str, str]
+    raw: bytes
+    offset: int
+
+    @property
+    def end(self) -> int:
+        """Absolute byte offset just past this record's `<EOR>`."""
+        return self.offset + len(self.raw)
+
+
+class AdiScanner:
+    """Push-style ADI tokenizer that tolerates records split across chunks.
+
+    Feed bytes with `feed()`; complete records are returned immediately and
+    any partial record is carried over to the next call. `finish()` flushes a
+    trailing record that has no `<EOR>`.
+    """
+
+    def __init__(self, offset: int = 0, encoding: str = "utf-8") -> None:
+        """Create a scanner positioned at absolute byte `offset`.
+
+        A non-zero offset means the caller is resuming after a previously
+        consumed record, so no header is expected.
+        """
+        self.encoding = encoding
+        self.header: bytes | None = b"" if offset else None
+        self.header_fields: dict[str, str] = {}
+        self._buf = b""
+        self._base = offset
+        self._pos = 0
+        self._rec_start = -1
+        self._fields: dict[str, str] = {}
+        self._consumed = offset
+        self._names: dict[bytes, str] = {}
+
+    @property
+    def consumed(self) -> int:
+        """Absolute offset just past the last complete record (or header)."""
+        return self._consumed
+
+    @property
+    def pending(self) -> bool:
+        """True when a partially received record is buffered."""
+        return bool(self._fields) or self._rec_start >= 0
+
+    def _name(self, raw: bytes) -> str:
+        name = self._names.get(raw)
+        if name is None:
+            name = raw.decode("ascii").lower()
+            self._names[raw] = name
+        return name
+
+    def feed(self, data: bytes) -> list[RawRecord]:
+        """Consume `data` and return every record completed by it."""
+        return self._scan(self._buf + data if self._buf else data, final=False)
+
+    def finish(self) -> list[RawRecord]:
+        """Flush at end of stream, emitting a trailing record without `<EOR>`."""
+        out = self._scan(self._buf, final=True)
+        if self._fields:
+            start = self._rec_start if self._rec_start >= 0 else self._pos
+            raw = self._buf[start:]
+            out.append(RawRecord(self._fields, raw, self._base + start))
+            self._consumed = self._base + len(self._buf)
+        self._buf = b""
+        self._base = self._consumed
+        self._pos = 0
+        self._rec_start = -1
+        self._fields = {}
+        return out
+
+    def _scan(self, buf: bytes, *, final: bool) -> list[RawRecord]:
+        out: list[RawRecord] = []
+        pos = self._pos
+        fields = self._fields
+        rec_start = self._rec_start
+        base = self._base
+        size = len(buf)
+        encoding = self.encoding
+        names = self._names
+        tag_search = _TAG.search
+
+        while True:
+            m = tag_search(buf, pos)
+            if m is None:
+                # Hold back a trailing '<' that may be the start of a split tag.
+                j = buf.rfind(b"<", pos)
+                pos = j if j >= 0 and not final and buf.find(b">", j) < 0 else size
+                break
+
+            raw_name, length = m.group(1, 2)
+            name = names.get(raw_name) or self._name(raw_name)
+            tag_end = m.end()
+            if length is None:
+                if name == "eor":
+                    if fields:
+                        i = m.start()
+                        start = rec_start if rec_start >= 0 else i
+                        out.append(RawRecord(fields, buf[start:tag_end], base + start))
+                    fields = {}
+                    rec_start = -1
+                    self._consumed = base + tag_end
+                    if self.header is None:
+                        self.header = b""
+                elif name == "eoh" and self.header is None:
+                    self.header = buf[:tag_end]
+                    self.header_fields = fields
+                    fields = {}
+                    rec_start = -1
+                    self._consumed = base + tag_end
+                pos = tag_end
+                continue
+
+            vend = tag_end + int(length)
+            if vend > size and not final:
+                pos = m.start()
+                break
+            if rec_start < 0:
+                rec_start = m.start()
+            value = buf[tag_end:vend].decode(encoding, errors="replace").strip()
+            if value:
+                fields[name] = value
+            pos = vend
+
+        # Compact: keep only the partial record (or the whole header until seen).
+        if self.header is None:
+            cut = 0
+        elif rec_start >= 0:
+            cut = rec_start
+        else:
+            cut = min(pos, size)
+        self._buf = buf[cut:]
+        self._base = base + cut
+        self._pos = pos - cut
+        self._rec_start = rec_start - cut if rec_start >= 0 else -1
+        self._fields = fields
+        return out
+
+
+def open_adi(path: str | Path) -> BinaryIO:
+    """Open an ADIF log for binary streaming.
+
+    gzip/bz2/xz/zstd files are decompressed on the fly (see `compression`).
+    """
+    return open_log(path)
+
+
+def iter_raw_records(
+    fh: BinaryIO,
+    *,
+    offset: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    scanner: AdiScanner | None = None,
+    complete_only: bool = False,
+) -> Iterator[RawRecord]:
+    """Stream `RawRecord`s from an open binary handle.
+
+    Args:
+        fh: Binary file-like object positioned at `offset`.
+        offset: Absolute offset of the handle's current position.
+        chunk_size: Bytes read per call.
+        scanner: Optional scanner to use (lets callers read `header` later).
+        complete_only: Skip a trailing record without `<EOR>` (it may still
+            be in the middle of being written by a logger).
+
+    Yields:
+        RawRecord objects in file order.
+    """
+    sc = scanner or AdiScanner(offset)
+    while True:
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            break
+        yield from sc.feed(chunk)
+    if not complete_only:
+        yield from sc.finish()
+
+
+def iter_records(
+    path: str | Path, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[dict[str, str]]:
+    """Stream field dicts from an ADIF file in constant memory.
+
+    ADX (XML) files are recognised and read with `adx.AdxReader`.
+    """
+    from adif_mcp.parsers.adx import is_adx, iter_adx_records
+
+    if is_adx(path):
+        yield from iter_adx_records(path)
+        return
+    with open_adi(path) as fh:
+        for rec in iter_raw_records(fh, chunk_size=chunk_size):
+            yield rec.fields
+
+
+def iter_raw_records_reverse(
+    path: str | Path, *, block_size: int = DEFAULT_REVERSE_BLOCK
+) -> Iterator[RawRecord]:
+    """Yield the records of a plain ADI file last-first, reading backwards from EOF.
+
+    The file is read in `block_size` blocks from the end and split at
+    `<EOR>` markers, so the cost grows with the number of records taken,
+    not with the file size, and no index is needed. A trailing record
+    without `<EOR>` is yielded first, as `iter_raw_records` would yield it
+    last. An `<EOR>` that is really part of a field value is recognised by
+    the length of that field, and the pieces are joined back together.
+
+    Raises:
+        ValueError: If the file is compressed (it cannot be read backwards).
+    """
+    codec = sniff(path)
+    if codec is not None:
+        raise ValueError(f"{path} is {codec}-compressed and cannot be read backwards")
+    step = max(16, block_size)
+    with open(path, "rb") as fh:
+        pos = fh.seek(0, os.SEEK_END)
+        buf = low = b""  # file[pos:], and its lowercase twin for searching
+        stop = 0  # file[pos:pos + stop] is not split into segments yet
+        term = 0  # 5 once the text before `stop` ends with an <EOR>, else 0
+        held: list[RawRecord] = []  # records after the current segment, not yet yielded
+        carry = b""  # ... and the bytes they were parsed from
+        carry_final = False  # carry runs to EOF (may end in a record without <EOR>)
+        while True:
+            i = low.rfind(b"<eor>", 0, stop - term)
+            if i < 0 and pos > 0:
+                n = min(step, pos)
+                pos -= n
+                fh.seek(pos)
+                block = fh.read(n)
+                buf, low = block + buf, block.lower() + low
+                stop += n
+                continue
+            start = i + 5 if i >= 0 else 0
+            seg = buf[start:stop]
+            sc = AdiScanner(pos + start)
+            recs = sc.feed(seg)
+            if term and sc.pending:
+                # seg ended at an "<EOR>" inside a field value: rejoin it with the
+                # unconfirmed text after it and parse again.
+                seg += carry
+                sc = AdiScanner(pos + start)
+                held = sc.feed(seg) + (sc.finish() if carry_final else [])
+                carry = seg
+            else:
+                if not term:
+                    recs += sc.finish()
+                if recs:  # seg parsed cleanly, so the boundary after it is real
+                    yield from reversed(held)
+                    held, carry, carry_final = recs, seg, not term
+                else:  # whitespace, or the tail of a value after a stray "<EOR>"
+                    carry = seg + carry
+                    carry_final = carry_final or not term
+            if i < 0:
+                yield from reversed(held)
+                return
+            stop, term = start, 5
+            buf, low = buf[:stop], low[:stop]
+
+
+@dataclass
+class LogCursor:
+    """Remembers how far into a log file records have been consumed.
+
+    `read_new()` yields only the complete records appended since the last
+    call; an unchanged file (same size, mtime and inode) is not even opened.
+    The log is re-read from the start when it was replaced or rewritten:
+
+    - its inode changed (rotated, or saved via write-and-rename);
+    - it shrank below the consumed offset (truncated);
+    - the bytes just before the offset no longer match (truncated and
+      refilled between two polls).
+
+    `resets` counts those restarts. Offsets are byte positions in the file
+    itself, so only uncompressed logs can be tailed: a compressed log is read
+    through `open_adi` and re-read in full whenever it changes (also counted
+    as a reset once anything was consumed).
+    """
+
+    path: Path
+    offset: int = 0
+    size: int = field(default=-1, compare=False)
+    mtime_ns: int = field(default=-1, compare=False)
+    inode: int = field(default=-1, compare=False)
+    mark: bytes = field(default=b"", compare=False)
+    resets: int = field(default=0, compare=False)
+
+    def read_new(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[RawRecord]:
+        """Yield complete records appended since the previous call."""
+        st = os.stat(self.path)
+        if (st.st_size, st.st_mtime_ns, st.st_ino) == (self.size, self.mtime_ns, self.inode):
+            return
+        if sniff(self.path) is not None:
+            yield from self._read_compressed(chunk_size)
+        else:
+            yield from self._read_plain(st, chunk_size)
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+        self.inode = st.st_ino
+
+    def rewind(self) -> None:
+        """Forget the position so the next `read_new()` starts from the top."""
+        self.offset = 0
+        self.size = self.mtime_ns = self.inode = -1
+        self.mark = b""
+
+    def _read_compressed(self, chunk_size: int) -> Iterator[RawRecord]:
+        if self.offset:
+            self.offset = 0
+            self.resets += 1
+        scanner = AdiScanner()
+        with open_adi(self.path) as fh:
+            for rec in iter_raw_records(fh, scanner=scanner, chunk_size=chunk_size):
+                self.offset = rec.end
+                yield rec
+        self.offset = scanner.consumed
+        self.mark = b""
+
+    def _read_plain(self, st: os.stat_result, chunk_size: int) -> Iterator[RawRecord]:
+        with open(self.path, "rb") as fh:
+            if self.offset and (
+                st.st_size < self.offset
+                or (self.inode >= 0 and st.st_ino != self.inode)
+                or not self._mark_matches(fh)
+            ):
+                self.offset = 0
+                self.resets += 1
+            scanner = AdiScanner(self.offset)
+            fh.seek(self.offset)
+            for rec in iter_raw_records(
+                fh, scanner=scanner, chunk_size=chunk_size, complete_only=True
+            ):
+                self.offset = rec.end
+                yield rec
+            self.offset = scanner.consumed
+            fh.seek(max(0, self.offset - _MARK_BYTES))
+            self.mark = fh.read(min(self.offset, _MARK_BYTES))
+
+    def _mark_matches(self, fh: BinaryIO) -> bool:
+        if not self.mark:
+            return True
+        fh.seek(self.offset - len(self.mark))
+        return fh.read(len(self.mark)) == self.mark
@@ -0,0 +1,203 @@
+"""
+High-throughput streaming ADI writer.
+
+`AdiWriter` turns field dicts (any key case) into ADI records:
+
+- the tag prefix (`"<CALL:"`) and output order are built once per key set;
+- lengths are byte counts of the encoded value, matching `AdiScanner`
+  (ASCII values, the common case, skip the extra encode);
+- each record is assembled as text and encoded once;
+- fields are emitted in a canonical order (core QSO fields first, then
+  the rest alphabetically), so the same record always serialises to the
+  same bytes;
+- records are buffered and written with one `writelines` call per batch.
+
+The header carries `ADIF_VER`, `CREATED_TIMESTAMP` and `PROGRAMID`
+`ADIF-MCP`. Use `write_raw` to pass already-encoded records through.
+"""
+
+from __future__ import annotations
+
+import datetime
+import re
+from collections.abc import Iterable, Mapping
+from typing import BinaryIO
+
+__all__ = ["CANONICAL_ORDER", "AdiWriter", "encode_record"]
+
+# Core fields, in the order loggers conventionally print them.
+CANONICAL_ORDER: tuple[str, ...] = (
+    "call",
+    "qso_date",
+    "time_on",
+    "qso_date_off",
+    "time_off",
+    "band",
+    "band_rx",
+    "freq",
+    "freq_rx",
+    "mode",
+    "submode",
+    "rst_sent",
+    "rst_rcvd",
+    "station_callsign",
+    "operator",
+    "my_gridsquare",
+    "gridsquare",
+    "name",
+    "qth",
+    "state",
+    "cnty",
+    "country",
+    "dxcc",
+    "cqz",
+    "ituz",
+    "cont",
+    "tx_pwr",
+    "comment",
+)
+_RANK = {name: i for i, name in enumerate(CANONICAL_ORDER)}
+_NAME = re.compile(r"[A-Za-z][A-Za-z0-9_]*\Z")
+_EOR = b"<EOR>\n"
+_MAX_PLANS = 4096
+
+
+def _prefix(name: str) -> str:
+    if not _NAME.match(name):
+        raise ValueError(f"Invalid ADIF field name: {name!r}")
+    return f"<{name.upper()}:"
+
+
+def encode_record(
+    fields: Mapping[str, object], *, canonical: bool = True, encoding: str = "utf-8"
+) -> bytes:
+    """One ADI record (ending `<EOR>\\n`) for `fields`; empty values are skipped."""
+    names = _ordered(tuple(fields)) if canonical else tuple(fields)
+    parts = []
+    for name in names:
+        value = fields[name]
+        if value is None or value == "":
+            continue
+        data = str(value).encode(encoding)
+        parts.append(b"%s%d>%s" % (_prefix(name).encode("ascii"), len(data), data))
+    parts.append(_EOR)
+    return b"".join(parts)
+
+
+def _ordered(names: tuple[str, ...]) -> tuple[str, ...]:
+    return tuple(
+        sorted(names, key=lambda n: (_RANK.get(n.lower(), len(_RANK)), n.lower()))
+    )
+
+
+class AdiWriter:
+    """Buffered ADI writer for large outputs.
+
+    Use as a context manager, or call `close()` to flush the last batch
+    (the underlying stream is left open).
+    """
+
+    def __init__(
+        self,
+        fh: BinaryIO,
+        header: Mapping[str, str] | None = None,
+        *,
+        comment: str = "Generated by adif-mcp",
+        canonical: bool = True,
+        batch: int = 4096,
+        encoding: str = "utf-8",
+    ) -> None:
+        """Write the header to `fh`.
+
+        Args:
+            fh: Binary output stream.
+            header: Extra header fields; `PROGRAMID` is always `ADIF-MCP`.
+            comment: Free text before the first header tag.
+            canonical: Emit fields in `CANONICAL_ORDER` (else as given).
+            batch: Records buffered per `writelines` call.
+            encoding: Value encoding; lengths count encoded bytes.
+        """
+        self._fh = fh
+        self._canonical = canonical
+        self._batch = max(1, batch)
+        self._encoding = encoding
+        self._buf: list[bytes] = []
+        self._prefixes: dict[str, str] = {}
+        self._orders: dict[tuple[str, ...], tuple[tuple[str, str], ...]] = {}
+        self.count = 0
+
+        hdr = {k.upper(): str(v) for k, v in (header or {}).items() if v not in (None, "")}
+        hdr.setdefault("ADIF_VER", "3.1.6")
+        hdr.setdefault(
+            "CREATED_TIMESTAMP",
+            datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d %H%M%S"),
+        )
+        hdr["PROGRAMID"] = "ADIF-MCP"
+        head = comment.encode(encoding) + b"\n" if comment else b""
+        body = encode_record(hdr, canonical=False, encoding=encoding)[: -len(_EOR)]
+        fh.write(head + body + b"<EOH>\n")
+
+    def _plan(self, names: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+        """(name, tag prefix) pairs in output order for a record's key set."""
+        plan = self._orders.get(names)
+        if plan is None:
+            if len(self._orders) >= _MAX_PLANS:  # pathological logs: many key sets
+                self._orders.clear()
+            ordered = _ordered(names) if self._canonical else names
+            pairs = []
+            for name in ordered:
+                prefix = self._prefixes.get(name)
+                if prefix is None:
+                    prefix = self._prefixes[name] = _prefix(name)
+                pairs.append((name, prefix))
+            plan = self._orders[names] = tuple(pairs)
+        return plan
+
+    def write(self, fields: Mapping[str, object]) -> None:
+        """Append one record."""
+        enc = self._encoding
+        parts = []
+        for name, prefix in self._plan(tuple(fields)):
+            value = fields[name]
+            if value is None or value == "":
+                continue
+            text = value if isinstance(value, str) else str(value)
+            size = len(text) if text.isascii() else len(text.encode(enc))
+            parts.append(f"{prefix}{size}>{text}")
+        parts.append("<EOR>\n")
+        self._buf.append("".join(parts).encode(enc))
+        self.count += 1
+        if len(self._buf) >= self._batch:
+            self.flush()
+
+    def write_raw(self, raw: bytes) -> None:
+        """Append an already-encoded record (e.g. `RawRecord.raw`) plus a newline."""
+        self._buf.append(raw if raw.endswith(b"\n") else raw + b"\n")
+        self.count += 1
+        if len(self._buf) >= self._batch:
+            self.flush()
+
+    def write_all(self, records: Iterable[Mapping[str, object]]) -> int:
+        """Append every record from `records`; returns how many were written."""
+        before = self.count
+        for rec in records:
+            self.write(rec)
+        return self.count - before
+
+    def flush(self) -> None:
+        """Write buffered records to the stream."""
+        if self._buf:
+            self._fh.writelines(self._buf)
+            self._buf.clear()
+
+    def close(self) -> None:
+        """Flush the final batch (does not close the stream)."""
+        self.flush()
+
+    def __enter__(self) -> AdiWriter:
+        """Return the writer."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Flush the final batch."""
+        self.close()
@@ -19,6 +19,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import TypedDict, cast
 
+from adif_mcp.parsers.compression import open_log
+
 __all__ = ["QSORecord", "parse_adi_file", "parse_adi_text"]
 
 
@@ -167,9 +169,11 @@ def parse_adi_file(path: str | Path, encoding: str = "utf-8") -> list[QSORecord]
         File path to the ADIF text.
     encoding:
         Text encoding. ADIF files are commonly UTF-8; change if needed.
+
+    gzip/bz2/xz/zstd-compressed files are decompressed transparently.
     """
-    p = Path(path)
-    data = p.read_text(encoding=encoding, errors="replace")
+    with open_log(Path(path)) as fh:
+        data = fh.read().decode(encoding, errors="replace")
     return parse_adi_text(data)
 
 
@@ -0,0 +1,238 @@
+"""
+Streaming ADX (XML ADIF) reader and writer.
+
+`AdxReader` walks an ADX document with `xml.etree.ElementTree.iterparse`
+and yields each `<RECORD>` as the same structure the ADI parsers produce: a
+dict of lowercased field names to stripped, non-empty string values. Each
+record element is cleared and detached as soon as it has been read, so
+memory stays flat however large the log is. Input may be compressed (see
+`compression.open_log`).
+
+Element mapping (ADX -> field key):
+
+- `<CALL>K1ABC</CALL>` -> `call`
+- `<USERDEF FIELDNAME="EPC">..</USERDEF>` -> `epc`
+- `<APP PROGRAMID="MONOLOG" FIELDNAME="Compression">..</APP>` ->
+  `app_monolog_compression` (the ADI `APP_<PROGRAMID>_<FIELD>` form)
+- header `<USERDEF FIELDID="1" ...>EPC</USERDEF>` -> `userdef1`
+
+`AdxWriter` is the inverse: it streams records out as ADX, batching writes,
+and maps non-ADIF field names to `USERDEF` and `app_*` names to `APP`.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import IO, Any, BinaryIO
+from xml.sax.saxutils import escape, quoteattr
+
+from adif_mcp.parsers.compression import open_log
+
+__all__ = [
+    "AdxReader",
+    "AdxWriter",
+    "is_adx",
+    "is_adx_bytes",
+    "iter_adx_records",
+    "read_adx_header",
+]
+
+_SPEC_FIELDS = Path(__file__).resolve().parent.parent / "resources" / "spec" / "316"
+_SNIFF_BYTES = 512
+
+
+def is_adx_bytes(head: bytes) -> bool:
+    """True if decompressed data starting with `head` looks like ADX."""
+    h = head.lstrip(b"\xef\xbb\xbf \t\r\n")
+    return h.startswith(b"<?xml") or h[:4].upper() == b"<ADX"
+
+
+def is_adx(path: str | Path) -> bool:
+    """True if the (possibly compressed) file at `path` is an ADX document."""
+    with open_log(path) as fh:
+        return is_adx_bytes(fh.read(_SNIFF_BYTES))
+
+
+def _key(elem: ET.Element) -> str:
+    tag = elem.tag.upper()
+    if tag == "USERDEF":
+        return (elem.get("FIELDNAME") or elem.get("fieldname") or "userdef").lower()
+    if tag == "APP":
+        prog = elem.get("PROGRAMID") or elem.get("programid") or ""
+        name = elem.get("FIELDNAME") or elem.get("fieldname") or ""
+        return f"app_{prog}_{name}".lower()
+    return tag.lower()
+
+
+class AdxReader:
+    """Iterate the records of an ADX stream in constant memory.
+
+    The header is read on construction, so `header_fields` is available
+    before the first record is requested.
+    """
+
+    def __init__(self, fh: IO[bytes]) -> None:
+        """Start parsing `fh` (a binary stream) and consume its header."""
+        self.header_fields: dict[str, str] = {}
+        self._events = ET.iterparse(fh, events=("start", "end"))
+        self._parent: ET.Element | None = None
+        self._read_header()
+
+    def _read_header(self) -> None:
+        root: ET.Element | None = None
+        for event, elem in self._events:
+            tag = elem.tag.upper()
+            if event == "start":
+                if root is None:
+                    root = elem
+                elif tag == "RECORDS":
+                    self._parent = elem
+                    return
+                elif tag == "RECORD":  # records directly under <ADX>
+                    self._parent = root
+                    return
+                continue
+            if tag == "HEADER":
+                for child in elem:
+                    text = (child.text or "").strip()
+                    if not text:
+                        continue
+                    if child.tag.upper() == "USERDEF" and child.get("FIELDID"):
+                        self.header_fields[f"userdef{child.get('FIELDID')}"] = text
+                    else:
+                        self.header_fields[_key(child)] = text
+                elem.clear()
+
+    def __iter__(self) -> Iterator[dict[str, str]]:
+        """Yield each record's field dict."""
+        parent = self._parent
+        for event, elem in self._events:
+            if event != "end" or elem.tag.upper() != "RECORD":
+                continue
+            fields: dict[str, str] = {}
+            for child in elem:
+                text = (child.text or "").strip()
+                if text:
+                    fields[_key(child)] = text
+            elem.clear()
+            if parent is not None:
+                parent.remove(elem)
+            if fields:
+                yield fields
+
+
+def read_adx_header(path: str | Path) -> dict[str, str]:
+    """Header fields of an ADX file (lowercased keys)."""
+    with open_log(path) as fh:
+        return AdxReader(fh).header_fields
+
+
+def iter_adx_records(path: str | Path) -> Iterator[dict[str, str]]:
+    """Stream field dicts from a (possibly compressed) ADX file."""
+    with open_log(path) as fh:
+        yield from AdxReader(fh)
+
+
+@functools.lru_cache(maxsize=1)
+def _adif_field_names() -> frozenset[str]:
+    with (_SPEC_FIELDS / "fields.json").open(encoding="utf-8") as f:
+        data: dict[str, Any] = json.load(f)
+    return frozenset(data["Adif"]["Fields"]["Records"])
+
+
+class AdxWriter:
+    """Write records as ADX, streaming and batched.
+
+    Use as a context manager; the closing tags are written on exit.
+    """
+
+    def __init__(
+        self,
+        fh: BinaryIO,
+        header: Mapping[str, str] | None = None,
+        *,
+        batch: int = 512,
+    ) -> None:
+        """Write the XML prolog and header to `fh`.
+
+        Args:
+            fh: Binary output stream.
+            header: Header fields; `PROGRAMID` defaults to `ADIF-MCP`.
+            batch: Records buffered per `write()` call on `fh`.
+        """
+        self._fh = fh
+        self._batch = max(1, batch)
+        self._buf: list[str] = []
+        self._elem: dict[str, tuple[str, str]] = {}
+        self.count = 0
+        hdr = {k.upper(): v for k, v in (header or {}).items()}
+        hdr.setdefault("ADIF_VER", "3.1.6")
+        hdr.setdefault("PROGRAMID", "ADIF-MCP")
+        parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<ADX>\n  <HEADER>\n']
+        for name, value in hdr.items():
+            text = escape(str(value))
+            if name.startswith("USERDEF") and name[7:].isdigit():
+                parts.append(f'    <USERDEF FIELDID="{name[7:]}">{text}</USERDEF>\n')
+            else:
+                parts.append(f"    <{name}>{text}</{name}>\n")
+        parts.append("  </HEADER>\n  <RECORDS>\n")
+        fh.write("".join(parts).encode("utf-8"))
+
+    def _tags(self, name: str) -> tuple[str, str]:
+        tags = self._elem.get(name)
+        if tags is None:
+            upper = name.upper()
+            if upper in _adif_field_names():
+                tags = (f"<{upper}>", f"</{upper}>")
+            elif upper.startswith("APP_") and "_" in upper[4:]:
+                prog, field = upper[4:].split("_", 1)
+                attrs = f"PROGRAMID={quoteattr(prog)} FIELDNAME={quoteattr(field)}"
+                tags = (f"<APP {attrs}>", "</APP>")
+            else:
+                tags = (f"<USERDEF FIELDNAME={quoteattr(upper)}>", "</USERDEF>")
+            self._elem[name] = tags
+        return tags
+
+    def write(self, fields: Mapping[str, str]) -> None:
+        """Append one record."""
+        parts = ["    <RECORD>"]
+        for name, value in fields.items():
+            if value is None or value == "":
+                continue
+            start, end = self._tags(name)
+            parts.append(f"{start}{escape(str(value))}{end}")
+        parts.append("</RECORD>\n")
+        self._buf.append("".join(parts))
+        self.count += 1
+        if len(self._buf) >= self._batch:
+            self.flush()
+
+    def write_all(self, records: Iterable[Mapping[str, str]]) -> int:
+        """Append every record from `records`; returns how many were written."""
+        before = self.count
+        for rec in records:
+            self.write(rec)
+        return self.count - before
+
+    def flush(self) -> None:
+        """Write buffered records to the stream."""
+        if self._buf:
+            self._fh.write("".join(self._buf).encode("utf-8"))
+            self._buf.clear()
+
+    def close(self) -> None:
+        """Flush and write the closing tags (does not close `fh`)."""
+        self.flush()
+        self._fh.write(b"  </RECORDS>\n</ADX>\n")
+
+    def __enter__(self) -> AdxWriter:
+        """Return the writer."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Close the document."""
+        self.close()
@@ -0,0 +1,305 @@
+"""
+Typed columnar export of QSO records: Parquet, Arrow IPC and CSV.
+
+Columns follow `QsoRecord` (see `cli/convert_adi.py`) with real types:
+`freq`/`tx_pwr` are float64, `qso_date` and the QSL dates are date32,
+`time_on` is time32[s], and a derived `qso_datetime` (UTC timestamp) is
+added for range queries. Unparseable dates/times become null.
+
+Parquet and Arrow IPC need the optional `pyarrow` package
+(`pip install 'adif-mcp[arrow]'`). Rows are buffered and written as one
+row group / record batch every `row_group_size` rows, so memory stays
+bounded while streaming. The Arrow IPC file is written uncompressed so it
+can be memory-mapped and read zero-copy (`pyarrow.memory_map` +
+`pyarrow.ipc.open_file`). CSV needs no dependencies; temporal values are
+ISO 8601 and `adif_fields` is a JSON object.
+"""
+
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+__all__ = [
+    "COLUMNS",
+    "FORMATS",
+    "ArrowWriter",
+    "CsvWriter",
+    "have_pyarrow",
+    "open_columnar",
+    "typed_row",
+]
+
+FORMATS = ("csv", "parquet", "arrow")
+
+# (column, logical type); order is the output column order.
+COLUMNS: tuple[tuple[str, str], ...] = (
+    ("station_call", "string"),
+    ("call", "string"),
+    ("qso_date", "date"),
+    ("time_on", "time"),
+    ("qso_datetime", "timestamp"),
+    ("band", "string"),
+    ("mode", "string"),
+    ("freq", "float"),
+    ("rst_sent", "string"),
+    ("rst_rcvd", "string"),
+    ("my_gridsquare", "string"),
+    ("gridsquare", "string"),
+    ("tx_pwr", "float"),
+    ("comment", "string"),
+    ("lotw_qsl_rcvd", "string"),
+    ("eqsl_qsl_rcvd", "string"),
+    ("lotw_qsl_date", "date"),
+    ("eqsl_qsl_date", "date"),
+    ("adif_fields", "map"),
+)
+_NAMES = tuple(name for name, _ in COLUMNS)
+
+
+def have_pyarrow() -> bool:
+    """True if the optional `pyarrow` package can be imported."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _date(value: object) -> datetime.date | None:
+    s = str(value or "")
+    if len(s) != 8 or not s.isdigit():
+        return None
+    try:
+        return datetime.date(int(s[:4]), int(s[4:6]), int(s[6:]))
+    except ValueError:
+        return None
+
+
+def _time(value: object) -> datetime.time | None:
+    s = str(value or "")
+    if len(s) not in (4, 6) or not s.isdigit():
+        return None
+    try:
+        return datetime.time(int(s[:2]), int(s[2:4]), int(s[4:6] or 0))
+    except ValueError:
+        return None
+
+
+def _float(value: object) -> float | None:
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
+def typed_row(rec: object) -> tuple[Any, ...]:
+    """Typed column values for a `QsoRecord` (or any object with its attributes)."""
+    get: Callable[[str], Any]
+    if isinstance(rec, dict):
+        get = rec.get
+    else:
+
+        def get(name: str) -> Any:
+            return getattr(rec, name, None)
+
+    day = _date(get("qso_date"))
+    tod = _time(get("time_on"))
+    stamp = (
+        datetime.datetime.combine(day, tod, tzinfo=datetime.timezone.utc)
+        if day is not None and tod is not None
+        else None
+    )
+    extra = get("adif_fields")
+    return (
+        get("station_call"),
+        get("call"),
+        day,
+        tod,
+        stamp,
+        get("band"),
+        get("mode"),
+        _float(get("freq")),
+        get("rst_sent"),
+        get("rst_rcvd"),
+        get("my_gridsquare"),
+        get("gridsquare"),
+        _float(get("tx_pwr")),
+        get("comment"),
+        get("lotw_qsl_rcvd"),
+        get("eqsl_qsl_rcvd"),
+        _date(get("lotw_qsl_date")),
+        _date(get("eqsl_qsl_date")),
+        dict(extra) if extra else None,
+    )
+
+
+class _Writer:
+    """Shared buffering for the columnar writers."""
+
+    def __init__(self, row_group_size: int) -> None:
+        self._rows: list[tuple[Any, ...]] = []
+        self._group = max(1, row_group_size)
+        self.count = 0
+
+    def write(self, rec: object) -> None:
+        """Append one record."""
+        self._rows.append(typed_row(rec))
+        self.count += 1
+        if len(self._rows) >= self._group:
+            self.flush()
+
+    def write_all(self, records: Iterable[object]) -> int:
+        """Append every record from `records`; returns how many were written."""
+        before = self.count
+        for rec in records:
+            self.write(rec)
+        return self.count - before
+
+    def flush(self) -> None:
+        """Write buffered rows as one group."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flush the last group and close the output."""
+        raise NotImplementedError
+
+    def __enter__(self) -> _Writer:
+        """Return the writer."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Close the output."""
+        self.close()
+
+
+class CsvWriter(_Writer):
+    """Dependency-free CSV output with a header row and ISO temporal values."""
+
+    def __init__(self, path: str | Path, *, row_group_size: int = 65536) -> None:
+        """Create `path` and write the header row."""
+        super().__init__(row_group_size)
+        self._fh = open(path, "w", encoding="utf-8", newline="")
+        self._csv = csv.writer(self._fh)
+        self._csv.writerow(_NAMES)
+
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        if value is None:
+            return ""
+        if isinstance(value, datetime.datetime):
+            return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, dict):
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        return value
+
+    def flush(self) -> None:
+        """Write buffered rows."""
+        if self._rows:
+            cell = self._cell
+            self._csv.writerows([cell(v) for v in row] for row in self._rows)
+            self._rows.clear()
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        self.flush()
+        self._fh.close()
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ValueError(
+            "Parquet/Arrow export needs the optional 'pyarrow' package "
+            "(pip install 'adif-mcp[arrow]'); use CSV otherwise"
+        ) from e
+    return pyarrow
+
+
+class ArrowWriter(_Writer):
+    """Parquet or Arrow IPC output, one row group / record batch per buffer."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        fmt: str = "parquet",
+        *,
+        row_group_size: int = 65536,
+        compression: str = "zstd",
+    ) -> None:
+        """Open the output file.
+
+        Args:
+            path: Destination file.
+            fmt: `parquet` or `arrow` (Arrow IPC file format).
+            row_group_size: Rows per Parquet row group / IPC record batch.
+            compression: Parquet codec (IPC output is left uncompressed).
+
+        Raises:
+            ValueError: If `pyarrow` is missing or `fmt` is unknown.
+        """
+        super().__init__(row_group_size)
+        pa = _pyarrow()
+        types = {
+            "string": pa.string(),
+            "date": pa.date32(),
+            "time": pa.time32("s"),
+            "timestamp": pa.timestamp("s", tz="UTC"),
+            "float": pa.float64(),
+            "map": pa.map_(pa.string(), pa.string()),
+        }
+        self._pa = pa
+        self._schema = pa.schema([(name, types[kind]) for name, kind in COLUMNS])
+        self._parquet = fmt == "parquet"
+        if self._parquet:
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(str(path), self._schema, compression=compression)
+        elif fmt == "arrow":
+            self._writer = pa.ipc.new_file(str(path), self._schema)
+        else:
+            raise ValueError(f"Unknown columnar format: {fmt!r}")
+
+    def flush(self) -> None:
+        """Write buffered rows as one row group / record batch."""
+        if not self._rows:
+            return
+        cols = [list(col) for col in zip(*self._rows)]
+        cols[-1] = [None if m is None else list(m.items()) for m in cols[-1]]
+        batch = self._pa.RecordBatch.from_arrays(
+            [self._pa.array(c, type=f.type) for c, f in zip(cols, self._schema)],
+            schema=self._schema,
+        )
+        if self._parquet:
+            self._writer.write_table(self._pa.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+        self._rows.clear()
+
+    def close(self) -> None:
+        """Flush and finalise the file footer."""
+        self.flush()
+        self._writer.close()
+
+
+def open_columnar(
+    path: str | Path, fmt: str, *, row_group_size: int = 65536
+) -> CsvWriter | ArrowWriter:
+    """Writer for `fmt` (`csv`, `parquet` or `arrow`) at `path`.
+
+    Raises:
+        ValueError: For Parquet/Arrow when `pyarrow` is not installed.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "csv":
+        return CsvWriter(path, row_group_size=row_group_size)
+    return ArrowWriter(path, fmt, row_group_size=row_group_size)
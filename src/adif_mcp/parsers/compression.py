@@ -0,0 +1,74 @@
+"""
+Transparent decompression of ADIF logs.
+
+`open_log` sniffs the first bytes of a file and returns a binary stream of
+the decompressed content, so every reader can take `.adi`, `.adi.gz`,
+`.adi.bz2`, `.adi.xz` or `.adi.zst` without unpacking to disk first. The
+file extension is ignored; only the magic bytes count.
+
+zstd support needs the optional `zstandard` package; without it, zstd
+input raises a clear `ValueError`.
+"""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+from pathlib import Path
+from typing import BinaryIO, cast
+
+__all__ = ["CODECS", "open_log", "sniff", "sniff_bytes"]
+
+# codec -> leading magic bytes
+CODECS: dict[str, bytes] = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+
+_SNIFF_BYTES = 6
+
+
+def sniff_bytes(head: bytes) -> str | None:
+    """Codec name for data starting with `head`, or None for plain text."""
+    for name, magic in CODECS.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def sniff(path: str | Path) -> str | None:
+    """Codec name of the file at `path`, or None if it is not compressed."""
+    with open(path, "rb") as fh:
+        return sniff_bytes(fh.read(_SNIFF_BYTES))
+
+
+def _open_zstd(path: str | Path) -> BinaryIO:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ValueError(
+            f"{path} is zstd-compressed: install the optional 'zstandard' package"
+        ) from e
+    fh = open(path, "rb")
+    return cast(BinaryIO, zstandard.ZstdDecompressor().stream_reader(fh, closefd=True))
+
+
+def open_log(path: str | Path) -> BinaryIO:
+    """Open a possibly compressed log as a stream of decompressed bytes.
+
+    Raises:
+        ValueError: For zstd input when `zstandard` is not installed.
+    """
+    codec = sniff(path)
+    if codec is None:
+        return open(path, "rb")
+    if codec == "gzip":
+        return cast(BinaryIO, gzip.open(path, "rb"))
+    if codec == "bz2":
+        return cast(BinaryIO, bz2.open(path, "rb"))
+    if codec == "xz":
+        return cast(BinaryIO, lzma.open(path, "rb"))
+    return _open_zstd(path)
@@ -0,0 +1,581 @@
+"""
+Persistent on-disk cache of parsed ADIF logs.
+
+Archive logs rarely change, yet every server process and CLI run used to
+re-parse them. `ParseCache` keeps one entry per log under
+`config_dir()/parse-cache`, keyed by the resolved path and validated
+against the log's size, `mtime_ns` and a fast content digest (BLAKE2b over
+the size plus the first and last 64 KiB). A stale entry is simply rebuilt.
+
+Entries are compact and columnar, and are memory-mapped on load, so
+reopening a large log reads a small JSON header and nothing else. Column
+values are decoded only when a column is used. The file layout is:
+
+    magic (8 bytes) | header length (u32) | JSON header | padding | sections
+
+The sections are native-endian arrays, each 8-byte aligned:
+
+- spans: the byte offset (u64) and length (u32) of each record in the
+  source stream, so a plain `.adi` can be re-read record by record;
+- nfields: the field count of each record (u16);
+- one section per field name. Low-cardinality fields (band, mode, dates)
+  are dictionary encoded: u16 codes, with 0 meaning absent, plus the
+  dictionary. Other fields store u32 end offsets into a UTF-8 blob, with
+  an empty value meaning absent.
+
+The cache directory is bounded by `budget_bytes`: after each write, the
+least recently used entries (a hit touches the entry's mtime) are removed
+until the total fits. Logs smaller than `min_bytes` are not cached; they
+parse faster than an entry can be validated.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, BinaryIO, Literal, NamedTuple
+
+from adif_mcp.parsers.adi_stream import iter_raw_records, open_adi
+from adif_mcp.parsers.compression import sniff
+
+__all__ = [
+    "BUDGET_ENV",
+    "CachedLog",
+    "Column",
+    "Fingerprint",
+    "ParseCache",
+    "default_cache",
+    "fingerprint",
+]
+
+MAGIC = b"ADIFPC1\n"
+CACHE_FORMAT = "adif-mcp-parse-cache/1"
+SUFFIX = ".pcache"
+
+# Cache budget in MiB; 0 disables the default cache.
+BUDGET_ENV = "ADIF_MCP_PARSE_CACHE_MB"
+
+DEFAULT_BUDGET = 512 << 20
+DEFAULT_MIN_BYTES = 1 << 20
+
+_SAMPLE = 1 << 16
+_MAX_CODES = 0xFFFF
+_MAX_BLOB = 0xFFFFFFFF
+
+
+class Fingerprint(NamedTuple):
+    """Identity of a log's contents, as recorded in its cache entry."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+def fingerprint(path: str | Path) -> Fingerprint:
+    """Fingerprint `path` by size, mtime and a digest of its first and last 64 KiB."""
+    p = Path(path).resolve()
+    with open(p, "rb") as fh:
+        st = os.fstat(fh.fileno())
+        h = hashlib.blake2b(st.st_size.to_bytes(8, "little"), digest_size=16)
+        h.update(fh.read(_SAMPLE))
+        if st.st_size > _SAMPLE:
+            fh.seek(max(_SAMPLE, st.st_size - _SAMPLE))
+            h.update(fh.read(_SAMPLE))
+    return Fingerprint(str(p), st.st_size, st.st_mtime_ns, h.hexdigest())
+
+
+# ---------------------------
+# Reading
+# ---------------------------
+
+
+class Column:
+    """One field of a cached log, decoded on access (None where absent)."""
+
+    def __init__(self, name: str, kind: str, index: memoryview, data: Any) -> None:
+        """Wrap the mapped sections of one column (see the module docstring)."""
+        self.name = name
+        self._kind = kind
+        self._index = index
+        self._data = data
+
+    def __len__(self) -> int:
+        """Number of records."""
+        return len(self._index)
+
+    def __getitem__(self, i: int) -> str | None:
+        """Value for 0-based record `i`."""
+        if self._kind == "dict":
+            return self._data[self._index[i]]  # type: ignore[no-any-return]
+        start = self._index[i - 1] if i > 0 else 0
+        end = self._index[i]
+        return bytes(self._data[start:end]).decode("utf-8") if end > start else None
+
+    def __iter__(self) -> Iterator[str | None]:
+        """Values in record order."""
+        if self._kind == "dict":
+            values = self._data
+            for code in self._index:
+                yield values[code]
+            return
+        blob = self._data
+        start = 0
+        for end in self._index:
+            yield bytes(blob[start:end]).decode("utf-8") if end > start else None
+            start = end
+
+
+class CachedLog:
+    """A memory-mapped cache entry: the parsed records of one log."""
+
+    def __init__(self, path: Path, entry: Path) -> None:
+        """Map `entry`, the cache file for the log at `path`.
+
+        Raises:
+            ValueError: If `entry` is not a readable cache file.
+        """
+        self.path = path
+        self.entry = entry
+        with open(entry, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = []
+        self._columns: dict[str, Column] = {}
+        try:
+            if self._mm[:8] != MAGIC:
+                raise ValueError(f"{entry} is not a parse cache entry")
+            hlen = int.from_bytes(self._mm[8:12], "little")
+            header = json.loads(self._mm[12 : 12 + hlen])
+            if header.get("format") != CACHE_FORMAT or header["byteorder"] != sys.byteorder:
+                raise ValueError(f"{entry} has an unsupported format")
+        except (KeyError, ValueError, IndexError):
+            self._mm.close()
+            raise
+        self.header: dict[str, Any] = header
+        self._base = _align(12 + hlen)
+        self.fingerprint = Fingerprint(*header["source"])
+        self.records: int = header["records"]
+        self.seekable: bool = header["seekable"]
+        self.names: list[str] = list(header["columns"])
+        self._offsets = self._section(header["offsets"], "Q")
+        self._lengths = self._section(header["lengths"], "I")
+        self.nfields = self._section(header["nfields"], "H")
+
+    def _section(self, where: list[int], fmt: Literal["B", "H", "I", "Q"] = "B") -> memoryview:
+        pos, size = where
+        view = memoryview(self._mm)[self._base + pos : self._base + pos + size]
+        if fmt != "B":
+            view = view.cast(fmt)
+        self._views.append(view)
+        return view
+
+    def __len__(self) -> int:
+        """Number of records."""
+        return self.records
+
+    def column(self, name: str) -> Column | None:
+        """The column for lowercase field `name`, or None if no record has it."""
+        col = self._columns.get(name)
+        if col is None:
+            spec = self.header["columns"].get(name)
+            if spec is None:
+                return None
+            kind = spec[0]
+            if kind == "dict":
+                blob = bytes(self._section(spec[3]))
+                ends = self._section(spec[2], "I")
+                values: list[str | None] = [None]
+                start = 0
+                for end in ends:
+                    values.append(blob[start:end].decode("utf-8"))
+                    start = end
+                col = Column(name, kind, self._section(spec[1], "H"), values)
+            else:
+                col = Column(name, kind, self._section(spec[1], "I"), self._section(spec[2]))
+            self._columns[name] = col
+        return col
+
+    def record(self, i: int) -> dict[str, str]:
+        """Fields of 0-based record `i` (lowercase names)."""
+        out: dict[str, str] = {}
+        for name in self.names:
+            col = self.column(name)
+            value = col[i] if col is not None else None
+            if value is not None:
+                out[name] = value
+        return out
+
+    def iter_records(
+        self, names: Iterable[str] | None = None, rows: Iterable[int] | None = None
+    ) -> Iterator[dict[str, str]]:
+        """Field dicts in file order, restricted to `names` when given.
+
+        `rows` picks 0-based records (in the order given) instead of all.
+        """
+        wanted = [n for n in (self.names if names is None else names) if n in self.names]
+        cols = [col for col in map(self.column, wanted) if col is not None]
+        if rows is not None:
+            for i in rows:
+                picked = [col[i] for col in cols]
+                yield {n: v for n, v in zip(wanted, picked) if v is not None}
+            return
+        if not cols:
+            for _ in range(self.records):
+                yield {}
+            return
+        for values in zip(*cols):
+            yield {n: v for n, v in zip(wanted, values) if v is not None}
+
+    def span(self, i: int) -> tuple[int, int]:
+        """(offset, length) of record `i` in the source stream."""
+        return self._offsets[i], self._lengths[i]
+
+    def read_raw(self, start: int, stop: int) -> list[bytes]:
+        """Exact source bytes of records `start`..`stop - 1` of a plain `.adi` log.
+
+        Raises:
+            ValueError: If the log is compressed or ADX (not `seekable`).
+        """
+        if not self.seekable:
+            raise ValueError(f"{self.path} cannot be read by byte offset")
+        out = []
+        with open(self.path, "rb") as fh:
+            for i in range(max(0, start), min(stop, self.records)):
+                offset, length = self.span(i)
+                fh.seek(offset)
+                out.append(fh.read(length))
+        return out
+
+    def close(self) -> None:
+        """Release the mapping."""
+        self._columns.clear()
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mm.close()
+
+    def __enter__(self) -> CachedLog:
+        """Return the log."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Release the mapping."""
+        self.close()
+
+
+# ---------------------------
+# Building
+# ---------------------------
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+class _ColumnBuilder:
+    """Accumulates one field, dictionary encoded until it has too many values."""
+
+    def __init__(self) -> None:
+        self.codes: array[int] | None = array("H")
+        self.lookup: dict[bytes, int] = {}
+        self.values: list[bytes] = []
+        self.ends = array("I")
+        self.blob = bytearray()
+
+    def pad(self, n: int) -> None:
+        """Mark records up to `n` (exclusive) as absent."""
+        if self.codes is not None:
+            self.codes.extend([0] * (n - len(self.codes)))
+        else:
+            self.ends.extend([len(self.blob)] * (n - len(self.ends)))
+
+    def add(self, i: int, value: bytes) -> None:
+        """Set record `i` (all earlier records are padded)."""
+        codes = self.codes
+        if codes is not None:
+            if len(codes) < i:
+                codes.extend([0] * (i - len(codes)))
+            code = self.lookup.get(value)
+            if code is not None:
+                codes.append(code)
+                return
+            if len(self.values) < _MAX_CODES:
+                code = self.lookup[value] = len(self.values) + 1
+                self.values.append(value)
+                codes.append(code)
+                return
+            self._to_plain()
+        self.pad(i)
+        self.blob += value
+        self.ends.append(len(self.blob))
+
+    def _to_plain(self) -> None:
+        assert self.codes is not None
+        values = [b""] + self.values
+        for code in self.codes:
+            self.blob += values[code]
+            self.ends.append(len(self.blob))
+        self.codes = None
+        self.lookup.clear()
+        self.values = []
+
+    def sections(self) -> tuple[str, list[bytes]]:
+        """Kind and the byte sections to write."""
+        if self.codes is not None:
+            ends = array("I")
+            total = 0
+            for v in self.values:
+                total += len(v)
+                ends.append(total)
+            return "dict", [self.codes.tobytes(), ends.tobytes(), b"".join(self.values)]
+        if len(self.blob) > _MAX_BLOB:
+            raise ValueError("column too large for the parse cache")
+        return "plain", [self.ends.tobytes(), bytes(self.blob)]
+
+
+def _parse(path: Path) -> Iterator[tuple[dict[str, str], int, int]]:
+    """(fields, offset, length) for every record of `path`."""
+    from adif_mcp.parsers.adx import is_adx, iter_adx_records
+
+    if is_adx(path):
+        for fields in iter_adx_records(path):
+            yield fields, 0, 0
+        return
+    with open_adi(path) as fh:
+        for rec in iter_raw_records(fh):
+            yield rec.fields, rec.offset, len(rec.raw)
+
+
+def _write_entry(fh: BinaryIO, path: Path, fp: Fingerprint) -> None:
+    """Parse `path` and write its cache entry to `fh`."""
+    from adif_mcp.parsers.adx import is_adx
+
+    offsets, lengths, nfields = array("Q"), array("I"), array("H")
+    builders: dict[str, _ColumnBuilder] = {}
+    for fields, offset, length in _parse(path):
+        i = len(offsets)
+        offsets.append(offset)
+        lengths.append(length)
+        nfields.append(min(len(fields), 0xFFFF))
+        for name, value in fields.items():
+            b = builders.get(name)
+            if b is None:
+                b = builders[name] = _ColumnBuilder()
+            b.add(i, value.encode("utf-8"))
+    n = len(offsets)
+
+    sections: list[bytes] = []
+    pos = 0
+
+    def place(data: bytes) -> list[int]:
+        nonlocal pos
+        sections.append(data)
+        where = [pos, len(data)]
+        pos = _align(pos + len(data))
+        return where
+
+    header: dict[str, Any] = {
+        "format": CACHE_FORMAT,
+        "byteorder": sys.byteorder,
+        "source": list(fp),
+        "records": n,
+        "seekable": not is_adx(path) and sniff(path) is None,
+        "offsets": place(offsets.tobytes()),
+        "lengths": place(lengths.tobytes()),
+        "nfields": place(nfields.tobytes()),
+        "columns": {},
+    }
+    for name, b in builders.items():
+        b.pad(n)
+        kind, parts = b.sections()
+        header["columns"][name] = [kind, *[place(d) for d in parts]]
+
+    head = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    fh.write(MAGIC + len(head).to_bytes(4, "little") + head)
+    fh.write(b"\0" * (_align(12 + len(head)) - 12 - len(head)))
+    for data in sections:
+        fh.write(data)
+        fh.write(b"\0" * (_align(len(data)) - len(data)))
+
+
+# ---------------------------
+# Cache directory
+# ---------------------------
+
+
+class ParseCache:
+    """Directory of cache entries with LRU eviction by total size."""
+
+    def __init__(
+        self,
+        root: str | Path | None = None,
+        *,
+        budget_bytes: int = DEFAULT_BUDGET,
+        min_bytes: int = DEFAULT_MIN_BYTES,
+    ) -> None:
+        """Create a cache.
+
+        Args:
+            root: Cache directory (default `config_dir()/parse-cache`,
+                resolved on each use).
+            budget_bytes: Total size the entries may occupy; 0 disables caching.
+            min_bytes: Smaller logs are parsed directly and never cached.
+        """
+        self._root = Path(root) if root is not None else None
+        self.budget_bytes = budget_bytes
+        self.min_bytes = min_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def root(self) -> Path:
+        """The cache directory (created on demand)."""
+        if self._root is not None:
+            root = self._root
+        else:
+            from adif_mcp.utils.paths import config_dir
+
+            root = config_dir() / "parse-cache"
+        root.mkdir(parents=True, exist_ok=True)
+        return root
+
+    def entry_path(self, path: str | Path) -> Path:
+        """Cache file used for the log at `path`."""
+        key = hashlib.blake2b(str(Path(path).resolve()).encode("utf-8"), digest_size=16)
+        return self.root / (key.hexdigest() + SUFFIX)
+
+    def get(self, path: str | Path) -> CachedLog | None:
+        """The cached parse of `path` if present and still current."""
+        fp = fingerprint(path)
+        entry = self.entry_path(path)
+        try:
+            log = CachedLog(Path(fp.path), entry)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if log.fingerprint != fp:
+            log.close()
+            return None
+        try:
+            os.utime(entry)  # LRU: a hit makes the entry recent
+        except OSError:
+            pass
+        return log
+
+    def build(self, path: str | Path) -> CachedLog:
+        """Parse `path`, store the entry and return it (then evict to budget).
+
+        The entry carries the fingerprint taken before parsing, so a log
+        that changes meanwhile simply misses (and is rebuilt) next time.
+        An entry larger than the whole budget is returned but not kept.
+        """
+        p = Path(path).resolve()
+        entry = self.entry_path(p)
+        fp = fingerprint(p)
+        fd, tmp = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                _write_entry(fh, p, fp)
+            os.replace(tmp, entry)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        log = CachedLog(p, entry)
+        self.evict(keep=entry)
+        if entry.stat().st_size > self.budget_bytes:
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+        return log
+
+    def open(self, path: str | Path) -> CachedLog | None:
+        """Cached parse of `path`, built on a miss.
+
+        Returns:
+            None when caching is disabled or `path` is below `min_bytes`.
+        """
+        if self.budget_bytes <= 0 or os.path.getsize(path) < self.min_bytes:
+            return None
+        log = self.get(path)
+        if log is not None:
+            self.hits += 1
+            return log
+        self.misses += 1
+        return self.build(path)
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        out = []
+        for entry in self.root.glob("*" + SUFFIX):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            out.append((st.st_mtime, st.st_size, entry))
+        return sorted(out)
+
+    def evict(self, keep: Path | None = None) -> int:
+        """Remove least recently used entries until the total fits the budget.
+
+        Returns:
+            Number of entries removed.
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in entries:
+            if total <= self.budget_bytes:
+                break
+            if entry == keep:
+                continue
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry; returns how many were removed."""
+        n = 0
+        for _, _, entry in self._entries():
+            entry.unlink(missing_ok=True)
+            n += 1
+        return n
+
+    def stats(self) -> dict[str, Any]:
+        """Entry count, total size, budget and hit/miss counters."""
+        entries = self._entries()
+        return {
+            "root": str(self.root),
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_default: ParseCache | None = None
+
+
+def default_cache() -> ParseCache:
+    """Process-wide cache under `config_dir()`, sized by `ADIF_MCP_PARSE_CACHE_MB`."""
+    global _default
+    if _default is None:
+        budget = DEFAULT_BUDGET
+        raw = os.environ.get(BUDGET_ENV)
+        if raw:
+            try:
+                budget = max(0, int(float(raw) * (1 << 20)))
+            except ValueError:
+                pass
+        _default = ParseCache(budget_bytes=budget)
+    return _default
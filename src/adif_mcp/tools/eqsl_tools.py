@@ -13,6 +13,8 @@ from typing import Any, Literal, TypedDict
 from qso_graph_auth.identity import PersonaManager
 from qso_graph_auth.providers.adapters import build_request
 
+from adif_mcp.logbook.aggregate import Aggregator
+
 # ---------------------------
 # Types
 # ---------------------------
@@ -212,25 +214,27 @@ def filter_summary(
             return False
         return True
 
-    # Work on a concrete list to satisfy both mypy (Sized) and logic clarity
-    items: list[QsoRecord] = list(records)
-
-    if confirmed_only:
-        items = [r for r in items if (r.get("eqsl_qsl_rcvd") or "").upper() == "Y"]
-    if date_from or date_to:
-        items = [r for r in items if in_window(r)]
+    # One pass: filter, keep a small sample and fold the rest into the tally
+    agg = Aggregator([by])
+    sample: list[QsoRecord] = []
+    total_in = confirmed_in = 0
+    for r in records:
+        confirmed = (r.get("eqsl_qsl_rcvd") or "").upper() == "Y"
+        if confirmed_only and not confirmed:
+            continue
+        if (date_from or date_to) and not in_window(r):
+            continue
+        total_in += 1
+        confirmed_in += confirmed
+        if len(sample) < 10:
+            sample.append(r)
+        v = r.get(by)
+        agg.add({by: v} if isinstance(v, str) else {})
 
-    key = "band" if by == "band" else "mode"
     tally: dict[str, int] = {}
-    for r in items:
-        # Guard each .upper() with a default string
-        v = r.get(key)
-        k = (v if isinstance(v, str) else "UNKNOWN").upper()
-        tally[k] = tally.get(k, 0) + 1
-
-    sample = items[:10]
-    total_in = len(items)
-    confirmed_in = sum(1 for r in items if (r.get("eqsl_qsl_rcvd") or "").upper() == "Y")
+    for row in agg.results():
+        k = (row[by] or "UNKNOWN").upper()
+        tally[k] = tally.get(k, 0) + row["count"]
 
     return {
         "total": total_in,
@@ -0,0 +1,269 @@
+"""
+Opt-in profiling for CLI commands and MCP tool calls.
+
+A `ProfileSession` owns one per-run directory (`<root>/<timestamp>-<pid>`)
+and writes one set of files per profiled unit of work:
+
+- `NNNN-<label>.prof` / `.txt`: cProfile stats (load the `.prof` with
+  `pstats` or snakeviz) and a top-N summary by cumulative time.
+- `NNNN-<label>.stacks`: sampled stacks of every thread in collapsed
+  ("folded") format, ready for flamegraph.pl or speedscope.
+- `NNNN-<label>.malloc.txt`: tracemalloc current/peak bytes and the top
+  allocation sites.
+
+cProfile only sees the thread that enabled it, so the MCP server (which
+runs sync tools in a worker pool) defaults to the stack sampler.
+
+The CLI enables it with `adif-mcp --profile[=DIR] [--profile-mode MODE]
+[--trace-malloc] <command> ...`; the MCP server reads `ADIF_MCP_PROFILE`
+(`1` or a directory), `ADIF_MCP_PROFILE_MODE` and `ADIF_MCP_TRACE_MALLOC`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+
+PROFILE_ENV = "ADIF_MCP_PROFILE"
+PROFILE_MODE_ENV = "ADIF_MCP_PROFILE_MODE"
+TRACE_MALLOC_ENV = "ADIF_MCP_TRACE_MALLOC"
+
+MODES = ("cprofile", "sample")
+
+_FALSE = {"", "0", "false", "no", "off"}
+_TRUE = {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True)
+class ProfileConfig:
+    """What to capture and where to write it.
+
+    Attributes:
+        root: Directory that receives one sub-directory per run.
+        mode: "cprofile", "sample", or None for no CPU profile.
+        trace_malloc: Also record tracemalloc peak and top allocations.
+        interval: Sampling period in seconds for the "sample" mode.
+        top: Number of functions/allocation sites in the text summaries.
+    """
+
+    root: Path
+    mode: str | None = "cprofile"
+    trace_malloc: bool = False
+    interval: float = 0.005
+    top: int = 30
+
+    def __post_init__(self) -> None:
+        """Reject unknown modes early."""
+        if self.mode is not None and self.mode not in MODES:
+            raise ValueError(f"Unknown profile mode '{self.mode}'. Expected one of {MODES}.")
+
+
+def default_root() -> Path:
+    """Default output root: `profiles/` in the config dir."""
+    from adif_mcp.utils.paths import config_dir
+
+    return config_dir() / "profiles"
+
+
+def config_from_env(
+    environ: Mapping[str, str] | None = None, *, default_mode: str = "sample"
+) -> ProfileConfig | None:
+    """Profiling settings from `ADIF_MCP_PROFILE*` variables, or None if off.
+
+    `ADIF_MCP_PROFILE` is `1`/`true` for the default directory or a
+    directory path; `ADIF_MCP_TRACE_MALLOC=1` alone enables allocation
+    tracking without a CPU profile.
+    """
+    env = os.environ if environ is None else environ
+    where = env.get(PROFILE_ENV, "").strip()
+    malloc = env.get(TRACE_MALLOC_ENV, "").strip().lower() in _TRUE
+    if where.lower() in _FALSE and not malloc:
+        return None
+    if where.lower() in _FALSE:
+        mode: str | None = None
+        root = default_root()
+    else:
+        mode = env.get(PROFILE_MODE_ENV, "").strip().lower() or default_mode
+        root = default_root() if where.lower() in _TRUE else Path(where).expanduser()
+    return ProfileConfig(root=root, mode=mode, trace_malloc=malloc)
+
+
+class StackSampler:
+    """Background thread that counts folded stacks of all other threads."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        """Create a sampler that wakes every `interval` seconds."""
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="adif-mcp-sampler", daemon=True)
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the thread."""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names: dict[int, str] = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                parts = []
+                f: FrameType | None = frame
+                while f is not None:
+                    code = f.f_code
+                    parts.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}:"
+                        f"{code.co_firstlineno})"
+                    )
+                    f = f.f_back
+                if ident not in names:
+                    names[ident] = next(
+                        (t.name for t in threading.enumerate() if t.ident == ident),
+                        str(ident),
+                    )
+                parts.append(names[ident])
+                self.counts[";".join(reversed(parts))] += 1
+            self.samples += 1
+
+    def write(self, path: Path) -> None:
+        """Write `stack count` lines, heaviest first."""
+        with path.open("w", encoding="utf-8") as fh:
+            for stack, n in self.counts.most_common():
+                fh.write(f"{stack} {n}\n")
+
+
+class ProfileSession:
+    """One profiling run: a directory plus numbered per-call outputs."""
+
+    def __init__(self, config: ProfileConfig) -> None:
+        """Create the session; the run directory is made on first use."""
+        self.config = config
+        self._dir: Path | None = None
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        """The per-run output directory (created, with `run.json`, on demand)."""
+        if self._dir is None:
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            d = self.config.root / f"{stamp}-{os.getpid()}"
+            d.mkdir(parents=True, exist_ok=True)
+            meta = {
+                "pid": os.getpid(),
+                "argv": sys.argv,
+                "python": sys.version,
+                "started": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "mode": self.config.mode,
+                "trace_malloc": self.config.trace_malloc,
+            }
+            (d / "run.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+            self._dir = d
+        return self._dir
+
+    def _prefix(self, label: str) -> Path:
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", label) or "run"
+        return self.directory / f"{seq:04d}-{safe}"
+
+    @contextlib.contextmanager
+    def profile(self, label: str) -> Iterator[Path]:
+        """Profile the body; yields the output path prefix (no suffix)."""
+        cfg = self.config
+        prefix = self._prefix(label)
+        started_malloc = False
+        if cfg.trace_malloc:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_malloc = True
+            tracemalloc.reset_peak()
+
+        prof = None
+        sampler = None
+        if cfg.mode == "cprofile":
+            import cProfile
+
+            prof = cProfile.Profile()
+        elif cfg.mode == "sample":
+            sampler = StackSampler(cfg.interval)
+            sampler.start()
+
+        t0 = time.perf_counter()
+        try:
+            if prof is not None:
+                prof.enable()
+            try:
+                yield prefix
+            finally:
+                if prof is not None:
+                    prof.disable()
+        finally:
+            elapsed = time.perf_counter() - t0
+            if sampler is not None:
+                sampler.stop()
+                sampler.write(prefix.with_name(prefix.name + ".stacks"))
+            if prof is not None:
+                _write_cprofile(prof, prefix, cfg.top, elapsed)
+            if cfg.trace_malloc:
+                _write_malloc(prefix, cfg.top, stop=started_malloc)
+
+
+def _write_cprofile(prof: object, prefix: Path, top: int, elapsed: float) -> None:
+    import io
+    import pstats
+
+    prof_path = prefix.with_name(prefix.name + ".prof")
+    buf = io.StringIO()
+    stats = pstats.Stats(prof, stream=buf)  # type: ignore[arg-type]
+    stats.dump_stats(prof_path)
+    buf.write(f"wall time: {elapsed:.3f}s\n")
+    stats.sort_stats("cumulative").print_stats(top)
+    prefix.with_name(prefix.name + ".txt").write_text(buf.getvalue(), encoding="utf-8")
+
+
+def _write_malloc(prefix: Path, top: int, *, stop: bool) -> None:
+    import tracemalloc
+
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        )
+    )
+    if stop:
+        tracemalloc.stop()
+    lines = [
+        f"current: {current} bytes",
+        f"peak: {peak} bytes",
+        "",
+        f"top {top} allocation sites (live at exit):",
+    ]
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        where = f"{frame.filename}:{frame.lineno}"
+        lines.append(f"{stat.size:>12} B {stat.count:>8} blocks  {where}")
+    path = prefix.with_name(prefix.name + ".malloc.txt")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
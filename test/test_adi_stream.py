@@ -0,0 +1,114 @@
+"""Tests for the incremental byte-oriented ADI scanner."""
+
+from pathlib import Path
+
+from adif_mcp.parsers.adi_stream import AdiScanner, iter_raw_records, iter_raw_records_reverse
+
+_DATA = Path(__file__).parent / "data" / "ki7mt-sample.adi"
+
+
+def test_chunk_boundaries_do_not_matter() -> None:
+    """Feeding one byte at a time yields the same records and exact raw spans."""
+    data = _DATA.read_bytes()
+    whole = AdiScanner()
+    expected = whole.feed(data) + whole.finish()
+
+    sc = AdiScanner()
+    got = []
+    for i in range(len(data)):
+        got.extend(sc.feed(data[i : i + 1]))
+    got.extend(sc.finish())
+
+    assert [r.fields for r in got] == [r.fields for r in expected]
+    assert len(got) > 100
+    assert all(data[r.offset : r.end] == r.raw for r in got)
+
+
+def test_header_and_trailing_record() -> None:
+    """Header fields are set aside; a trailing record is only flushed by finish()."""
+    sc = AdiScanner()
+    out = sc.feed(b"Log\n<ADIF_VER:5>3.1.6<EOH>\n<CALL:4>K1AB<eor>\n<CALL:3>W1A")
+    assert [r.fields for r in out] == [{"call": "K1AB"}]
+    assert sc.header_fields == {"adif_ver": "3.1.6"}
+    assert sc.header is not None and sc.header.endswith(b"<EOH>")
+    assert sc.pending
+    assert [r.fields for r in sc.finish()] == [{"call": "W1A"}]
+
+
+def test_reverse_reader_matches_forward(tmp_path: Path) -> None:
+    """Reading backwards yields the forward records reversed, whatever the block size."""
+    path = tmp_path / "log.adi"
+    path.write_bytes(
+        _DATA.read_bytes()
+        + b"<CALL:4>W1AW<COMMENT:19>see <eor> and <EOR><EOR>\n"
+        + b"<CALL:3>K1A<NOTES:5><EOR><EOR>\n<CALL:4>TAIL"
+    )
+    with path.open("rb") as fh:
+        forward = [(r.fields, r.offset, r.raw) for r in iter_raw_records(fh)]
+    for block in (16, 97, 1 << 16):
+        backward = [
+            (r.fields, r.offset, r.raw)
+            for r in iter_raw_records_reverse(path, block_size=block)
+        ]
+        assert backward[::-1] == forward
+    assert forward[-3][0]["comment"] == "see <eor> and <EOR>"
+
+
+def test_parse_adif_tail_reads_only_the_end(tmp_path: Path) -> None:
+    """Negative start_at / from_end page from EOF without counting the whole log."""
+    import asyncio
+
+    from adif_mcp.mcp.server import parse_adif
+
+    path = tmp_path / "big.adi"
+    path.write_text(
+        "<EOH>\n" + "".join(f"<CALL:{len(str(i)) + 1}>K{i}<EOR>\n" for i in range(1, 5001))
+    )
+    (out,) = asyncio.run(parse_adif(str(path), start_at=-3, limit=2))
+    assert "TOTAL RECORDS: unknown" in out.text
+    assert "--- RECORD -3 ---\n<CALL:5>K4998<EOR>" in out.text
+    assert "--- RECORD -2 ---\n<CALL:5>K4999<EOR>" in out.text
+    assert "K5000" not in out.text
+
+    (out,) = asyncio.run(parse_adif(str(path), start_at=3, limit=2, from_end=True))
+    assert "DISPLAYING: -4 to -3" in out.text
+    assert "K4997" in out.text and "K4998" in out.text
+
+    small = tmp_path / "small.adi"
+    small.write_text("<EOH>\n<CALL:2>K1<EOR>\n<CALL:2>K2<EOR>\n")
+    (out,) = asyncio.run(parse_adif(str(small), start_at=-5, limit=5))
+    assert "TOTAL RECORDS: 2\nDISPLAYING: 1 to 2" in out.text
+
+
+def test_parse_adif_structured_projection_and_budget(tmp_path: Path) -> None:
+    """fields projects records, structured returns JSON, max_bytes yields a cursor."""
+    import asyncio
+    import json
+
+    from adif_mcp.mcp.server import parse_adif
+
+    path = tmp_path / "log.adi"
+    path.write_text(
+        "<EOH>\n"
+        + "".join(
+            f"<CALL:{len(str(i)) + 1}>K{i}<BAND:3>20m<COMMENT:9>long note<EOR>\n"
+            for i in range(1, 51)
+        )
+    )
+    (out,) = asyncio.run(
+        parse_adif(str(path), start_at=5, limit=10, fields=["call", "BAND"], structured=True)
+    )
+    doc = json.loads(out.text)
+    assert (doc["total"], doc["start_at"], doc["count"]) == (50, 5, 10)
+    assert doc["records"][0] == {"CALL": "K5", "BAND": "20m"}
+    assert doc["fields"] == ["CALL", "BAND"] and doc["next_start_at"] == 15
+
+    (out,) = asyncio.run(parse_adif(str(path), limit=10, structured=True, max_bytes=100))
+    doc = json.loads(out.text)
+    assert 0 < doc["count"] < 10 and doc["next_start_at"] == 1 + doc["count"]
+    (out,) = asyncio.run(parse_adif(str(path), start_at=45, limit=10, structured=True))
+    assert json.loads(out.text)["next_start_at"] is None
+
+    (out,) = asyncio.run(parse_adif(str(path), limit=10, fields=["CALL"], max_bytes=80))
+    assert "NEXT START_AT: 3 (size limit reached)" in out.text
+    assert "--- RECORD 2 ---\n<CALL:2>K2<EOR>" in out.text and "COMMENT" not in out.text
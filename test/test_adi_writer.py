@@ -0,0 +1,85 @@
+"""Tests for the streaming ADI writer and its CLI wiring."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.cli import root
+from adif_mcp.parsers.adi_stream import AdiScanner, iter_records
+from adif_mcp.parsers.adi_writer import AdiWriter, encode_record
+
+
+class _CountingStream(io.BytesIO):
+    """BytesIO that counts writelines calls."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches = 0
+
+    def writelines(self, lines):  # type: ignore[no-untyped-def,override]
+        """Count and forward."""
+        self.batches += 1
+        super().writelines(lines)
+
+
+def test_canonical_order_and_byte_lengths() -> None:
+    """Core fields come first; lengths count UTF-8 bytes."""
+    rec = {"zzz_app": "1", "COMMENT": "café", "mode": "CW", "call": "W1AW", "band": "20m"}
+    data = encode_record(rec)
+    assert data == (
+        b"<CALL:4>W1AW<BAND:3>20m<MODE:2>CW<COMMENT:5>caf\xc3\xa9<ZZZ_APP:1>1<EOR>\n"
+    )
+    buf = io.BytesIO()
+    with AdiWriter(buf, comment="") as w:
+        w.write(rec)
+    assert buf.getvalue().endswith(data)
+
+
+def test_header_and_round_trip() -> None:
+    """Header carries PROGRAMID; records parse back unchanged."""
+    recs = [
+        {"call": f"K{i}AA", "band": "40m", "name": "Zoë", "notes": "" if i else None}
+        for i in range(10)
+    ]
+    buf = _CountingStream()
+    with AdiWriter(buf, {"station_callsign": "KI7MT"}, batch=4) as w:
+        assert w.write_all(recs) == 10  # type: ignore[arg-type]
+    assert buf.batches == 3
+    scanner = AdiScanner()
+    out = list(scanner.feed(buf.getvalue()))
+    assert scanner.header_fields["programid"] == "ADIF-MCP"
+    assert scanner.header_fields["station_callsign"] == "KI7MT"
+    assert [r.fields for r in out] == [
+        {"call": f"K{i}AA", "band": "40m", "name": "Zoë"} for i in range(10)
+    ]
+
+
+def test_write_raw_and_bad_names() -> None:
+    """Raw records pass through; malformed field names are rejected."""
+    buf = io.BytesIO()
+    with AdiWriter(buf, comment="") as w:
+        w.write_raw(b"<CALL:4>W1AW<EOR>")
+        with pytest.raises(ValueError):
+            w.write({"bad name": "x"})
+    assert buf.getvalue().endswith(b"<EOH>\n<CALL:4>W1AW<EOR>\n")
+
+
+def test_convert_adi_output(tmp_path: Path) -> None:
+    """`convert --adi` writes a normalized ADI log that parses back."""
+    src = tmp_path / "in.adi"
+    src.write_text(
+        "<EOH>\n<CALL:4>W1AW<QSO_DATE:8>20240101<TIME_ON:4>1200<BAND:3>20M<MODE:2>CW<EOR>\n",
+        encoding="utf-8",
+    )
+    out = tmp_path / "out.adi"
+    nd = tmp_path / "out.ndjson"
+    common = ["convert", "-i", str(src), "--station-call", "KI7MT", "--band", "20m"]
+    assert root.dispatch([*common, "-o", str(out), "--adi"]) == 0
+    root.dispatch([*common, "-o", str(nd), "--ndjson"])
+    (rec,) = iter_records(out)
+    (row,) = [json.loads(line) for line in nd.read_text().splitlines()]
+    assert rec["call"] == row["call"] == "W1AW"
+    assert rec["band"].lower() == row["band"]  # ADI keeps the source value
+    assert out.read_bytes().index(b"<CALL:") < out.read_bytes().index(b"<BAND:")
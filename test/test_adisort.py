@@ -0,0 +1,55 @@
+"""Tests for the external ADIF merge sort."""
+
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.cli.sort import parse_size
+from adif_mcp.logbook.adisort import sort_adif
+from adif_mcp.parsers.adi_stream import iter_raw_records
+
+_HEADER = "Generated by logger A\n<ADIF_VER:5>3.1.6<EOH>"
+_RECORDS = [
+    "<CALL:4>N0CZ<QSO_DATE:8>20240902<TIME_ON:6>120000<COMMENT:6>café!<EOR>",
+    "<CALL:5>W9ILY<QSO_DATE:8>20220616<TIME_ON:4>2358<EOR>",
+    "<CALL:5>KM4FO<QSO_DATE:8>20240902<TIME_ON:4>1130<EOR>",
+    "<CALL:4>K1JT<QSO_DATE:8>20220616<TIME_ON:4>2358<EOR>",
+    "<CALL:4>AA1A<EOR>",
+]
+
+
+def _write(tmp_path: Path) -> Path:
+    p = tmp_path / "mixed.adi"
+    p.write_bytes(("\n".join([_HEADER, *_RECORDS]) + "\n").encode("utf-8"))
+    return p
+
+
+@pytest.mark.parametrize("max_bytes", [64 * 1024 * 1024, 1])
+def test_sort_by_date_time_keeps_header_and_bytes(tmp_path: Path, max_bytes: int) -> None:
+    """Chronological order, stable ties, header and raw bytes preserved."""
+    src = _write(tmp_path)
+    out = tmp_path / "sorted.adi"
+    assert sort_adif(src, out, max_bytes=max_bytes) == 5
+
+    data = out.read_bytes()
+    assert data.startswith(_HEADER.encode("utf-8") + b"\n")
+    with out.open("rb") as fh:
+        raws = [r.raw.decode("utf-8") for r in iter_raw_records(fh)]
+    assert raws == [_RECORDS[i] for i in (4, 1, 3, 2, 0)]
+
+
+def test_sort_by_call(tmp_path: Path) -> None:
+    """Custom keys are honoured."""
+    src = _write(tmp_path)
+    out = tmp_path / "by_call.adi"
+    sort_adif(src, out, ["CALL"])
+    with out.open("rb") as fh:
+        calls = [r.fields["call"] for r in iter_raw_records(fh)]
+    assert calls == ["AA1A", "K1JT", "KM4FO", "N0CZ", "W9ILY"]
+
+
+def test_parse_size() -> None:
+    """Memory caps accept plain bytes and K/M/G suffixes."""
+    assert parse_size("4096") == 4096
+    assert parse_size("64M") == 64 << 20
+    assert parse_size("1.5g") == int(1.5 * (1 << 30))
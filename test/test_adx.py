@@ -0,0 +1,129 @@
+"""Tests for the streaming ADX reader/writer and its CLI/MCP wiring."""
+
+import asyncio
+import gzip
+import io
+import json
+from pathlib import Path
+
+from adif_mcp.cli import root
+from adif_mcp.parsers.adi_stream import iter_records
+from adif_mcp.parsers.adx import AdxReader, AdxWriter, is_adx, read_adx_header
+
+_ADX = """<?xml version="1.0" encoding="UTF-8"?>
+<ADX>
+  <HEADER>
+    <ADIF_VER>3.1.6</ADIF_VER>
+    <PROGRAMID>MONOLOG</PROGRAMID>
+    <STATION_CALLSIGN>KI7MT</STATION_CALLSIGN>
+    <USERDEF FIELDID="1" TYPE="N">EPC</USERDEF>
+  </HEADER>
+  <RECORDS>
+    <RECORD>
+      <QSO_DATE>19900620</QSO_DATE>
+      <TIME_ON>1523</TIME_ON>
+      <CALL>VK9NS</CALL>
+      <BAND>20M</BAND>
+      <MODE>RTTY</MODE>
+      <COMMENT> Café &amp; friends </COMMENT>
+      <USERDEF FIELDNAME="EPC">32123</USERDEF>
+      <APP PROGRAMID="MONOLOG" FIELDNAME="Compression" TYPE="s">off</APP>
+    </RECORD>
+    <RECORD>
+      <QSO_DATE>20101022</QSO_DATE>
+      <TIME_ON>0111</TIME_ON>
+      <CALL>ON4UN</CALL>
+      <BAND>40M</BAND>
+      <MODE>PSK</MODE>
+      <SUBMODE>PSK63</SUBMODE>
+      <NOTES></NOTES>
+    </RECORD>
+  </RECORDS>
+</ADX>
+"""
+
+
+def test_reader_yields_adi_style_records() -> None:
+    """Records use lowercased keys, stripped values; USERDEF/APP are named."""
+    reader = AdxReader(io.BytesIO(_ADX.encode("utf-8")))
+    assert reader.header_fields == {
+        "adif_ver": "3.1.6",
+        "programid": "MONOLOG",
+        "station_callsign": "KI7MT",
+        "userdef1": "EPC",
+    }
+    recs = list(reader)
+    assert recs[0]["call"] == "VK9NS"
+    assert recs[0]["comment"] == "Café & friends"
+    assert recs[0]["epc"] == "32123"
+    assert recs[0]["app_monolog_compression"] == "off"
+    assert recs[1] == {
+        "qso_date": "20101022",
+        "time_on": "0111",
+        "call": "ON4UN",
+        "band": "40M",
+        "mode": "PSK",
+        "submode": "PSK63",
+    }
+
+
+def test_reader_detaches_records_as_it_goes() -> None:
+    """Processed records are removed from the tree (bounded by parser read-ahead)."""
+    buf = io.BytesIO()
+    with AdxWriter(buf) as w:
+        w.write_all({"call": f"K{i}AA", "band": "20m"} for i in range(20000))
+    reader = AdxReader(io.BytesIO(buf.getvalue()))
+    n = 0
+    for _ in reader:
+        n += 1
+        assert reader._parent is not None and len(reader._parent) < 500
+    assert n == 20000
+
+
+def test_writer_round_trip(tmp_path: Path) -> None:
+    """Writer output parses back to the same records, USERDEF/APP included."""
+    recs = list(AdxReader(io.BytesIO(_ADX.encode("utf-8"))))
+    path = tmp_path / "out.adx.gz"
+    with gzip.open(path, "wb") as fh, AdxWriter(fh, {"userdef1": "EPC"}, batch=1) as w:
+        w.write_all(recs)
+    text = gzip.decompress(path.read_bytes()).decode("utf-8")
+    assert "<PROGRAMID>ADIF-MCP</PROGRAMID>" in text
+    assert '<USERDEF FIELDID="1">EPC</USERDEF>' in text
+    assert '<USERDEF FIELDNAME="EPC">32123</USERDEF>' in text
+    assert '<APP PROGRAMID="MONOLOG" FIELDNAME="COMPRESSION">off</APP>' in text
+    assert is_adx(path)
+    assert read_adx_header(path)["userdef1"] == "EPC"
+    assert list(iter_records(path)) == recs
+
+
+def test_transcode_and_convert_accept_adx(tmp_path: Path) -> None:
+    """ADX → ADI → ADX keeps fields; convert reads ADX with header station call."""
+    src = tmp_path / "log.adx"
+    src.write_text(_ADX, encoding="utf-8")
+    adi = tmp_path / "log.adi"
+    back = tmp_path / "back.adx"
+    assert root.dispatch(["transcode", "-i", str(src), "-o", str(adi)]) == 0
+    assert root.dispatch(["transcode", "-i", str(adi), "-o", str(back)]) == 0
+    assert list(iter_records(adi)) == list(iter_records(src)) == list(iter_records(back))
+    assert b"<PROGRAMID:8>ADIF-MCP" in adi.read_bytes()
+
+    out = tmp_path / "out.ndjson"
+    root.dispatch(["convert", "-i", str(src), "-o", str(out), "--ndjson"])
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["call"] for r in rows] == ["VK9NS", "ON4UN"]
+    assert rows[0]["station_call"] == "KI7MT"
+
+
+def test_mcp_tools_accept_adx(tmp_path: Path) -> None:
+    """parse_adif pages ADX files; validate_adif_record takes an ADX record."""
+    from adif_mcp.mcp.server import parse_adif, validate_adif_record
+
+    src = tmp_path / "log.adx"
+    src.write_text(_ADX, encoding="utf-8")
+    (out,) = asyncio.run(parse_adif(str(src), start_at=2, limit=5))
+    assert "TOTAL RECORDS: 2" in out.text
+    assert "--- RECORD 2 ---\n<QSO_DATE:8>20101022<TIME_ON:4>0111<CALL:5>ON4UN" in out.text
+
+    report = validate_adif_record("<RECORD><CALL>W1AW</CALL><FREQ>abc</FREQ></RECORD>")
+    assert report["record"] == {"CALL": "W1AW", "FREQ": "abc"}
+    assert report["status"] == "invalid"
@@ -0,0 +1,109 @@
+"""Tests for the streaming group-by aggregation engine."""
+
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.logbook.aggregate import Aggregator
+
+_RECS = [
+    {"call": "W1AW", "band": "20M", "mode": "CW", "qso_date": "20240105", "dxcc": "291"},
+    {
+        "call": "w1aw",
+        "band": "20m",
+        "mode": "SSB",
+        "qso_date": "20240210",
+        "dxcc": "291",
+        "lotw_qsl_rcvd": "Y",
+    },
+    {
+        "call": "JA1XX",
+        "band": "40m",
+        "mode": "FT8",
+        "qso_date": "20231231",
+        "dxcc": "339",
+        "cont": "as",
+    },
+    {
+        "call": "DL1AB",
+        "band": "20m",
+        "mode": "FT8",
+        "qso_date": "20240301",
+        "dxcc": "230",
+        "eqsl_qsl_rcvd": "Y",
+        "freq": "14.074",
+    },
+    {"call": "K1ABC", "mode": "CW", "qso_date": "2024013x", "freq": "7.030"},
+]
+
+
+def _run(max_in_memory: int, **kw: object) -> list[dict[str, object]]:
+    agg = Aggregator(
+        ["band", "year"],
+        ["count", "distinct:call", "min:qso_date", "max:freq", "confirmed", "confirmed:lotw"],
+        max_in_memory=max_in_memory,
+        **kw,  # type: ignore[arg-type]
+    )
+    agg.add_many(_RECS)
+    return agg.results()
+
+
+def test_group_keys_and_aggregates() -> None:
+    """Keys are normalized; distinct, min/max and confirmed shares are per group."""
+    rows = _run(1000)
+    by = {(r["band"], r["year"]): r for r in rows}
+    assert set(by) == {("20m", "2024"), ("40m", "2023"), (None, None)}
+    r20 = by[("20m", "2024")]
+    assert (r20["count"], r20["distinct:call"], r20["min:qso_date"]) == (3, 2, "20240105")
+    assert r20["max:freq"] == "14.074"
+    assert (r20["confirmed"], r20["confirmed:lotw"]) == (0.6667, 0.3333)
+    assert rows[-1]["band"] is None  # missing keys sort last
+
+
+def test_spill_matches_in_memory() -> None:
+    """A tiny memory bound spills partial states and merges to the same rows."""
+    assert _run(1) == _run(1000)
+
+
+def test_approx_distinct_counts_toward_memory() -> None:
+    """Each new HyperLogLog state is charged its registers, so many groups spill."""
+    agg = Aggregator(["call"], ["approx_distinct:band"], max_in_memory=4096)
+    agg.add_many({"call": f"K{i}AA", "band": "20m"} for i in range(10))
+    assert agg.spills == 2
+    rows = agg.results()
+    assert len(rows) == 10
+    assert all(r["approx_distinct:band"] == 1 for r in rows)
+
+
+def test_where_order_and_errors() -> None:
+    """where filters on normalized keys; order_by sorts; bad specs are rejected."""
+    agg = Aggregator(["mode"], where={"band": "20M", "year": "2024"})
+    agg.add_many(_RECS)
+    rows = agg.results(order_by="-count")
+    assert (agg.total, agg.matched) == (5, 3)
+    assert sorted(r["mode"] for r in rows) == ["CW", "FT8", "SSB"]
+    assert [r["mode"] for r in agg.results()] == []  # results() drains the table
+    with pytest.raises(ValueError):
+        Aggregator(["band"], ["sum:freq"])
+    with pytest.raises(ValueError):
+        Aggregator(["band"], ["confirmed:fax"])
+    totals = Aggregator([], ["count", "distinct:continent"])
+    totals.add_many(_RECS)
+    assert totals.results() == [{"count": 5, "distinct:continent": 1}]
+
+
+def test_aggregate_log_tool(tmp_path: Path) -> None:
+    """The MCP tool aggregates across logs, ordered and limited."""
+    from adif_mcp.mcp.server import aggregate_log
+
+    a = tmp_path / "a.adi"
+    b = tmp_path / "b.adi"
+    a.write_text("<EOH>\n<CALL:4>W1AW<BAND:3>20m<EOR>\n<CALL:4>K1AB<BAND:3>40m<EOR>\n")
+    b.write_text("<CALL:4>W1AW<BAND:3>20M<EOR>\n<CALL:4>N0XX<BAND:3>20m<EOR>\n")
+    out = aggregate_log(
+        [str(a), str(b)], ["band"], ["count", "distinct:call"], limit=1, order_by="-count"
+    )
+    assert out["total"] == 4 and out["groups"] == 2
+    assert out["rows"] == [{"band": "20m", "count": 3, "distinct:call": 2}]
+    assert "error" in aggregate_log([str(a)], ["band"], ["median:freq"])
+    assert "error" in aggregate_log([str(tmp_path / "nope.adi")], ["band"])
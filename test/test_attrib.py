@@ -0,0 +1,98 @@
+"""Tests for interval-indexed callsign attribution (`adif-mcp attrib`)."""
+
+import argparse
+import json
+from datetime import date
+from pathlib import Path
+
+from adif_mcp.cli.attrib import CallRange, CallsignIndex, cmd_attrib
+
+_RANGES = [
+    CallRange("ki7mt", "KI7MT", date(2010, 1, 1), None, ("KI7MT/4", "KI7MT/P")),
+    CallRange("ki7mt", "K7XX", date(2015, 6, 1), date(2015, 6, 30)),
+    CallRange("contest", "W7C", date(2015, 6, 27), date(2015, 6, 28)),
+    CallRange("dxped", "VP2V/KI7MT", date(2020, 3, 1), date(2020, 3, 10)),
+]
+
+
+def test_latest_start_wins_and_gaps() -> None:
+    """Overlapping ranges resolve to the latest start; uncovered dates give None."""
+    index = CallsignIndex(_RANGES)
+    calls = [
+        (hit.callsign if hit else None)
+        for hit in map(
+            index.at,
+            [
+                date(2009, 12, 31),
+                date(2012, 1, 1),
+                date(2015, 6, 26),
+                date(2015, 6, 28),
+                date(2015, 6, 29),
+                date(2015, 7, 1),
+                date(2020, 3, 5),
+                date(2030, 1, 1),
+            ],
+        )
+    ]
+    assert calls == [None, "KI7MT", "K7XX", "W7C", "K7XX", "KI7MT", "VP2V/KI7MT", "KI7MT"]
+    assert index.lookup("20150627").persona == "contest"  # type: ignore[union-attr]
+    assert index.lookup("20150627") is index.lookup("20150627")
+    assert index.lookup.cache_info().hits == 2
+    assert index.by_call["KI7MT/4"].callsign == "KI7MT"
+
+    bounded = CallsignIndex([CallRange("p", "N0CALL", date(2000, 1, 1), date(2000, 12, 31))])
+    assert bounded.at(date(2001, 1, 1)) is None
+
+
+def test_cmd_attrib_with_ranges_file(tmp_path: Path) -> None:
+    """Ranges from a file attribute dates; aliases are kept and attribute undated QSOs."""
+    ranges = tmp_path / "ranges.json"
+    ranges.write_text(
+        json.dumps(
+            [
+                {
+                    "persona": "ki7mt",
+                    "callsign": "KI7MT",
+                    "start": "2010-01-01",
+                    "aliases": ["KI7MT/4"],
+                },
+                {
+                    "persona": "contest",
+                    "callsign": "W7C",
+                    "start": "20150627",
+                    "end": "20150628",
+                },
+            ]
+        ),
+        encoding="utf-8",
+    )
+    src = tmp_path / "in.ndjson"
+    recs = [
+        {"call": "A", "qso_date": "20150627"},
+        {"call": "B", "qso_date": "20160101", "station_call": "KI7MT/4"},
+        {"call": "C", "qso_date": "20160101", "station_call": "N0CALL"},
+        {"call": "D", "station_call": "ki7mt/4"},
+        {"call": "E", "qso_date": "20000101"},
+    ]
+    src.write_text("".join(json.dumps(r) + "\n" for r in recs), encoding="utf-8")
+    out = tmp_path / "out.ndjson"
+    args = argparse.Namespace(
+        persona=None,
+        ranges=str(ranges),
+        input=str(src),
+        output=str(out),
+        force_overwrite=True,
+        stats=False,
+    )
+    assert cmd_attrib(args) == 0
+    got = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r.get("station_call") for r in got] == ["W7C", "KI7MT/4", "KI7MT", "ki7mt/4", None]
+    assert [r["_attrib"]["source"] for r in got] == [
+        "range",
+        "alias",
+        "range",
+        "alias",
+        "none",
+    ]
+    assert got[0]["_attrib"]["persona"] == "contest"
+    assert got[3]["_attrib"]["callsign"] == "KI7MT"
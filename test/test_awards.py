@@ -0,0 +1,157 @@
+"""Tests for the incremental award-progress engine."""
+
+import gzip
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.logbook.awards import AwardTracker, award_keys
+
+_LOG = (
+    "Test log<ADIF_VER:5>3.1.6<EOH>\n"
+    "<CALL:4>K1AB<BAND:3>20M<MODE:2>CW<DXCC:3>291<STATE:2>CT<CQZ:1>5"
+    "<LOTW_QSL_RCVD:1>Y<EOR>\n"
+    "<CALL:5>JA1XX<BAND:3>20M<MODE:3>FT8<DXCC:3>339<CQZ:2>25<EOR>\n"
+    "<CALL:4>W6GF<BAND:2>6M<MODE:3>SSB<DXCC:3>291<STATE:2>DC<CQZ:1>3"
+    "<GRIDSQUARE:6>CM87xx<QSL_RCVD:1>Y<EOR>\n"
+)
+
+
+def test_award_keys_extraction() -> None:
+    """DXCC/WAS/WAZ/VUCC keys come from the right fields and bands."""
+    keys = award_keys(
+        {"dxcc": "291", "state": "dc", "cqz": "03", "band": "6m", "gridsquare": "cm87xx"}
+    )
+    assert keys == {"DXCC": ["291"], "WAS": ["MD"], "WAZ": ["3"], "VUCC": ["CM87"]}
+    # VUCC needs 6m or higher; WAS needs a US DXCC entity.
+    assert award_keys({"dxcc": "339", "state": "13", "band": "20m", "gridsquare": "PM95"}) == {
+        "DXCC": ["339"],
+        "WAS": [],
+        "WAZ": [],
+        "VUCC": [],
+    }
+
+
+def test_worked_vs_confirmed_slices() -> None:
+    """Progress is split by band/mode group and by confirmation."""
+    t = AwardTracker()
+    new = t.add({"dxcc": "291", "band": "20m", "mode": "CW", "lotw_qsl_rcvd": "Y"})
+    assert new == {"DXCC": ["291"]}
+    assert t.add({"dxcc": "291", "band": "40m", "mode": "SSB"}) == {}
+    t.add({"dxcc": "339", "band": "20m", "mode": "FT8"})
+
+    assert t.progress("DXCC") == {
+        "award": "DXCC", "band": "*", "mode": "*", "worked": 2, "confirmed": 1,
+    }
+    assert t.progress("dxcc", band="20M")["worked"] == 2
+    assert t.progress("DXCC", mode="SSB")["worked"] == 1
+    assert t.progress("DXCC", band="20m", mode="DIGITAL")["confirmed"] == 0
+    assert t.unconfirmed("DXCC") == ["339"]
+    with pytest.raises(ValueError):
+        t.progress("IOTA")
+
+
+def test_ingest_is_incremental_and_persisted(tmp_path: Path) -> None:
+    """Only appended QSOs are scanned; state round-trips through JSON."""
+    log = tmp_path / "log.adi"
+    state = tmp_path / "state.json"
+    log.write_text(_LOG, encoding="utf-8")
+
+    t = AwardTracker.open(log, state)
+    assert t.qso_count == 3
+    s = t.summary()["awards"]
+    assert s["DXCC"] == {
+        "worked": 2,
+        "confirmed": 1,
+        "by_band": {"20m": {"worked": 2, "confirmed": 1}, "6m": {"worked": 1, "confirmed": 1}},
+        "by_mode": {
+            "CW": {"worked": 1, "confirmed": 1},
+            "DIGITAL": {"worked": 1, "confirmed": 0},
+            "PHONE": {"worked": 1, "confirmed": 1},
+        },
+    }
+    assert t.members("WAS", confirmed=True) == ["CT", "MD"]
+    assert t.members("VUCC", band="6m") == ["CM87"]
+
+    # Append one QSO plus a half-written record; only the complete one counts.
+    with log.open("a", encoding="utf-8") as fh:
+        fh.write("<CALL:4>VK2A<BAND:3>15m<MODE:2>CW<DXCC:3>150<CQZ:2>30<EOR>\n<CALL:4>ZL")
+    t2 = AwardTracker.open(log, state)
+    assert t2.qso_count == 4
+    assert t2.progress("WAZ")["worked"] == 4
+    assert t2.progress("DXCC", mode="CW")["worked"] == 2
+
+    # Nothing new: state unchanged and nothing re-applied.
+    assert AwardTracker.open(log, state).qso_count == 4
+
+
+def test_rewritten_log_is_not_double_counted(tmp_path: Path) -> None:
+    """A replaced log rebuilds the state instead of adding to the old counts."""
+    log = tmp_path / "log.adi"
+    state = tmp_path / "state.json"
+    log.write_text(_LOG, encoding="utf-8")
+    assert AwardTracker.open(log, state).qso_count == 3
+
+    new = tmp_path / "new.adi"
+    new.write_text(
+        "<EOH>\n<CALL:4>VK2A<BAND:3>15m<MODE:2>CW<DXCC:3>150<CQZ:2>30<EOR>\n",
+        encoding="utf-8",
+    )
+    new.replace(log)
+    t = AwardTracker.open(log, state)
+    assert t.qso_count == 1
+    assert t.members("DXCC") == ["150"]
+
+
+def test_compressed_log_is_read_whole(tmp_path: Path) -> None:
+    """A gzipped log is decompressed and re-read in full when it changes."""
+    log = tmp_path / "log.adi.gz"
+    state = tmp_path / "state.json"
+    log.write_bytes(gzip.compress(_LOG.encode("utf-8")))
+    assert AwardTracker.open(log, state).qso_count == 3
+    assert AwardTracker.open(log, state).qso_count == 3
+
+    extra = "<CALL:4>VK2A<BAND:3>15m<MODE:2>CW<DXCC:3>150<CQZ:2>30<EOR>\n"
+    log.write_bytes(gzip.compress((_LOG + extra).encode("utf-8")))
+    t = AwardTracker.open(log, state)
+    assert t.qso_count == 4
+    assert t.members("DXCC") == ["150", "291", "339"]
+
+
+def test_replacing_one_log_keeps_the_others(tmp_path: Path) -> None:
+    """Only the replaced log's QSOs are dropped from a tracker fed by two logs."""
+    a = tmp_path / "a.adi"
+    b = tmp_path / "b.adi"
+    a.write_text(_LOG, encoding="utf-8")
+    b.write_text(
+        "<EOH>\n<CALL:4>VK2A<BAND:3>15m<MODE:2>CW<DXCC:3>150<CQZ:2>30<EOR>\n",
+        encoding="utf-8",
+    )
+    t = AwardTracker()
+    assert t.ingest_file(a) + t.ingest_file(b) == 4
+
+    new = tmp_path / "new.adi"
+    new.write_text(
+        "<EOH>\n<CALL:4>F5XX<BAND:3>40m<MODE:2>CW<DXCC:3>227<EOR>\n", encoding="utf-8"
+    )
+    new.replace(a)
+    assert t.ingest_file(a) == 1
+    assert t.qso_count == 2
+    assert t.members("DXCC") == ["150", "227"]
+    assert t.ingest_file(b) == 0
+
+
+def test_refilled_log_is_detected_across_opens(tmp_path: Path) -> None:
+    """A log truncated and refilled past the saved offset is re-read in full."""
+    log = tmp_path / "log.adi"
+    state = tmp_path / "state.json"
+    log.write_text(_LOG, encoding="utf-8")
+    assert AwardTracker.open(log, state).qso_count == 3
+
+    with log.open("r+", encoding="utf-8") as fh:  # same inode, larger size
+        fh.truncate(0)
+        fh.write(_LOG.replace("CM87xx", "DM79xx"))
+        fh.write("<CALL:4>VK2A<BAND:3>15m<MODE:2>CW<DXCC:3>150<CQZ:2>30<EOR>\n")
+    t = AwardTracker.open(log, state)
+    assert t.qso_count == 4
+    assert t.members("VUCC") == ["DM79"]
@@ -0,0 +1,52 @@
+"""Tests for the benchmark runner and its baseline gate."""
+
+import json
+from pathlib import Path
+
+from adif_mcp.bench.runner import compare, parse_size, run, synthetic_log
+from adif_mcp.cli import root
+
+
+def test_synthetic_log_is_deterministic() -> None:
+    """The same seed always produces the same log."""
+    assert synthetic_log(50, seed=3) == synthetic_log(50, seed=3)
+    assert synthetic_log(50, seed=3) != synthetic_log(50, seed=4)
+    assert synthetic_log(50).count("<EOR>") == 50
+    assert parse_size("1k") == 1000 and parse_size("1M") == 1_000_000
+
+
+def test_run_reports_throughput_latency_and_rss() -> None:
+    """Every requested workload yields a complete measurement."""
+    report = run(
+        [40], ["parse_adi_text", "adi_stream", "geography", "worked_lookup"], repeat=2
+    )
+    assert [r["workload"] for r in report["results"]] == [
+        "parse_adi_text",
+        "adi_stream",
+        "geography",
+        "worked_lookup",
+    ]
+    for r in report["results"]:
+        assert r["items"] == 40
+        assert r["throughput_per_s"] > 0
+        assert set(r["latency_ms"]) == {"p50", "p90", "p99", "max"}
+
+
+def test_compare_flags_regressions_only_past_threshold() -> None:
+    """Throughput drops beyond the threshold are reported."""
+    base = {"results": [{"workload": "w", "size": 10, "throughput_per_s": 100.0}]}
+    cur = {"results": [{"workload": "w", "size": 10, "throughput_per_s": 85.0}]}
+    assert compare(cur, base, 0.2) == []
+    (reg,) = compare(cur, base, 0.1)
+    assert reg["change"] == -0.15
+
+
+def test_cli_gates_on_baseline(tmp_path: Path) -> None:
+    """`adif-mcp bench` exits 1 when the baseline is out of reach."""
+    base = tmp_path / "base.json"
+    argv = ["bench", "--sizes", "20", "-w", "geography", "-o", str(tmp_path / "r.json")]
+    assert root.dispatch([*argv, "--save-baseline", str(base)]) == 0
+    data = json.loads(base.read_text(encoding="utf-8"))
+    data["results"][0]["throughput_per_s"] *= 1000
+    base.write_text(json.dumps(data), encoding="utf-8")
+    assert root.dispatch([*argv, "--baseline", str(base)]) == 1
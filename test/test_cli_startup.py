@@ -0,0 +1,46 @@
+"""Import-time budget for short-lived CLI invocations."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Cumulative microseconds spent importing adif_mcp modules (stdlib modules they
+# pull in included). Measured at ~5 ms; the budget leaves room for slow CI.
+IMPORT_BUDGET_US = 60_000
+
+HEAVY_MODULES = {"click", "fastmcp", "aiofiles", "mcp.types", "adif_mcp.mcp.server"}
+
+
+def _importtime(*args: str) -> dict[str, int]:
+    """Run the CLI under `-X importtime`; map top-level imports to cumulative µs."""
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "adif_mcp.cli", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    assert proc.returncode == 0, proc.stderr
+    imports: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imports[name.rstrip()] = int(cumulative)
+    return imports
+
+
+@pytest.mark.parametrize("args", [("--version",), ("convert", "--help"), ("--help",)])
+def test_cli_startup_is_lazy(args: tuple[str, ...]) -> None:
+    """Quick commands skip heavy dependencies and stay within the import budget."""
+    imports = _importtime(*args)
+    loaded = {name.strip() for name in imports}
+    assert not loaded & HEAVY_MODULES
+    own = sum(us for name, us in imports.items() if name.startswith("adif_mcp"))
+    assert own < IMPORT_BUDGET_US, f"{own} µs spent importing adif_mcp modules"
@@ -0,0 +1,104 @@
+"""Tests for typed columnar export (CSV, Parquet, Arrow IPC)."""
+
+import csv
+import dataclasses
+import datetime
+import json
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.cli import root
+from adif_mcp.cli.convert_adi import QsoRecord
+from adif_mcp.parsers.columnar import COLUMNS, have_pyarrow, open_columnar, typed_row
+
+_ADI = (
+    "<STATION_CALLSIGN:5>KI7MT<EOH>\n"
+    "<CALL:4>W1AW<QSO_DATE:8>20240101<TIME_ON:6>123456<BAND:3>20M<MODE:2>CW"
+    "<FREQ:6>14.025<TX_PWR:3>100<EOR>\n"
+    "<CALL:5>JA1XX<QSO_DATE:8>20240102<TIME_ON:4>0001<BAND:3>40M<MODE:3>FT8"
+    "<LOTW_QSL_RCVD:1>Y<LOTW_QSLRDATE:8>20240105<EOR>\n"
+)
+
+
+def test_columns_cover_qso_record() -> None:
+    """Every QsoRecord field has a column (plus the derived qso_datetime)."""
+    names = [name for name, _ in COLUMNS]
+    assert set(names) - {f.name for f in dataclasses.fields(QsoRecord)} == {"qso_datetime"}
+
+
+def test_typed_row_parses_values() -> None:
+    """Dates, times and floats are typed; bad values become None."""
+    rec = QsoRecord("KI7MT", "W1AW", "20240101", "1234", "20m", "CW", freq=14.025)
+    row = dict(zip([n for n, _ in COLUMNS], typed_row(rec)))
+    assert row["qso_date"] == datetime.date(2024, 1, 1)
+    assert row["time_on"] == datetime.time(12, 34)
+    assert row["qso_datetime"] == datetime.datetime(
+        2024, 1, 1, 12, 34, tzinfo=datetime.timezone.utc
+    )
+    assert row["freq"] == 14.025
+    bad = dict(zip([n for n, _ in COLUMNS], typed_row({"qso_date": "2024013x"})))
+    assert bad["qso_date"] is None and bad["qso_datetime"] is None
+
+
+def test_convert_csv(tmp_path: Path) -> None:
+    """`convert --csv` streams typed rows with a header, in small groups."""
+    src = tmp_path / "in.adi"
+    src.write_text(_ADI, encoding="utf-8")
+    out = tmp_path / "out.csv"
+    args = ["convert", "-i", str(src), "-o", str(out), "--csv", "--row-group-size", "1"]
+    assert root.dispatch(args) == 0
+    with out.open(encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["call"] for r in rows] == ["W1AW", "JA1XX"]
+    assert rows[0]["qso_datetime"] == "2024-01-01T12:34:56Z"
+    assert rows[0]["freq"] == "14.025" and rows[0]["tx_pwr"] == "100.0"
+    assert rows[1]["band"] == "40m" and rows[1]["freq"] == ""
+    assert json.loads(rows[1]["adif_fields"])["call"] == "JA1XX"
+
+
+def test_output_formats_are_exclusive(tmp_path: Path) -> None:
+    """Two output formats are rejected rather than one being dropped silently."""
+    src = tmp_path / "in.adi"
+    src.write_text(_ADI, encoding="utf-8")
+    with pytest.raises(SystemExit) as exc:
+        root.dispatch(["convert", "-i", str(src), "-o", str(tmp_path / "o"), "--csv", "--adi"])
+    assert exc.value.code == 2
+    assert not (tmp_path / "o").exists()
+
+
+@pytest.mark.skipif(have_pyarrow(), reason="pyarrow is installed")
+def test_parquet_without_pyarrow(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Parquet/Arrow report the missing extra instead of failing mid-stream."""
+    src = tmp_path / "in.adi"
+    src.write_text(_ADI, encoding="utf-8")
+    out = tmp_path / "out.parquet"
+    assert root.dispatch(["convert", "-i", str(src), "-o", str(out), "--parquet"]) == 2
+    assert "pyarrow" in capsys.readouterr().err
+    assert not out.exists()
+    with pytest.raises(ValueError, match="pyarrow"):
+        open_columnar(out, "arrow")
+
+
+def test_parquet_and_arrow_round_trip(tmp_path: Path) -> None:
+    """Typed columns survive Parquet and a memory-mapped Arrow IPC read."""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    recs = [
+        QsoRecord("KI7MT", f"K{i}AA", "20240101", "1200", "20m", "CW", freq=14.0 + i)
+        for i in range(5)
+    ]
+    with open_columnar(tmp_path / "q.parquet", "parquet", row_group_size=2) as w:
+        w.write_all(recs)
+    meta = pq.ParquetFile(tmp_path / "q.parquet").metadata
+    assert (meta.num_rows, meta.num_row_groups) == (5, 3)
+    table = pq.read_table(tmp_path / "q.parquet")
+    assert table.schema.field("qso_date").type == pa.date32()
+    assert table.column("freq").to_pylist() == [14.0, 15.0, 16.0, 17.0, 18.0]
+
+    with open_columnar(tmp_path / "q.arrow", "arrow", row_group_size=2) as w:
+        w.write_all(recs)
+    with pa.memory_map(str(tmp_path / "q.arrow")) as src:
+        reader = pa.ipc.open_file(src)
+        assert reader.num_record_batches == 3
+        assert reader.read_all().column("call").to_pylist()[-1] == "K4AA"
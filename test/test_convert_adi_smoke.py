@@ -4,8 +4,10 @@ Verifies: header autodetect (station_call + PROGRAMID), band normalization,
 and eQSL eqsl_qslrdate → eqsl_qsl_date mapping + provenance.
 """
 
+from pathlib import Path
+
 import adif_mcp.cli.convert_adi as m  # used to set module-level defaults in the test
-from adif_mcp.cli.convert_adi import _extract_header_info, build_qso, parse_adif
+from adif_mcp.cli.convert_adi import build_qso, extract_header_info, parse_adif
 
 _ADIF_TEXT = """Received eQSLs for KI7MT
 <PROGRAMID:21>eQSL.cc DownloadInBox
@@ -18,7 +20,7 @@ _ADIF_TEXT = """Received eQSLs for KI7MT
 
 def test_header_extracts_station_call_and_program() -> None:
     """Test if we can extract station call from the adi header"""
-    station_call, source, program = _extract_header_info(_ADIF_TEXT)
+    station_call, source, program = extract_header_info(_ADIF_TEXT)
     assert station_call == "KI7MT"
     # Could be "header_tag:station_callsign" if present, or "header_text"
     # from the plain line.
@@ -33,7 +35,7 @@ def test_header_extracts_station_call_and_program() -> None:
 
 def test_build_qso_normalizes_and_maps() -> None:
     """prime module defaults from the header (what main() normally does)"""
-    station_call, source, program = _extract_header_info(_ADIF_TEXT)
+    station_call, source, program = extract_header_info(_ADIF_TEXT)
     m._DEFAULT_STATION_CALL = station_call
     m._DEFAULT_STATION_CALL_SOURCE = source
     m._DEFAULT_SOURCE_PROGRAM = program
@@ -68,3 +70,26 @@ def test_build_qso_normalizes_and_maps() -> None:
     # If PROGRAMID was seen, builder stamps _source_program
     sp = q1.adif_fields.get("_source_program")
     assert (sp is None) or sp.endswith("DownloadInBox")
+
+
+def test_build_qso_takes_header_explicitly() -> None:
+    """A HeaderInfo argument is used instead of the module defaults."""
+    header = extract_header_info(_ADIF_TEXT)
+    fields = next(iter(parse_adif(_ADIF_TEXT)))
+    q = build_qso(fields, header._replace(station_call="W7C", station_call_source="cli"))
+    assert q.station_call == "W7C"
+    assert q.eqsl_qsl_rcvd == "Y"  # implied by the DownloadInBox program
+    assert q.adif_fields is not None and q.adif_fields["_station_call_source"] == "cli"
+
+
+def test_read_adi_header_stops_early(tmp_path: Path) -> None:
+    """<EOH> split across chunks is found; header-less logs stop at the first record."""
+    log = tmp_path / "log.adi"
+    log.write_text(_ADIF_TEXT, encoding="utf-8")
+    head = m._read_adi_header(log, chunk_size=7)
+    assert head.endswith("<EOH>") and head == _ADIF_TEXT[: _ADIF_TEXT.index("<EOH>") + 5]
+
+    log.write_text("<CALL:4>K1AB<EOR>\n<EOH>" + "x" * 100, encoding="utf-8")
+    assert m._read_adi_header(log, chunk_size=16) == ""
+    log.write_text("no header here " * 100, encoding="utf-8")
+    assert m._read_adi_header(log, chunk_size=64, max_bytes=256) == ""
@@ -0,0 +1,107 @@
+"""Tests for the resident daemon and transparent CLI forwarding."""
+
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.cli import daemon, root
+
+
+@pytest.fixture
+def sock(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Run a daemon in a background thread on a per-test socket."""
+    path = tmp_path / "d.sock"
+    monkeypatch.setenv(daemon.SOCKET_ENV, str(path))
+    monkeypatch.delenv(daemon.NO_DAEMON_ENV, raising=False)
+    t = threading.Thread(target=daemon.serve, args=(path,), kwargs={"warm": False})
+    t.start()
+    for _ in range(200):
+        if path.exists():
+            break
+        time.sleep(0.01)
+    yield path
+    daemon.request({"op": "stop"}, path)
+    t.join(timeout=5)
+    assert not path.exists()
+
+
+def test_forwarded_command_runs_in_daemon(
+    sock: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """A forwardable subcommand is executed by the daemon, output relayed."""
+    src = tmp_path / "in.adi"
+    src.write_text(
+        "<CALL:4>K1JT<QSO_DATE:8>20240902<EOR>\n<CALL:4>N0CZ<QSO_DATE:8>20240901<EOR>\n",
+        encoding="utf-8",
+    )
+    before = daemon.request({"op": "ping"}, sock)["served"]
+    assert root.main(["sort", "-i", str(src), "-o", str(tmp_path / "out.adi")]) == 0
+    assert "sorted 2 record(s)" in capsys.readouterr().out
+    assert (tmp_path / "out.adi").read_text(encoding="utf-8").startswith("<CALL:4>N0CZ")
+    assert daemon.request({"op": "ping"}, sock)["served"] == before + 2
+
+
+def test_tool_call_and_errors(sock: Path) -> None:
+    """MCP tools are callable through the socket; bad input is reported."""
+    reply = daemon.request(
+        {"op": "call", "tool": "search_enumerations", "args": {"search_term": "FT8"}}, sock
+    )
+    assert "FT8" in reply["result"]["results"]["Mode"]["records"]
+    assert "error" in daemon.request({"op": "call", "tool": "_enum_cache"}, sock)
+    for name in ("main", "warm_caches", "install_single_flight"):
+        reply = daemon.request({"op": "call", "tool": name}, sock)
+        assert reply == {"error": f"Unknown tool '{name}'"}
+    bad = daemon.request({"op": "run", "argv": ["mcp"], "cwd": "."}, sock)
+    assert bad["code"] == 2
+
+
+def test_tool_call_resolves_paths_against_client_cwd(sock: Path, tmp_path: Path) -> None:
+    """A relative file_path names the caller's file, not one in the daemon's cwd."""
+    (tmp_path / "log.adi").write_text(
+        "<CALL:4>K1JT<QSO_DATE:8>20240902<TIME_ON:4>1200<BAND:3>20m<MODE:2>CW<EOR>\n",
+        encoding="utf-8",
+    )
+    call = {"op": "call", "tool": "find_duplicates", "args": {"file_paths": ["log.adi"]}}
+    reply = daemon.request({**call, "cwd": str(tmp_path)}, sock)
+    assert reply["result"]["total"] == 1
+    assert reply["result"]["sources"] == [str(tmp_path / "log.adi")]
+
+
+def test_forward_falls_back_without_daemon(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """No socket (or a stale one) means the command runs locally."""
+    path = tmp_path / "none.sock"
+    monkeypatch.setenv(daemon.SOCKET_ENV, str(path))
+    assert daemon.forward(["sort", "--help"]) is None
+    path.write_text("", encoding="utf-8")
+    assert daemon.forward(["sort", "--help"]) is None
+
+
+def test_failing_tool_and_silent_daemon(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Any tool exception becomes an error reply; a daemon that never answers
+    times out and the command runs locally."""
+    from adif_mcp.mcp import server as mcp_server
+
+    def boom(**_: object) -> None:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(mcp_server, "search_enumerations", boom)
+    assert daemon.call_tool("search_enumerations", {}) == {"error": "boom"}
+
+    path = tmp_path / "silent.sock"
+    monkeypatch.setenv(daemon.SOCKET_ENV, str(path))
+    monkeypatch.delenv(daemon.NO_DAEMON_ENV, raising=False)
+    monkeypatch.setattr(daemon, "REQUEST_TIMEOUT", 0.2)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as srv:
+        srv.bind(str(path))
+        srv.listen(1)  # accepts connections but never replies
+        with pytest.raises(TimeoutError):
+            daemon.request({"op": "ping"}, path, timeout=0.2)
+        assert daemon.forward(["sort", "--help"]) is None
@@ -0,0 +1,154 @@
+"""Tests for streaming duplicate-QSO detection."""
+
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.logbook.dedup import StreamDeduper, find_duplicates, write_deduplicated
+from adif_mcp.logbook.normalize import qso_minutes
+from adif_mcp.parsers.adi_stream import iter_records
+
+_LOCAL = (
+    "local<EOH>\n"
+    "<CALL:5>W9ILY<QSO_DATE:8>20220616<TIME_ON:4>2358<BAND:3>40M<MODE:2>CW<EOR>\n"
+    "<CALL:5>KM4FO<QSO_DATE:8>20240803<TIME_ON:4>2121<BAND:3>20M<MODE:2>CW<EOR>\n"
+    "<CALL:5>KM4FO<QSO_DATE:8>20240803<TIME_ON:4>2200<BAND:3>20M<MODE:2>CW<EOR>\n"
+)
+_LOTW = (
+    "<CALL:5>w9ily<QSO_DATE:8>20220617<TIME_ON:4>0001<BAND:3>40m<MODE:2>CW"
+    "<LOTW_QSL_RCVD:1>Y<EOR>\n"
+    "<CALL:5>KM4FO<QSO_DATE:8>20240803<TIME_ON:6>212300<BAND:3>20m<MODE:2>CW"
+    "<RST_SENT:3>599<EOR>\n"
+    "<CALL:5>KM4FO<QSO_DATE:8>20240803<TIME_ON:4>2121<BAND:3>20m<MODE:3>FT8<EOR>\n"
+)
+
+
+def _write(tmp_path: Path) -> list[Path]:
+    a = tmp_path / "local.adi"
+    b = tmp_path / "lotw.adi"
+    a.write_text(_LOCAL, encoding="utf-8")
+    b.write_text(_LOTW, encoding="utf-8")
+    return [a, b]
+
+
+def test_window_matching_and_keep_reason(tmp_path: Path) -> None:
+    """Matches cross midnight and files; the kept record and reason are reported."""
+    paths = _write(tmp_path)
+    result = find_duplicates(paths, window_minutes=5)
+    report = result.to_dict()
+
+    assert report["total"] == 6
+    assert report["duplicates"] == 2
+    by_call = {g["kept"]["call"]: g for g in report["groups"]}
+
+    w9 = by_call["W9ILY"]
+    assert w9["kept"]["source"].endswith("lotw.adi")
+    assert w9["reason"] == "confirmed via LoTW"
+
+    km = by_call["KM4FO"]
+    assert km["reason"] == "most complete record (6 fields)"
+    assert km["dropped"][0]["time_on"] == "2121"
+    # 2200 is outside the window; FT8 is a different mode.
+    assert find_duplicates(paths, window_minutes=0).duplicates == 0
+
+
+def test_spilled_partitions_match_in_memory(tmp_path: Path) -> None:
+    """Forcing the partitioned spill path gives identical groups."""
+    paths = _write(tmp_path)
+    mem = find_duplicates(paths, window_minutes=5).to_dict()
+    spilled = find_duplicates(paths, window_minutes=5, max_in_memory=1).to_dict()
+    assert spilled == mem
+
+
+def test_stream_deduper_matches_find_duplicates(tmp_path: Path) -> None:
+    """Time-ordered input drops what find_duplicates drops; late copies lose."""
+    paths = _write(tmp_path)
+    recs = [
+        ((src, idx), fields)
+        for src, path in enumerate(paths)
+        for idx, fields in enumerate(iter_records(path), start=1)
+    ]
+    recs.sort(key=lambda r: qso_minutes(r[1]["qso_date"], r[1]["time_on"]) or 0)
+    deduper: StreamDeduper[tuple[int, int]] = StreamDeduper(5)
+    kept = [pos for pos, fields in recs for pos in deduper.push(fields, pos)]
+    kept += deduper.flush()
+    dropped = find_duplicates(paths, window_minutes=5).dropped_positions()
+    assert kept == [pos for pos, _ in recs if pos not in dropped]
+    assert deduper.duplicates == 2
+
+    # a copy arriving after its cluster was released keeps the written record,
+    # while clusters older than the window of the newest record are forgotten
+    late = {"call": "KM4FO", "qso_date": "20240803", "band": "20m", "mode": "CW"}
+    assert deduper.push({**late, "time_on": "2158", "lotw_qsl_rcvd": "Y"}, (9, 9)) == []
+    assert deduper.push({**late, "time_on": "2124"}, (9, 10)) == [(9, 10)]
+    assert deduper.push({"call": "N0CALL"}, (9, 11)) == [(9, 11)]
+    assert deduper.duplicates == 3
+    with pytest.raises(ValueError):
+        StreamDeduper(-1)
+
+
+def test_stream_deduper_memory_follows_the_window() -> None:
+    """Released clusters are forgotten once the stream moves past their window."""
+    deduper: StreamDeduper[int] = StreamDeduper(5)
+    kept = 0
+    for i in range(20_000):
+        day, minute = divmod(i, 1440)
+        fields = {
+            "call": f"K{i % 977}AB",
+            "qso_date": f"202401{day + 1:02d}",
+            "time_on": f"{minute // 60:02d}{minute % 60:02d}",
+            "band": "20m",
+            "mode": "CW",
+        }
+        kept += len(deduper.push(fields, i))
+        assert sum(map(len, deduper._released.values())) <= 7
+        assert len(deduper._expiry) <= 7
+    assert kept + len(deduper.flush()) == 20_000
+    assert deduper.duplicates == 0
+
+
+def test_write_deduplicated_copies_raw_records(tmp_path: Path) -> None:
+    """The deduplicated output keeps the first header and the surviving records."""
+    paths = _write(tmp_path)
+    out = tmp_path / "out.adi"
+    n = write_deduplicated(find_duplicates(paths), out)
+    assert n == 4
+    text = out.read_text(encoding="utf-8")
+    assert text.startswith("local<EOH>")
+    assert "<RST_SENT:3>599" in text
+    assert len(list(iter_records(out))) == 4
+
+
+def test_cli_reports_bad_input_without_traceback(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """A missing log or a negative window is an error message and exit code 2."""
+    from adif_mcp.cli.root import dispatch
+
+    assert dispatch(["dedup", "--no-cache", "-i", str(tmp_path / "missing.adi")]) == 2
+    assert capsys.readouterr().err.startswith("error: ")
+    paths = _write(tmp_path)
+    assert dispatch(["dedup", "--no-cache", "-i", str(paths[0]), "-w", "-1"]) == 2
+    assert "window_minutes" in capsys.readouterr().err
+
+
+def test_mode_spellings_match(tmp_path: Path) -> None:
+    """SSB/USB and FT8/MFSK spellings of one QSO match; CW, RTTY and FT8 do not."""
+    log = tmp_path / "modes.adi"
+    log.write_text(
+        "<EOH>\n"
+        "<CALL:4>K1AB<QSO_DATE:8>20240101<TIME_ON:4>1200<BAND:3>20m<MODE:3>SSB<EOR>\n"
+        "<CALL:4>K1AB<QSO_DATE:8>20240101<TIME_ON:4>1201<BAND:3>20m<MODE:3>USB<EOR>\n"
+        "<CALL:4>K2CD<QSO_DATE:8>20240101<TIME_ON:4>1300<BAND:3>40m<MODE:3>FT8<EOR>\n"
+        "<CALL:4>K2CD<QSO_DATE:8>20240101<TIME_ON:4>1300<BAND:3>40m<MODE:4>MFSK"
+        "<SUBMODE:3>FT8<EOR>\n"
+        "<CALL:4>K2CD<QSO_DATE:8>20240101<TIME_ON:4>1301<BAND:3>40m<MODE:2>CW<EOR>\n"
+        "<CALL:4>K2CD<QSO_DATE:8>20240101<TIME_ON:4>1302<BAND:3>40m<MODE:4>RTTY<EOR>\n"
+        "<CALL:4>K2CD<QSO_DATE:8>20240101<TIME_ON:4>1303<BAND:3>40m<MODE:4>MFSK"
+        "<SUBMODE:3>FT4<EOR>\n",
+        encoding="utf-8",
+    )
+    assert find_duplicates([log]).duplicates == 2
+    deduper: StreamDeduper[int] = StreamDeduper(5)
+    kept = [k for i, f in enumerate(iter_records(log)) for k in deduper.push(f, i)]
+    assert kept + deduper.flush() == [0, 3, 4, 5, 6]  # MFSK/FT8 has more fields
@@ -0,0 +1,87 @@
+"""Tests for the live worked-before / needed lookup index."""
+
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.logbook.lookup import BloomFilter, WorkedIndex
+
+
+def test_worked_flags_and_new_credits() -> None:
+    """Call/band/mode keys and entity/zone/grid matrices answer correctly."""
+    idx = WorkedIndex()
+    idx.add(
+        {"call": "k1ab", "band": "20M", "mode": "CW", "dxcc": "291", "cqz": "5",
+         "gridsquare": "FN31pr"}
+    )
+    r = idx.check("K1AB", "20m", "CW", dxcc="291", cqz="5", grid="FN31")
+    assert r["worked"] == {"any": True, "band": True, "band_mode": True}
+    assert r["new"]["entity"] == {"overall": False, "band": False, "band_mode": False}
+
+    r = idx.check("K1AB", "40m", "SSB", dxcc="291", cqz="14", grid="JO62")
+    assert r["worked"] == {"any": True, "band": False, "band_mode": False}
+    assert r["new"]["entity"] == {"overall": False, "band": True, "band_mode": True}
+    assert r["new"]["zone"]["overall"] is True
+    assert r["new"]["grid"]["overall"] is True
+    # 20m DIGITAL is a new slot for the entity even though 20m CW is worked.
+    assert idx.check("W1AW", "20m", "FT8", dxcc="291")["new"]["entity"]["band_mode"] is True
+
+
+def test_bloom_only_mode_never_misses() -> None:
+    """Bloom-only indexes may false-positive but never false-negative."""
+    bf = BloomFilter(1000, 0.01)
+    for i in range(1000):
+        bf.add(f"K{i}")
+    assert all(f"K{i}" in bf for i in range(1000))
+    assert sum(f"W{i}" in bf for i in range(1000)) < 50
+
+    idx = WorkedIndex(bloom_capacity=100, exact=False)
+    idx.add({"call": "JA1XX", "band": "15m", "mode": "FT8"})
+    assert idx.worked("JA1XX", "15m", "FT8")
+    assert idx.check("JA1XX")["approximate"] is True
+    with pytest.raises(ValueError):
+        WorkedIndex(exact=False)
+
+
+def test_follow_picks_up_appends(tmp_path: Path) -> None:
+    """Appended records are indexed on refresh."""
+    log = tmp_path / "live.adi"
+    log.write_text(
+        "".join(f"<CALL:6>K{i:05d}<BAND:3>20m<MODE:3>FT8<EOR>\n" for i in range(20000)),
+        encoding="utf-8",
+    )
+    idx = WorkedIndex(bloom_capacity=50000)
+    assert idx.follow(log) == 20000
+    assert not idx.worked("ZL2ABC")
+
+    with log.open("a", encoding="utf-8") as fh:
+        fh.write("<CALL:6>ZL2ABC<BAND:3>40m<MODE:2>CW<EOR>\n")
+    assert idx.refresh() == 1
+    assert idx.worked("zl2abc", "40m", "CW")
+    assert idx.refresh() == 0
+
+    assert idx.check("K00042", "20m", "FT8")["worked"]["band_mode"] is True
+
+
+def test_replaced_log_rebuilds_the_index(tmp_path: Path) -> None:
+    """A rotated log clears the old calls and Bloom bits; other logs are re-read."""
+    log, other = tmp_path / "live.adi", tmp_path / "other.adi"
+    log.write_text("<CALL:4>K1AB<BAND:3>20m<MODE:2>CW<DXCC:3>291<EOR>\n", encoding="utf-8")
+    other.write_text("<CALL:5>JA1XX<BAND:3>40m<MODE:3>FT8<EOR>\n", encoding="utf-8")
+    idx = WorkedIndex(bloom_capacity=100)
+    idx.follow(log)
+    idx.follow(other)
+    assert idx.qso_count == 2
+
+    new = tmp_path / "new.adi"
+    new.write_text(
+        "<CALL:4>VK2A<BAND:3>15m<MODE:2>CW<EOR>\n<CALL:4>ZL2B<BAND:3>15m<MODE:2>CW<EOR>\n",
+        encoding="utf-8",
+    )
+    new.replace(log)
+    assert idx.refresh() == 3
+    assert idx.qso_count == 3
+    assert not idx.worked("K1AB")
+    assert idx.bloom is not None and "K1AB" not in idx.bloom
+    assert idx.worked("VK2A", "15m", "CW") and idx.worked("JA1XX", "40m")
+    assert idx.check("K1AB", dxcc="291")["new"]["entity"]["overall"] is True
@@ -0,0 +1,109 @@
+"""Tests for the content-fingerprinted on-disk parse cache."""
+
+import asyncio
+import gzip
+import os
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.logbook.dedup import find_duplicates
+from adif_mcp.parsers import parse_cache
+from adif_mcp.parsers.adi_stream import iter_raw_records, iter_records, open_adi
+from adif_mcp.parsers.parse_cache import ParseCache
+
+
+def _log(n: int, start: int = 0) -> str:
+    out = []
+    for i in range(start, start + n):
+        call = f"K{i}AA"
+        extra = f"<NAME:5>Jörg<COMMENT:{len(str(i)) + 4}>note{i}" if i % 3 == 0 else ""
+        out.append(
+            f"<CALL:{len(call)}>{call}<QSO_DATE:8>2024010{1 + i % 9}<TIME_ON:4>1200"
+            f"<BAND:3>{'20m' if i % 2 else '40m'}<MODE:2>CW{extra}<EOR>\n"
+        )
+    return "<EOH>\n" + "".join(out)
+
+
+def test_round_trip_and_hit(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Cached records match a fresh parse; the second open is a mapped hit."""
+    monkeypatch.setattr(parse_cache, "_MAX_CODES", 8)  # force a dict -> plain switch
+    log = tmp_path / "log.adi"
+    log.write_text(_log(50), encoding="utf-8")
+    cache = ParseCache(tmp_path / "cache", min_bytes=0)
+    with cache.open(log) as built:
+        assert built is not None and len(built) == 50
+    with cache.open(log) as hit:
+        assert hit is not None
+        assert list(hit.iter_records()) == list(iter_records(log))
+        assert hit.record(3)["name"] == "Jörg" and "name" not in hit.record(4)
+        assert list(hit.iter_records(["call", "nope"]))[1] == {"call": "K1AA"}
+        with open_adi(log) as fh:
+            raw = [r.raw for r in iter_raw_records(fh)]
+        assert hit.read_raw(48, 60) == raw[48:]
+        assert list(hit.nfields[:4]) == [7, 5, 5, 7]
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.stats()["entries"] == 1
+
+
+def test_changed_and_compressed_logs(tmp_path: Path) -> None:
+    """An appended log misses and is rebuilt; compressed logs are not seekable."""
+    log = tmp_path / "log.adi"
+    log.write_text(_log(5), encoding="utf-8")
+    cache = ParseCache(tmp_path / "cache", min_bytes=0)
+    cache.open(log).close()  # type: ignore[union-attr]
+    with log.open("a", encoding="utf-8") as fh:
+        fh.write(_log(2, 5)[6:])
+    assert cache.get(log) is None
+    with cache.open(log) as again:
+        assert again is not None and len(again) == 7
+    assert cache.misses == 2
+
+    gz = tmp_path / "log.adi.gz"
+    gz.write_bytes(gzip.compress(log.read_bytes()))
+    with cache.open(gz) as packed:
+        assert packed is not None and not packed.seekable
+        assert packed.record(6)["call"] == "K6AA"
+        with pytest.raises(ValueError):
+            packed.read_raw(0, 1)
+    assert ParseCache(tmp_path / "cache", min_bytes=1 << 20).open(log) is None
+
+
+def test_lru_eviction_by_budget(tmp_path: Path) -> None:
+    """Past the budget the least recently used entry is removed."""
+    cache = ParseCache(tmp_path / "cache", min_bytes=0)
+    logs = []
+    for name in ("a", "b", "c"):
+        p = tmp_path / f"{name}.adi"
+        p.write_text(_log(20), encoding="utf-8")
+        logs.append(p)
+        cache.open(p).close()  # type: ignore[union-attr]
+    size = cache.entry_path(logs[0]).stat().st_size
+    os.utime(cache.entry_path(logs[0]), (1, 1))
+    os.utime(cache.entry_path(logs[1]), (2, 2))
+    cache.get(logs[0]).close()  # type: ignore[union-attr]
+    cache.budget_bytes = 2 * size
+    assert cache.evict() == 1
+    assert not cache.entry_path(logs[1]).exists()
+    assert cache.entry_path(logs[0]).exists() and cache.entry_path(logs[2]).exists()
+
+
+def test_tools_use_the_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """find_duplicates and parse_adif give the same answers from a cached log."""
+    from adif_mcp.mcp.server import parse_adif
+
+    log = tmp_path / "log.adi"
+    log.write_text(_log(30) + _log(30)[6:], encoding="utf-8")
+    cache = ParseCache(tmp_path / "cache", min_bytes=0)
+    plain = find_duplicates([log]).to_dict()
+    assert find_duplicates([log], cache=cache).to_dict() == plain
+    assert find_duplicates([log], cache=cache).to_dict() == plain
+    assert cache.hits == 1
+
+    (expected,) = asyncio.run(parse_adif(str(log), start_at=28, limit=4))
+    monkeypatch.setattr(parse_cache, "_default", cache)
+    (out,) = asyncio.run(parse_adif(str(log), start_at=28, limit=4))
+    assert out.text == expected.text
+    (tail,) = asyncio.run(parse_adif(str(log), start_at=-2, limit=2))
+    assert "K29AA" in tail.text
+    assert cache.hits == 2
@@ -0,0 +1,145 @@
+"""Tests for the in-process parse → normalize → filter → attrib → dedup → write pipeline."""
+
+import argparse
+import json
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.cli import convert_adi
+from adif_mcp.cli.attrib import cmd_attrib
+from adif_mcp.cli.pipeline import Pipeline, load_spec, run_pipeline
+from adif_mcp.parsers.adi_stream import iter_records
+
+_LOG = (
+    "<STATION_CALLSIGN:5>KI7MT<EOH>\n"
+    "<CALL:4>W1AW<QSO_DATE:8>20150627<TIME_ON:4>1200<BAND:3>20M<MODE:2>CW<EOR>\n"
+    "<CALL:4>W1AW<QSO_DATE:8>20150627<TIME_ON:4>1202<BAND:3>20M<MODE:2>CW"
+    "<LOTW_QSL_RCVD:1>Y<EOR>\n"
+    "<CALL:5>K1ABC<QSO_DATE:8>20160101<TIME_ON:4>0100<BAND:3>40M<MODE:3>SSB<EOR>\n"
+    "<CALL:5>JA1XX<QSO_DATE:8>20160102<TIME_ON:4>0200<BAND:3>20M<MODE:3>FT8"
+    "<STATION_CALLSIGN:7>KI7MT/4<EOR>\n"
+    "<CALL:5>DL1AB<TIME_ON:4>0300<BAND:3>20M<MODE:2>CW<EOR>\n"
+)
+
+_RANGES = [
+    {"persona": "ki7mt", "callsign": "KI7MT", "start": "20100101", "aliases": ["KI7MT/4"]},
+    {"persona": "contest", "callsign": "W7C", "start": "20150627", "end": "20150628"},
+]
+
+
+def _setup(tmp_path: Path) -> tuple[Path, Path]:
+    log = tmp_path / "log.adi"
+    log.write_text(_LOG, encoding="utf-8")
+    ranges = tmp_path / "ranges.json"
+    ranges.write_text(json.dumps(_RANGES), encoding="utf-8")
+    return log, ranges
+
+
+def test_matches_convert_then_attrib(tmp_path: Path) -> None:
+    """One pass gives the same NDJSON as convert | attrib, with per-stage counters."""
+    log, ranges = _setup(tmp_path)
+    convert_adi.main(["-i", str(log), "-o", str(tmp_path / "c.ndjson"), "--ndjson"])
+    args = argparse.Namespace(
+        persona=None,
+        ranges=str(ranges),
+        input=str(tmp_path / "c.ndjson"),
+        output=str(tmp_path / "chained.ndjson"),
+        force_overwrite=True,
+        stats=False,
+    )
+    assert cmd_attrib(args) == 0
+
+    result = run_pipeline(
+        [log],
+        [
+            {"stage": "normalize", "errors": str(tmp_path / "errors.ndjson")},
+            {"stage": "attrib", "ranges": str(ranges), "force_overwrite": True},
+            {"stage": "write", "output": str(tmp_path / "piped.ndjson")},
+            {"stage": "write", "output": str(tmp_path / "piped.adi")},
+        ],
+    )
+    chained = (tmp_path / "chained.ndjson").read_text(encoding="utf-8")
+    assert (tmp_path / "piped.ndjson").read_text(encoding="utf-8") == chained
+    stations = [r.get("station_callsign") for r in iter_records(tmp_path / "piped.adi")]
+    assert stations == ["W7C", "W7C", "KI7MT", "KI7MT/4"]
+
+    stats = {s.name: s.to_dict() for s in result.stages}
+    assert (stats["parse"]["in"], stats["parse"]["out"], stats["parse"]["files"]) == (0, 5, 1)
+    assert (stats["normalize"]["out"], stats["normalize"]["errors"]) == (4, 1)
+    assert stats["attrib"]["attributed"] == 4
+    assert [s["stage"] for s in result.to_dict()["stages"]][-2:] == ["write", "write"]
+    assert all(s.seconds >= 0 for s in result.stages)
+    errors = (tmp_path / "errors.ndjson").read_text(encoding="utf-8").splitlines()
+    assert json.loads(errors[0])["index"] == "5"
+
+
+def test_filter_and_dedup(tmp_path: Path) -> None:
+    """Dedup drops what `adif-mcp dedup` would; filters then narrow the stream."""
+    log, _ = _setup(tmp_path)
+    spec = {
+        "inputs": [str(log)],
+        "stages": [
+            {"stage": "dedup", "window": 5},
+            {"stage": "normalize"},
+            {"stage": "filter", "band": "20m"},
+            {"stage": "write", "output": str(tmp_path / "out.json")},
+        ],
+    }
+    inputs, stages = load_spec(json.dumps(spec))
+    pipeline = Pipeline(stages)
+    calls = [item.fields["call"] for item in pipeline.iter(inputs)]
+    assert calls == ["W1AW", "JA1XX"]
+    written = json.loads((tmp_path / "out.json").read_text(encoding="utf-8"))
+    assert [r["lotw_qsl_rcvd"] for r in written] == ["Y", None]
+    assert pipeline.stats[1].counters["duplicates"] == 1
+
+
+@pytest.mark.parametrize("suffix", [".adi", ".adx"])
+def test_dedup_after_filter(tmp_path: Path, suffix: str) -> None:
+    """Dedup matches only what reaches it, so a filtered-out record keeps none away."""
+    log = tmp_path / "log.adi"
+    log.write_text(
+        "<EOH>\n"
+        "<CALL:4>K1AB<QSO_DATE:8>20240101<TIME_ON:4>2358<BAND:3>20M<MODE:2>CW<EOR>\n"
+        "<CALL:4>K1AB<QSO_DATE:8>20240102<TIME_ON:4>0001<BAND:3>20M<MODE:2>CW<EOR>\n",
+        encoding="utf-8",
+    )
+    if suffix == ".adx":
+        run_pipeline([log], [{"stage": "write", "output": str(tmp_path / "log.adx")}])
+        log = tmp_path / "log.adx"
+    out = tmp_path / "out.ndjson"
+    result = run_pipeline(
+        [log],
+        [
+            {"stage": "normalize", "station_call": "KI7MT"},
+            {"stage": "filter", "since": "20240102"},
+            {"stage": "dedup", "window": 5},
+            {"stage": "write", "output": str(out)},
+        ],
+    )
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["time_on"] for r in rows] == ["0001"]
+    assert result.stages[3].counters["duplicates"] == 0
+
+    both = run_pipeline(
+        [log],
+        [{"stage": "dedup", "window": 5}, {"stage": "write", "output": str(log) + ".adi"}],
+    )
+    assert both.stages[1].to_dict()["out"] == 1
+
+
+@pytest.mark.parametrize(
+    "stages",
+    [
+        [{"stage": "sort"}],
+        [{"stage": "normalize", "bands": ["20m"]}],
+        [{"stage": "filter", "band": "20m"}],
+        [{"stage": "write", "output": "out.ndjson"}],
+        [{"stage": "normalize"}, {"stage": "write", "output": "out.txt"}],
+    ],
+)
+def test_invalid_specs(stages: list[dict[str, object]]) -> None:
+    """Unknown stages/options, missing normalize and unknown formats are rejected."""
+    with pytest.raises(ValueError):
+        Pipeline(stages)
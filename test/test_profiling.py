@@ -0,0 +1,121 @@
+"""Tests for the --profile / ADIF_MCP_PROFILE profiling hooks."""
+
+import asyncio
+import pstats
+import time
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.cli import root
+from adif_mcp.utils import profiling
+
+
+def _busy(seconds: float) -> int:
+    end = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < end:
+        n += 1
+    return n
+
+
+def test_cprofile_and_malloc_outputs(tmp_path: Path) -> None:
+    """One numbered .prof/.txt/.malloc.txt set per profiled call in a run dir."""
+    session = profiling.ProfileSession(
+        profiling.ProfileConfig(root=tmp_path, mode="cprofile", trace_malloc=True)
+    )
+    with session.profile("first") as prefix:
+        _busy(0.01)
+        keep = [bytearray(1024) for _ in range(100)]
+    with session.profile("second job"):
+        pass
+    assert keep
+    assert session.directory.parent == tmp_path
+    assert (session.directory / "run.json").exists()
+    assert prefix.name == "0001-first"
+    stats = pstats.Stats(str(prefix) + ".prof")
+    assert any(func[2] == "_busy" for func in stats.stats)  # type: ignore[attr-defined]
+    assert "wall time" in Path(str(prefix) + ".txt").read_text()
+    malloc = Path(str(prefix) + ".malloc.txt").read_text()
+    assert "peak:" in malloc and "test_profiling.py" in malloc
+    assert (session.directory / "0002-second_job.prof").exists()
+
+
+def test_sampler_sees_worker_threads(tmp_path: Path) -> None:
+    """Sampled stacks include work done on other threads."""
+    import threading
+
+    session = profiling.ProfileSession(
+        profiling.ProfileConfig(root=tmp_path, mode="sample", interval=0.001)
+    )
+    with session.profile("threads") as prefix:
+        t = threading.Thread(target=_busy, args=(0.2,))
+        t.start()
+        t.join()
+    folded = Path(str(prefix) + ".stacks").read_text()
+    assert "_busy (test_profiling.py" in folded
+    stack, count = folded.splitlines()[0].rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+
+
+def test_config_from_env(tmp_path: Path) -> None:
+    """ADIF_MCP_PROFILE selects the directory; TRACE_MALLOC alone is memory-only."""
+    assert profiling.config_from_env({}) is None
+    assert profiling.config_from_env({"ADIF_MCP_PROFILE": "0"}) is None
+    cfg = profiling.config_from_env({"ADIF_MCP_PROFILE": str(tmp_path)})
+    assert cfg is not None and cfg.root == tmp_path and cfg.mode == "sample"
+    cfg = profiling.config_from_env(
+        {"ADIF_MCP_PROFILE": str(tmp_path), "ADIF_MCP_PROFILE_MODE": "cprofile"}
+    )
+    assert cfg is not None and cfg.mode == "cprofile" and not cfg.trace_malloc
+    cfg = profiling.config_from_env({"ADIF_MCP_TRACE_MALLOC": "1"})
+    assert cfg is not None and cfg.mode is None and cfg.trace_malloc
+    with pytest.raises(ValueError):
+        profiling.config_from_env({"ADIF_MCP_PROFILE": "1", "ADIF_MCP_PROFILE_MODE": "x"})
+
+
+def test_cli_profile_option(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """`--profile=DIR` profiles the command and never swallows the command name."""
+    monkeypatch.setenv("ADIF_MCP_NO_DAEMON", "1")
+    out = tmp_path / "gen.adi"
+    prof = tmp_path / "prof"
+    argv = [f"--profile={prof}", "--trace-malloc", "generate", "-n", "50", "--stations", "50"]
+    argv += ["-o", str(out)]
+    assert root.main(argv) == 0
+    assert out.exists()
+    (run_dir,) = prof.iterdir()
+    assert (run_dir / "0001-generate.prof").exists()
+    assert (run_dir / "0001-generate.malloc.txt").exists()
+
+    assert root._requested_command(["--profile-mode", "sample", "sort"]) == "sort"
+    assert root._normalize_argv(["--profile", "sort", "--profile"]) == [
+        "--profile=",
+        "sort",
+        "--profile",
+    ]
+    assert root._profiling_requested(["--profile", "sort"])
+    assert not root._profiling_requested(["sort", "--profile"])
+
+
+def test_mcp_middleware_profiles_tool_calls(tmp_path: Path) -> None:
+    """Each MCP tool call gets its own profile output."""
+    from fastmcp import Client
+
+    from adif_mcp.mcp import server
+
+    session = profiling.ProfileSession(profiling.ProfileConfig(root=tmp_path, mode="sample"))
+    mw = server.ProfilingMiddleware(session)
+    server.mcp.add_middleware(mw)
+
+    async def call() -> None:
+        async with Client(server.mcp) as client:
+            await client.call_tool("get_version_info", {})
+            await client.call_tool("calculate_distance", {"start": "DN13", "end": "FN31"})
+
+    try:
+        asyncio.run(call())
+    finally:
+        server.mcp.middleware.remove(mw)
+    names = sorted(p.name for p in session.directory.iterdir())
+    assert "0001-tool-get_version_info.stacks" in names
+    assert "0002-tool-calculate_distance.stacks" in names
@@ -0,0 +1,76 @@
+"""Tests for sort-merge reconciliation and the external sort it uses."""
+
+import random
+from pathlib import Path
+
+from adif_mcp.logbook.extsort import external_sort
+from adif_mcp.logbook.reconcile import reconcile
+from adif_mcp.parsers.adi_stream import iter_records
+
+_LOCAL = (
+    "local<EOH>\n"
+    "<CALL:5>W9ILY<QSO_DATE:8>20220616<TIME_ON:4>2358<BAND:3>40M<MODE:3>USB<EOR>\n"
+    "<CALL:5>KM4FO<QSO_DATE:8>20240803<TIME_ON:4>2121<BAND:3>20M<MODE:2>CW<EOR>\n"
+    "<CALL:4>N0CZ<QSO_DATE:8>20240901<TIME_ON:4>1000<BAND:3>15M<MODE:3>FT8"
+    "<EQSL_QSL_RCVD:1>Y<EOR>\n"
+    "<CALL:4>K1JT<QSO_DATE:8>20240902<TIME_ON:4>1200<BAND:3>10M<MODE:3>FT8<EOR>\n"
+)
+_EQSL = (
+    "eQSL inbox<EOH>\n"
+    "<CALL:5>w9ily<QSO_DATE:8>20220617<TIME_ON:4>0010<BAND:3>40m<MODE:3>SSB"
+    "<QSLRDATE:8>20220701<EOR>\n"
+    "<CALL:5>KM4FO<QSO_DATE:8>20240803<TIME_ON:4>2121<BAND:3>20m<MODE:3>FT8<EOR>\n"
+    "<CALL:4>N0CZ<QSO_DATE:8>20240901<TIME_ON:4>1005<BAND:3>15m<MODE:3>FT8<EOR>\n"
+    "<CALL:4>K1JT<QSO_DATE:8>20240902<TIME_ON:4>1300<BAND:3>10m<MODE:3>FT8<EOR>\n"
+)
+
+
+def _write(tmp_path: Path) -> tuple[Path, Path]:
+    a = tmp_path / "local.adi"
+    b = tmp_path / "eqsl.adi"
+    a.write_text(_LOCAL, encoding="utf-8")
+    b.write_text(_EQSL, encoding="utf-8")
+    return a, b
+
+
+def test_external_sort_spills_and_stays_stable() -> None:
+    """Spilled runs merge back into a stable, fully sorted stream."""
+    rng = random.Random(7)
+    items = [(rng.randrange(50), i) for i in range(2000)]
+    out = list(external_sort(items, key=lambda t: t[0], max_items=64))
+    assert out == sorted(items, key=lambda t: t[0])
+
+
+def test_reconcile_sets_and_patch(tmp_path: Path) -> None:
+    """Tolerance, mode groups and midnight crossing decide the match sets."""
+    local, remote = _write(tmp_path)
+    result = reconcile(local, remote, provider="eqsl", tolerance_minutes=30)
+    summary = result.summary()
+
+    assert summary["matched"] == 2
+    assert summary["already_confirmed"] == 1
+    assert summary["to_patch"] == 1
+    # CW vs FT8 and a 60-minute gap stay unmatched on both sides.
+    assert {e.call for e in result.unmatched_local} == {"KM4FO", "K1JT"}
+    assert {e.call for e in result.unmatched_remote} == {"KM4FO", "K1JT"}
+
+    files = result.write(tmp_path / "out")
+    patch = list(iter_records(files["patch"]))
+    assert patch == [
+        {
+            "call": "W9ILY",
+            "qso_date": "20220616",
+            "time_on": "2358",
+            "band": "40m",
+            "mode": "USB",
+            "eqsl_qsl_rcvd": "Y",
+            "eqsl_qslrdate": "20220701",
+        }
+    ]
+
+
+def test_reconcile_spilled_matches_in_memory(tmp_path: Path) -> None:
+    """Forcing spilled sort runs yields the same summary."""
+    local, remote = _write(tmp_path)
+    mem = reconcile(local, remote).summary()
+    assert reconcile(local, remote, max_in_memory=1).summary() == mem
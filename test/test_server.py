@@ -1,6 +1,7 @@
 """Unit tests for the ADIF-MCP server and its internal logic."""
 
 import tempfile
+from pathlib import Path
 
 import pytest
 
@@ -60,3 +61,59 @@ def test_geography_invalid_locator() -> None:
     """Verify that invalid locators raise ValueError in the utility."""
     with pytest.raises(ValueError, match="at least 4 characters"):
         calculate_distance_impl("FN2", "FN20")
+
+
+def test_single_flight_coalesces_and_memoizes(tmp_path: Path) -> None:
+    """Identical concurrent calls share one run; a changed log misses the memo."""
+    import asyncio
+
+    import mcp.types as types
+    from fastmcp.server.middleware import MiddlewareContext
+
+    from adif_mcp.mcp.server import SingleFlightMiddleware
+
+    log = tmp_path / "log.adi"
+    log.write_text("<CALL:4>W1AW<EOR>\n")
+    mw = SingleFlightMiddleware(ttl=60)
+    runs: list[str] = []
+
+    async def call_next(ctx: MiddlewareContext[types.CallToolRequestParams]) -> str:
+        runs.append(ctx.message.name)
+        await asyncio.sleep(0.05)
+        if ctx.message.name == "validate_adif_record":
+            raise ValueError("boom")
+        return f"{ctx.message.name} #{runs.count(ctx.message.name)}"
+
+    def ctx(name: str, **args: object) -> MiddlewareContext[types.CallToolRequestParams]:
+        return MiddlewareContext(
+            message=types.CallToolRequestParams(name=name, arguments=args)
+        )
+
+    async def burst() -> list[object]:
+        calls = [
+            mw.on_call_tool(ctx("parse_adif", file_path=str(log), limit=5), call_next)
+            for _ in range(5)
+        ]
+        calls.append(mw.on_call_tool(ctx("get_version_info"), call_next))
+        return await asyncio.gather(*calls)
+
+    results = asyncio.run(burst())
+    assert results[:5] == ["parse_adif #1"] * 5
+    assert sorted(runs) == ["get_version_info", "parse_adif"]
+    assert mw.stats()["coalesced"] == 4
+
+    again = asyncio.run(
+        mw.on_call_tool(ctx("parse_adif", limit=5, file_path=str(log)), call_next)
+    )
+    assert again == "parse_adif #1" and mw.memo_hits == 1
+    with log.open("a") as fh:
+        fh.write("<CALL:4>K1AB<EOR>\n")
+    asyncio.run(mw.on_call_tool(ctx("parse_adif", file_path=str(log), limit=5), call_next))
+    assert runs.count("parse_adif") == 2
+
+    with pytest.raises(ValueError):
+        asyncio.run(mw.on_call_tool(ctx("validate_adif_record", adif_string="x"), call_next))
+    with pytest.raises(ValueError):
+        asyncio.run(mw.on_call_tool(ctx("validate_adif_record", adif_string="x"), call_next))
+    assert runs.count("validate_adif_record") == 2
+    assert mw.key("reconcile_log", {"file_path": "a", "output_dir": "out"}) is None
@@ -0,0 +1,105 @@
+"""Tests for the HyperLogLog / Count-Min sketches and their log wiring."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.logbook.aggregate import Aggregator
+from adif_mcp.logbook.normalize import call_prefix
+from adif_mcp.logbook.sketch import HyperLogLog, LogSketch, TopK, sketch_files
+
+
+def test_hyperloglog_estimate_and_merge() -> None:
+    """Estimates stay within a few standard errors, and merging is a union."""
+    a, b = HyperLogLog(), HyperLogLog()
+    for i in range(30_000):
+        a.add(f"K{i}AA")
+    for i in range(20_000, 50_000):
+        b.add(f"K{i}AA")
+    assert abs(a.count() - 30_000) < 30_000 * 4 * a.error
+    small = HyperLogLog()
+    for call in ("W1AW", "W1AW", "JA1XX", "DL1AB"):
+        small.add(call)
+    assert small.count() == 3
+    union = HyperLogLog.from_dict(json.loads(json.dumps(a.to_dict()))).merge(b)
+    assert abs(union.count() - 50_000) < 50_000 * 4 * a.error
+    with pytest.raises(ValueError):
+        a.merge(HyperLogLog(10))
+
+
+def test_topk_heavy_hitters_and_merge() -> None:
+    """Heavy keys surface with counts that never under-estimate, also after a merge."""
+    left, right = TopK(3, width=256), TopK(3, width=256)
+    for i in range(2_000):
+        left.add(f"N{i}")
+    for key, n in (("W1AW", 300), ("JA1XX", 200), ("DL1AB", 100)):
+        for _ in range(n):
+            left.add(key)
+            right.add(key)
+    keys = [key for key, _ in left.most_common()]
+    assert keys == ["W1AW", "JA1XX", "DL1AB"]
+    merged = TopK.from_dict(left.to_dict()).merge(right)
+    assert [key for key, _ in merged.most_common()] == keys
+    counts = dict(merged.most_common())
+    assert counts["W1AW"] >= 600 and counts["DL1AB"] >= 200
+
+
+def test_topk_heap_stays_bounded() -> None:
+    """Re-counting tracked keys does not grow the heap past about 2k entries."""
+    top = TopK(3, width=256)
+    for i in range(200_000):
+        top.add(f"K{i % 5}")
+    assert len(top._heap) <= 2 * top.k
+    assert sum(n for _, n in top.most_common()) == 3 * 40_000
+
+
+def test_call_prefix() -> None:
+    """WPX prefixes handle portable suffixes, slashed prefixes and call areas."""
+    assert [
+        call_prefix(c)
+        for c in ("W1AW", "3DA0XX", "K1ABC/P", "DL/W1AW", "W1AW/4", "JA1/K1ABC", "")
+    ] == ["W1", "3DA0", "K1", "DL0", "W4", "JA1", ""]
+
+
+def _write_log(path: Path, calls: list[str]) -> None:
+    body = "".join(
+        f"<CALL:{len(c)}>{c}<GRIDSQUARE:6>FN31pr<QSO_DATE:8>20240101<EOR>\n" for c in calls
+    )
+    path.write_text("<EOH>\n" + body, encoding="utf-8")
+
+
+def test_sketch_directory_and_server_tool(tmp_path: Path) -> None:
+    """Per-file sketches over a directory merge into one summary."""
+    from adif_mcp.mcp.server import log_sketch
+
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    _write_log(logs / "a.adi", ["W1AW", "W1AW", "K1ABC"])
+    _write_log(logs / "b.adi", ["W1AW", "JA1XX/P"])
+    (logs / "notes.txt").write_text("not a log", encoding="utf-8")
+
+    sketch, files = sketch_files([logs])
+    assert [Path(f).name for f in files] == ["a.adi", "b.adi"]
+    summary = sketch.summary(2)
+    assert summary["qsos"] == 5
+    assert summary["distinct"]["call"]["estimate"] == 3
+    assert summary["distinct"]["grid"]["estimate"] == 1
+    assert summary["top"]["call"]["keys"][0] == {"key": "W1AW", "count": 3}
+    assert {k["key"] for k in summary["top"]["prefix"]["keys"]} == {"W1", "JA1"}
+    again = LogSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+    assert again.summary(2) == summary
+
+    out = log_sketch([str(logs)], top=["prefix"], k=1)
+    assert out["top"]["prefix"]["keys"] == [{"key": "W1", "count": 3}]
+    assert "error" in log_sketch([str(tmp_path / "missing.adi")])
+
+
+def test_approx_distinct_aggregate_survives_spills() -> None:
+    """approx_distinct matches distinct on small groups, through spill and merge."""
+    recs = [{"call": f"K{i % 40}AA", "band": "20m" if i % 2 else "40m"} for i in range(400)]
+    agg = Aggregator(["band"], ["distinct:call", "approx_distinct:call"], max_in_memory=16)
+    agg.add_many(recs)
+    rows = agg.results()
+    assert agg.spills > 0
+    assert [(r["distinct:call"], r["approx_distinct:call"]) for r in rows] == [(20, 20)] * 2
@@ -0,0 +1,75 @@
+"""Tests for the full-text index over COMMENT/QSLMSG/NOTES/NAME and search_log."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.logbook.textindex import TextIndex, tokenize
+from adif_mcp.logbook.watch import LogWatcher
+
+_RECS = [
+    {"call": "W1AW", "comment": "Running a 3-element Yagi at 40ft", "name": "Hiram"},
+    {"call": "K1ABC", "qslmsg": "TNX for the yagi QSO", "notes": "element 3 broke"},
+    {"call": "JA1XX", "comment": "dipole", "name_intl": "Tarō"},
+    {"call": "DL1AB"},
+]
+
+
+def test_words_prefixes_phrases_and_fields() -> None:
+    """Terms intersect; phrases and field-bound terms are checked in order and place."""
+    index = TextIndex()
+    assert index.add_many(_RECS) == 4
+    assert tokenize("3-Element YAGI!") == ["3", "element", "yagi"]
+    assert index.search("yagi") == (2, [0, 1])
+    assert index.search("YAG*") == (2, [0, 1])
+    assert index.search('"3-element yagi"') == (1, [0])
+    assert index.search("element 3") == (2, [0, 1])
+    assert index.search('"element 3"') == (1, [1])
+    assert index.search("qslmsg:yagi") == (1, [1])
+    assert index.search("yagi", fields=["comment"]) == (1, [0])
+    assert index.search("tarō") == (1, [2])
+    assert index.search("yagi dipole") == (0, [])
+    assert index.search("yagi", limit=1) == (2, [0])
+    assert index.describe(2)["text"] == {"comment": "dipole", "name": "Tarō"}
+    assert index.stats()["with_text"] == 3
+    with pytest.raises(ValueError):
+        index.search("yagi", fields=["rig"])
+
+
+def _qso(call: str, comment: str) -> str:
+    return f"<CALL:{len(call)}>{call}<COMMENT:{len(comment.encode())}>{comment}<EOR>\n"
+
+
+def test_follows_appends_and_replacement(tmp_path: Path) -> None:
+    """A watched index adds appended QSOs and starts over when the log is replaced."""
+    log = tmp_path / "live.adi"
+    log.write_text("<EOH>\n" + _qso("W1AW", "nice yagi"), encoding="utf-8")
+    watcher, index = LogWatcher(), TextIndex()
+    watcher.watch(log, index)
+    watcher.poll()
+    with log.open("a", encoding="utf-8") as fh:
+        fh.write(_qso("K1ABC", "big yagi"))
+    watcher.poll()
+    assert index.search("yagi") == (2, [0, 1])
+
+    new = tmp_path / "new.adi"
+    new.write_text("<EOH>\n" + _qso("JA1XX", "loop"), encoding="utf-8")
+    os.replace(new, log)
+    watcher.poll()
+    assert index.records == 1 and index.search("yagi") == (0, [])
+
+
+def test_search_log_tool(tmp_path: Path) -> None:
+    """search_log indexes on first use and sees appended QSOs on the next call."""
+    from adif_mcp.mcp.server import search_log
+
+    log = tmp_path / "log.adi"
+    log.write_text("<EOH>\n" + _qso("W1AW", "3-element yagi"), encoding="utf-8")
+    out = search_log(str(log), '"3 element"')
+    assert out["total"] == 1 and out["matches"][0]["call"] == "W1AW"
+    assert out["matches"][0]["index"] == 1
+    with log.open("a", encoding="utf-8") as fh:
+        fh.write(_qso("K1ABC", "yagi up 20m"))
+    assert search_log(str(log), "yagi")["total"] == 2
+    assert "error" in search_log(str(tmp_path / "missing.adi"), "yagi")
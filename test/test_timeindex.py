@@ -0,0 +1,93 @@
+"""Tests for the sorted QSO time index and the range queries that use it."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.cli import convert_adi
+from adif_mcp.logbook.aggregate import aggregate_files
+from adif_mcp.logbook.timeindex import TimeIndex, log_time_index, parse_bound
+from adif_mcp.parsers import parse_cache
+from adif_mcp.parsers.parse_cache import ParseCache
+
+# (date, time) per record, deliberately out of order, with one undated record.
+_QSOS = [
+    ("20240103", "1200"),
+    ("20240101", "2359"),
+    ("", "0000"),
+    ("20240102", "0000"),
+    ("20240101", "0830"),
+    ("20240105", "0100"),
+]
+
+
+def _write_log(path: Path) -> None:
+    body = []
+    for i, (d, t) in enumerate(_QSOS):
+        call = f"K{i}AA"
+        date = f"<QSO_DATE:8>{d}" if d else ""
+        body.append(
+            f"<CALL:{len(call)}>{call}{date}<TIME_ON:4>{t}<BAND:3>20m<MODE:2>CW<EOR>\n"
+        )
+    path.write_text("<PROGRAMID:4>TEST<EOH>\n" + "".join(body), encoding="utf-8")
+
+
+def test_bounds_and_out_of_order_slices() -> None:
+    """Ranges are inclusive, whole days by default, and map back to ordinals."""
+    assert parse_bound("2024-01-02") == parse_bound("202401020000")
+    assert parse_bound("20240102", end=True) == parse_bound("202401022359")
+    with pytest.raises(ValueError):
+        parse_bound("2024")
+
+    recs = [{"qso_date": d, "time_on": t} for d, t in _QSOS]
+    index = TimeIndex.from_records(recs)
+    assert (len(index), list(index.undated), index.in_order) == (5, [2], False)
+    assert list(index.ordinals("20240101", "20240102")) == [4, 1, 3]
+    assert list(index.ordinals("20240101", "20240102", file_order=True)) == [1, 3, 4]
+    assert list(index.ordinals(since="202401021200")) == [0, 5]
+    assert index.count(until="20231231") == 0
+
+    ordered = TimeIndex([10, 20, 20, 30])
+    assert ordered.order is None and ordered.ordinals(20, 20) == range(1, 3)
+
+
+def test_cached_ranges_match_a_full_scan(tmp_path: Path) -> None:
+    """aggregate_files gives the same range answer with and without the index."""
+    log = tmp_path / "log.adi"
+    _write_log(log)
+    cache = ParseCache(tmp_path / "cache", min_bytes=0)
+    query = {"group_by": ["date"], "since": "20240101", "until": "20240103"}
+    plain = aggregate_files([log], **query)  # type: ignore[arg-type]
+    indexed = aggregate_files([log], cache=cache, **query)  # type: ignore[arg-type]
+    assert indexed == plain
+    assert (plain["total"], plain["matched"]) == (6, 4)
+    with cache.open(log) as cached:
+        assert cached is not None
+        assert log_time_index(cached) is log_time_index(cached)
+
+
+def test_convert_since_until_uses_the_index(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """convert --cache --since/--until reads only the range from the cache, identically."""
+    log = tmp_path / "log.adi"
+    _write_log(log)
+    with log.open("a", encoding="utf-8") as fh:  # lengths count bytes, not characters
+        fh.write("<CALL:4>DL1J<QSO_DATE:8>20240102<TIME_ON:4>0100<NAME:5>J\u00f6rg<BAND:3>20m")
+        fh.write("<MODE:2>CW<EOR>\n")
+    monkeypatch.setattr(parse_cache, "_default", ParseCache(tmp_path / "c", min_bytes=0))
+    args = ["-i", str(log), "--ndjson", "--station-call", "W1AW", "--since", "20240102"]
+    args += ["--until", "20240103"]
+    convert_adi.main([*args, "-o", str(tmp_path / "plain.ndjson")])
+    assert not (tmp_path / "c").exists()  # no cache writes without --cache
+    convert_adi.main([*args, "--cache", "-o", str(tmp_path / "indexed.ndjson")])
+
+    def rows(name: str) -> list[dict[str, str]]:
+        lines = (tmp_path / name).read_text(encoding="utf-8").splitlines()
+        return [json.loads(line) for line in lines]
+
+    assert rows("indexed.ndjson") == rows("plain.ndjson")
+    assert [r["call"] for r in rows("plain.ndjson")] == ["K0AA", "K3AA", "DL1J"]
+    assert rows("plain.ndjson")[2]["adif_fields"]["name"] == "J\u00f6rg"
+    assert parse_cache._default.hits + parse_cache._default.misses == 1  # type: ignore[union-attr]
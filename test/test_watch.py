@@ -0,0 +1,162 @@
+"""Tests for the polling log watcher, LogCursor rotation handling and `adif-mcp watch`."""
+
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+
+import pytest
+
+from adif_mcp.cli import root
+from adif_mcp.logbook.awards import AwardTracker, state_path_for
+from adif_mcp.logbook.lookup import WorkedIndex
+from adif_mcp.logbook.watch import AwardSink, LogWatcher
+from adif_mcp.parsers.adi_stream import LogCursor
+
+
+def _qso(call: str, band: str = "20m", extra: str = "") -> str:
+    return (
+        f"<CALL:{len(call)}>{call}<BAND:{len(band)}>{band}<MODE:2>CW"
+        f"<QSO_DATE:8>20240101<TIME_ON:4>1200{extra}<EOR>\n"
+    )
+
+
+class _Calls:
+    """Sink collecting the calls it receives."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def add(self, rec: Mapping[str, str]) -> None:
+        """Record the call."""
+        self.calls.append(rec["call"])
+
+
+def test_appends_and_partial_records(tmp_path: Path) -> None:
+    """Only complete records are pushed; a half-written one waits for its <EOR>."""
+    log = tmp_path / "live.adi"
+    log.write_text("<EOH>\n" + _qso("W1AW"), encoding="utf-8")
+    watcher, sink, index = LogWatcher(), _Calls(), WorkedIndex()
+    watcher.watch(log, sink)
+    watcher.watch(log, index)
+    assert watcher.poll() == 1
+    with log.open("a", encoding="utf-8") as fh:
+        fh.write(_qso("K1ABC")[:20])
+    assert watcher.poll() == 0
+    with log.open("a", encoding="utf-8") as fh:
+        fh.write(_qso("K1ABC")[20:] + _qso("JA1XX", "40m"))
+    assert watcher.poll(log) == 2
+    assert watcher.poll(log) == 0
+    assert sink.calls == ["W1AW", "K1ABC", "JA1XX"]
+    assert index.qso_count == 3 and index.worked("JA1XX", "40m")
+
+
+def test_rotation_and_in_place_rewrite(tmp_path: Path) -> None:
+    """A replaced (new inode) or truncated-and-refilled log is re-read from the start."""
+    log = tmp_path / "live.adi"
+    log.write_text("<EOH>\n" + _qso("W1AW"), encoding="utf-8")
+    watcher, sink = LogWatcher(), _Calls()
+    watcher.watch(log, sink)
+    watcher.poll()
+
+    new = tmp_path / "new.adi"
+    new.write_text("<EOH>\n" + _qso("K2AAA") + _qso("K2BBB"), encoding="utf-8")
+    os.replace(new, log)
+    watcher.poll()
+    assert sink.calls == ["W1AW", "K2AAA", "K2BBB"]
+
+    # same inode, rewritten larger: caught by the bytes before the offset
+    log.write_text("<EOH>\n" + _qso("K3CCC", extra="<NAME:3>Bob") * 3, encoding="utf-8")
+    watcher.poll()
+    assert sink.calls[3:] == ["K3CCC"] * 3
+    assert watcher.stats()["logs"][str(log.resolve())]["resets"] == 2
+
+
+def test_cursor_detects_truncation(tmp_path: Path) -> None:
+    """LogCursor restarts on a shrunk file and counts the reset."""
+    log = tmp_path / "a.adi"
+    log.write_text(_qso("W1AW") + _qso("K1ABC"), encoding="utf-8")
+    cursor = LogCursor(log)
+    assert len(list(cursor.read_new())) == 2
+    log.write_text(_qso("N0X"), encoding="utf-8")
+    assert [r.fields["call"] for r in cursor.read_new()] == ["N0X"]
+    assert cursor.resets == 1
+
+
+def test_late_subscriber_and_award_checkpoint(tmp_path: Path) -> None:
+    """A late subscriber catches up alone; AwardSink persists offset and state."""
+    log = tmp_path / "live.adi"
+    log.write_text("<EOH>\n" + _qso("W1AW", extra="<DXCC:3>291"), encoding="utf-8")
+    state = tmp_path / "state.json"
+    tracker = AwardTracker()
+    tracker.ingest_file(log)
+    awards = AwardSink(tracker, log, state)
+    watcher, sink = LogWatcher(), _Calls()
+    watcher.watch(log, awards, offset=awards.offset)
+    watcher.watch(log, sink)
+    with log.open("a", encoding="utf-8") as fh:
+        fh.write(_qso("JA1XX", extra="<DXCC:3>339"))
+    watcher.poll()
+    assert sink.calls == ["W1AW", "JA1XX"]
+    assert tracker.qso_count == 2
+    saved = AwardTracker.load(state)
+    assert saved.progress("DXCC")["worked"] == 2
+    assert saved.offsets[str(log.resolve())] == log.read_bytes().rindex(b"<EOR>") + 5
+
+
+def test_rotated_log_rebuilds_award_state(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A rotated log replaces the award counts instead of adding to them."""
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    log = tmp_path / "live.adi"
+    log.write_text(
+        "<EOH>\n" + _qso("W1AW", extra="<DXCC:3>291") + _qso("K1ABC", extra="<DXCC:3>291"),
+        encoding="utf-8",
+    )
+    tracker = AwardTracker()
+    awards = AwardSink(tracker, log, tmp_path / "state.json")
+    watcher = LogWatcher()
+    watcher.watch(log, awards)
+    watcher.poll()
+    assert root.dispatch(["watch", str(log), "--awards", "--once"]) == 0
+
+    new = tmp_path / "new.adi"
+    new.write_text(
+        "<EOH>\n" + "".join(_qso(c, extra="<DXCC:3>339") for c in ("JA1A", "JA1B", "JA1C")),
+        encoding="utf-8",
+    )
+    os.replace(new, log)
+    watcher.poll()
+    assert tracker.summary()["qso_count"] == 3
+    assert tracker.members("DXCC") == ["339"]
+
+    assert root.dispatch(["watch", str(log), "--awards", "--once"]) == 0
+    saved = AwardTracker.load(state_path_for(log))
+    assert (saved.qso_count, saved.members("DXCC")) == (3, ["339"])
+
+
+def test_watch_cli_once(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """`adif-mcp watch --once --from-start` prints NDJSON with quick problems."""
+    log = tmp_path / "live.adi"
+    log.write_text("<EOH>\n" + _qso("W1AW") + "<CALL:4>K1AB<TIME_ON:4>2500<EOR>\n")
+    assert root.dispatch(["watch", str(log), "--from-start", "--once"]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["record"]["call"] for line in lines] == ["W1AW", "K1AB"]
+    assert "problems" not in lines[0]
+    assert lines[1]["problems"] == ["missing QSO_DATE", "bad TIME_ON '2500'"]
+
+
+def test_server_tools_follow_appends(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """worked_before and award_progress see QSOs appended between calls."""
+    from adif_mcp.mcp import server
+
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "cfg"))
+    log = tmp_path / "live.adi"
+    log.write_text("<EOH>\n" + _qso("W1AW", extra="<DXCC:3>291"), encoding="utf-8")
+    assert server.award_progress(str(log), "DXCC")["worked"] == 1
+    assert not server.worked_before(str(log), "JA1XX")["worked"]["any"]
+    with log.open("a", encoding="utf-8") as fh:
+        fh.write(_qso("JA1XX", extra="<DXCC:3>339"))
+    assert server.worked_before(str(log), "JA1XX")["worked"]["any"]
+    assert server.award_progress(str(log), "DXCC")["worked"] == 2